@@ -0,0 +1,381 @@
+import math
+
+from factorysimpy.base.belt_store import BeltStore
+from factorysimpy.base.belt_span_index import BeltSpanIndex
+from factorysimpy.utils.logger import logger
+
+
+class AnalyticalBeltStore(BeltStore):
+    """
+        A BeltStore that moves its items in closed form instead of running a process per item.
+
+        The belt keeps a local clock that advances with the simulation time while the belt runs and is frozen
+        while it is stopped. Every item stores the clock value at which it entered the belt, so its progress
+        (the time it has spent moving) is `clock - entry`. An item reaches the exit when its progress equals its
+        delay, and it has fully entered the belt when its progress equals `length/speed`.
+
+        An item waiting in `ready_items` occupies the exit. The items behind it keep moving until they queue up,
+        so the progress of the i-th item on the belt is capped at `delay - (length of the items ahead)/speed`.
+        When the exit is cleared, the capped items are rebased to the position they reached and move on together.
+        Entry clocks and item lengths are kept in a BeltSpanIndex, so items of different lengths are spaced
+        exactly, and the queued items are found and released in O(log n). All items share the delay of the belt.
+
+        Only the next exit of the head item and the moment the last item has fully entered the belt (which may
+        allow a new `reserve_put`) are scheduled, using a single timer.
+
+        The speed of the belt can be changed at runtime with `set_speed`, at once or along a linear ramp. The
+        belt clock is kept in units of the nominal `speed` (the one the delays and item lengths are expressed
+        in) and advances at the rate `current speed / speed`, so the positions of the items do not depend on the
+        speed profile. A speed change only reschedules the single timer, converting the clock time left to the
+        next event into simulation time by integrating the rate.
+
+        Stalls are handled in the same way as in BeltStore:
+            - non accumulating belt (`noaccumulation_mode_on` set when stalled): the belt clock is frozen, so all items stop.
+            - accumulating belt: the clock keeps running and the items queue up behind the item at the exit.
+
+        The reservation interface (`reserve_put`, `reserve_get`, `put`, `get` and the cancel methods) is inherited
+        from BeltStore.
+
+        Attributes:
+            clock_running (bool): False while the belt is stopped.
+            speed (float): Nominal speed of the belt, the unit of the belt clock.
+        """
+
+    def __init__(self, env, capacity=float('inf'), speed=1, accumulation_mode_indicator=True):
+        """
+        Args:
+         capacity (int, optional): The maximum number of items the store can hold.
+                                    Defaults to infinity.
+         speed (float, optional): The speed of the conveyor belt. Defaults to 1.
+         accumulation_mode_indicator (bool, optional): Indicates if the belt is in accumulation mode.
+                                                       Defaults to True.
+        """
+        super().__init__(env, capacity, speed, accumulation_mode_indicator)
+        self.clock_running = True
+        self._clock_value = 0.0        # belt clock at _clock_time
+        self._clock_time = env.now
+        self._spans = BeltSpanIndex(speed)  # entry clocks and lengths of the items in self.items
+        self._timer = None
+        # speed profile, as a rate of the belt clock: linear from _speed_time to _ramp_end, constant afterwards
+        self._speed_time = env.now
+        self._rate = 1.0
+        self._acceleration = 0.0
+        self._ramp_end = env.now
+
+    # ----- belt clock -----------------------------------------------------------------------------
+
+    def _rate_at(self, t):
+        return self._rate + self._acceleration * (min(t, self._ramp_end) - self._speed_time)
+
+    def _advance(self, t0, t1):
+        # integral of the rate between two times of the current speed profile, exact as the rate is piecewise linear
+        ramp_end = min(max(self._ramp_end, t0), t1)
+        return (ramp_end - t0) * (self._rate_at(t0) + self._rate_at(ramp_end)) / 2 + (t1 - ramp_end) * self._rate_at(t1)
+
+    def _time_to_advance(self, delta):
+        """Return the simulation time the running belt clock takes to advance by `delta`, infinity if it never does."""
+        if delta <= 0:
+            return 0.0
+        now = self.env.now
+        rate = self._rate_at(now)
+        ramp = max(self._ramp_end - now, 0.0)
+        gained = ramp * (rate + self._rate_at(self._ramp_end)) / 2
+        if delta <= gained:
+            # solve rate*t + acceleration*t**2/2 = delta, in a form that stays exact for small accelerations
+            return 2 * delta / (rate + math.sqrt(max(rate * rate + 2 * self._acceleration * delta, 0.0)))
+        final_rate = self._rate_at(self._ramp_end)
+        return ramp + (delta - gained) / final_rate if final_rate > 0 else float('inf')
+
+    def belt_clock(self):
+        """Return the current value of the belt clock."""
+        if self.clock_running:
+            return self._clock_value + self._advance(self._clock_time, self.env.now)
+        return self._clock_value
+
+    def current_speed(self):
+        """Return the speed of the belt at the current simulation time."""
+        return self.speed * self._rate_at(self.env.now)
+
+    def set_speed(self, speed, ramp_time=0):
+        """
+        Change the speed of the belt, at once or linearly over `ramp_time`.
+
+        The positions of the items are kept and only the timer of the next exit is rescheduled. A belt at speed
+        0 keeps its items in place until its speed is raised again.
+
+        Args:
+            speed (float): The new speed of the belt.
+            ramp_time (float, optional): Time taken to reach `speed` from the current speed. Defaults to 0.
+
+        Raises:
+            ValueError: If `speed` or `ramp_time` is negative.
+        """
+        if speed < 0:
+            raise ValueError(f"speed must not be negative, got {speed!r}.")
+        if ramp_time < 0:
+            raise ValueError(f"ramp_time must not be negative, got {ramp_time!r}.")
+        now = self.env.now
+        self._clock_value = self.belt_clock()
+        self._clock_time = now
+        rate, target = self._rate_at(now), speed / self.speed
+        self._speed_time = now
+        if ramp_time > 0:
+            self._rate = rate
+            self._acceleration = (target - rate) / ramp_time
+            self._ramp_end = now + ramp_time
+        else:
+            self._rate = target
+            self._acceleration = 0.0
+            self._ramp_end = now
+        if logger.debug_enabled:
+            logger.debug(self, f"T={now:.2f} belt speed set to {speed} over {ramp_time}")
+        self._schedule()
+
+    def _freeze(self):
+        if self.clock_running:
+            self._clock_value = self.belt_clock()
+            self._clock_time = self.env.now
+            self.clock_running = False
+
+    def _unfreeze(self):
+        if not self.clock_running:
+            self._clock_time = self.env.now
+            self.clock_running = True
+
+    # ----- closed form positions ------------------------------------------------------------------
+
+    def _limit(self, index):
+        """Return the maximum progress of self.items[index], or None if the exit is free."""
+        if not self.ready_items:
+            return None
+        return self.items[index][1] - (self.ready_items[-1].length + self._spans.length_ahead(index)) / self.speed
+
+    def progress(self, index):
+        """
+        Return the time self.items[index] has spent moving on the belt.
+
+        Args:
+            index (int): Index of the item in `items`.
+
+        Returns:
+            float: The progress of the item, capped by the item queued ahead of it.
+        """
+        free = self.belt_clock() - self._spans.entry(index)
+        limit = self._limit(index)
+        return free if limit is None else min(free, limit)
+
+    def _rebase_queued_items(self):
+        # items queued behind the exit keep the position they reached when the exit is cleared
+        if self.items:
+            exit_length = self.ready_items[-1].length if self.ready_items else 0.0
+            self._spans.pack(self.belt_clock(), self.items[0][1], exit_length)
+
+    def num_queued_items(self):
+        """
+        Return the number of items queued behind the item waiting at the exit.
+
+        Returns:
+            int: Number of items counted from the first item on the belt, 0 if the exit is free.
+        """
+        if not self.ready_items or not self.items:
+            return 0
+        return self._spans.num_queued(self.belt_clock(), self.items[0][1], self.ready_items[-1].length)
+
+    def entry_gap(self):
+        """
+        Return the free length at the entry of the belt, behind the last item.
+
+        Returns:
+            float: The free length, or infinity if the belt is empty.
+        """
+        if not self.items:
+            return float('inf')
+        tail = len(self.items) - 1
+        return self.progress(tail) * self.speed - self.items[tail][0].length
+
+    # ----- scheduling -----------------------------------------------------------------------------
+
+    def _schedule(self):
+        """Schedule the single timer for the next exit or the next full entry of the last item."""
+        self._timer = None
+        if not self.clock_running or not self.items:
+            return
+        candidates = []
+        clock = self.belt_clock()
+        if not self.ready_items:
+            candidates.append(self.items[0][1] - (clock - self._spans.entry(0)))
+        tail = len(self.items) - 1
+        entered = self.items[tail][0].length / self.speed
+        if clock - self._spans.entry(tail) < entered - 1e-9:
+            limit = self._limit(tail)
+            if limit is None or limit >= entered:
+                candidates.append(entered - (clock - self._spans.entry(tail)))
+        if candidates:
+            delay = self._time_to_advance(max(min(candidates), 0))
+            if delay < float('inf'):
+                timer = self.env.timeout(delay)
+                timer.callbacks.append(self._on_timer)
+                self._timer = timer
+
+    def _on_timer(self, timer):
+        if timer is not self._timer:
+            return
+        self._timer = None
+        if not self.ready_items and self.items and self.progress(0) >= self.items[0][1] - 1e-9:
+            self._move_head_to_ready_items()
+        else:
+            # the last item has fully entered the belt, another item may be put
+            self._schedule()
+            self._trigger_reserve_put(None)
+
+    def _move_head_to_ready_items(self):
+        item = self.items.pop(0)
+        self._spans.popleft()
+        item[0].total_interruption_time = self.env.now - item[0].conveyor_entry_time - item[1]
+        if len(self.ready_items) + len(self.items) < self.capacity:
+            self.ready_items.append(item[0])
+            item[0].conveyor_ready_item_entry_time = self.env.now
+            if not self.ready_item_event.triggered:
+                self.ready_item_event.succeed()
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} beltstore moved item {item[0].id} to ready_items")
+            self._schedule()
+            self._trigger_reserve_get(None)
+            self._trigger_reserve_put(None)
+        else:
+            raise RuntimeError("Total number of items in the store exceeds capacity. Cannot move item to ready_items.")
+
+    # ----- store operations -----------------------------------------------------------------------
+
+    def _do_reserve_put(self, event):
+        """
+        Attempts to reserve space on the belt for an incoming item.
+
+        The reservation is granted if the store is not full, the last item has fully entered the belt and the
+        head item is not reaching the exit at this very moment. A non accumulating belt does not accept items
+        while an item is waiting at the exit.
+
+        Args:
+            event (simpy.Event): The event associated with the reservation request.
+        """
+        if len(self.reservations_put) + len(self.items) + len(self.ready_items) >= self.capacity:
+            return
+        if self.items:
+            if not (self.accumulation_mode_indicator or not self.ready_items):
+                return
+            if self.entry_gap() < -1e-5 * self.speed:
+                return
+            if self.progress(0) >= self.items[0][1] - 1e-9:
+                return
+        self.reservations_put.append(event)
+        event.succeed()
+
+    def _do_put(self, put_event, item):
+        """
+        Put the item on the belt at the current belt clock.
+
+        Args:
+            put_event (simpy.Event): The reservation event associated with the put request.
+            item (tuple): The (item, delay) pair, `delay` being the time the item needs to reach the exit.
+
+        Returns:
+            proceed (bool): True if the item was successfully added
+
+        Raises:
+            RuntimeError: If the process does not have a valid reservation
+        """
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
+        if reserved_event is None:
+            raise RuntimeError(
+                f"Time {self.env.now:.2f}, No matching reservation found "
+                f"for process {self.env.active_process} in reservations_put."
+            )
+        self.reservations_put.remove(reserved_event)
+
+        if len(self.items) + len(self.ready_items) < self.capacity:
+            item[0].total_interruption_time = 0
+            item[0].interruption_start_time = None
+            self.items.append(item)
+            self._spans.append(self.belt_clock(), item[0].length)
+            self._update_time_averaged_level()
+            self._schedule()
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: AnalyticalBeltStore:_do_put: putting item on belt {item[0].id}")
+            return True
+
+    def _do_get(self, get_event):
+        """
+        Take out the reserved item from the exit and let the queued items move on.
+        """
+        self._rebase_queued_items()
+        item = super()._do_get(get_event)
+        self._schedule()
+        return item
+
+    # ----- stall handling, called by ConveyorBelt ---------------------------------------------------
+
+    def selective_interrupt(self, reason="Selective interrupt"):
+        """
+        Stop the belt when it stalls in non accumulating mode. An accumulating belt keeps running and its
+        items queue up behind the item at the exit.
+
+        Args:
+            reason (str): Reason for the stall
+        """
+        if self.noaccumulation_mode_on:
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} belt clock frozen - {reason}")
+            self._freeze()
+            self._schedule()
+
+    def interrupt_all_move_processes(self, reason="External interrupt"):
+        """
+        Stop the belt.
+
+        Args:
+            reason (str): Reason for the stop
+        """
+        self._freeze()
+        self._schedule()
+
+    def resume_all_move_processes(self):
+        """
+        Restart the belt.
+        """
+        self._unfreeze()
+        self._schedule()
+
+    def handle_new_item_during_interruption(self, item):
+        """
+        Nothing to do: a new item queues up behind the others through the closed form positions.
+        """
+
+    def interrupt_and_resume_all_delayed_interrupt_processes(self, reason="State change interrupt"):
+        """
+        Nothing to do: no delayed interrupts are used.
+        """
+
+    def _get_belt_pattern(self):
+        """
+        Generate a pattern string representing the conveyor occupancy.
+        '*' represents an item, '_' represents empty space.
+
+        Returns:
+            tuple: (belt_pattern: str, belt_item_rep: list)
+        """
+        belt_positions = ['_'] * self.capacity
+        belt_item_rep = ['-'] * self.capacity
+        last = self.capacity
+        for item in self.ready_items:
+            last -= 1
+            belt_positions[last] = '*'
+            belt_item_rep[last] = (item.id, last)
+        for i, item in enumerate(self.items):
+            # slots have the width of the belt divided by its capacity, whatever the item lengths
+            pos = min(int(math.ceil(self.progress(i) * self.capacity / item[1])), last - 1)
+            if pos < 0:
+                break
+            belt_positions[pos] = '*'
+            belt_item_rep[pos] = (item[0].id, pos)
+            last = pos
+        return ''.join(belt_positions), belt_item_rep
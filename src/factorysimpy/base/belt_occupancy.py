@@ -0,0 +1,63 @@
+class BeltOccupancy:
+    """Slot occupancy of a belt at one time instant.
+
+    The belt is divided into `capacity` slots numbered from the entry (0) to the
+    exit (`capacity - 1`). The index keeps the occupied slots in ascending order
+    together with the ids of the items in them, and the run-length of empty
+    slots after every occupied slot. Questions asked by the interruption plans
+    (are the items contiguous, how many empty slots lie ahead of an item) are
+    answered from these lists without scanning the whole belt.
+
+    Args:
+        capacity (int): Number of slots on the belt.
+        placed (list): (slot, item id) pairs, in any order.
+    """
+
+    __slots__ = ("capacity", "positions", "ids", "gaps")
+
+    def __init__(self, capacity, placed):
+        placed.sort(key=lambda entry: entry[0])
+        self.capacity = capacity
+        self.positions = [slot for slot, _ in placed]
+        self.ids = [item_id for _, item_id in placed]
+        # gaps[i] is the number of empty slots between positions[i] and the next occupied slot (or the exit)
+        self.gaps = [nxt - pos - 1 for pos, nxt in zip(self.positions, self.positions[1:])]
+        if self.positions:
+            self.gaps.append(capacity - 1 - self.positions[-1])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def is_full(self):
+        """Return True if every slot is occupied."""
+        return len(self.positions) == self.capacity
+
+    def is_contiguous(self):
+        """Return True if there is no empty slot between the occupied slots."""
+        return len(self.positions) <= 1 or self.positions[-1] - self.positions[0] + 1 == len(self.positions)
+
+    def empty_slots_ahead(self, index):
+        """
+        Return the number of empty slots between the index-th occupied slot and the exit.
+
+        Args:
+            index (int): Index in `positions`.
+
+        Returns:
+            int: Sum of the gaps ahead of the slot.
+        """
+        return (self.capacity - 1 - self.positions[index]) - (len(self.positions) - 1 - index)
+
+    def pattern(self):
+        """
+        Return the occupancy as strings, for debugging.
+
+        Returns:
+            tuple: (belt_pattern: str, belt_item_rep: list), '*' for an item and '_' for an empty slot.
+        """
+        belt_positions = ['_'] * self.capacity
+        belt_item_rep = ['-'] * self.capacity
+        for pos, item_id in zip(self.positions, self.ids):
+            belt_positions[pos] = '*'
+            belt_item_rep[pos] = (item_id, pos)
+        return ''.join(belt_positions), belt_item_rep
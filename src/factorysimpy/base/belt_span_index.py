@@ -0,0 +1,124 @@
+from bisect import bisect_left
+
+
+class BeltSpanIndex:
+    """Index of the spans occupied by the items on a continuous belt, in belt clock coordinates.
+
+    Items are kept in belt order (first item nearest to the exit). For every
+    item the index stores the belt clock at which it entered the belt and
+    the total length of the items put before it, so the length of the items
+    ahead of any item is a difference of two prefix sums.
+
+    A free moving item entered at clock `e` has its front at
+    `speed * (clock - e)`. It is queued behind the exit once its front
+    reaches the rear of the items ahead of it. Along the belt the key
+    `e - (length put before the item) / speed` never decreases, which makes
+    the queued items a prefix of the belt that is found by bisection.
+
+    When the exit is cleared the queued items start moving again as one
+    packed block. The block is kept as a count and a single key, so
+    releasing it does not touch the items one by one.
+
+    Args:
+        speed (float): Speed of the belt.
+    """
+
+    __slots__ = ("speed", "_entry", "_keys", "_before", "_lengths", "_start", "_total",
+                 "_packed", "_packed_key")
+
+    def __init__(self, speed):
+        self.speed = speed
+        self._entry = []
+        self._keys = []
+        self._before = []
+        self._lengths = []
+        self._start = 0
+        self._total = 0.0
+        self._packed = 0
+        self._packed_key = 0.0
+
+    def __len__(self):
+        return len(self._entry) - self._start
+
+    def append(self, clock, length):
+        """
+        Add an item at the entry of the belt.
+
+        Args:
+            clock (float): Belt clock at which the item enters.
+            length (float): Length of the item.
+        """
+        self._entry.append(clock)
+        self._keys.append(clock - self._total / self.speed)
+        self._before.append(self._total)
+        self._lengths.append(length)
+        self._total += length
+
+    def popleft(self):
+        """Remove the first item of the belt."""
+        self._start += 1
+        if self._packed:
+            self._packed -= 1
+        if self._start > 64 and self._start * 2 > len(self._entry):
+            for values in (self._entry, self._keys, self._before, self._lengths):
+                del values[:self._start]
+            self._start = 0
+
+    def entry(self, index):
+        """Return the belt clock at which the index-th item entered, as if it had never been queued."""
+        if index < self._packed:
+            return self._packed_key + self._before[self._start + index] / self.speed
+        return self._entry[self._start + index]
+
+    def length(self, index):
+        """Return the length of the index-th item."""
+        return self._lengths[self._start + index]
+
+    def length_ahead(self, index):
+        """Return the total length of the items ahead of the index-th item."""
+        return self._before[self._start + index] - self._before[self._start]
+
+    def total_length(self):
+        """Return the total length of the items on the belt."""
+        return self._total - self._before[self._start] if len(self) else 0.0
+
+    def _queue_key(self, clock, delay, exit_length):
+        # items whose key is below this value have reached the rear of the items ahead of them
+        return clock - delay + (exit_length - self._before[self._start]) / self.speed
+
+    def num_queued(self, clock, delay, exit_length):
+        """
+        Return the number of items queued behind the item at the exit, in O(log n).
+
+        Args:
+            clock (float): Current belt clock.
+            delay (float): Time an item needs to travel the whole belt.
+            exit_length (float): Length of the item waiting at the exit.
+
+        Returns:
+            int: Number of items, counted from the first item of the belt.
+        """
+        if not len(self):
+            return 0
+        threshold = self._queue_key(clock, delay, exit_length)
+        if self._packed:
+            if self._packed_key >= threshold:
+                return 0
+            lo = self._start + self._packed
+        else:
+            lo = self._start
+        return bisect_left(self._keys, threshold, lo) - self._start
+
+    def pack(self, clock, delay, exit_length):
+        """
+        Record that the queued items start moving again as one block, in O(log n).
+
+        Args:
+            clock (float): Current belt clock.
+            delay (float): Time an item needs to travel the whole belt.
+            exit_length (float): Length of the item leaving the exit.
+        """
+        count = self.num_queued(clock, delay, exit_length)
+        if count:
+            self._packed = count
+            self._packed_key = self._queue_key(clock, delay, exit_length)
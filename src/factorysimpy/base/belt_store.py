@@ -6,6 +6,9 @@ import simpy
 import math
 import numpy as np
 from simpy.resources.store import Store
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
+from factorysimpy.base.belt_occupancy import BeltOccupancy
+from factorysimpy.utils.logger import logger
 
 class BeltStore(Store):
     """
@@ -35,11 +38,11 @@ class BeltStore(Store):
         Instead, it becomes available only after the specified delay has elapsed, simulating the movement of items on a conveyor belt.
 
         Attributes:
-           reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations
+           reserved_items (dict):  Maps each successful reserve_get event to the exact item reserved for it
+           reserve_put_queue (ReservationQueue): Queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations
         """
    
     def __init__(self, env, capacity=float('inf'), speed=1, accumulation_mode_indicator=True):
@@ -61,25 +64,27 @@ class BeltStore(Store):
         self.env = env
         
         self.speed = speed  # Speed of the conveyor belt (units per time)
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
-        self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
+        self.reserve_put_queue = ReservationQueue()  # FIFO queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue()  # FIFO queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.ready_items=[]  #Maintains the items ready to be taken out
-        self.reserved_items   = []   # parallel list of the exact items reserved
+        self.reserved_items = {}   # reserve_get event -> exact item reserved for it, in reservation order
         self._last_level_change_time = self.env.now
         self._last_num_items = 0
         self._weighted_sum = 0.0
         self.time_averaged_num_of_items_in_store = 0.0  # Time-averaged number of items in the store
         # Process tracking for interrupt functionality
         self.active_move_processes = {}  # Dictionary to track active move_to_ready_items processes
-        self.active_delayed_interrupt_processes = {}  # Dictionary to track active delayed interrupt processes
+        self._stopped_ids = []  # items with a stop recorded since the belt last resumed
+        self._sequence = 0      # orders the stops and the legs of the items scheduled for the same time
         self.resume_event = self.env.event()  # Event to signal when to resume processes
         self.noaccumulation_mode_on = False # to control if the belt is in noaccumulation mode
         self.accumulation_mode_indicator = accumulation_mode_indicator # to indicate if the belt is in accumulation mode or not
         self.one_item_inserted = False # to control insertion of only one item in noaccumulation mode
         self.ready_item_event= self.env.event()
+        self._occupancy = None  # BeltOccupancy cached for the time instant _occupancy_time
+        self._occupancy_time = None
 
     def _update_time_averaged_level(self):
         now = self.env.now
@@ -93,7 +98,7 @@ class BeltStore(Store):
             self._weighted_sum / total_time if total_time > 0 else 0.0
         )
 
-    def reserve_put(self):
+    def reserve_put(self, select=None):
         """
         Create a reservation request to put an item into the store.
 
@@ -106,11 +111,15 @@ class BeltStore(Store):
         any pending reservations.
 
         
+        Args:
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
+
         Returns:
             event (simpy.Event): A reservation event that will succeed when space is available.
 
         """
-        event = self.env.event()
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename = self  # Store reference
         event.requesting_process = self.env.active_process  # Process making the reservation
         
@@ -133,21 +142,14 @@ class BeltStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -179,29 +181,25 @@ class BeltStore(Store):
                 #if self.noaccumulation_mode_on==False or (self.noaccumulation_mode_on==True and len(self.ready_items)==0):
                 if self.accumulation_mode_indicator==True  or (self.noaccumulation_mode_on==False and len(self.ready_items)==0) or (self.noaccumulation_mode_on==True and len(self.ready_items)==0) :
 
-                    time_on_belt = self.env.now- self.items[-1][0].conveyor_entry_time - self.items[-1][0].total_interruption_time 
-                    time_on_belt_last_item =self.env.now- self.items[0][0].conveyor_entry_time - self.items[0][0].total_interruption_time 
-                    print(f"T={self.env.now:.2f}: time_on_belt1111 for {self.items[-1][0].id} is {time_on_belt} rounding to {np.round(time_on_belt)}, item length is {self.items[-1][0].length}, speed is {self.speed}, length/speed is {self.items[-1][0].length/self.speed}")
-                    
-                    if self.items[-1][0].interruption_start_time is not None:
-                        print(self._get_belt_pattern()[1])
-                        time_on_belt = self.env.now- self.items[-1][0].conveyor_entry_time - (self.env.now - self.items[-1][0].interruption_start_time)- self.items[-1][0].total_interruption_time
-                    if self.items[0][0].interruption_start_time is not None:
-                        print(self._get_belt_pattern()[1])
-                        time_on_belt_last_item = self.env.now- self.items[0][0].conveyor_entry_time - (self.env.now - self.items[0][0].interruption_start_time)- self.items[0][0].total_interruption_time
-                    print(f"T={self.env.now:.2f}: time_on_belt2222 for {self.items[-1][0].id} is {time_on_belt} rounding to {np.round(time_on_belt)}, item length is {self.items[-1][0].length}, speed is {self.speed}, length/speed is {self.items[-1][0].length/self.speed}")
+                    time_on_belt = self._time_on_belt(self.items[-1][0], self.env.now)
+                    time_on_belt_last_item = self._time_on_belt(self.items[0][0], self.env.now)
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: time_on_belt2222 for {self.items[-1][0].id} is {time_on_belt} rounding to {np.round(time_on_belt)}, item length is {self.items[-1][0].length}, speed is {self.speed}, length/speed is {self.items[-1][0].length/self.speed}")
                     #There is an item going to be in ready_items in the same time step, so do not allow another item to be put. It is because "put" was called first before the otem was moved to ready_items. all happens at same time instant.
                     if np.abs(time_on_belt  - self.items[-1][0].length/self.speed) < 1e-5 or time_on_belt > self.items[-1][0].length/self.speed:
-                        print("the last item check",self.items[0][0].id, time_on_belt_last_item)
+                        if logger.debug_enabled:
+                            logger.debug(self, "the last item check",self.items[0][0].id, time_on_belt_last_item)
                         if time_on_belt_last_item >= self.items[0][0].length* self.capacity/self.speed:
-                            print("the first item check",self.items[0][0].id, time_on_belt_last_item)
+                            if logger.debug_enabled:
+                                logger.debug(self, "the first item check",self.items[0][0].id, time_on_belt_last_item)
                     #if self.env.now>= self.items[-1][0].conveyor_entry_time + self.items[-1][0].length/self.speed:
                         #print(f"At time={self.env.now:.2f}, Process {self.env.active_process} "
                         # f"reserved space. Total reservations: {len(self.reservations_put)}")
                         else:
                             self.reservations_put.append(event)
                             event.succeed()
-                            print(f"T={self.env.now:.2f}: yielded reserve_put when noaccumulation_mode_on is {self.noaccumulation_mode_on}")
+                            if logger.debug_enabled:
+                                logger.debug(self, f"T={self.env.now:.2f}: yielded reserve_put when noaccumulation_mode_on is {self.noaccumulation_mode_on}")
                         
         else:# if not items succeed, belt is empty and succeed immediately
             #if self.accumulation_mode_indicator==False or (self.accumulation_mode_indicator==True and len(self.ready_items)==0):
@@ -209,7 +207,8 @@ class BeltStore(Store):
 
                     self.reservations_put.append(event)  # Add reservation
                     event.succeed()
-                    print(f"T={self.env.now:.2f}: yielded reserve_put when {self.noaccumulation_mode_on}")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: yielded reserve_put when {self.noaccumulation_mode_on}")
                     # Log the success of the reservation
                     #print(f"At time={self.env.now:.2f}, Process {self.env.active_process} "
                     #      f"reserved space. Total reservations: {len(self.reservations_put)}")
@@ -272,28 +271,24 @@ class BeltStore(Store):
             # 1) Remove from active reservations
             self.reservations_get.remove(get_event_to_cancel)
 
-            # 2) Find its index in the parallel lists
-            ev_idx = self.reserved_events.index(get_event_to_cancel)
-
-            # 3) Pop out the exact item reference
-            item = self.reserved_items.pop(ev_idx)
-            # 4) Drop the event token
-            self.reserved_events.pop(ev_idx)
+            # 2) Pop out the exact item reserved for the event
+            item = self.reserved_items.pop(get_event_to_cancel)
 
-            # 5) Remove it from ready_items wherever it currently is
+            # 3) Remove it from ready_items wherever it currently is
             try:
                 self.ready_items.remove(item)
             except ValueError:
                 raise RuntimeError(f"Item {item!r} not found in ready_items during cancel.")
 
-            # 6) Compute new insertion index
+            # 4) Compute new insertion index
            
-            insert_idx = len(self.ready_items) - len(self.reserved_events) - 1
+            insert_idx = len(self.ready_items) - len(self.reserved_items) - 1
             
-            # 7) Re‑insert it
+            # 5) Re‑insert it
             self.ready_items.insert(insert_idx, item)
+            self._invalidate_occupancy()
 
-            # 8) Trigger any other pending reservations
+            # 6) Trigger any other pending reservations
             self._trigger_reserve_get(None)
             return True
 
@@ -302,7 +297,7 @@ class BeltStore(Store):
             "No matching event in reserve_get_queue or reservations_get"
         )
 
-    def reserve_get(self):
+    def reserve_get(self, select=None):
         """
         Create a reservation request to retrieve an item from the store.
 
@@ -316,11 +311,15 @@ class BeltStore(Store):
 
         
 
+        Args:
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
+
         Returns:
            event (simpy.Event): A reservation event that will succeed when an item becomes available.
         """
         #adding attributes to the newly created event for reserve_get
-        event = self.env.event()
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename=self
         event.requesting_process = self.env.active_process  # Associate event with the current process
        
@@ -344,22 +343,14 @@ class BeltStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
         """
-        idx=0
-        
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
-          
           if not reserve_get_event.triggered:
-            
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
@@ -371,7 +362,7 @@ class BeltStore(Store):
         This method checks if there are available items in the store. If so,
         it grants the reservation request by adding the event to `reservations_get`
         and marking the reservation as successful. The event is also added
-        to `reserved_events` to maintain item order. If a request is
+        to `reserved_items` to maintain item order. If a request is
         successfully processed, it is removed from the queue.
 
         Args:
@@ -395,14 +386,13 @@ class BeltStore(Store):
             Called when a process reserves an item.
             But do NOT remove it yet—just record the exact item.
             """
-            j = len(self.reserved_events)
+            j = len(self.reserved_items)
            
             item = self.ready_items[j]
             
 
             # record the reservation
-            self.reserved_events.append(event)
-            self.reserved_items .append(item)
+            self.reserved_items[event] = item
 
 
 
@@ -470,37 +460,30 @@ class BeltStore(Store):
         Removes the reservation and takes out that exact item from ready_items.
         """
         # 1) validate reservation exists for this process
-        reserved_event = next(
-            (ev for ev in self.reservations_get
-             if ev == get_event and ev.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
         if reserved_event is None:
             raise RuntimeError(
                 f"Time {self.env.now:.2f}, no matching reservation for process {self.env.active_process}."
             )
 
-        # 2) find its index in the reservation lists
-        ev_idx = self.reserved_events.index(reserved_event)
-
-        # 3) remove from reservations
+        # 2) remove from reservations
         self.reservations_get.remove(reserved_event)
-        self.reserved_events.remove(reserved_event)
 
-        # 4) pop out the exact item reference
+        # 3) pop out the exact item reference
         try:
-            assigned_item = self.reserved_items.pop(ev_idx)
-            
-        except IndexError:
+            assigned_item = self.reserved_items.pop(reserved_event)
+        except KeyError:
             raise ValueError(f"Reserved item for {get_event} not found in store.")
 
-        # 5) remove that object from ready_items by value
+        # 4) remove that object from ready_items by value
         try:
             self.ready_items.remove(assigned_item)
         except ValueError:
             raise ValueError(f"Item {assigned_item} not in ready_items.")
+        self._invalidate_occupancy()
         self._update_time_averaged_level()
-        print(self.env.now, assigned_item, ev_idx)
+        if logger.debug_enabled:
+            logger.debug(self, self.env.now, assigned_item, ev_idx)
         return assigned_item
 
     
@@ -590,10 +573,7 @@ class BeltStore(Store):
 
         # Locate and remove the reservation event efficiently
     
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -606,22 +586,32 @@ class BeltStore(Store):
         # Add the item if space is available
         if len(self.items)+len(self.ready_items) < self.capacity:
             self.items.append(item)
+            self._invalidate_occupancy()
             self._update_time_averaged_level()
             #self.env.process(self.move_to_ready_items(item))
            
-            # Start the move process and track it
+            # Start the move process and track it, the item may be stopped before the process starts
+            item[0].total_interruption_time = 0
+            item[0].interruption_start_time = None
             move_process = self.env.process(self.move_to_ready_items(item))
             item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
             self.active_move_processes[item_id] = {
                 'process': move_process,
                 'item': item,
-                'start_time': self.env.now
+                'start_time': self.env.now,
+                'stop': None,       # time at which the belt stops the item, may be ahead while the items compact
+                'start': None,      # time at which the current leg of the movement started
+                'remaining': 0.0,   # time the item had left to move at the start of the leg
+                'leg_sequence': 0,  # when the current leg was scheduled, relative to the stops
+                'stop_sequence': None,  # when the stop was recorded, None for a stop at once
+                'waiting': False,   # whether the item waits for the belt to resume
             }
             
             # Handle selective interruption for new items during no accumulation mode
         
          
-            print(f"T={self.env.now:.2f}: BeltStore:_do_put: putting item on belt {item[0].id} and belt items are {[(i[0].id) for i in self.items]} and ready items are {[(i.id) for i in self.ready_items]}")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: BeltStore:_do_put: putting item on belt {item[0].id} and belt items are {[(i[0].id) for i in self.items]} and ready items are {[(i.id) for i in self.ready_items]}")
             return True  # Successfully added item
 
 
@@ -630,290 +620,260 @@ class BeltStore(Store):
         """
         Move items from the store to the ready_items list after a put operation.
         This method is called as a process to ensure that items are moved asynchronously.
-        Handles interrupts when state changes to stalled and resumes when state changes back.
         Movement is split into two phases:
         1. First phase: item[0].length/self.speed time (time for item to fully enter belt)
         2. Second phase: remaining time (time for item to reach exit)
+
+        The stops of the belt are applied lazily. A stall only records when the item stops (`_stop_items`) and
+        a resume adds the time it stood still to the time it owes (`resume_all_move_processes`). The process
+        waits on one timeout per phase and looks at its stops only when the timeout fires, so a stall and
+        resume cost no event for the items whose timeouts do not fire in between.
         """
         item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
+        move = self.active_move_processes[item_id]
         event=self.env.event()
-        total_interruption_time=0
-        #self.delay=item[0].length/self.speed
-        #print(f"created Added event suceeded{self.delay}")
         event.callbacks.append(self._trigger_reserve_put)# after putting an item, an event is created and will be triggered ater delay amount of time to allow waiting get calls to succeed in a stalled belt
-        #event.callbacks.append(self._trigger_put)# this may not be needed
-       
-        #print(f"{self.env.now}Added event suceed        ed")
-        
+
         # Calculate the two phases of movement
         phase1_time = item[0].length / self.speed  # Time for item to fully enter belt
         phase2_time = item[1] - phase1_time        # Remaining time to reach exit
-        item[0].total_interruption_time= total_interruption_time
-        item[0].interruption_start_time=None
         try:
-            # Move items to the ready_items list
-            if self.items:
-                print(f"T={self.env.now:.2f} beltstore received an item {item[0].id, item[1]} . Item started moving in belt")
-                
-                # Phase 1: Item entering the belt (length/speed time)
-                remaining_phase1_time = phase1_time
-                print(f"T={self.env.now:.2f} Item {item_id} starting Phase 1 (entering belt): {phase1_time:.2f} time")
-                
-                while remaining_phase1_time > 0:
-                    try:
-                        start_time = self.env.now
-                        yield self.env.timeout(remaining_phase1_time)
-                        # If we reach here, phase 1 completed without interruption
-                        event.succeed()
-                        remaining_phase1_time = 0
-                        break
-                    except simpy.Interrupt as interrupt:
-                        # Calculate how much time has passed
-                        interruption_start_time_phase1 = self.env.now
-                        item[0].interruption_start_time= interruption_start_time_phase1
-                        print(f"{self.env.now} for item {item_id} Phase 1 started interruption at {interruption_start_time_phase1}")
-                        elapsed_time = self.env.now - start_time
-                        remaining_phase1_time -= elapsed_time
-                        
-                        print(f"T={self.env.now:.2f} Move process Phase 1 for item {item_id} interrupted: {interrupt.cause}")
-                        print(f"T={self.env.now:.2f} Remaining Phase 1 time for item {item_id}: {remaining_phase1_time:.2f}")
-                        
-                        # Wait for resume signal
-                        print(f"T={self.env.now:.2f} Item {item_id} waiting for resume signal with {remaining_phase1_time:.2f} time left to complete(Phase 1)...")
-                        yield self.resume_event
-                        total_interruption_time += self.env.now - interruption_start_time_phase1
-                        item[0].interruption_start_time=None
-                        item[0].total_interruption_time= total_interruption_time
-                        print(f"T={self.env.now:.2f} Item {item_id} resuming Phase 1 movement with {remaining_phase1_time:.2f} time remaining")
-                
-                print(f"T={self.env.now:.2f} Item {item_id} completed Phase 1 (fully entered belt)")
-                
-                # Phase 2: Item moving through the belt to exit
-                remaining_phase2_time = phase2_time
-                print(f"T={self.env.now:.2f} Item {item_id} starting Phase 2 (moving to exit): {phase2_time:.2f} time")
-                
-                while remaining_phase2_time > 0:
-                    try:
-                        start_time = self.env.now
-                        yield self.env.timeout(remaining_phase2_time)
-                        # If we reach here, phase 2 completed without interruption
-                        remaining_phase2_time = 0
-                        break
-                    except simpy.Interrupt as interrupt:
-                        # Calculate how much time has passed
-                        interruption_start_time_phase2 = self.env.now
-                        item[0].interruption_start_time= interruption_start_time_phase2
-                        print(f"{self.env.now} for item {item_id} Phase 2 started interruption at {interruption_start_time_phase2}")
-                        elapsed_time = self.env.now - start_time
-                        remaining_phase2_time -= elapsed_time
-                        
-                        print(f"T={self.env.now:.2f} Move process Phase 2 for item {item_id} interrupted: {interrupt.cause}")
-                        print(f"T={self.env.now:.2f} Remaining Phase 2 time for item {item_id}: {remaining_phase2_time:.2f}")
-                        
-                        # Wait for resume signal
-                        print(f"T={self.env.now:.2f} Item {item_id} waiting for resume signal (Phase 2) time left- {remaining_phase2_time:.2f}...")
-                        yield self.resume_event
-                        item[0].interruption_start_time = None
-                        total_interruption_time += self.env.now - interruption_start_time_phase2
-                        item[0].total_interruption_time= total_interruption_time
-                        print(f"T={self.env.now:.2f} Item {item_id} resuming Phase 2 movement with {remaining_phase2_time:.2f} time remaining")
-                
-                print(f"T={self.env.now:.2f} Item {item_id} completed Phase 2 (reached exit)")
-                #print(f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} going to ready_items")
-                
-                item_index = self.items.index(item)
-                item_to_put = self.items.pop(item_index)  # Remove the item
-                
-                if len(self.ready_items) + len(self.items) < self.capacity:
-                    self.ready_items.append(item_to_put[0])
-                    item_to_put[0].conveyor_ready_item_entry_time = self.env.now
-                    print("Total items on belt",len(self.ready_items)+len(self.items))
-                   
-                    if not self.ready_item_event.triggered:
-                        self.ready_item_event.succeed()
-                        
-                    print(f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} moved to ready_items")
-                    self._trigger_reserve_get(None)
-                    self._trigger_reserve_put(None)
-                else:
-                    raise RuntimeError("Total number of items in the store exceeds capacity. Cannot move item to ready_items.")
-            
-            
-        except simpy.Interrupt as interrupt:
-            # Handle any uncaught interrupts
-            print(f"T={self.env.now:.2f} Item {item_id} move process was interrupted: {interrupt.cause}")   
-            
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Item {item_id} starting Phase 1 (entering belt): {phase1_time:.2f} time")
+            if (yield from self._travel(item_id, move, phase1_time)):
+                event.succeed()
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Item {item_id} starting Phase 2 (moving to exit): {phase2_time:.2f} time")
+            yield from self._travel(item_id, move, phase2_time)
+            if move['stop'] is not None:
+                # the item reached the exit before the compaction reached it
+                move['stop'] = None
+                item[0].interruption_start_time = None
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Item {item_id} completed Phase 2 (reached exit)")
+
+            item_index = self.items.index(item)
+            item_to_put = self.items.pop(item_index)  # Remove the item
+            self._invalidate_occupancy()
+
+            if len(self.ready_items) + len(self.items) < self.capacity:
+                self.ready_items.append(item_to_put[0])
+                item_to_put[0].conveyor_ready_item_entry_time = self.env.now
+                if logger.debug_enabled:
+                    logger.debug(self, "Total items on belt",len(self.ready_items)+len(self.items))
+
+                if not self.ready_item_event.triggered:
+                    self.ready_item_event.succeed()
+
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} moved to ready_items")
+                self._trigger_reserve_get(None)
+                self._trigger_reserve_put(None)
+            else:
+                raise RuntimeError("Total number of items in the store exceeds capacity. Cannot move item to ready_items.")
         finally:
             # Clean up the process tracking when done
             if item_id in self.active_move_processes:
                 del self.active_move_processes[item_id]
-                print(f"T={self.env.now:.2f} Removed tracking for completed move process of item {item_id}")
-  
-     
-    
-    
-    def interrupt_all_move_processes(self, reason="External interrupt"):
-        """
-        Interrupt all active move_to_ready_items processes.
-        
-        Args:
-            reason (str): Reason for the interrupt
-        """
-        print(f"T={self.env.now:.2f} Belt_Store interrupting {len(self.active_move_processes)} move processes - {reason}")
-        
-        for item_id, process_info in self.active_move_processes.items():
-            process = process_info['process']
-            if process and not process.processed:
-                try:
-                    process.interrupt(reason)
-                    print(f"T={self.env.now:.2f} Interrupted move process for item {item_id}")
-                except RuntimeError:
-                    # Process might already be finished
-                    pass
-    
-    def resume_all_move_processes(self):
-        """
-        Resume all interrupted move_to_ready_items processes.
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Removed tracking for completed move process of item {item_id}")
+
+    def _travel(self, item_id, move, duration):
         """
-        print(f"T={self.env.now:.2f} Belt_Store resuming move processes")
-        
-        # Create a new resume event and trigger it
-        old_resume_event = self.resume_event
-        self.resume_event = self.env.event()
-        old_resume_event.succeed()
-   
+        Let an item move for `duration` time on the running belt, standing still while the belt has stopped it.
 
-   
+        The item keeps the time at which its current leg started and the time it had left to move then, as the
+        interrupted timeouts did. A resume starts a new leg for the items it restarts, so the item arrives at
+        the same time as if it had been interrupted and resumed.
 
+        Args:
+            item_id: ID of the item.
+            move (dict): Tracking entry of the move process of the item.
+            duration (float): Time the item has to move.
 
-    def _get_belt_pattern(self):
+        Returns:
+            bool: True if the item arrived at the end of a timeout, False if it was stopped exactly when it
+                  completed the movement.
         """
-        Generate a pattern string representing the conveyor occupancy.
-        '*' represents an item, '_' represents empty space.
+        move['start'], move['remaining'] = self.env.now, duration
+        completed = False
+        while move['remaining'] > 0:
+            leg_start = move['start']
+            if self.env.now == leg_start:
+                move['leg_sequence'] = self._next_sequence()
+                yield self.env.timeout(move['remaining'])
+            else:
+                yield self.env.timeout(max(leg_start + move['remaining'] - self.env.now, 0))
+            if self._reached_stop(move):
+                # the item stood still from `stop`, it moves the rest of the way after the belt resumes
+                move['remaining'] -= move['stop'] - move['start']
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Item {item_id} waiting for resume signal with {move['remaining']:.2f} time left")
+                move['waiting'] = True
+                yield self.resume_event
+                move['waiting'] = False
+                move['start'] = self.env.now
+                completed = False
+            elif move['start'] != leg_start:
+                # the belt stopped and resumed the item during the timeout, it arrives later
+                completed = False
+            else:
+                completed = True
+                break
+        return completed
+
+    def _next_sequence(self):
+        self._sequence += 1
+        return self._sequence
+
+    def _reached_stop(self, move):
+        # whether the item was stopped before the end of its leg, now. A stop at the very end of the leg is
+        # reached if it is a stop at once, or if it was recorded before the leg was scheduled, as the timeout
+        # scheduled first fires first.
+        stop = move['stop']
+        if stop is None or stop > self.env.now:
+            return False
+        if stop < self.env.now or move['stop_sequence'] is None:
+            return True
+        return move['stop_sequence'] < move['leg_sequence']
 
-        Returns:
-            tuple: (belt_pattern: str, belt_item_rep: list[str])
+    def interrupt_all_move_processes(self, reason="External interrupt"):
         """
+        Stop all the items moving on the belt.
 
-        belt_positions = ['_'] * self.capacity
-        belt_item_rep = ['-'] * self.capacity
+        Args:
+            reason (str): Reason for the stop
+        """
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} Belt_Store stopping {len(self.active_move_processes)} items - {reason}")
+        self._stop_items(list(self.active_move_processes))
 
-        
+    def _stop_items(self, item_ids, delays=None):
+        """
+        Record that the belt stops items after the given delays, without interrupting their move processes.
 
-        for item in self.ready_items:
-            print(self.env.now, "ready_items in belt", item.id)
-            item_obj = item  #( item object)
-            
-            if not hasattr(item_obj, 'conveyor_entry_time') or not hasattr(item_obj, 'length'):
-                raise AttributeError("Item must have 'conveyor_entry_time' and 'length' attributes.")
-            time_on_belt = self.env.now - item_obj.conveyor_entry_time
-            print("time_onbelt", time_on_belt)
-            #print(item_obj.id, " item on belt_inspect", time_on_belt, "item_obj.total_interruption_time", item_obj.total_interruption_time)
-            #print(item_obj.id, item_obj " item on 66666661 belt_inspect", time_on_belt)
-            #(item_obj.id, item_obj.total_interruption_time, " item on 6666666 belt_inspect", time_on_belt)
-            if getattr(item_obj, "total_interruption_time", None) is not None:
-                if item_obj.total_interruption_time > 0:
-                    time_on_belt -= item_obj.total_interruption_time
-                    print("adjusted time on belt", time_on_belt)
-            else:
-                print(f"T={self.env.now:.2f} Warning: item {getattr(item_obj, 'id', str(id(item_obj)))} missing 'total_interruption_time' attribute. Assuming 0.")
+        Args:
+            item_ids (list): IDs of the items to stop.
+            delays (list, optional): Time after which each item stops, 0 to stop it at once. All the items stop
+                                     at once if not given.
+        """
+        if delays is None:
+            delays = [0.0] * len(item_ids)
+        for item_id, delay in zip(item_ids, delays):
+            move = self.active_move_processes.get(item_id)
+            if move is None or move['stop'] is not None:
+                # the item has already reached the exit or is already stopped
+                continue
+            stop = float(self.env.now + delay)
+            move['stop'] = stop
+            move['stop_sequence'] = self._next_sequence() if delay > 0 else None
+            move['item'][0].interruption_start_time = stop
+            self._stopped_ids.append(item_id)
+        self._invalidate_occupancy()
 
-        
-            if item_obj.interruption_start_time is not None:
-                time_on_belt -= (self.env.now - item_obj.interruption_start_time)
+    def resume_all_move_processes(self):
+        """
+        Restart the belt.
 
-                print(item_obj.id, " item on belt adjusted for ongoing interruption", time_on_belt)
+        Every stopped item adds the time it stood still to its interruption time. The stopped items
+        whose timeouts have not fired start a new leg with the time they had left at their stop, the items
+        waiting for the resume do so when they wake up. Stops that the items had not reached yet are dropped.
+        """
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} Belt_Store resuming move processes")
+        self._invalidate_occupancy()
+        moves = [self.active_move_processes[item_id] for item_id in self._stopped_ids
+                 if item_id in self.active_move_processes]
+        self._stopped_ids = []
+        for move in moves:
+            stop = move['stop']
+            item_obj = move['item'][0]
+            item_obj.total_interruption_time += max(self.env.now - stop, 0.0)
+            item_obj.interruption_start_time = None
+            move['stop'] = None
+            if stop <= self.env.now and not move['waiting']:
+                move['remaining'] -= stop - move['start']
+                move['start'] = self.env.now
+                move['leg_sequence'] = self._next_sequence()
+        # only the items whose timeouts fired during the stop wait for the resume
+        old_resume_event = self.resume_event
+        self.resume_event = self.env.event()
+        if old_resume_event.callbacks:
+            old_resume_event.succeed()
+
+    def _time_on_belt(self, item_obj, now):
+        # time the item spent moving on the belt
+        time_on_belt = now - item_obj.conveyor_entry_time
+        total_interruption_time = getattr(item_obj, "total_interruption_time", None)
+        if total_interruption_time is not None and total_interruption_time > 0:
+            time_on_belt -= total_interruption_time
+        interruption_start_time = getattr(item_obj, "interruption_start_time", None)
+        if interruption_start_time is not None and interruption_start_time < now:
+            # a stop ahead of now is one the item has not reached yet while the items compact
+            time_on_belt -= (now - interruption_start_time)
+        return time_on_belt
+
+    def _belt_occupancy(self):
+        """
+        Return the slot occupancy index of the belt at the current time.
 
-            if getattr(item_obj, "conveyor_ready_item_entry_time", None) is not None:
-                if self.env.now - item_obj.conveyor_ready_item_entry_time > 0:
-                    time_on_belt -= (self.env.now - item_obj.conveyor_ready_item_entry_time)
-                    print("item has entered ready_items, adjusted time on belt", time_on_belt)
-            
-            travel_distance = time_on_belt * self.speed
-                
+        The index is rebuilt at most once per time instant, and again after an item was put, moved to
+        `ready_items`, taken out or after the belt stalled or resumed. Building it costs O(number of items).
+        Items in `ready_items` occupy the slots at the exit. An item whose slot is already taken is moved
+        to the nearest free slot behind it.
 
-            # Position is integer number of slots travelled
-            #position = np.round(travel_distance / item_obj.length)
-            position = math.ceil(travel_distance / item_obj.length)
-            pos = int(position)
+        Returns:
+            BeltOccupancy: The occupancy index.
 
-            print(self.env.now, item_obj.id, " item on belt_inspect final pos1", pos)
+        Raises:
+            RuntimeError: If an item cannot be placed on the belt.
+        """
+        now = self.env.now
+        if self._occupancy is not None and self._occupancy_time == now:
+            return self._occupancy
+
+        capacity = self.capacity
+        taken = set()
+        placed = []
+
+        def place(pos, item_obj):
+            while pos in taken:
+                pos -= 1
+                if pos < 0:
+                    raise RuntimeError(f"Belt on-belt placement logic error: no space found when shifting left {sorted(taken)}, for item {getattr(item_obj, 'id', str(id(item_obj)))}.")
+            taken.add(pos)
+            placed.append((pos, getattr(item_obj, "id", str(id(item_obj)))))
+
+        for item_obj in self.ready_items:
+            time_on_belt = self._time_on_belt(item_obj, now)
+            ready_time = getattr(item_obj, "conveyor_ready_item_entry_time", None)
+            if ready_time is not None and now - ready_time > 0:
+                time_on_belt -= (now - ready_time)
+            if math.ceil(time_on_belt * self.speed / item_obj.length) <= capacity:
+                place(capacity - 1, item_obj)
 
-            if pos <= self.capacity:
-                
-                
-                pos= self.capacity -1
-                print(self.env.now, item_obj.id, " item on belt_inspect final pos", pos)
-                if belt_positions[pos] == '_':
-                    belt_positions[pos] = '*'
-                    belt_item_rep[pos] = (getattr(item_obj, "id", str(id(item_obj))), pos)
-                    
-                    #print([i[0].id for i in self.items] , "items in belt")
-                    print( item_obj.id, " item placed at pos", pos, "belt_item_rep is", belt_item_rep)
-                else:
-                    ( item_obj.id, " position already occupied at pos", pos, "belt_item_rep is", belt_item_rep)
-                    #raise RuntimeError( item_obj.id, " position already occupied at pos", pos, "belt_item_rep is", belt_item_rep, item[0].conveyor_entry_time, item[0].interruption_start_time, item[0].total_interruption_time)
-                    while True:
-                        pos -= 1
-                        if pos < 0:
-                            raise RuntimeError(f"Belt on-belt placement logic error: no space found when shifting left {belt_item_rep}, for item {getattr(item_obj, 'id', str(id(item_obj)))}.")
-                        if belt_positions[pos] == '_':
-                            belt_positions[pos] = '*'
-                            belt_item_rep[pos] = (getattr(item_obj, "id", str(id(item_obj))), pos)
-                            break
-        
-            print(f"T={self.env.now:.2f}::put58585858585: item {item_obj.id} placed at pos {pos} {belt_item_rep}")
         for item in self.items:
-            item_obj = item[0] #( item object, time delay to exit)
-            
-            if not hasattr(item_obj, 'conveyor_entry_time') or not hasattr(item_obj, 'length'):
-                raise AttributeError("Item must have 'conveyor_entry_time' and 'length' attributes.")
-            time_on_belt = self.env.now - item_obj.conveyor_entry_time
-            #print(self.env.now, item_obj.id, " item on belt_inspect", time_on_belt, "item_obj.total_interruption_time", item_obj.total_interruption_time)
-            #print(item_obj.id, item_obj " item on 66666661 belt_inspect", time_on_belt)
-            #(item_obj.id, item_obj.total_interruption_time, " item on 6666666 belt_inspect", time_on_belt)
-            if getattr(item_obj, "total_interruption_time", None) is not None:
-                print(self.env.now, item_obj.id, " item on belt_inspect", time_on_belt, "item_obj.total_interruption_time", item_obj.total_interruption_time)
-            
-                if item_obj.total_interruption_time > 0:
-                    time_on_belt -= item_obj.total_interruption_time
-            else:
-                print(f"T={self.env.now:.2f} Warning: item {getattr(item_obj, 'id', str(id(item_obj)))} missing 'total_interruption_time' attribute. Assuming 0.")
+            item_obj = item[0]
+            pos = int(math.ceil(self._time_on_belt(item_obj, now) * self.speed / item_obj.length))
+            if pos < capacity:
+                place(pos, item_obj)
 
-            if getattr(item_obj, "interruption_start_time", None) is not None:
-                time_on_belt -= (self.env.now - item_obj.interruption_start_time)
-                print(item_obj.id,"111start_time",item_obj.interruption_start_time, " item on belt adjusted for ongoing interruption", time_on_belt)
-            
-        
-            travel_distance = time_on_belt * self.speed
-                
+        self._occupancy = BeltOccupancy(capacity, placed)
+        self._occupancy_time = now
+        return self._occupancy
 
-            # Position is integer number of slots travelled
-            position = math.ceil(travel_distance / item_obj.length)
-            pos = int(position)
+    def _invalidate_occupancy(self):
+        self._occupancy = None
 
-            if pos < self.capacity:
-           
-                
-                if belt_positions[pos] == '_':
-                    belt_positions[pos] = '*'
-                    belt_item_rep[pos] = (getattr(item_obj, "id", str(id(item_obj))), pos)
-                    #print([i[0].id for i in self.items] , "items in belt")
-                    #print( item_obj.id, " item placed at pos", pos, "belt_item_rep is", belt_item_rep)
-                else:
-                    print( item_obj.id, " position already occupied at pos", pos, "belt_item_rep is", belt_item_rep, item[0].conveyor_entry_time)
-                    while True:
-                        print("pushing items for item", item_obj.id)
-                        pos -= 1
-                        if pos < 0:
-                            raise RuntimeError(f"Belt on-belt placement logic error: no space found when shifting left {belt_item_rep}, for item {getattr(item_obj, 'id', str(id(item_obj)))}.")
-                        if belt_positions[pos] == '_':
-                            belt_positions[pos] = '*'
-                            belt_item_rep[pos] = (getattr(item_obj, "id", str(id(item_obj))), pos)
-                            break
-                          
+    def _get_belt_pattern(self):
+        """
+        Generate a pattern string representing the conveyor occupancy.
+        '*' represents an item, '_' represents empty space.
 
-        return ''.join(belt_positions), belt_item_rep
+        Returns:
+            tuple: (belt_pattern: str, belt_item_rep: list[str])
+        """
+        return self._belt_occupancy().pattern()
 
 
 
@@ -939,147 +899,102 @@ class BeltStore(Store):
             reason (str): Reason for the interrupt
         """
         if not self.items:
-            print(f"T={self.env.now:.2f} No items on belt to interrupt")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} No items on belt to interrupt")
             return
+        self._invalidate_occupancy()
         
         # If noaccumulation_mode_on is True (STALLED_NONACCUMULATING_STATE), interrupt all items immediately
         if self.noaccumulation_mode_on == True:
-            print(f"T={self.env.now:.2f} Noaccumulation_mode_on: interrupting all items immediately")
-            for i, item in enumerate(self.items):
-                item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
-                self._interrupt_specific_item(item_id, f"{reason} - immediate (no accumulation)")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Noaccumulation_mode_on: interrupting all items immediately")
+            item_ids = [item[0].id if hasattr(item[0], 'id') else str(id(item)) for item in self.items]
+            self._stop_items(item_ids)
             return
         
         # For accumulating mode (STALLED_ACCUMULATING_STATE), use pattern-based interruption
         if self.accumulation_mode_indicator == True:
         #if self.noaccumulation_mode_on == False:
-            print(f"T={self.env.now:.2f} Accumulating mode: using pattern-based interruption")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Accumulating mode: using pattern-based interruption")
         
-            # Get current belt pattern
-            all_patterns = self._get_belt_pattern()
-            pattern = all_patterns[0]
-            beltitems = all_patterns[1]
-            print(f"T={self.env.now:.2f} Current belt pattern: {pattern} and items {beltitems}")
+            # Get current belt occupancy
+            occupancy = self._belt_occupancy()
+            if logger.debug_enabled:
+                pattern, beltitems = occupancy.pattern()
+                logger.debug(self, f"T={self.env.now:.2f} Current belt pattern: {pattern} and items {beltitems}")
             
             # Analyze pattern and determine interruption strategy
-            interruption_plan = self._analyze_pattern_for_interruption(all_patterns)
+            interruption_plan = self._analyze_pattern_for_interruption(occupancy)
             
             if not interruption_plan:
-                print(f"T={self.env.now:.2f} No interruption needed for current pattern")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} No interruption needed for current pattern")
                 return
             
-            print(f"T={self.env.now:.2f} Executing selective interruption plan: {interruption_plan}")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Executing selective interruption plan: {interruption_plan}")
             
             # Execute the interruption plan
             self._execute_interruption_plan(interruption_plan, reason)
 
-    def _analyze_pattern_for_interruption(self, pattern):
+    def _analyze_pattern_for_interruption(self, occupancy):
         """
-        Analyze the belt pattern and determine which items to interrupt and when.
+        Analyze the belt occupancy and determine which items to interrupt and when.
         
         Args:
-            pattern (str): Belt pattern string with '*' for items and '_' for empty spaces
+            occupancy (BeltOccupancy): Occupancy index of the belt
             
         Returns:
             list: List of dictionaries with interruption instructions
                   [{'item_index': int, 'delay': float}, ...]
         """
         interruption_plan = []
-        
-        # Find all item positions
-        item_positions = [i for i, char in enumerate(pattern[0]) if char == '*']
-        print("item_positions", item_positions)
 
-        if not item_positions:
+        if not len(occupancy):
             return interruption_plan
         
         # Check for consecutive items pattern (like '_****' or '**__*')
-        if self._has_consecutive_items(pattern[0]):
+        if occupancy.is_contiguous():
             # Rule: Interrupt all items in consecutive blocks
-            for i, pos in enumerate(item_positions):
-                interruption_plan.append({'item_index': i, 'delay': 0, 'item_id': pattern[1][pos][0]})
+            for i, item_id in enumerate(occupancy.ids):
+                interruption_plan.append({'item_index': i, 'delay': 0, 'item_id': item_id})
         else:
             # Rule: Interrupt items with delays based on gaps
-            interruption_plan = self._calculate_gap_based_interruptions(pattern[0], item_positions, pattern[1])
+            interruption_plan = self._calculate_gap_based_interruptions(occupancy)
         
         return interruption_plan
 
-    def _has_consecutive_items(self, pattern):
-        """
-        Check if the pattern has consecutive items (no gaps between items).
-        """
-        item_positions = [i for i, char in enumerate(pattern) if char == '*']
-        
-        if len(item_positions) <= 1:
-            return True
-        
-        # Check if positions are consecutive
-        for i in range(1, len(item_positions)):
-            if item_positions[i] - item_positions[i-1] > 1:
-                return False
-        
-        return True
-    
-    def _calculate_gap_based_interruptions(self, pattern, item_positions, belt_rep):
+    def _calculate_gap_based_interruptions(self, occupancy, count=None):
         """
         Compute delays for each item in the conveyor based on its
         actual position and available space ahead.
 
+        The delay of an item is the number of empty slots between it and the exit, read from the
+        gap run-lengths of the occupancy index, so the plan costs O(number of planned items).
+
         Args:
-            pattern (str): Belt pattern, e.g., '__**_*'
-            item_positions (list[int]): indices of '*' in pattern
-            belt_rep (BeltStore): The belt store object for context
+            occupancy (BeltOccupancy): Occupancy index of the belt
+            count (int, optional): Plan only the first `count` items from the entry. Defaults to all items.
 
         Returns:
             List[dict]: [{'item_index': i, 'delay': int}, ...]
         """
-        interruption_plan = []
-
-        cap = len(pattern)
-        if not item_positions:
-            return interruption_plan
+        if count is None:
+            count = len(occupancy)
+        count = min(count, len(occupancy))
 
         # Special case: full belt
-        if '_' not in pattern:
-            return [{'item_index': i, 'delay': 0} for i in range(len(item_positions))]
-    
-        items_on_real_belt = [i[0].id for i in self.items]
-        for i, pos in enumerate(item_positions):
-            # Rightmost item always stalls at exit
-            #print(pos, max(item_positions))
-
-            #print(pos, item, " item on belt_inspect in gap based interruption", pattern, [i[0].id for i in self.items], [i.id for i in self.ready_items])
-            # if pos == max(item_positions):
-            #     delay = 0
-            # else:
-            # Count contiguous empties until blocked
-            delay = 0
-            #print(self.env.now, "counting empties for item at pos", pos, "pattern:", pattern[pos+1:cap])
-            for j in range(pos + 1, cap):
-                #print(self.env.now, "checking position", j, "char:", pattern[j], delay)
-                if pattern[j] == '_':
-                    
-                    delay += 1
-                    #print(self.env.now, "found empty space at", j)
-                #else:
-                    #break
-        #print("total delay for item at pos", pos, "is", delay)
-            item=belt_rep[pos][0]
-            #delay = delay *( 0.5 / self.speed)
-            #print("holahola",items_on_real_belt,item, delay)
-            #index = items_on_real_belt.index(item)
-            interruption_plan.append({'item_index': i, 'delay': delay, "item_index_on_pattern": pos, "item_id": item})
-
-        return interruption_plan
-
-
+        if occupancy.is_full():
+            return [{'item_index': i, 'delay': 0} for i in range(count)]
 
-
-    
+        return [{'item_index': i, 'delay': occupancy.empty_slots_ahead(i),
+                 "item_index_on_pattern": occupancy.positions[i], "item_id": occupancy.ids[i]}
+                for i in range(count)]
 
     def _execute_interruption_plan(self, interruption_plan, reason):
         """
-        Execute the interruption plan by interrupting items with specified delays.
+        Execute the interruption plan by recording the stops of the items after the specified delays.
         
         Args:
             interruption_plan (list): List of interruption instructions
@@ -1087,85 +1002,40 @@ class BeltStore(Store):
 
             reason (str): Reason for interruption
         """
+        item_indices = {(i[0].id if hasattr(i[0], 'id') else str(id(i))): index for index, i in enumerate(self.items)}
+        stopped_ids, delays = [], []
         for instruction in interruption_plan:
             item_index = instruction['item_index']
             item_id = instruction.get('item_id', None)
             delay = instruction['delay']
-            print(f"T={self.env.now:.2f} Scheduling interruption for item {item_id} at index {item_index} with delay {delay}")
-            all_items = [i[0].id if hasattr(i[0], 'id') else str(id(i)) for i in self.items]
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Scheduling interruption for item {item_id} at index {item_index} with delay {delay}")
 
-            if item_id in all_items:
-                item_index = all_items.index(item_id)
+            if item_id in item_indices:
+                item_index = item_indices[item_id]
                 if item_index < self.capacity:
-                    print(f"T={self.env.now:.2f} Found item at index {item_index} for interruption")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} Found item at index {item_index} for interruption")
                     item = self.items[item_index]
                     item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
                     item_length = item[0].length if hasattr(item[0], 'length') else 1.0
                     delay = delay * (item_length / self.speed)
 
                 
-                    if delay > 0:
-                        # Schedule delayed interruption
-                        
-                        item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
-                        delayed_process=self.env.process(self._delayed_interrupt(item_id, delay, reason))
-                        self.active_delayed_interrupt_processes[item_id] = delayed_process
-                    else:
-                        # Immediate interruption
-                        print(f"T={self.env.now:.2f} Immediate interrupt for item {item_id}")
-                        self._interrupt_specific_item(item_id, reason)
+                    # an item with a delay stops once the items ahead of it have compacted
+                    stopped_ids.append(item_id)
+                    delays.append(max(delay, 0))
             
-                else: print (f"T={self.env.now:.2f} item_index {item_index} exceeds capacity {self.capacity}, skipping interruption")
+                else:
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} item_index {item_index} exceeds capacity {self.capacity}, skipping interruption")
             else:
                 if item_id in self.ready_items:
-                    print(f"T={self.env.now:.2f} Item {item_id} already in ready_items, skipping interruption")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} Item {item_id} already in ready_items, skipping interruption")
                     continue
-    
-    
-    def _delayed_interrupt(self, item_id, delay, reason):
-        """
-        Process to handle delayed interruption of a specific item.
-        
-        Args:
-            item_id: ID of the item to interrupt
-            delay (float): Delay before interruption
-            reason (str): Reason for interruption
-        """
-        
-        try:
-            yield self.env.timeout(delay)
-            print(f"T={self.env.now:.2f} Delayed interrupt for item {item_id} after {delay} time units")
-            self._interrupt_specific_item(item_id, reason)
-        except simpy.Interrupt as interrupt:
-            print(f"Interruption cancelled for item {item_id}: {interrupt.cause}")
-        finally:
-            self.active_delayed_interrupt_processes.pop(item_id, None)
-
+        self._stop_items(stopped_ids, delays)
 
-    def _interrupt_specific_item(self, item_id, reason):
-        """
-        Interrupt a specific item's move process.
-        
-        Args:
-            item_id: ID of the item to interrupt
-            reason (str): Reason for interruption
-        """
-        #print(f"T={self.env.now:.2f} Attempting to interrupt item {item_id}: {reason}")
-        if item_id in self.active_move_processes:
-            process_info = self.active_move_processes[item_id]
-            process = process_info['process']
-            
-            if process and not process.processed:
-                try:
-                    process.interrupt(reason)
-                    print(f"T={self.env.now:.2f} Selectively interrupted item {item_id}: {reason}")
-                except RuntimeError:
-                    print(f"T={self.env.now:.2f} Could not interrupt item {item_id} - process may be finished")
-            else:
-                print(f"T={self.env.now:.2f} Item {item_id} process already finished")
-        else:
-            print(f"T={self.env.now:.2f} Item {item_id} not found in active processes")
-            
     def handle_new_item_during_interruption(self, item):
         """
         Handle new item added during STALLED_ACCUMULATING_STATE with accumulation=1.
@@ -1174,54 +1044,25 @@ class BeltStore(Store):
         """
         
 
-        # Build the updated belt pattern with new item
-        current_pattern = self._get_belt_pattern()
-        print(f"T={self.env.now:.2f} Current belt pattern after adding new item: {current_pattern[0]} and items {current_pattern[1]}")
-        updated_pattern = list(current_pattern[0])
-        
-
-        
-
-        # Recompute item positions
-        item_positions = [i for i, c in enumerate(updated_pattern) if c == '*']
-        print("item_positions with new item", item_positions)
-        # Get interruption plan
-        interruption_plan = self._calculate_gap_based_interruptions(''.join(updated_pattern), item_positions, current_pattern[1])
-        print(f"T={self.env.now:.2f} Interruption plan with new item: {interruption_plan}")
-        # The new item is the last one added in pattern
+        # The new item is the one nearest to the entry, only its delay is needed
+        occupancy = self._belt_occupancy()
+        if logger.debug_enabled:
+            pattern, beltitems = occupancy.pattern()
+            logger.debug(self, f"T={self.env.now:.2f} Current belt pattern after adding new item: {pattern} and items {beltitems}")
+        interruption_plan = self._calculate_gap_based_interruptions(occupancy, count=1)
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} Interruption plan with new item: {interruption_plan}")
         delay_for_new_item = interruption_plan[0]['delay']
 
-        item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
         item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
         item_length = item[0].length if hasattr(item[0], 'length') else 1.0
         delay_for_new_item = delay_for_new_item * (item_length / self.speed)
-        if delay_for_new_item > 0:
-            print(f"T={self.env.now:.2f} New item {item_id} will be interrupted after {delay_for_new_item} time units")
-            interrupt_process= self.env.process(self._delayed_interrupt(item_id, delay_for_new_item, "New item during interruption"))
-            item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
-            self.active_delayed_interrupt_processes[item_id] = interrupt_process
-        else:
-            print(f"T={self.env.now:.2f} New item {item_id} {interruption_plan[0]['item_index']} {interruption_plan[-1]['delay']} interrupted immediately")
-            self._interrupt_specific_item(item_id, "New item during interruption")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} New item {item_id} will stop after {delay_for_new_item} time units")
+        self._stop_items([item_id], [max(delay_for_new_item, 0)])
 
 
     def interrupt_and_resume_all_delayed_interrupt_processes(self, reason="State change interrupt"):
         """
-        Interrupt all active delayed interrupt processes and clear them.
-        
-        Args:
-            reason (str): Reason for the interrupt
+        Nothing to do: the stops the items had not reached yet are dropped by `resume_all_move_processes`.
         """
-        print(f"T={self.env.now:.2f} Belt_Store interrupting {len(self.active_delayed_interrupt_processes)} delayed interrupt processes - {reason}")
-        
-        for item_id, process in list(self.active_delayed_interrupt_processes.items()):
-            if process and not process.processed:
-                try:
-                    process.interrupt(reason)
-                    print(f"T={self.env.now:.2f} Interrupted delayed interrupt process for item {item_id}")
-                except RuntimeError:
-                    # Process might already be finished
-                    pass
-            # Remove from tracking regardless
-            self.active_delayed_interrupt_processes.pop(item_id, None)
-            
\ No newline at end of file
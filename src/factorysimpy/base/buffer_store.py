@@ -3,6 +3,8 @@
 
 import simpy
 from simpy.resources.store import Store
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
+from factorysimpy.base.delay_queue import DelayQueue
 
 class BufferStore(Store):
     """
@@ -22,6 +24,10 @@ class BufferStore(Store):
         ReservableReqStore preserves item order by associating an unreserved item in the store with a reservation event
         by index when a reserve_get() request is made. As a result, it maintains a list of reserved events to preserve item order.
 
+        A single reservation can cover several units: `reserve_put(n)` reserves space for n items and
+        `reserve_get(n)` reserves n items. Such a reservation is granted atomically, once all n units are
+        available, and is completed by one `put` of a list of n items or one `get` returning a list of n items.
+
         It also allows users to cancel an already placed reserve_get or reserve_put request even if it is yielded.
         It also handles the dissociation of the event and item done at the time of reservation when an already yielded
         event is canceled.
@@ -30,11 +36,11 @@ class BufferStore(Store):
         to be available for retrieval. The delay can also be 0. The items can be retrieved in FIFO or LIFO manner based on the mode of operation of the BufferStore.
 
         Attributes:
-           reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations
+           reserved_items (dict):  Maps each successful reserve_get event to the exact item (or list of items) reserved for it
+           reserve_put_queue (ReservationQueue): Queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations
         """
 
     def __init__(self, env, capacity=float('inf'),mode='FIFO'):
@@ -48,13 +54,13 @@ class BufferStore(Store):
         super().__init__(env, capacity)
         self.env = env
         self.mode=mode
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
-        self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
+        self.reserve_put_queue = ReservationQueue()  # FIFO queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue()  # FIFO queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.ready_items=[]  #Maintains the items ready to be taken out
-        self.reserved_items   = []   # parallel list of the exact items reserved
+        self.reserved_items = {}   # reserve_get event -> exact item reserved for it, in reservation order
+        self.transit = DelayQueue(env, self.move_to_ready_items)  # items in transit, moved to ready_items by one shared timer
         self._last_level_change_time = self.env.now
         self._last_num_items = 0
         self._weighted_sum = 0.0
@@ -72,9 +78,15 @@ class BufferStore(Store):
             self._weighted_sum / total_time if total_time > 0 else 0.0
         )
 
-    def reserve_put(self):
+    def _check_quantity(self, n):
+        if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+            raise ValueError(f"Number of units to reserve must be a positive integer, got {n!r}.")
+        if n > self.capacity:
+            raise ValueError(f"Cannot reserve {n} units in a store of capacity {self.capacity}.")
+
+    def reserve_put(self, n=1, select=None):
         """
-        Create a reservation request to put an item into the store.
+        Create a reservation request to put an item, or `n` items, into the store.
 
         This function generates a SimPy event representing a reservation request. The event is
         assigned attributes such as resource name, and the process making the request.
@@ -85,13 +97,24 @@ class BufferStore(Store):
 
        
 
+        Args:
+            n (int, optional): Number of slots to reserve. The event succeeds only when all `n` slots
+                are free, and the reservation is used by a single `put` of a list of `n` items. Defaults to 1.
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
+
         Returns:
             event (simpy.Event): A reservation event that will succeed when space is available.
 
+        Raises:
+            ValueError: If `n` is not a positive integer or exceeds the capacity of the store.
+
         """
-        event = self.env.event()
+        self._check_quantity(n)
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename = self  # Store reference
         event.requesting_process = self.env.active_process  # Process making the reservation
+        event.quantity = n  # Number of slots reserved
             
         self.reserve_put_queue.append(event)
         
@@ -112,21 +135,14 @@ class BufferStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -152,8 +168,8 @@ class BufferStore(Store):
 
         """
         # Check if there's enough space to reserve
-        if len(self.reservations_put) + len(self.items) +len(self.ready_items) < self.capacity:
-            self.reservations_put.append(event)  # Add reservation
+        if self.reservations_put.units + len(self.items) +len(self.ready_items) + event.quantity <= self.capacity:
+            self.reservations_put.append(event, event.quantity)  # Add reservation
             event.succeed()
             # Log the success of the reservation
             #print(f"At time={self.env.now:.2f}, Process {self.env.active_process} "
@@ -218,32 +234,29 @@ class BufferStore(Store):
             # 1) Remove from active reservations
             self.reservations_get.remove(get_event_to_cancel)
 
-            # 2) Find its index in the parallel lists
-            ev_idx = self.reserved_events.index(get_event_to_cancel)
-
-            # 3) Pop out the exact item reference
-            item = self.reserved_items.pop(ev_idx)
-            # 4) Drop the event token
-            self.reserved_events.pop(ev_idx)
-
-            # 5) Remove it from ready_items wherever it currently is
-            try:
-                self.ready_items.remove(item)
-            except ValueError:
-                raise RuntimeError(f"Item {item} not found in ready_items during cancel.")
-
-            # 6) Compute new insertion index as a get call is cancelled and item that is reserved and associated to an event is now freely available to be assigned to a new incoming event
-            if self.mode == "FIFO":
-                # one slot before the remaining reserved block
-                insert_idx = len(self.ready_items) - len(self.reserved_events) - 1
-            else:  # LIFO
-                # top of stack
-                insert_idx = len(self.ready_items)
-
-            # 7) Re‑insert it
-            self.ready_items.insert(insert_idx, item)
-
-            # 8) Trigger any other pending reservations
+            # 2) Pop out the exact item(s) reserved for the event
+            reserved = self.reserved_items.pop(get_event_to_cancel)
+            items = reserved if get_event_to_cancel.quantity > 1 else [reserved]
+
+            for item in items:
+                # 3) Remove it from ready_items wherever it currently is
+                try:
+                    self.ready_items.remove(item)
+                except ValueError:
+                    raise RuntimeError(f"Item {item} not found in ready_items during cancel.")
+
+                # 4) Compute new insertion index as a get call is cancelled and item that is reserved and associated to an event is now freely available to be assigned to a new incoming event
+                if self.mode == "FIFO":
+                    # one slot before the remaining reserved block
+                    insert_idx = len(self.ready_items) - self.reservations_get.units - 1
+                else:  # LIFO
+                    # top of stack
+                    insert_idx = len(self.ready_items)
+
+                # 5) Re‑insert it
+                self.ready_items.insert(insert_idx, item)
+
+            # 6) Trigger any other pending reservations
             self._trigger_reserve_get(None)
             return True
 
@@ -254,9 +267,9 @@ class BufferStore(Store):
 
     
 
-    def reserve_get(self):
+    def reserve_get(self, n=1, select=None):
         """
-        Create a reservation request to retrieve an item from the store.
+        Create a reservation request to retrieve an item, or `n` items, from the store.
 
         This method generates a SimPy event representing a request to reserve an item
         for retrieval (`get`). The event is assigned attributes such as the resource 
@@ -267,13 +280,24 @@ class BufferStore(Store):
         reservations if items are available.
 
         
+        Args:
+            n (int, optional): Number of items to reserve. The event succeeds only when `n` unreserved items
+                are ready, and the reservation is used by a single `get` returning a list of `n` items. Defaults to 1.
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
+
         Returns:
            event (simpy.Event): A reservation event that will succeed when an item becomes available.
+
+        Raises:
+            ValueError: If `n` is not a positive integer or exceeds the capacity of the store.
         """
+        self._check_quantity(n)
         #adding attributes to the newly created event for reserve_get
-        event = self.env.event()
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename=self
         event.requesting_process = self.env.active_process  # Associate event with the current process
+        event.quantity = n  # Number of items reserved
        
         
         self.reserve_get_queue.append(event)
@@ -293,19 +317,14 @@ class BufferStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
         """
-        idx=0
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
           if not reserve_get_event.triggered:
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
@@ -317,7 +336,7 @@ class BufferStore(Store):
         This method checks if there are available items in the store. If so,
         it grants the reservation request by adding the event to `reservations_get`
         and marking the reservation as successful. The event is also added
-        to `reserved_events` to maintain item order. If a request is
+        to `reserved_items` to maintain item order. If a request is
         successfully processed, it is removed from the queue.
 
         Args:
@@ -326,11 +345,8 @@ class BufferStore(Store):
 
         """
         #if there are items that are unreserved, the create a reservation by adding that event to the reservations_get list
-        if len(self.reservations_get) < len(self.ready_items):
-            # Successful reservation; add to reservations list
-            self.reservations_get.append(event)
-            event.succeed()  # Immediately succeed the event
-
+        n = event.quantity
+        if self.reservations_get.units + n <= len(self.ready_items):
             #reserving the item to preserved item order by adding the reserve_get event to a list(the index position of event= index position of reserved item)
             
 
@@ -339,15 +355,17 @@ class BufferStore(Store):
             We pick the j-th from top (for LIFO) or bottom (for FIFO)
             but do NOT remove it yet—we just record the exact item.
             """
-            j = len(self.reserved_events)
+            j = self.reservations_get.units
             if self.mode == "FIFO":
-                item = self.ready_items[j]
+                items = self.ready_items[j:j + n]
             else:  # LIFO
-                item = self.ready_items[-1 - j]
+                items = [self.ready_items[-1 - j - k] for k in range(n)]
 
+            # Successful reservation; add to reservations list
+            self.reservations_get.append(event, n)
             # record the reservation
-            self.reserved_events.append(event)
-            self.reserved_items .append(item)
+            self.reserved_items[event] = items if n > 1 else items[0]
+            event.succeed()  # Immediately succeed the event
 
 
 
@@ -366,7 +384,8 @@ class BufferStore(Store):
             get_event (simpy.Event): The reservation event associated with the request.
 
         Returns:
-            item (Object): The retrieved item if successful, otherwise raises an error
+            item (Object): The retrieved item if successful, otherwise raises an error.
+                A list of items if the reservation was made for more than one item.
 
         Raises:
             RuntimeError: If no reservations are available in the reservations_get
@@ -415,34 +434,27 @@ class BufferStore(Store):
         Removes the reservation and takes out that exact item from ready_items.
         """
         # 1) validate reservation exists for this process
-        reserved_event = next(
-            (ev for ev in self.reservations_get
-             if ev == get_event and ev.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
         if reserved_event is None:
             raise RuntimeError(
                 f"Time {self.env.now:.2f}, no matching reservation for process {self.env.active_process}."
             )
 
-        # 2) find its index in the reservation lists
-        ev_idx = self.reserved_events.index(reserved_event)
-
-        # 3) remove from reservations
+        # 2) remove from reservations
         self.reservations_get.remove(reserved_event)
-        self.reserved_events.remove(reserved_event)
 
-        # 4) pop out the exact item reference
+        # 3) pop out the exact item reference
         try:
-            assigned_item = self.reserved_items.pop(ev_idx)
-        except IndexError:
+            assigned_item = self.reserved_items.pop(reserved_event)
+        except KeyError:
             raise ValueError(f"Reserved item for {get_event} not found in store.")
 
-        # 5) remove that object from ready_items by value
-        try:
-            self.ready_items.remove(assigned_item)
-        except ValueError:
-            raise ValueError(f"Item {assigned_item} not in ready_items.")
+        # 4) remove that object from ready_items by value
+        for item in (assigned_item if reserved_event.quantity > 1 else [assigned_item]):
+            try:
+                self.ready_items.remove(item)
+            except ValueError:
+                raise ValueError(f"Item {item} not in ready_items.")
         self._update_time_averaged_level()
         return assigned_item
 
@@ -455,7 +467,8 @@ class BufferStore(Store):
 
         Args:
             put_event (simpy.Event): The event corresponding to the reservation.
-            item (object): The item to be added to the store.
+            item (object): The item to be added to the store. A list of exactly `n` items if the
+                reservation was made for `n` > 1 slots.
 
         Returns:
             proceed (bool): True if the put operation succeeded, False otherwise.
@@ -463,6 +476,7 @@ class BufferStore(Store):
         Raises:
             RuntimeError: If no reservations are available in the reservations_put
             RuntimeError: If proceed is False after put operation
+            ValueError: If the number of items does not match the number of reserved slots
         """
         proceed = False
 
@@ -530,10 +544,7 @@ class BufferStore(Store):
 
         # Locate and remove the reservation event efficiently
     
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -541,28 +552,39 @@ class BufferStore(Store):
                 f"for process {self.env.active_process} in reservations_put."
             )
 
+        items = [item]
+        if reserved_event.quantity > 1:
+            items = list(item)
+            if len(items) != reserved_event.quantity:
+                raise ValueError(
+                    f"Reservation is for {reserved_event.quantity} items, but {len(items)} items were put."
+                )
+
         self.reservations_put.remove(reserved_event)
 
-        # Add the item if space is available
-        if len(self.items)+len(self.ready_items) < self.capacity:
-            self.items.append(item)
+        # Add the items if space is available
+        if len(self.items)+len(self.ready_items) + len(items) <= self.capacity:
+            for item in items:
+                self.items.append(item)
+                self.transit.push(item, item[1])
             self._update_time_averaged_level()
-            self.env.process(self.move_to_ready_items(item))
             return True  # Successfully added item
         
     def move_to_ready_items(self,item):
         """
-        Move items from the store to the ready_items list after a put operation.
-        This method is called as a process to ensure that items are moved asynchronously.
+        Move an item from the store to the ready_items list once its delay has elapsed.
+        This method is called by the `transit` queue when the item becomes ready.
+
+        Args:
+            item (tuple): The (item, delay) pair that was put into the store.
         """
 
         # Move items to the ready_items list
         if self.items:
-            #print(f"T={self.env.now:.2f} beltstore received an item {item[0].id, item[1]} . Item started moving in belt")
-            yield self.env.timeout(item[1])
             #print(f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} going to ready_items")
             
-            item_index = self.items.index(item)
+            # with a constant delay the item leaving is always the oldest one
+            item_index = 0 if self.items[0] is item else self.items.index(item)
             item_to_put = self.items.pop(item_index)  # Remove the first item
             #print(item_to_put, item)
             if len(self.ready_items)+ len(self.items) < self.capacity:
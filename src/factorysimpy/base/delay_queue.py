@@ -0,0 +1,100 @@
+import heapq
+from collections import deque
+
+
+class DelayQueue:
+    """Time ordered queue of entries that are released by a single shared timer.
+
+    Every entry is pushed with a delay and passed to *callback* once the
+    simulation reaches its ready time. Entries with the same ready time are
+    released in the order they were pushed. Only one timeout is pending at any
+    time, for the earliest ready time in the queue.
+
+    As long as ready times are pushed in non-decreasing order (for example a
+    constant delay) the entries are kept in a plain FIFO deque. The first entry
+    that overtakes an earlier one turns the queue into a binary heap until it
+    runs empty again.
+
+    Args:
+        env (simpy.Environment): The simulation environment.
+        callback (callable): Called as `callback(entry)` when an entry becomes ready.
+    """
+
+    def __init__(self, env, callback):
+        self.env = env
+        self.callback = callback
+        self._fifo = deque()
+        self._heap = None
+        self._seq = 0
+        self._timer = None
+        self._timer_time = None
+
+    def push(self, entry, delay):
+        """
+        Add *entry* to the queue, to be released after *delay* time units.
+
+        Args:
+            entry (object): The entry passed to the callback.
+            delay (float): Non-negative delay from now.
+        """
+        ready_time = self.env.now + delay
+        record = (ready_time, self._seq, entry)
+        self._seq += 1
+        if self._heap is not None:
+            heapq.heappush(self._heap, record)
+        elif self._fifo and ready_time < self._fifo[-1][0]:
+            # a sorted list is a valid heap
+            self._heap = list(self._fifo)
+            self._fifo.clear()
+            heapq.heappush(self._heap, record)
+        else:
+            self._fifo.append(record)
+
+        if self._timer is None or ready_time < self._timer_time:
+            self._schedule(ready_time, delay)
+
+    def _head(self):
+        if self._heap is not None:
+            return self._heap[0] if self._heap else None
+        return self._fifo[0] if self._fifo else None
+
+    def _pop(self):
+        if self._heap is not None:
+            record = heapq.heappop(self._heap)
+            if not self._heap:
+                self._heap = None
+            return record
+        return self._fifo.popleft()
+
+    def _schedule(self, ready_time, delay):
+        self._timer_time = ready_time
+        self._timer = self.env.timeout(delay)
+        self._timer.callbacks.append(self._release)
+
+    def _release(self, timer):
+        # a timer superseded by an earlier one is ignored
+        if timer is not self._timer:
+            return
+        self._timer = None
+        self._timer_time = None
+        now = self.env.now
+        # entries pushed by the callbacks wait for the next timer, even with zero delay
+        last_seq = self._seq
+        head = self._head()
+        while head is not None and head[0] <= now and head[1] < last_seq:
+            self._pop()
+            self.callback(head[2])
+            head = self._head()
+        if head is not None and self._timer is None:
+            self._schedule(head[0], max(head[0] - now, 0))
+
+    def __len__(self):
+        return len(self._heap) if self._heap is not None else len(self._fifo)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        """Iterate over the waiting entries in release order."""
+        records = sorted(self._heap) if self._heap is not None else self._fifo
+        return (record[2] for record in records)
@@ -0,0 +1,61 @@
+import inspect
+
+EDGE_PROTOCOL = ("reserve_put", "put", "reserve_get", "get")
+EDGE_CANCEL_PROTOCOL = ("reserve_put_cancel", "reserve_get_cancel")
+
+
+class EdgeOps:
+    """Bound methods of the edge protocol of one edge.
+
+    Nodes move items on an edge only through the methods of `EDGE_PROTOCOL`:
+    `reserve_put()` / `reserve_get()` return an event that succeeds when the
+    edge can accept / give an item, and `put(event, item)` / `get(event)` move
+    the item with the successful event. `reserve_put_cancel(event)` and
+    `reserve_get_cancel(event)` are optional. Buffer, ConveyorBelt and Fleet
+    implement the protocol, and so can any user-defined edge.
+
+    The reserve methods may also take a `select` argument, for a
+    :class:`ReservationSelect` waiting on several edges at once. Edges whose
+    reserve methods do not take it are reserved with a plain `reserve_put()`
+    or `reserve_get()` in a select, and the reservation is cancelled if
+    another edge is chosen.
+
+    A node resolves its edges once, when it starts, and calls the methods of
+    the tables for every item, so the per-item path does not look at the
+    type of the edge.
+
+    Args:
+        edge: The edge.
+
+    Attributes:
+        supports_select (bool): Whether `reserve_put` and `reserve_get` take a `select` argument.
+
+    Raises:
+        ValueError: If the edge does not implement the protocol.
+    """
+
+    __slots__ = ("edge", "id", "supports_select") + EDGE_PROTOCOL + EDGE_CANCEL_PROTOCOL
+
+    def __init__(self, edge):
+        self.edge = edge
+        self.id = getattr(edge, "id", None)
+        for name in EDGE_PROTOCOL:
+            method = getattr(edge, name, None)
+            if not callable(method):
+                raise ValueError(f"Unsupported edge type: {edge.__class__.__name__} has no method '{name}'.")
+            setattr(self, name, method)
+        for name in EDGE_CANCEL_PROTOCOL:
+            method = getattr(edge, name, None)
+            setattr(self, name, method if callable(method) else None)
+        self.supports_select = _accepts_select(self.reserve_put) and _accepts_select(self.reserve_get)
+
+    def __repr__(self):
+        return f"EdgeOps({self.id!r})"
+
+
+def _accepts_select(method):
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "select" or p.kind is p.VAR_KEYWORD for p in parameters)
@@ -2,8 +2,11 @@
 
 
 
+import numpy as np
 import simpy
 from simpy.resources.store import Store
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
+from factorysimpy.utils.logger import logger
 
 class FleetStore(Store):
     """
@@ -24,48 +27,138 @@ class FleetStore(Store):
         ReservablePriorityReqStore preserves item order by associating an unreserved item in the store with a reservation event
         by index when a reserve_get() request is made. As a result, it maintains a list of reserved events to preserve item order.
 
+        A single reservation can cover several units: `reserve_put(n=...)` reserves space for n items and
+        `reserve_get(n=...)` reserves n items. Such a reservation is granted atomically, once all n units are
+        available, and is completed by one `put` of a list of n items or one `get` returning a list of n items.
+
+        By default the trips of the fleet are not bound to vehicles and the store holds up to `batch_size` items.
+        A dispatch timer of `delay` is started when the first item is put for the fleet. When it expires, or when
+        the store is full, all the waiting items leave together, so several batches can be in transit at once.
+        A trip takes `transit_delay` to reach the items and `transit_delay` to carry them to `ready_items`.
+
+        When `num_vehicles` is given, the fleet is a pool of `num_vehicles` vehicles, each carrying up to
+        `batch_size` items per trip, and the store holds up to `batch_size * num_vehicles` items. A vehicle is
+        busy until it delivers its batch. A free vehicle leaves as soon as a full batch is
+        waiting. A dispatch timer of `delay` is started when the first item is put for the fleet. When it expires,
+        or when the store is full, a free vehicle also leaves with a partial batch; if no vehicle is free, the
+        next vehicle coming back takes it. The loads of all the free vehicles are computed at once from the number
+        of waiting items. A trip takes `transit_delay` to reach the items and `transit_delay` to carry them to
+        `ready_items`, where the whole batch is moved in one step. The vehicles are driven by timer callbacks
+        rather than by a process each, and an idle fleet schedules no events.
+
+        When a `route_graph` is given, the fleet is a pool of vehicles, with one vehicle if `num_vehicles` is not
+        given, and the trip times come from its shortest paths instead of `transit_delay`:
+        a vehicle travels from where it is to `pickup_station`, then carries the items to `dropoff_station`,
+        where it stays until its next trip. The free vehicles nearest to `pickup_station` are dispatched first.
+        With a `traffic` layer as well, every leg of a trip reserves the aisles along its path, and the vehicle
+        waits before an aisle used by another vehicle, of this fleet or of another fleet sharing the layer.
+
         It also allows users to cancel an already placed reserve_get or reserve_put request even if it is yielded.
         It also handles the dissociation of the event and item done at the time of reservation when an already yielded
         event is canceled.
 
         Attributes:
-           reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations
-        """
-
-    def __init__(self, env, capacity=float('inf'),delay=1, transit_delay=0):
+           batch_size (int): Number of items a vehicle carries in one trip
+           num_vehicles (int): Number of vehicles in the fleet, None if the trips are not bound to vehicles
+           num_trips (int): Number of trips started
+           num_items_moved (int): Number of items carried on the trips started
+           vehicle_in_transit (numpy.ndarray): Whether each vehicle is on a trip, the per-vehicle arrays are
+                                               empty if the trips are not bound to vehicles
+           vehicle_num_trips (numpy.ndarray): Number of trips started by each vehicle
+           vehicle_num_items_moved (numpy.ndarray): Number of items carried by each vehicle
+           vehicle_busy_time (numpy.ndarray): Time spent by each vehicle on completed trips
+           vehicle_departure_time (numpy.ndarray): Start time of the last trip of each vehicle
+           vehicle_traffic_delay (numpy.ndarray): Time each vehicle has waited for other vehicles in the aisles
+           vehicle_location (numpy.ndarray): Node index in the route graph where each vehicle is or is heading to,
+                                             None without a route graph
+           reserved_items (dict):  Maps each successful reserve_get event to the exact item (or list of items) reserved for it
+           reserve_put_queue (ReservationQueue): Queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations
+        """
+
+    def __init__(self, env, capacity=float('inf'),delay=1, transit_delay=0, num_vehicles=None, route_graph=None,
+                 pickup_station=None, dropoff_station=None, home_station=None, traffic=None):
         """
         Initializes a reservable store with priority-based reservations.
 
         Args:
          env (simpy.Environment): The simulation environment.
-         capacity (int, optional): target quantity of items after which the fleet will be activated
-                                   Defaults to infinity.
+         capacity (int, optional): target quantity of items after which a vehicle will be activated, ie, the
+                                   number of items a vehicle carries in one trip. Defaults to infinity.
          delay (int, float, optional): Delay after which fleet activates to move items incase the target capacity is not reached.
          transit_delay (int, float, optional): Time to move the items after which the item becomes available.
                                                      Can be a constant, generator, or callable. Defaults to 0.
-        """
-        super().__init__(env, capacity)
+         num_vehicles (int, optional): Number of vehicles in the fleet. Defaults to None, for trips that are
+                                       not bound to vehicles.
+         route_graph (RouteGraph, optional): Layout travelled by the vehicles. `transit_delay` is not used when
+                                             it is given, and the fleet has one vehicle if `num_vehicles` is
+                                             not given. Defaults to None.
+         pickup_station (optional): Node of `route_graph` where the items are picked up.
+         dropoff_station (optional): Node of `route_graph` where the items are dropped off.
+         home_station (optional): Node of `route_graph` where the vehicles start. Defaults to `pickup_station`.
+         traffic (TrafficGrid, optional): Traffic layer on `route_graph`, which may be shared with other fleets.
+                                          Defaults to None.
+
+        Raises:
+            ValueError: If `num_vehicles` is not a positive integer.
+            ValueError: If a station is missing from `route_graph` or if the stations cannot be reached from each other.
+            ValueError: If `traffic` is not built on `route_graph`.
+        """
+        if num_vehicles is None and route_graph is not None:
+            num_vehicles = 1  # the vehicles have a location on the route graph
+        if num_vehicles is not None and (not isinstance(num_vehicles, int) or isinstance(num_vehicles, bool)
+                                         or num_vehicles < 1):
+            raise ValueError(f"num_vehicles must be a positive integer, got {num_vehicles!r}.")
+        super().__init__(env, capacity if num_vehicles is None else capacity * num_vehicles)
+        self.batch_size = capacity
+        self.num_vehicles = num_vehicles
         self.env = env
         self.delay = delay
         self.transit_delay = transit_delay
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
-        self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
+        self.reserve_put_queue = ReservationQueue("priority_to_put")  # Priority queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue("priority_to_get")  # Priority queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.ready_items=[]  #Maintains the items ready to be taken out
-        self.reserved_items   = []   # parallel list of the exact items reserved
+        self.reserved_items = {}   # reserve_get event -> exact item reserved for it, in reservation order
         self._last_level_change_time = self.env.now
         self._last_num_items = 0
         self._weighted_sum = 0.0
         self.time_averaged_num_of_items_in_store = 0.0  # Time-averaged number of items in the store
-        self.activate_fleet= self.env.event()  # Event to activate the fleet when items are available
-        
-        self.env.process(self.fleet_activation_process())  # Start the fleet activation process
+        self._in_transit = 0  # Number of items at the head of self.items already picked up by the fleet
+        self._dispatch_timer = None  # Pending timeout that dispatches the fleet after `delay`
+        self._dispatch_due = False  # The timer expired while no vehicle was free
+        self.num_trips = 0
+        self.num_items_moved = 0
+        num_tracked = num_vehicles or 0  # vehicles with their own state
+        self.vehicle_in_transit = np.zeros(num_tracked, dtype=bool)
+        self.vehicle_num_trips = np.zeros(num_tracked, dtype=int)
+        self.vehicle_num_items_moved = np.zeros(num_tracked, dtype=int)
+        self.vehicle_busy_time = np.zeros(num_tracked)
+        self.vehicle_departure_time = np.zeros(num_tracked)
+        self.vehicle_traffic_delay = np.zeros(num_tracked)
+        self.route_graph = route_graph
+        self.traffic = traffic
+        self.vehicle_location = None
+        if traffic is not None and (route_graph is None or traffic.route_graph is not route_graph):
+            raise ValueError("traffic must be built on the route_graph of the fleet.")
+        if route_graph is not None:
+            if home_station is None:
+                home_station = pickup_station
+            for station in (pickup_station, dropoff_station, home_station):
+                if station not in route_graph.index:
+                    raise ValueError(f"Station {station!r} is not a node of the route graph.")
+            self._pickup = route_graph.index[pickup_station]
+            self._dropoff = route_graph.index[dropoff_station]
+            home = route_graph.index[home_station]
+            times = route_graph.travel_times
+            if not np.isfinite([times[home, self._pickup], times[self._pickup, self._dropoff],
+                                times[self._dropoff, self._pickup]]).all():
+                raise ValueError(f"Stations {home_station!r}, {pickup_station!r} and {dropoff_station!r} "
+                                 f"cannot be reached from each other in the route graph.")
+            self.vehicle_location = np.full(num_vehicles, home, dtype=np.int64)
 
     def _update_time_averaged_level(self):
         now = self.env.now
@@ -79,27 +172,113 @@ class FleetStore(Store):
             self._weighted_sum / total_time if total_time > 0 else 0.0
         )
 
-    def fleet_activation_process(self,):
+    def _arm_dispatch_timer(self):
         """
-        Process to activate the fleet when items are available but not equivalent to self.capacity(level not achieved).
-        This process waits for the activate_fleet event to be triggered.
+        Start the dispatch timer when the first item is waiting for the fleet. An idle fleet has no pending timer.
         """
-        while True:
-            timeout_event = self.env.timeout(self.delay)
-            event_list= [timeout_event, self.activate_fleet]
-            yield self.env.any_of(event_list)
-            
-            print(f"T={self.env.now:.2f}: Fleet activation process triggered.")
-            
-            if self.items:
-                print(f"T={self.env.now:.2f}: Fleet activated with {len(self.items)} items ready.")
-                self.env.process(self.move_to_ready_items(self.items))
-                #self.env.process(self.move_to_ready_items(self.items))
-                if self.activate_fleet.triggered:
-                    #print("yes")
-                    self.activate_fleet = self.env.event()  # Reset the event for next activation
+        if self._dispatch_timer is None:
+            timer = self.env.timeout(self.delay)
+            timer.callbacks.append(self._on_dispatch_timer)
+            self._dispatch_timer = timer
+
+    def _on_dispatch_timer(self, timer):
+        if timer is not self._dispatch_timer:
+            # the timer was cancelled by a dispatch of all the waiting items
+            return
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: Fleet dispatch timer expired.")
+        self._dispatch_timer = None
+        self._dispatch_due = True
+        self.dispatch_fleet()
+
+    def _is_full(self):
+        return len(self.items) + len(self.ready_items) == self.capacity
 
-    def reserve_put(self, priority=0):
+    def dispatch_fleet(self, partial=True):
+        """
+        Send the free vehicles away with the items waiting for them, or all the waiting items on one trip if the
+        trips are not bound to vehicles. The dispatch timer is cancelled once no item is left waiting, and
+        started if items are left waiting without a timer.
+
+        Args:
+            partial (bool, optional): Whether a vehicle may leave with fewer than `batch_size` items.
+                                      Defaults to True.
+        """
+        waiting = len(self.items) - self._in_transit
+        if waiting and (partial or waiting >= self.batch_size):
+            if self.num_vehicles is None:
+                # the trips are not bound to vehicles, all the waiting items leave together
+                self.num_trips += 1
+                self.num_items_moved += waiting
+                self._start_trip(None, self.items[self._in_transit:])
+                self._in_transit += waiting
+                waiting = 0
+            else:
+                free = np.flatnonzero(~self.vehicle_in_transit)
+                if self.route_graph is not None:
+                    # nearest vehicles first
+                    distance = self.route_graph.travel_times[self.vehicle_location[free], self._pickup]
+                    free = free[np.argsort(distance, kind="stable")]
+                batch = waiting if self.batch_size >= waiting else int(self.batch_size)
+                loads = np.clip(waiting - batch * np.arange(len(free)), 0, batch)
+                if not partial:
+                    loads[loads < self.batch_size] = 0
+                vehicles = free[loads > 0]
+                loads = loads[loads > 0]
+                if len(vehicles):
+                    self.vehicle_in_transit[vehicles] = True
+                    self.vehicle_num_trips[vehicles] += 1
+                    self.vehicle_num_items_moved[vehicles] += loads
+                    self.vehicle_departure_time[vehicles] = self.env.now
+                    self.num_trips += len(vehicles)
+                    self.num_items_moved += int(loads.sum())
+                    ends = self._in_transit + np.cumsum(loads)
+                    for vehicle, end, load in zip(vehicles.tolist(), ends.tolist(), loads.tolist()):
+                        self._start_trip(vehicle, self.items[end - load:end])
+                    self._in_transit = int(ends[-1])
+                    waiting = len(self.items) - self._in_transit
+
+        if not waiting:
+            self._dispatch_timer = None
+            self._dispatch_due = False
+        elif not self._dispatch_due:
+            self._arm_dispatch_timer()
+
+    def _start_trip(self, vehicle, items):
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: Fleet vehicle {vehicle} activated with {len(items)} items ready.")
+        # the vehicle travels to the items, then carries them to the destination
+        if self.route_graph is None:
+            delay = self.transit_delay
+        else:
+            delay = self._leg_time(vehicle, self.vehicle_location[vehicle], self._pickup)
+            self.vehicle_location[vehicle] = self._dropoff
+        timer = self.env.timeout(delay)
+        timer.callbacks.append(lambda event: self._carry(vehicle, items))
+
+    def _carry(self, vehicle, items):
+        if self.route_graph is None:
+            delay = self.transit_delay
+        else:
+            delay = self._leg_time(vehicle, self._pickup, self._dropoff)
+        timer = self.env.timeout(delay)
+        timer.callbacks.append(lambda event: self.move_to_ready_items(vehicle, items))
+
+    def _leg_time(self, vehicle, from_node, to_node):
+        travel_time = self.route_graph.travel_times[from_node, to_node]
+        if self.traffic is None:
+            return travel_time
+        leg_time = self.traffic.reserve_path((id(self), vehicle), from_node, to_node, self.env.now) - self.env.now
+        self.vehicle_traffic_delay[vehicle] += leg_time - travel_time
+        return leg_time
+
+    def _check_quantity(self, n):
+        if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+            raise ValueError(f"Number of units to reserve must be a positive integer, got {n!r}.")
+        if n > self.capacity:
+            raise ValueError(f"Cannot reserve {n} units in a store of capacity {self.capacity}.")
+
+    def reserve_put(self, priority=0, select=None, n=1):
         """
         Create a reservation request to put an item into the store.
 
@@ -113,19 +292,27 @@ class FleetStore(Store):
         Args:
             priority (int, optional): The priority level of the reservation request.
                                       Lower values indicate higher priority. Defaults to 0.
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
+            n (int, optional): Number of slots to reserve. The event succeeds only when all `n` slots
+                are free, and the reservation is used by a single `put` of a list of `n` items. Defaults to 1.
 
         Returns:
             event (simpy.Event): A reservation event that will succeed when space is available.
 
+        Raises:
+            ValueError: If `n` is not a positive integer or exceeds the capacity of the store.
+
         """
-        event = self.env.event()
+        self._check_quantity(n)
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename = self  # Store reference
         event.requesting_process = self.env.active_process  # Process making the reservation
         event.priority_to_put = priority  # Priority for sorting reservations
+        event.quantity = n  # Number of slots reserved
 
-        # Add the event to the reservation queue and sort by priority
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_put_queue.append(event)
-        self.reserve_put_queue.sort(key=lambda e: e.priority_to_put)
 
         # Attempt to process reservations
         self._trigger_reserve_put(event)
@@ -143,21 +330,14 @@ class FleetStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -183,8 +363,8 @@ class FleetStore(Store):
 
         """
         # Check if there's enough space to reserve
-        if len(self.reservations_put) + len(self.items) +len(self.ready_items) < self.capacity:
-            self.reservations_put.append(event)  # Add reservation
+        if self.reservations_put.units + len(self.items) +len(self.ready_items) + event.quantity <= self.capacity:
+            self.reservations_put.append(event, event.quantity)  # Add reservation
             event.succeed()
             # Log the success of the reservation
             #print(f"At time={self.env.now:.2f}, Process {self.env.active_process} "
@@ -249,30 +429,27 @@ class FleetStore(Store):
             # 1) Remove from active reservations
             self.reservations_get.remove(get_event_to_cancel)
 
-            # 2) Find its index in the parallel lists
-            ev_idx = self.reserved_events.index(get_event_to_cancel)
-
-            # 3) Pop out the exact item reference
-            item = self.reserved_items.pop(ev_idx)
-            # 4) Drop the event token
-            self.reserved_events.pop(ev_idx)
+            # 2) Pop out the exact item(s) reserved for the event
+            reserved = self.reserved_items.pop(get_event_to_cancel)
+            items = reserved if get_event_to_cancel.quantity > 1 else [reserved]
 
-            # 5) Remove it from ready_items wherever it currently is
-            try:
-                self.ready_items.remove(item)
-            except ValueError:
-                raise RuntimeError(f"Item {item!r} not found in ready_items during cancel.")
-
-            # 6) Compute new insertion index
-            # "FIFO":
-                # one slot before the remaining reserved block
-            insert_idx = len(self.ready_items) - len(self.reserved_events) - 1
-            
+            for item in items:
+                # 3) Remove it from ready_items wherever it currently is
+                try:
+                    self.ready_items.remove(item)
+                except ValueError:
+                    raise RuntimeError(f"Item {item!r} not found in ready_items during cancel.")
+
+                # 4) Compute new insertion index
+                # "FIFO":
+                    # one slot before the remaining reserved block
+                insert_idx = len(self.ready_items) - self.reservations_get.units - 1
+                
 
-            # 7) Re‑insert it
-            self.ready_items.insert(insert_idx, item)
+                # 5) Re‑insert it
+                self.ready_items.insert(insert_idx, item)
 
-            # 8) Trigger any other pending reservations
+            # 6) Trigger any other pending reservations
             self._trigger_reserve_get(None)
             return True
 
@@ -281,61 +458,7 @@ class FleetStore(Store):
             "No matching event in reserve_get_queue or reservations_get"
         )
 
-    def reserve_get_cancel1(self, get_event_to_cancel):
-
-      """
-        Cancel a previously made `reserve_get` request.
-
-        This method allows a process to cancel its reservation for retrieving an item
-        from the store. If the reservation exists in the `reserve_get_queue`, it is removed,
-        and `_trigger_reserve_get()` is called to process any remaining reservations.
-
-        If the reservation is already in `reservations_get`, it is removed, and the corresponding
-        item is repositioned in the store to maintain order. `_trigger_reserve_get()` is then
-        triggered to handle pending reservations.
-
-        Args:
-            get_event_to_cancel (simpy.Event): The reservation event that needs to be canceled.
-
-        Returns:
-            proceed (bool): True if the reservation was successfully canceled.
-
-        Raises:
-            RuntimeError: If the specified event does not exist in `reserve_get_queue`
-                          or `reservations_get`.
-        """
-      
-      proceed = False
-      #checking and removing the event if it is not yielded and is present in the reserve_get_queue
-      if get_event_to_cancel in self.reserve_get_queue:
-        self.reserve_get_queue.remove(get_event_to_cancel)
-        self._trigger_reserve_get(None)#if t is removed, then a waiting event can be succeeded, if any
-        proceed = True
-
-      #checking and removing the event if it is already yielded and is present in the reservations_queue.
-      # 1-to-1 association with items done to preserve item order should also be removed.
-      elif get_event_to_cancel in self.reservations_get:
-        self.reservations_get.remove(get_event_to_cancel)
-
-        #deleting the associated event in the reserved_events list to preserve the order of the items
-        #finding index of the item
-        event_in_index = self.reserved_events.index(get_event_to_cancel)
-        delta_position = len(self.reserved_events)
-        #shifting the item
-        item_to_shift = self.items.pop(event_in_index)
-        self.items.insert(delta_position-1, item_to_shift)
-        #deleting the event
-        self.reserved_events.pop(event_in_index)#if t is removed, then a waiting event can be succeeded, if any
-
-        self._trigger_reserve_get(None)
-        proceed = True
-
-      else:
-        raise RuntimeError("No matching event in reserve_get_queue or reservations_get for this process")
-      
-      return proceed
-
-    def reserve_get(self,priority=0):
+    def reserve_get(self,priority=0, select=None, n=1):
         """
         Create a reservation request to retrieve an item from the store.
 
@@ -350,21 +473,29 @@ class FleetStore(Store):
         Args:
             priority (int, optional): The priority level of the reservation request.
                                       Lower values indicate higher priority. Defaults to 0.
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
+            n (int, optional): Number of items to reserve. The event succeeds only when `n` unreserved items
+                are ready, and the reservation is used by a single `get` returning a list of `n` items. Defaults to 1.
 
         Returns:
            event (simpy.Event): A reservation event that will succeed when an item becomes available.
+
+        Raises:
+            ValueError: If `n` is not a positive integer or exceeds the capacity of the store.
         """
+        self._check_quantity(n)
         #adding attributes to the newly created event for reserve_get
-        event = self.env.event()
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename=self
         event.requesting_process = self.env.active_process  # Associate event with the current process
+        event.quantity = n  # Number of items reserved
        
         #event.priority_to_get = (priority, self._env.now)
         event.priority_to_get = priority
 
-        #sorting the list based on priority after appending the new event
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_get_queue.append(event)
-        self.reserve_get_queue.sort(key=lambda e: e.priority_to_get)
 
         self._trigger_reserve_get(event)
         return event
@@ -380,19 +511,14 @@ class FleetStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
         """
-        idx=0
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
           if not reserve_get_event.triggered:
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
@@ -404,7 +530,7 @@ class FleetStore(Store):
         This method checks if there are available items in the store. If so,
         it grants the reservation request by adding the event to `reservations_get`
         and marking the reservation as successful. The event is also added
-        to `reserved_events` to maintain item order. If a request is
+        to `reserved_items` to maintain item order. If a request is
         successfully processed, it is removed from the queue.
 
         Args:
@@ -413,11 +539,8 @@ class FleetStore(Store):
 
         """
         #if there are items that are unreserved, the create a reservation by adding that event to the reservations_get list
-        if len(self.reservations_get) < len(self.ready_items):
-            # Successful reservation; add to reservations list
-            self.reservations_get.append(event)
-            event.succeed()  # Immediately succeed the event
-
+        n = event.quantity
+        if self.reservations_get.units + n <= len(self.ready_items):
             #reserving the item to preserved item order by adding the reserve_get event to a list(the index position of event= index position of reserved item)
             
 
@@ -426,15 +549,17 @@ class FleetStore(Store):
             We pick the j-th from top (for LIFO) or bottom (for FIFO)
             but do NOT remove it yet—we just record the exact item.
             """
-            j = len(self.reserved_events)
+            j = self.reservations_get.units
             #if self.mode == "FIFO":
-            item = self.ready_items[j]
+            items = self.ready_items[j:j + n]
             #else:  # LIFO
             #   item = self.ready_items[-1 - j]
 
+            # Successful reservation; add to reservations list
+            self.reservations_get.append(event, n)
             # record the reservation
-            self.reserved_events.append(event)
-            self.reserved_items .append(item)
+            self.reserved_items[event] = items if n > 1 else items[0]
+            event.succeed()  # Immediately succeed the event
 
 
 
@@ -453,7 +578,8 @@ class FleetStore(Store):
             get_event (simpy.Event): The reservation event associated with the request.
 
         Returns:
-            item (Object): The retrieved item if successful, otherwise raises an error
+            item (Object): The retrieved item if successful, otherwise raises an error.
+                A list of items if the reservation was made for more than one item.
 
         Raises:
             RuntimeError: If no reservations are available in the reservations_get
@@ -502,87 +628,32 @@ class FleetStore(Store):
         Removes the reservation and takes out that exact item from ready_items.
         """
         # 1) validate reservation exists for this process
-        reserved_event = next(
-            (ev for ev in self.reservations_get
-             if ev == get_event and ev.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
         if reserved_event is None:
             raise RuntimeError(
                 f"Time {self.env.now:.2f}, no matching reservation for process {self.env.active_process}."
             )
 
-        # 2) find its index in the reservation lists
-        ev_idx = self.reserved_events.index(reserved_event)
-
-        # 3) remove from reservations
+        # 2) remove from reservations
         self.reservations_get.remove(reserved_event)
-        self.reserved_events.remove(reserved_event)
 
-        # 4) pop out the exact item reference
+        # 3) pop out the exact item reference
         #yield self.env.timeout(self.transit_delay)  # Simulate delay for the fleet to travel to the source node to get the item to be transported.
         try:
-            assigned_item = self.reserved_items.pop(ev_idx)
-        except IndexError:
+            assigned_item = self.reserved_items.pop(reserved_event)
+        except KeyError:
             raise ValueError(f"Reserved item for {get_event} not found in store.")
 
-        # 5) remove that object from ready_items by value
-        try:
-            self.ready_items.remove(assigned_item)
-        except ValueError:
-            raise ValueError(f"Item {assigned_item} not in ready_items.")
+        # 4) remove that object from ready_items by value
+        for item in (assigned_item if reserved_event.quantity > 1 else [assigned_item]):
+            try:
+                self.ready_items.remove(item)
+            except ValueError:
+                raise ValueError(f"Item {item} not in ready_items.")
         self._update_time_averaged_level()
         #yield self.env.timeout(self.transit_delay)  # Simulate delay for the fleet to transport the item to the destination node
         return assigned_item
 
-    def _do_get1(self, get_event):
-        """
-        Execute a `get` operation from the store while ensuring valid reservations.
-
-        This method processes a `reserve_get` request by validating that the calling
-        process has a matching reservation. It retrieves the corresponding item from
-        the store while maintaining the correct order of reservations.
-
-        Args:
-            get_event (simpy.Event): The event associated with the reservation request.
-
-        Returns:
-            item (object): The retrieved item if successful.
-
-        Raises:
-            RuntimeError: If the process does not have a valid reservation ie, if the get_event is not in the reservations_gett list
-            ValueError: If the reserved item is not found in the store.
-        """
-
-        # Locate the reservation event for the current process
-        reserved_event = next(
-            (event for event in self.reservations_get
-            if event == get_event and event.requesting_process == self.env.active_process),
-            None
-        )
-
-        if reserved_event is None:
-            raise RuntimeError(
-                f"Time {self.env.now:.2f}, No matching reservation found for process {self.env.active_process}."
-            )
-
-        # Identify the corresponding item in the reserved events list
-        if self.mode == 'FIFO':
-            item_index = self.reserved_events.index(reserved_event)
-            self.reservations_get.remove(reserved_event)
-
-            # Retrieve the assigned item and remove it from storage
-            assigned_item = self.ready_items.pop(item_index)
-            self.reserved_events.pop(item_index)
-
-        if assigned_item is None:
-            raise ValueError(f"Reserved item for {get_event} not found in store.")
-
-        return assigned_item  # Successfully retrieved item
-
-
-
-
     def put(self,put_event,item):
         """
         Perform a `put` operation on the store and trigger any pending `reserve_get` requests.
@@ -592,7 +663,8 @@ class FleetStore(Store):
 
         Args:
             put_event (simpy.Event): The event corresponding to the reservation.
-            item (object): The item to be added to the store.
+            item (object): The item to be added to the store. A list of exactly `n` items if the
+                reservation was made for `n` > 1 slots.
 
         Returns:
             proceed (bool): True if the put operation succeeded, False otherwise.
@@ -600,6 +672,7 @@ class FleetStore(Store):
         Raises:
             RuntimeError: If no reservations are available in the reservations_put
             RuntimeError: If proceed is False after put operation
+            ValueError: If the number of items does not match the number of reserved slots
         """
         
         proceed = False
@@ -668,10 +741,7 @@ class FleetStore(Store):
 
         # Locate and remove the reservation event efficiently
     
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -679,51 +749,51 @@ class FleetStore(Store):
                 f"for process {self.env.active_process} in reservations_put."
             )
 
+        items = [item]
+        if reserved_event.quantity > 1:
+            items = list(item)
+            if len(items) != reserved_event.quantity:
+                raise ValueError(
+                    f"Reservation is for {reserved_event.quantity} items, but {len(items)} items were put."
+                )
+
         self.reservations_put.remove(reserved_event)
 
-        # Add the item if space is available
-        if len(self.items) + len(self.ready_items) < self.capacity:
+        # Add the items if space is available
+        if len(self.items) + len(self.ready_items) + len(items) <= self.capacity:
            
-            self.items.append(item)
+            self.items.extend(items)
             self._update_time_averaged_level()
             self._trigger_reserve_get(None)
-            if len(self.items) + len(self.ready_items) == self.capacity:
-                #self.activate_fleet = self.env.event()
-                if not self.activate_fleet.triggered:
-                    self.activate_fleet.succeed()  # Trigger fleet activation if capacity is reached
+            # a full store gets no more items, so a partial batch does not wait for the timer
+            self.dispatch_fleet(partial=self._dispatch_due or self._is_full())
             return True  # Successfully added item
 
-    def move_to_ready_items(self, items):
-        """
-        Move items from the store to the ready_items list after a put operation.
-        This method is called as a process to ensure that items are moved asynchronously.
+    def move_to_ready_items(self, vehicle, items):
         """
+        Move the batch of items carried by a vehicle to the ready_items list at the end of its trip and
+        send the vehicle away again if items are waiting for it.
+
+        Args:
+            vehicle (int): Index of the vehicle, None if the trips are not bound to vehicles.
+            items (list): The items carried by the vehicle, they are contiguous in `self.items`.
+        """
+        if len(self.ready_items) + len(items) > self.capacity:
+            raise RuntimeError("Total number of items in the store exceeds capacity. Cannot move item to ready_items.")
+        # batches usually arrive in the order they were dispatched, but trips on a route graph may overtake each other
+        start = 0 if self.items[0] is items[0] else self.items.index(items[0])
+        del self.items[start:start + len(items)]
+        self._in_transit -= len(items)
+        self.ready_items.extend(items)
+        if vehicle is not None:
+            self.vehicle_in_transit[vehicle] = False
+            self.vehicle_busy_time[vehicle] += self.env.now - self.vehicle_departure_time[vehicle]
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: Fleetstore vehicle {vehicle} moved {len(items)} items to ready_items.")
+        self._trigger_reserve_get(None)
+        self._trigger_reserve_put(None)
+        self.dispatch_fleet(partial=self._dispatch_due or self._is_full())
 
-        # Move items to the ready_items list
-        if items:
-            
-            print(f"T={self.env.now:.2f}: Moving items to ready_items.")
-            #START=self.env.now
-            yield self.env.timeout(self.transit_delay)
-            #print("WAITED FOR TRANSIT_DELAY BEFORE MOVING", self.env.now-START)
-            yield self.env.timeout(self.transit_delay)
-            
-            for item in items:
-                
-                item_index = self.items.index(item)
-                item_to_put = self.items.pop(item_index)  # Remove the first item
-               
-                if len(self.ready_items) < self.capacity:
-                    self.ready_items.append(item_to_put)
-                    #print(f"T={self.env.now:.2f}: {self.id} moved item {item_to_put.id} to ready_items.")
-                    self._trigger_reserve_get(None)
-                    self._trigger_reserve_put(None)
-                    #print(f"T={self.env.now:.2f} bufferstore is moving item {item[0].id, item[1]} to ready_items. Total items in buffer is {len(self.items)+len(self.ready_items)}"   )
-                else:
-                    raise RuntimeError("Total number of items in the store exceeds capacity. Cannot move item to ready_items.")
-            
-            print(f"T={self.env.now:.2f}: Fleetstore moved items to ready_items.")
-                
 
 # import simpy
 
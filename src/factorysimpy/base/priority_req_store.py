@@ -26,9 +26,17 @@ class SortedQueue(list):
         if self.maxlen is not None and len(self) >= self.maxlen:
             raise RuntimeError('Cannot append event. Queue is full.')
 
-        super().append(item)
-        super().sort(key=lambda e: e.key)
-
+        # binary search for the position after all events with key <= item.key,
+        # so that events with equal keys stay in FIFO order
+        key = item.key
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < self[mid].key:
+                hi = mid
+            else:
+                lo = mid + 1
+        super().insert(lo, item)
 
 
 class PriorityGet(Get):
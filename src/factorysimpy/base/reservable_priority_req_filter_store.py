@@ -1,4 +1,7 @@
 import simpy
+from collections import deque
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
+from factorysimpy.base.delay_queue import DelayQueue
 from simpy.resources.store import FilterStore
 
 class ReservablePriorityReqFilterStore(FilterStore):
@@ -27,15 +30,28 @@ class ReservablePriorityReqFilterStore(FilterStore):
         It also handles the dissociation of the event and item done at the time of reservation when an already yielded
         event is canceled.
 
+        If a `key_function` is given, the store is keyed: every item gets a key (item type, product family,
+        destination, ...) and processes can reserve by key with `reserve_get(key=...)`. The store keeps a FIFO
+        index of the unreserved items of each key and a separate priority queue of waiting requests per key, so
+        matching a keyed request is O(1) and requests for different keys never wait behind each other. Requests
+        with a filter are still served in a keyed store, by scanning the items. In a keyed store every reservation
+        is associated with the exact item it matched (`reserved_items`) instead of by index.
+
         Attributes:
            reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations 
-           trigger_delay (int): Delay time after which a trigger_reserve_get is called to allow waiting get calls to succeed. """
-
-    def __init__(self, env, capacity=float('inf'),trigger_delay=0):
+           reserve_put_queue (ReservationQueue): Priority queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Priority queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations 
+           trigger_delay (int): Delay time after which a trigger_reserve_get is called to allow waiting get calls to succeed.
+           ready_index (DelayQueue): Items ordered by the time they become ready (put_time + trigger_delay). A single
+                                     timer calls trigger_reserve_get when the next item becomes ready.
+           key_function (callable): Function returning the key of an item, None if the store is not keyed.
+           key_index (dict): Keyed stores only. Maps a key to a deque of the unreserved items with that key, in put order.
+           key_waiters (dict): Keyed stores only. Maps a key to the priority queue of the requests waiting for that key.
+           reserved_items (dict): Keyed stores only. Maps each successful reserve_get event to the exact item reserved for it. """
+
+    def __init__(self, env, capacity=float('inf'),trigger_delay=0, key_function=None):
         """
         Initializes a reservable store with priority-based reservations.
 
@@ -43,17 +59,31 @@ class ReservablePriorityReqFilterStore(FilterStore):
            
             capacity (int, optional): The maximum number of items the store can hold.
                                       Defaults to infinity.
+            trigger_delay (int, optional): Time after its put until an item can be reserved by the default filter.
+            key_function (callable, optional): Function returning the key of an item. Enables `reserve_get(key=...)`.
+
+        Raises:
+            ValueError: If `key_function` is not callable.
         """
         super().__init__(env, capacity)
         self.env = env
 
         self.trigger_delay = trigger_delay
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
+        self.ready_index = DelayQueue(env, self._on_item_ready)  # items waiting for trigger_delay to elapse
+        self.reserve_put_queue = ReservationQueue("priority_to_put")  # Priority queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue("priority_to_get")  # Priority queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
 
+        if key_function is not None and not callable(key_function):
+            raise ValueError("key_function must be callable.")
+        self.key_function = key_function
+        self.key_index = {}       # key -> deque of unreserved items, in put order
+        self.key_waiters = {}     # key -> ReservationQueue of waiting keyed reserve_get requests
+        self.reserved_items = {}  # reserve_get event -> exact item reserved for it (keyed stores)
+        self._reserved_ids = set()  # ids of the reserved items (keyed stores)
+
 
     def reserve_put(self, priority=0):
         """
@@ -78,9 +108,8 @@ class ReservablePriorityReqFilterStore(FilterStore):
         event.requesting_process = self.env.active_process  # Process making the reservation
         event.priority_to_put = priority  # Priority for sorting reservations
 
-        # Add the event to the reservation queue and sort by priority
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_put_queue.append(event)
-        self.reserve_put_queue.sort(key=lambda e: e.priority_to_put)
 
         # Attempt to process reservations
         self._trigger_reserve_put(event)
@@ -93,26 +122,19 @@ class ReservablePriorityReqFilterStore(FilterStore):
         """
         Process pending reservation requests for putting items into the store.
 
-        This method iterates through the `reserve_put_queue` and attempts to fulfill
-        pending `reserve_put` requests by calling `do_reserve_put`.
+        This method attempts to fulfill the highest priority pending `reserve_put`
+        request in `reserve_put_queue` by calling `do_reserve_put`.
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait (priority order)
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -220,6 +242,23 @@ class ReservablePriorityReqFilterStore(FilterStore):
         self._trigger_reserve_get(None)#if t is removed, then a waiting event can be succeeded, if any
         return True
 
+      #keyed request still waiting in the queue of its key
+      key = getattr(get_event_to_cancel, "key", None)
+      if key is not None and get_event_to_cancel in self.key_waiters.get(key, ()):
+        self.key_waiters[key].remove(get_event_to_cancel)
+        if not self.key_waiters[key]:
+          del self.key_waiters[key]
+        return True
+
+      #keyed store, the reserved item is released and put back at the front of its key index
+      if self.key_function is not None and get_event_to_cancel in self.reservations_get:
+        self.reservations_get.remove(get_event_to_cancel)
+        item = self.reserved_items.pop(get_event_to_cancel)
+        self._reserved_ids.discard(id(item))
+        self.key_index.setdefault(self.key_function(item), deque()).appendleft(item)
+        self._trigger_reserve_get(None)
+        return True
+
       #checking and removing the event if it is already yielded and is present in the reservations_queue.
       # 1-to-1 association with items done to preserve item order should also be removed.
       elif get_event_to_cancel in self.reservations_get:
@@ -243,7 +282,7 @@ class ReservablePriorityReqFilterStore(FilterStore):
 
       return proceed
     
-    def reserve_get(self,priority=0,filter= None):
+    def reserve_get(self,priority=0,filter= None, key=None):
         """
         Create a reservation request to retrieve an item from the store.
 
@@ -259,9 +298,14 @@ class ReservablePriorityReqFilterStore(FilterStore):
             priority (int, optional): The priority level of the reservation request.
                                       Lower values indicate higher priority. Defaults to 0.
             filter (filter=lambdaitem=True, optional):  Filter to be used while using "reserve_get
+            key (object, optional): Keyed stores only. Reserve the oldest unreserved item with this key that is
+                                    older than `trigger_delay`. Cannot be combined with `filter`.
 
         Returns:
             event (simpy.Event): A reservation event that will succeed when an item becomes available.
+
+        Raises:
+            ValueError: If `key` is given and the store has no `key_function`, or if both `key` and `filter` are given.
         """
         #adding attributes to the newly created event for reserve_get
 
@@ -271,51 +315,89 @@ class ReservablePriorityReqFilterStore(FilterStore):
         #event.priority_to_get = (priority, self._env.now)
         event.priority_to_get = priority
 
+        if key is not None:
+            if self.key_function is None:
+                raise ValueError("reserve_get by key requires a store created with a key_function.")
+            if filter is not None:
+                raise ValueError("reserve_get accepts either a filter or a key, not both.")
+            event.key = key
+            # keyed requests wait in the queue of their key, ordered by (priority, arrival)
+            if key not in self.key_waiters:
+                self.key_waiters[key] = ReservationQueue("priority_to_get")
+            self.key_waiters[key].append(event)
+            self._trigger_reserve_get_key(key)
+            return event
+
+        event.key = None
         # Check if 'filter' is provided, if not, assign a default filter
         if filter is None:
             #print(f"T={self.env.now} filter is None so making it true for all items")
             #filter = lambda item: True  # Default filter that accepts all items
-            filter=lambda x : self.env.now>= x.put_time + self.trigger_delay
-            event.filter = filter
+            event.filter = self.is_ready
         else:
             #print(f"T={self.env.now} filter is not None ")
             event.filter = filter
 
-        #sorting the list based on priority after appending the new event
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_get_queue.append(event)
-        self.reserve_get_queue.sort(key=lambda e: e.priority_to_get)
 
         self._trigger_reserve_get(event)
         return event
 
 
-    def _trigger_reserve_get(self, event):
+    def _trigger_reserve_get(self, event, key=None):
         """
         Process pending `reserve_get` requests to fulfill reservations.
 
-        This method iterates through the `reserve_get_queue` and attempts
-        to fulfill pending `reserve_get` requests by calling `do_reserve_get`.
+        This method attempts to fulfill the highest priority pending `reserve_get`
+        request in `reserve_get_queue` by calling `do_reserve_get`.
 
 
+        In a keyed store the waiting requests of every key are processed as well,
+        or only those of `key` if it is given.
+
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
+            key (object, optional): Keyed stores only. The key of the items that became available.
         """
-        idx=0
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        if self.key_waiters:
+          for waiting_key in ([key] if key is not None else list(self.key_waiters)):
+            self._trigger_reserve_get_key(waiting_key)
+
+        # only the request at the head of the queue can be served, requests behind it wait (priority order)
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
           if not reserve_get_event.triggered:
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
 
+    def _trigger_reserve_get_key(self, key):
+        """
+        Process the pending keyed `reserve_get` requests for `key`, in priority order.
+
+        Args:
+            key (object): The key whose waiting requests are processed.
+        """
+        waiters = self.key_waiters.get(key)
+        if waiters is None:
+          return
+        candidates = self.key_index.get(key)
+        while waiters and candidates and self.is_ready(candidates[0]):
+          self._reserve_item(waiters.pop(), candidates.popleft())
+        if not waiters:
+          del self.key_waiters[key]
+
+    def _reserve_item(self, event, item):
+        """Grants `event` and associates it with `item` (keyed stores)."""
+        self.reservations_get.append(event)
+        self.reserved_items[event] = item
+        self._reserved_ids.add(id(item))
+        event.succeed()
+
     def _do_reserve_get(self,event):
         """
         Process a `reserve_get` request and reserve an item if available.
@@ -332,7 +414,23 @@ class ReservablePriorityReqFilterStore(FilterStore):
 
         """
         #if there are items that are unreserved, the create a reservation by adding that event to the reservations_get list
-        if len(self.reservations_get) < len(self.items):
+        if len(self.reservations_get) < len(self.items) and self.key_function is not None:
+            # keyed store: the filter is checked against every unreserved item, the matching item is taken out of its key index
+            for item in self.items:
+                if id(item) not in self._reserved_ids and event.filter(item):
+                    self.key_index[self.key_function(item)].remove(item)
+                    self._reserve_item(event, item)
+                    break
+
+        elif len(self.reservations_get) < len(self.items) and event.filter == self.is_ready:
+            # default filter: items become ready in put order, so only the oldest unreserved item has to be checked
+            item_len = len(self.reserved_events)
+            if self.is_ready(self.items[item_len]):
+                self.reservations_get.append(event)
+                event.succeed()
+                self.reserved_events.append(event)
+
+        elif len(self.reservations_get) < len(self.items):
             # Successful reservation; add to reservations list
             item_len = len(self.reserved_events)
             #check if there any items that satisfy filter condition in other items thatare not already reserved
@@ -432,17 +530,21 @@ class ReservablePriorityReqFilterStore(FilterStore):
         """
 
         # Locate the reservation event for the current process
-        reserved_event = next(
-            (event for event in self.reservations_get
-            if event == get_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
                 f"Time {self.env.now:.2f}, No matching reservation found for process {self.env.active_process}."
             )
 
+        if self.key_function is not None:
+            # keyed store: the reservation is associated with the exact item
+            self.reservations_get.remove(reserved_event)
+            assigned_item = self.reserved_items.pop(reserved_event)
+            self._reserved_ids.discard(id(assigned_item))
+            self.items.remove(assigned_item)
+            return assigned_item
+
         # Identify the corresponding item in the reserved events list
         item_index = self.reserved_events.index(reserved_event)
         self.reservations_get.remove(reserved_event)
@@ -487,7 +589,10 @@ class ReservablePriorityReqFilterStore(FilterStore):
         if proceed:
           #print(f"{self.env.now} proceed")
           #self._trigger_get(None)
-          self._trigger_reserve_get(None)
+          if self.key_function is not None:
+            self._trigger_reserve_get(None, key=self.key_function(item))
+          else:
+            self._trigger_reserve_get(None)
 
         if not proceed:
 
@@ -516,16 +621,16 @@ class ReservablePriorityReqFilterStore(FilterStore):
            #print(f"{self.env.now} {self.env.active_process}{proceed}")
         return proceed
 
-    def _add_trigger_event(self):
-        """Trigger get events after a delay time after put event."""
-        event=self.env.event()
-        self.delay=self.trigger_delay
-        #print(f"created Added event suceeded{self.delay}")
-        event.callbacks.append(self._trigger_reserve_get)# after putting an item, an event is created and will be triggered ater delay amount of time to allow waiting get calls to succeed in a stalled belt
-        #event.callbacks.append(self._trigger_put)# this may not be needed
-        yield self.env.timeout(self.delay)
-        #print(f"{self.env.now}Added event suceeded")
-        event.succeed()
+    def is_ready(self, item):
+        """Default filter of `reserve_get`. True if `trigger_delay` has elapsed since the item was put."""
+        return self.env.now >= item.put_time + self.trigger_delay
+
+    def _on_item_ready(self, item):
+        """Called by `ready_index` when `item` becomes ready, to allow waiting get calls to succeed."""
+        if self.key_function is not None:
+            self._trigger_reserve_get(None, key=self.key_function(item))
+        else:
+            self._trigger_reserve_get(None)
 
 
 
@@ -550,10 +655,7 @@ class ReservablePriorityReqFilterStore(FilterStore):
 
         # Locate and remove the reservation event efficiently
 
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -563,8 +665,6 @@ class ReservablePriorityReqFilterStore(FilterStore):
 
         self.reservations_put.remove(reserved_event)
 
-        self.env.process(self._add_trigger_event())
-
         #put_event.item[1]=self.env.now # stamping the current put time
 
         # Add the item if space is available
@@ -572,4 +672,12 @@ class ReservablePriorityReqFilterStore(FilterStore):
             item.put_time=self.env.now
             #print(f"Time is {self.env.now}")
             self.items.append(item)
+            # items are ready immediately without a trigger_delay, else the ready index wakes up the waiting get calls
+            if self.trigger_delay > 0:
+                self.ready_index.push(item, self.trigger_delay)
+            if self.key_function is not None:
+                key = self.key_function(item)
+                if key not in self.key_index:
+                    self.key_index[key] = deque()
+                self.key_index[key].append(item)
             return True  # Successfully added item
\ No newline at end of file
@@ -3,6 +3,7 @@
 
 
 import simpy
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
 from simpy.resources.store import Store
 
 class ReservablePriorityReqStore(Store):
@@ -30,10 +31,10 @@ class ReservablePriorityReqStore(Store):
 
         Attributes:
            reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations
+           reserve_put_queue (ReservationQueue): Priority queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Priority queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations
         """
 
     def __init__(self, env, capacity=float('inf')):
@@ -47,10 +48,10 @@ class ReservablePriorityReqStore(Store):
         """
         super().__init__(env, capacity)
         self.env = env
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
+        self.reserve_put_queue = ReservationQueue("priority_to_put")  # Priority queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue("priority_to_get")  # Priority queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
         self._last_level_change_time = self.env.now
         self._last_num_items = 0
@@ -93,9 +94,8 @@ class ReservablePriorityReqStore(Store):
         event.requesting_process = self.env.active_process  # Process making the reservation
         event.priority_to_put = priority  # Priority for sorting reservations
 
-        # Add the event to the reservation queue and sort by priority
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_put_queue.append(event)
-        self.reserve_put_queue.sort(key=lambda e: e.priority_to_put)
 
         # Attempt to process reservations
         self._trigger_reserve_put(event)
@@ -108,26 +108,19 @@ class ReservablePriorityReqStore(Store):
         """
         Process pending reservation requests for putting items into the store.
 
-        This method iterates through the `reserve_put_queue` and attempts to fulfill
-        pending `reserve_put` requests by calling `do_reserve_put`.
+        This method attempts to fulfill the highest priority pending `reserve_put`
+        request in `reserve_put_queue` by calling `do_reserve_put`.
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait (priority order)
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -285,9 +278,8 @@ class ReservablePriorityReqStore(Store):
         #event.priority_to_get = (priority, self._env.now)
         event.priority_to_get = priority
 
-        #sorting the list based on priority after appending the new event
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_get_queue.append(event)
-        self.reserve_get_queue.sort(key=lambda e: e.priority_to_get)
 
         self._trigger_reserve_get(event)
         return event
@@ -297,25 +289,20 @@ class ReservablePriorityReqStore(Store):
         """
         Process pending `reserve_get` requests to fulfill reservations.
 
-        This method iterates through the `reserve_get_queue` and attempts
-        to fulfill pending `reserve_get` requests by calling `do_reserve_get`.
+        This method attempts to fulfill the highest priority pending `reserve_get`
+        request in `reserve_get_queue` by calling `do_reserve_get`.
 
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
         """
-        idx=0
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait (priority order)
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
           if not reserve_get_event.triggered:
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
@@ -428,11 +415,7 @@ class ReservablePriorityReqStore(Store):
         """
 
         # Locate the reservation event for the current process
-        reserved_event = next(
-            (event for event in self.reservations_get
-            if event == get_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -539,10 +522,7 @@ class ReservablePriorityReqStore(Store):
 
         # Locate and remove the reservation event efficiently
     
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -4,6 +4,7 @@
 
 import simpy
 from simpy.resources.store import Store
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
 
 class ReservableReqStore(Store):
     """
@@ -29,10 +30,10 @@ class ReservableReqStore(Store):
 
         Attributes:
            reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations
+           reserve_put_queue (ReservationQueue): Queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations
         """
 
     def __init__(self, env, capacity=float('inf')):
@@ -46,10 +47,10 @@ class ReservableReqStore(Store):
         """
         super().__init__(env, capacity)
         self.env = env
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
+        self.reserve_put_queue = ReservationQueue()  # FIFO queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue()  # FIFO queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
         self._last_level_change_time = self.env.now
         self._last_num_items = 0
@@ -109,21 +110,14 @@ class ReservableReqStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -295,19 +289,14 @@ class ReservableReqStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
         """
-        idx=0
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
           if not reserve_get_event.triggered:
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
@@ -420,11 +409,7 @@ class ReservableReqStore(Store):
         """
 
         # Locate the reservation event for the current process
-        reserved_event = next(
-            (event for event in self.reservations_get
-            if event == get_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -531,10 +516,7 @@ class ReservableReqStore(Store):
 
         # Locate and remove the reservation event efficiently
     
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -0,0 +1,288 @@
+import heapq
+import itertools
+import simpy
+
+
+class ReservationSet:
+    """Insertion ordered set of reservation events.
+
+    Used for the successful reservations of a store. Appending, membership
+    tests and removal are O(1), and iteration follows the order in which
+    the reservations were granted.
+
+    A reservation may hold several units (slots or items). `units` is the
+    total number of units held by all reservations in the set, while
+    `len()` counts the reservations.
+
+    """
+
+    __slots__ = ("_events", "units")
+
+    def __init__(self):
+        self._events = {}
+        self.units = 0
+
+    def append(self, event, units=1) -> None:
+        """Add *event*, holding *units* units, at the end of the set."""
+        self._events[event] = units
+        self.units += units
+
+    def remove(self, event) -> None:
+        """Remove *event*. Raise a :exc:`ValueError` if it is not in the set."""
+        try:
+            self.units -= self._events.pop(event)
+        except KeyError:
+            raise ValueError('Event is not in the reservation set.') from None
+
+    def __contains__(self, event):
+        return event in self._events
+
+    def __len__(self):
+        return len(self._events)
+
+    def __bool__(self):
+        return bool(self._events)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __repr__(self):
+        return f"ReservationSet({list(self._events)})"
+
+
+class ReservationQueue:
+    """Binary heap of reservation events ordered by (priority, sequence number).
+
+    The priority of an event is read from the attribute *priority_attr* when it
+    is appended. Events with equal priority are served in FIFO order. If
+    *priority_attr* is None, all events have the same priority and the queue
+    is a plain FIFO queue.
+
+    Removing an event only marks its heap entry as cancelled; cancelled
+    entries are discarded when they reach the top of the heap, and the heap
+    is rebuilt without them when they outnumber the waiting events, so that
+    entries behind a waiting head do not accumulate.
+
+    """
+
+    def __init__(self, priority_attr=None):
+        self.priority_attr = priority_attr
+        self._heap = []
+        self._entries = {}
+        self._seq = itertools.count()
+
+    def append(self, event) -> None:
+        """Push *event* into the queue."""
+        priority = getattr(event, self.priority_attr) if self.priority_attr is not None else 0
+        entry = [priority, next(self._seq), event]
+        self._entries[event] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, event) -> None:
+        """Cancel *event*. Raise a :exc:`ValueError` if it is not in the queue."""
+        entry = self._entries.pop(event, None)
+        if entry is None:
+            raise ValueError('Event is not in the queue.')
+        entry[2] = None
+        if len(self._heap) > 2 * len(self._entries):
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+
+    def peek(self):
+        """Return the event with the highest priority without removing it, or None if the queue is empty."""
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def pop(self):
+        """Remove and return the event with the highest priority."""
+        event = self.peek()
+        if event is None:
+            raise IndexError('pop from an empty queue')
+        heapq.heappop(self._heap)
+        del self._entries[event]
+        return event
+
+    def __contains__(self, event):
+        return event in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __iter__(self):
+        """Iterate over the waiting events in priority order."""
+        return (entry[2] for entry in sorted(self._entries.values()))
+
+
+class SelectRequest:
+    """Placeholder for a :class:`ReservationSelect` in the reservation queue of one store.
+
+    Stores treat it like a reservation event: they set `resourcename`,
+    `requesting_process` and the priority attributes, queue it, and call
+    `succeed()` when the reservation is granted. It is not a SimPy event and
+    nothing waits on it; granting it triggers the owning select instead.
+
+    """
+
+    __slots__ = ("select", "index", "resourcename", "requesting_process",
+                 "priority_to_put", "priority_to_get", "quantity", "triggered")
+
+    def __init__(self, select, index):
+        self.select = select
+        self.index = index
+        self.resourcename = None
+        self.requesting_process = None
+        self.priority_to_put = 0
+        self.priority_to_get = 0
+        self.quantity = 1
+        self.triggered = False
+
+    def succeed(self, value=None):
+        """Grant the reservation. Called by the store."""
+        self.triggered = True
+        self.select._grant(self)
+        return self
+
+    def __repr__(self):
+        return f"SelectRequest(index={self.index}, store={self.resourcename!r})"
+
+
+class ReservationSelect(simpy.Event):
+    """One waiter for a reservation on any one of several edges.
+
+    `reserve(edges)` registers a :class:`SelectRequest` in the reservation
+    queue of each edge, in order, and stops as soon as one of them is
+    granted. The first store that grants its request wins: the requests in
+    the other stores are dropped from their queues and the select succeeds
+    with the granted request as its value. At most one reservation is ever
+    granted, so nothing has to be cancelled afterwards.
+
+    An edge whose `EdgeOps.supports_select` is False is reserved with a plain
+    `reserve_put()` or `reserve_get()` instead. If another edge wins, its
+    reservation is cancelled with `reserve_put_cancel` or `reserve_get_cancel`.
+
+    The granted request is used like the event returned by `reserve_put` or
+    `reserve_get` in the following `put` or `get` call of the edge.
+
+    Args:
+        env (simpy.Environment): The simulation environment.
+        kind (str): "put" to reserve space, "get" to reserve an item.
+
+    Attributes:
+        requests (list): The registered requests, in the order of the edges.
+        chosen (SelectRequest or simpy.Event): The granted request, None while waiting.
+        index (int): Index of the edge whose store granted the request, None while waiting.
+
+    Raises:
+        ValueError: If `kind` is not "put" or "get".
+    """
+
+    def __init__(self, env, kind):
+        if kind not in ("put", "get"):
+            raise ValueError(f"kind must be 'put' or 'get', got {kind!r}.")
+        super().__init__(env)
+        self.kind = kind
+        self.requests = []
+        self.chosen = None
+        self.index = None
+        self._edge_index = 0  # index of the edge being reserved on
+        self._plain = []  # (index, edge ops, event) of the edges reserved without the select
+
+    def reserve(self, edges):
+        """
+        Register the select with `edges` until one of them grants the reservation.
+
+        Args:
+            edges (list): `EdgeOps` of the edges to reserve on, in order of preference. Edges and stores whose
+                          reserve methods take a `select` argument can be passed directly.
+
+        Returns:
+            ReservationSelect: The select itself, to be yielded.
+
+        Raises:
+            ValueError: If an edge without `select` support has no cancel method and other edges are given.
+        """
+        for index, edge in enumerate(edges):
+            self._edge_index = index
+            if getattr(edge, "supports_select", True):
+                if self.kind == "put":
+                    edge.reserve_put(select=self)
+                else:
+                    edge.reserve_get(select=self)
+            else:
+                self._reserve_plain(index, edge, len(edges))
+            if self.triggered:
+                break
+        return self
+
+    def _reserve_plain(self, index, ops, num_edges):
+        if self._cancel_method(ops) is None and num_edges > 1:
+            raise ValueError(f"Edge {ops.id!r} takes no select and has no method to cancel a reservation, "
+                             f"it cannot be reserved together with other edges.")
+        event = ops.reserve_put() if self.kind == "put" else ops.reserve_get()
+        self._plain.append((index, ops, event))
+        if event.triggered:
+            self._grant_plain(index, event)
+        else:
+            event.callbacks.append(lambda event: self._grant_plain(index, event))
+
+    def _grant_plain(self, index, event):
+        if self.chosen is not None or not any(entry[2] is event for entry in self._plain):
+            # granted already, or withdrawn by `cancel`
+            return
+        self._grant(event, index)
+
+    def request(self, store):
+        """Create the request of this select for `store`. Called by the store."""
+        request = SelectRequest(self, self._edge_index)
+        self.requests.append(request)
+        return request
+
+    def _grant(self, request, index=None):
+        if self.chosen is not None:
+            raise RuntimeError("A reservation select can only be granted once.")
+        self.chosen = request
+        self.index = request.index if index is None else index
+        for other in self.requests:
+            if other is not request:
+                self._queue(other).remove(other)
+        for _, ops, event in self._plain:
+            if event is not request:
+                self._cancel_plain(ops, event)
+        # only the granted plain reservation is kept, for `cancel`
+        self._plain = [entry for entry in self._plain if entry[2] is request]
+        self.succeed(request)
+
+    def _queue(self, request):
+        store = request.resourcename
+        return store.reserve_put_queue if self.kind == "put" else store.reserve_get_queue
+
+    def _cancel_method(self, ops):
+        return ops.reserve_put_cancel if self.kind == "put" else ops.reserve_get_cancel
+
+    def _cancel_plain(self, ops, event):
+        cancel = self._cancel_method(ops)
+        if cancel is None:
+            raise RuntimeError(f"Edge {ops.id!r} has no method to cancel a reservation.")
+        cancel(event)
+
+    def cancel(self):
+        """
+        Withdraw the select from every store, releasing the granted reservation if there is one.
+        """
+        pending = self.requests if self.chosen is None else [self.chosen]
+        for request in pending:
+            if not isinstance(request, SelectRequest):
+                continue
+            if self.kind == "put":
+                request.resourcename.reserve_put_cancel(request)
+            else:
+                request.resourcename.reserve_get_cancel(request)
+        for _, ops, event in self._plain:
+            self._cancel_plain(ops, event)
+        self.requests = []
+        self._plain = []
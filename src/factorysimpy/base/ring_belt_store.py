@@ -0,0 +1,224 @@
+from collections import deque
+
+from factorysimpy.base.slotted_belt_store import BeltStore
+from factorysimpy.utils.logger import logger
+
+
+class RingBeltStore(BeltStore):
+    """
+        A slotted BeltStore that keeps its slots in a fixed size circular array instead of running a process per item.
+
+        The belt has `capacity` slots numbered from the entry (0) to the exit (`capacity - 1`). Slot `p` is stored
+        at index `(p + head) % capacity` of the array, so advancing every item by one slot is a single decrement of
+        `head`. A single timer advances the belt every `delay` time units while there are items that can move.
+        An item is put into slot 0, which must be empty, and is moved to `ready_items` when it is advanced past the
+        last slot. The items waiting in `ready_items` still count towards the capacity.
+
+        The items that form a contiguous run ending at the last slot are not kept in the array: they are the first
+        `front_run` items of `items` and occupy the slots `capacity - 1`, `capacity - 2`, ... An item joins the run
+        when it is advanced next to it, and the first item of the run leaves the belt at every advance. As the run
+        keeps its shape while the belt moves, only its length is updated.
+
+        The exit is blocked while there are items in `ready_items` and no process has reserved one of them:
+            - non accumulating belt: the belt stops until the exit is cleared.
+            - accumulating belt: the run stops and the items behind it keep moving until they join it.
+
+        An advance, a stop and a restart cost O(1) whatever the number of slots, plus O(1) for every item joining
+        the run. The reservation interface is inherited from the slotted BeltStore. The belt controls its own stops,
+        so the interrupt methods called by the conveyor do nothing.
+
+        Attributes:
+            accumulating (bool): Whether the items behind a blocked exit keep moving.
+            head (int): Index of slot 0 in the slot array.
+            front_run (int): Number of items in the run ending at the last slot.
+        """
+
+    def __init__(self, env, capacity, delay=1, accumulating=True):
+        """
+        Args:
+            capacity (int): Number of slots on the belt.
+            delay (float, optional): Time taken by an item to move by one slot. Defaults to 1.
+            accumulating (bool, optional): Whether the belt accumulates items at a blocked exit. Defaults to True.
+        """
+        super().__init__(env, capacity, mode="FIFO", delay=delay)
+        self.accumulating = accumulating
+        self.items = deque()  # items on the belt, in the order they were put
+        self._slots = [None] * capacity
+        self.head = 0
+        self.front_run = 0
+        self._timer = None
+        self._last_put_time = None
+
+    def _index(self, slot):
+        return (slot + self.head) % self.capacity
+
+    def _exit_blocked(self):
+        return bool(self.ready_items) and len(self.reservations_get) == 0
+
+    def _can_move(self):
+        if not self.items:
+            return False
+        if not self._exit_blocked():
+            return True
+        return self.accumulating and len(self.items) > self.front_run
+
+    def _join_front_run(self):
+        # items of the array advanced next to the run join it
+        slot = self.capacity - 1 - self.front_run
+        while slot >= 0 and self._slots[self._index(slot)] is not None:
+            self._slots[self._index(slot)] = None
+            self.front_run += 1
+            slot -= 1
+
+    # ----- timer ----------------------------------------------------------------------------------
+
+    def _start(self):
+        if self._timer is None and self._can_move():
+            timer = self.env.timeout(self.delay)
+            timer.callbacks.append(self._advance)
+            self._timer = timer
+
+    def _advance(self, timer):
+        if timer is not self._timer:
+            return
+        self._timer = None
+        blocked = self._exit_blocked()
+        if blocked and not self.accumulating:
+            # the whole belt stops, _release restarts it
+            return
+
+        now = self.env.now
+        exited = None
+        if not blocked and self.front_run:
+            if self._last_put_time == now and self.front_run == self.capacity:
+                # the last item of the run was put at the instant of the advance, it stays in the entry slot
+                self.front_run -= 1
+                self._slots[self._index(-1)] = self.items[-1]
+            if self.front_run:
+                # the run moves with the belt, its first item leaves it
+                exited = self.items.popleft()
+                self.front_run -= 1
+
+        entry = self.head
+        fresh = self._last_put_time == now and self._slots[entry] is not None
+        self.head = (self.head - 1) % self.capacity
+        if fresh and entry != self.head:
+            # an item put at the instant of the advance stays in the entry slot
+            self._slots[self.head] = self._slots[entry]
+            self._slots[entry] = None
+        self._join_front_run()
+
+        if exited is not None:
+            self.ready_items.append(exited[0])
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} ringbeltstore moved item {exited[0].id} to ready_items")
+            if not self.ready_item_event.triggered:
+                self.ready_item_event.succeed()
+        self._start()
+        if exited is not None:
+            self._trigger_reserve_get(None)
+        self._trigger_reserve_put(None)
+
+    def _release(self):
+        """Restart the belt once the exit is no longer blocked."""
+        self._start()
+
+    # ----- store operations -----------------------------------------------------------------------
+
+    def _do_reserve_put(self, event):
+        """
+        Attempts to reserve the entry slot for an incoming item.
+
+        The reservation is granted if the store is not full, the entry slot is empty and no other put
+        reservation is pending.
+
+        Args:
+            event (simpy.Event): The event associated with the reservation request.
+        """
+        # a full belt also covers the case of a run reaching the entry slot
+        if self.reservations_put or len(self.items) + len(self.ready_items) >= self.capacity:
+            return
+        if self._slots[self.head] is not None:
+            return
+        self.reservations_put.append(event)
+        event.succeed()
+
+    def _do_put(self, put_event, item):
+        """
+        Put the item into the entry slot.
+
+        Args:
+            put_event (simpy.Event): The reservation event associated with the put request.
+            item (tuple): The (item, delay) pair.
+
+        Returns:
+            proceed (bool): True if the item was successfully added
+
+        Raises:
+            RuntimeError: If the process does not have a valid reservation
+        """
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
+        if reserved_event is None:
+            raise RuntimeError(
+                f"Time {self.env.now:.2f}, No matching reservation found "
+                f"for process {self.env.active_process} in reservations_put."
+            )
+        self.reservations_put.remove(reserved_event)
+
+        self._slots[self.head] = item
+        self._last_put_time = self.env.now
+        self.items.append(item)
+        self._join_front_run()
+        self._update_time_averaged_level()
+        self._start()
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: RingBeltStore:_do_put: putting item on belt {item[0].id}")
+        return True
+
+    def _do_reserve_get(self, event):
+        super()._do_reserve_get(event)
+        if event.triggered:
+            self._release()
+
+    def _do_get(self, get_event):
+        item = super()._do_get(get_event)
+        self._release()
+        return item
+
+    def reserve_get_cancel(self, get_event_to_cancel):
+        proceed = super().reserve_get_cancel(get_event_to_cancel)
+        self._release()
+        return proceed
+
+    # ----- interrupt interface used by the conveyor -----------------------------------------------
+
+    def selective_interrupt(self, reason="Selective interrupt"):
+        """
+        Nothing to do: the belt stops by itself when its exit is blocked.
+        """
+
+    def interrupt_all_move_processes(self, reason="External interrupt"):
+        """
+        Nothing to do: the belt stops by itself when its exit is blocked.
+        """
+
+    def resume_all_move_processes(self):
+        """
+        Restart the belt if its exit is no longer blocked.
+        """
+        self._release()
+
+    def handle_new_item_during_interruption(self, item):
+        """
+        Nothing to do: a new item waits in the entry slot or moves up to the stopped items.
+        """
+
+    def _get_belt_pattern(self):
+        """
+        Generate a pattern string representing the current belt occupancy.
+        Returns a string where '*' represents an item and '_' represents empty space.
+        """
+        belt_positions = ['*' if self._slots[self._index(p)] is not None else '_' for p in range(self.capacity)]
+        for k in range(self.front_run):
+            belt_positions[self.capacity - 1 - k] = '*'
+        return ''.join(belt_positions)
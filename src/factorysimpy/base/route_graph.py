@@ -0,0 +1,137 @@
+import hashlib
+import heapq
+import json
+import os
+
+import numpy as np
+
+
+class RouteGraph:
+    """
+    Layout graph of the stations and aisles travelled by the vehicles of a fleet.
+
+    The nodes of the graph are stations or waypoints and its weighted edges are aisles. The shortest
+    distances between all pairs of nodes are computed once, when the graph is built, and kept in a
+    distance matrix together with a next-hop matrix from which the shortest paths are recovered. Travel
+    times are then O(1) lookups in a matrix of `distance / speed`.
+
+    The all-pairs computation runs Dijkstra from every node, in O(n m log n) for n nodes and m aisles. When `cache_dir` is given, the matrices are saved
+    there in a file named after a hash of the layout and loaded back by any graph built from the same
+    layout.
+
+    Args:
+        aisles (iterable): (from_node, to_node, length) triples. Nodes can be any JSON serialisable value.
+        stations (iterable, optional): Nodes to add even if no aisle reaches them. Defaults to None.
+        speed (float, optional): Speed of the vehicles. Defaults to 1.
+        directed (bool, optional): Whether the aisles are one-way. Defaults to False.
+        cache_dir (str, optional): Directory where the matrices are cached. Defaults to None (no caching).
+
+    Attributes:
+        nodes (list): The nodes, in the order of the rows of the matrices.
+        index (dict): Maps every node to its row in the matrices.
+        distance (numpy.ndarray): Shortest distance between every pair of nodes, `inf` if unreachable.
+        next_hop (numpy.ndarray): Row of the node after the first one on the shortest path, -1 if unreachable.
+        travel_times (numpy.ndarray): `distance / speed`.
+        layout_hash (str): Hash of the layout, used to name the cache file.
+
+    Raises:
+        ValueError: If an aisle has a negative length or if `speed` is not positive.
+    """
+
+    def __init__(self, aisles, stations=None, speed=1, directed=False, cache_dir=None):
+        if speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed!r}.")
+        aisles = [(u, v, float(length)) for u, v, length in aisles]
+        self.nodes = []
+        self.index = {}
+        for u, v, length in aisles:
+            if length < 0:
+                raise ValueError(f"Aisle {u!r} -> {v!r} has a negative length {length}.")
+            self._add_node(u)
+            self._add_node(v)
+        for station in stations or ():
+            self._add_node(station)
+        self.speed = speed
+        self.directed = directed
+        self.layout_hash = hashlib.sha256(
+            json.dumps([self.nodes, aisles, directed]).encode()).hexdigest()[:16]
+
+        cache_path = os.path.join(cache_dir, f"route_graph_{self.layout_hash}.npz") if cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                self.distance = cached["distance"]
+                self.next_hop = cached["next_hop"]
+        else:
+            self.distance, self.next_hop = self._all_pairs_shortest_paths(aisles)
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.savez(cache_path, distance=self.distance, next_hop=self.next_hop)
+        self.travel_times = self.distance / speed
+
+    def _add_node(self, node):
+        if node not in self.index:
+            self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+
+    def _all_pairs_shortest_paths(self, aisles):
+        n = len(self.nodes)
+        neighbours = [[] for _ in range(n)]
+        for u, v, length in aisles:
+            neighbours[self.index[u]].append((self.index[v], length))
+            if not self.directed:
+                neighbours[self.index[v]].append((self.index[u], length))
+
+        # Dijkstra from every node, which suits the sparse graphs of plant layouts
+        distance = np.full((n, n), np.inf)
+        next_hop = np.full((n, n), -1, dtype=np.int64)
+        for source in range(n):
+            dist = [np.inf] * n
+            first = [-1] * n
+            dist[source] = 0.0
+            first[source] = source
+            heap = [(0.0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                for v, length in neighbours[u]:
+                    if d + length < dist[v]:
+                        dist[v] = d + length
+                        first[v] = v if u == source else first[u]
+                        heapq.heappush(heap, (dist[v], v))
+            distance[source] = dist
+            next_hop[source] = first
+        return distance, next_hop
+
+    def travel_time(self, from_node, to_node):
+        """
+        Return the time taken to travel from one node to another along the shortest path.
+
+        Args:
+            from_node: Start node.
+            to_node: End node.
+
+        Returns:
+            float: The travel time, `inf` if `to_node` cannot be reached.
+        """
+        return self.travel_times[self.index[from_node], self.index[to_node]]
+
+    def path(self, from_node, to_node):
+        """
+        Return the shortest path between two nodes.
+
+        Args:
+            from_node: Start node.
+            to_node: End node.
+
+        Returns:
+            list: The nodes along the path, both ends included. Empty if `to_node` cannot be reached.
+        """
+        i, j = self.index[from_node], self.index[to_node]
+        if self.next_hop[i, j] < 0:
+            return []
+        path = [from_node]
+        while i != j:
+            i = self.next_hop[i, j]
+            path.append(self.nodes[i])
+        return path
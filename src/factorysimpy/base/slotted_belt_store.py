@@ -4,6 +4,8 @@
 
 import simpy
 from simpy.resources.store import Store
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet
+from factorysimpy.utils.logger import logger
 
 class BeltStore(Store):
     """
@@ -29,11 +31,11 @@ class BeltStore(Store):
         event is canceled.
 
         Attributes:
-           reserved_events (list):  Maintains events corresponding to reserved items to preserve item order by index
-           reserve_put_queue (list): Queue for managing reserve_put reservations
-           reservations_put (list): List of successful put reservations
-           reserve_get_queue (list): Queue for managing reserve_get reservations
-           reservations_get (list):List of successful get reservations
+           reserved_items (dict):  Maps each successful reserve_get event to the exact item reserved for it
+           reserve_put_queue (ReservationQueue): Queue for managing reserve_put reservations
+           reservations_put (ReservationSet): Ordered set of successful put reservations
+           reserve_get_queue (ReservationQueue): Queue for managing reserve_get reservations
+           reservations_get (ReservationSet): Ordered set of successful get reservations
         """
 
     def __init__(self, env, capacity=float('inf'),mode='FIFO', delay=1):
@@ -49,13 +51,12 @@ class BeltStore(Store):
         self.env = env
         self.mode=mode
         self.delay = delay  # Speed of the conveyor belt (units per time)
-        self.reserve_put_queue = []  # Queue for managing reserve_put reservations
-        self.reservations_put = []   # List of successful put reservations
-        self.reserve_get_queue = []  # Queue for managing reserve_get reservations
-        self.reservations_get = []   # List of successful get reservations
-        self.reserved_events = []     # Maintains events corresponding to reserved items to preserve item order
+        self.reserve_put_queue = ReservationQueue("priority_to_put")  # Priority queue for managing reserve_put reservations
+        self.reservations_put = ReservationSet()   # Ordered set of successful put reservations
+        self.reserve_get_queue = ReservationQueue("priority_to_get")  # Priority queue for managing reserve_get reservations
+        self.reservations_get = ReservationSet()   # Ordered set of successful get reservations
         self.ready_items=[]  #Maintains the items ready to be taken out
-        self.reserved_items   = []   # parallel list of the exact items reserved
+        self.reserved_items = {}   # reserve_get event -> exact item reserved for it, in reservation order
         self._last_level_change_time = self.env.now
         self._last_num_items = 0
         self._weighted_sum = 0.0
@@ -79,7 +80,7 @@ class BeltStore(Store):
             self._weighted_sum / total_time if total_time > 0 else 0.0
         )
 
-    def reserve_put(self, priority=0):
+    def reserve_put(self, priority=0, select=None):
         """
         Create a reservation request to put an item into the store.
 
@@ -93,19 +94,20 @@ class BeltStore(Store):
         Args:
             priority (int, optional): The priority level of the reservation request.
                                       Lower values indicate higher priority. Defaults to 0.
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
 
         Returns:
             event (simpy.Event): A reservation event that will succeed when space is available.
 
         """
-        event = self.env.event()
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename = self  # Store reference
         event.requesting_process = self.env.active_process  # Process making the reservation
         event.priority_to_put = priority  # Priority for sorting reservations
 
-        # Add the event to the reservation queue and sort by priority
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_put_queue.append(event)
-        self.reserve_put_queue.sort(key=lambda e: e.priority_to_put)
 
         # Attempt to process reservations
         self._trigger_reserve_put(event)
@@ -123,21 +125,14 @@ class BeltStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_put_queue` is not found
-                          when attempting to remove it after successful processing.
         """
-        idx=0
-
-        while idx < len(self.reserve_put_queue):
-
-          reserve_put_event = self.reserve_put_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_put_queue:
+          reserve_put_event = self.reserve_put_queue.peek()
           proceed = self._do_reserve_put(reserve_put_event)
           if not reserve_put_event.triggered:
-            idx += 1
-          elif self.reserve_put_queue.pop(idx) != reserve_put_event:
-            raise RuntimeError('Reserve put queue invariant violated')
+            break
+          self.reserve_put_queue.pop()
 
           if not proceed:
             break
@@ -250,32 +245,27 @@ class BeltStore(Store):
             # 1) Remove from active reservations
             self.reservations_get.remove(get_event_to_cancel)
 
-            # 2) Find its index in the parallel lists
-            ev_idx = self.reserved_events.index(get_event_to_cancel)
-
-            # 3) Pop out the exact item reference
-            item = self.reserved_items.pop(ev_idx)
-            # 4) Drop the event token
-            self.reserved_events.pop(ev_idx)
+            # 2) Pop out the exact item reserved for the event
+            item = self.reserved_items.pop(get_event_to_cancel)
 
-            # 5) Remove it from ready_items wherever it currently is
+            # 3) Remove it from ready_items wherever it currently is
             try:
                 self.ready_items.remove(item)
             except ValueError:
                 raise RuntimeError(f"Item {item!r} not found in ready_items during cancel.")
 
-            # 6) Compute new insertion index
+            # 4) Compute new insertion index
             if self.mode == "FIFO":
                 # one slot before the remaining reserved block
-                insert_idx = len(self.ready_items) - len(self.reserved_events) - 1
+                insert_idx = len(self.ready_items) - len(self.reserved_items) - 1
             else:  # LIFO
                 # top of stack
                 insert_idx = len(self.ready_items)
 
-            # 7) Re‑insert it
+            # 5) Re‑insert it
             self.ready_items.insert(insert_idx, item)
 
-            # 8) Trigger any other pending reservations
+            # 6) Trigger any other pending reservations
             self._trigger_reserve_get(None)
             return True
 
@@ -284,7 +274,7 @@ class BeltStore(Store):
             "No matching event in reserve_get_queue or reservations_get"
         )
 
-    def reserve_get(self,priority=0):
+    def reserve_get(self,priority=0, select=None):
         """
         Create a reservation request to retrieve an item from the store.
 
@@ -299,21 +289,22 @@ class BeltStore(Store):
         Args:
             priority (int, optional): The priority level of the reservation request.
                                       Lower values indicate higher priority. Defaults to 0.
+            select (ReservationSelect, optional): If given, the request is queued on behalf of this select
+                instead of creating a new event.
 
         Returns:
            event (simpy.Event): A reservation event that will succeed when an item becomes available.
         """
         #adding attributes to the newly created event for reserve_get
-        event = self.env.event()
+        event = self.env.event() if select is None else select.request(self)
         event.resourcename=self
         event.requesting_process = self.env.active_process  # Associate event with the current process
        
         #event.priority_to_get = (priority, self._env.now)
         event.priority_to_get = priority
 
-        #sorting the list based on priority after appending the new event
+        # Add the event to the reservation queue, ordered by (priority, arrival)
         self.reserve_get_queue.append(event)
-        self.reserve_get_queue.sort(key=lambda e: e.priority_to_get)
 
         self._trigger_reserve_get(event)
         return event
@@ -329,19 +320,14 @@ class BeltStore(Store):
 
         Args:
             event (simpy.Event): The event associated with the reservation request.
-
-        Raises:
-            RuntimeError: If an event expected to be in `reserve_get_queue` is not
-                          found when attempting to remove it after successful processing.
         """
-        idx=0
-        while idx < len(self.reserve_get_queue):
-          reserve_get_event = self.reserve_get_queue[idx]
+        # only the request at the head of the queue can be served, requests behind it wait
+        while self.reserve_get_queue:
+          reserve_get_event = self.reserve_get_queue.peek()
           proceed = self._do_reserve_get(reserve_get_event)
           if not reserve_get_event.triggered:
-            idx += 1
-          elif self.reserve_get_queue.pop(idx) != reserve_get_event:
-            raise RuntimeError('Reserve get queue invariant violated')
+            break
+          self.reserve_get_queue.pop()
 
           if not proceed:
             break
@@ -353,7 +339,7 @@ class BeltStore(Store):
         This method checks if there are available items in the store. If so,
         it grants the reservation request by adding the event to `reservations_get`
         and marking the reservation as successful. The event is also added
-        to `reserved_events` to maintain item order. If a request is
+        to `reserved_items` to maintain item order. If a request is
         successfully processed, it is removed from the queue.
 
         Args:
@@ -378,15 +364,14 @@ class BeltStore(Store):
             We pick the j-th from top (for LIFO) or bottom (for FIFO)
             but do NOT remove it yet—we just record the exact item.
             """
-            j = len(self.reserved_events)
+            j = len(self.reserved_items)
             if self.mode == "FIFO":
                 item = self.ready_items[j]
             else:  # LIFO
                 item = self.ready_items[-1 - j]
 
             # record the reservation
-            self.reserved_events.append(event)
-            self.reserved_items .append(item)
+            self.reserved_items[event] = item
 
 
 
@@ -454,30 +439,22 @@ class BeltStore(Store):
         Removes the reservation and takes out that exact item from ready_items.
         """
         # 1) validate reservation exists for this process
-        reserved_event = next(
-            (ev for ev in self.reservations_get
-             if ev == get_event and ev.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = get_event if get_event in self.reservations_get and get_event.requesting_process == self.env.active_process else None
         if reserved_event is None:
             raise RuntimeError(
                 f"Time {self.env.now:.2f}, no matching reservation for process {self.env.active_process}."
             )
 
-        # 2) find its index in the reservation lists
-        ev_idx = self.reserved_events.index(reserved_event)
-
-        # 3) remove from reservations
+        # 2) remove from reservations
         self.reservations_get.remove(reserved_event)
-        self.reserved_events.remove(reserved_event)
 
-        # 4) pop out the exact item reference
+        # 3) pop out the exact item reference
         try:
-            assigned_item = self.reserved_items.pop(ev_idx)
-        except IndexError:
+            assigned_item = self.reserved_items.pop(reserved_event)
+        except KeyError:
             raise ValueError(f"Reserved item for {get_event} not found in store.")
 
-        # 5) remove that object from ready_items by value
+        # 4) remove that object from ready_items by value
         try:
             self.ready_items.remove(assigned_item)
         except ValueError:
@@ -571,10 +548,7 @@ class BeltStore(Store):
 
         # Locate and remove the reservation event efficiently
     
-        reserved_event = next(
-            (event for event in self.reservations_put if event == put_event and event.requesting_process == self.env.active_process),
-            None
-        )
+        reserved_event = put_event if put_event in self.reservations_put and put_event.requesting_process == self.env.active_process else None
 
         if reserved_event is None:
             raise RuntimeError(
@@ -631,11 +605,13 @@ class BeltStore(Store):
         try:
             # Move items to the ready_items list
             if self.items:
-                print(f"T={self.env.now:.2f} beltstore received an item {item[0].id, item[1]} . Item started moving in belt")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} beltstore received an item {item[0].id, item[1]} . Item started moving in belt")
                 
                 # Phase 1: Item entering the belt (length/speed time)
                 remaining_phase1_time = phase1_time
-                print(f"T={self.env.now:.2f} Item {item_id} starting Phase 1 (entering belt): {phase1_time:.2f} time")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Item {item_id} starting Phase 1 (entering belt): {phase1_time:.2f} time")
                 
                 while remaining_phase1_time > 0:
                     try:
@@ -650,19 +626,24 @@ class BeltStore(Store):
                         elapsed_time = self.env.now - start_time
                         remaining_phase1_time -= elapsed_time
                         
-                        print(f"T={self.env.now:.2f} Move process Phase 1 for item {item_id} interrupted: {interrupt.cause}")
-                        print(f"T={self.env.now:.2f} Remaining Phase 1 time for item {item_id}: {remaining_phase1_time:.2f}")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f} Move process Phase 1 for item {item_id} interrupted: {interrupt.cause}")
+                            logger.debug(self, f"T={self.env.now:.2f} Remaining Phase 1 time for item {item_id}: {remaining_phase1_time:.2f}")
                         
                         # Wait for resume signal
-                        print(f"T={self.env.now:.2f} Item {item_id} waiting for resume signal (Phase 1)...")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f} Item {item_id} waiting for resume signal (Phase 1)...")
                         yield self.resume_event
-                        print(f"T={self.env.now:.2f} Item {item_id} resuming Phase 1 movement with {remaining_phase1_time:.2f} time remaining")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f} Item {item_id} resuming Phase 1 movement with {remaining_phase1_time:.2f} time remaining")
                 
-                print(f"T={self.env.now:.2f} Item {item_id} completed Phase 1 (fully entered belt)")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Item {item_id} completed Phase 1 (fully entered belt)")
                 
                 # Phase 2: Item moving through the belt to exit
                 remaining_phase2_time = phase2_time
-                print(f"T={self.env.now:.2f} Item {item_id} starting Phase 2 (moving to exit): {phase2_time:.2f} time")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Item {item_id} starting Phase 2 (moving to exit): {phase2_time:.2f} time")
                 
                 while remaining_phase2_time > 0:
                     try:
@@ -676,16 +657,20 @@ class BeltStore(Store):
                         elapsed_time = self.env.now - start_time
                         remaining_phase2_time -= elapsed_time
                         
-                        print(f"T={self.env.now:.2f} Move process Phase 2 for item {item_id} interrupted: {interrupt.cause}")
-                        print(f"T={self.env.now:.2f} Remaining Phase 2 time for item {item_id}: {remaining_phase2_time:.2f}")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f} Move process Phase 2 for item {item_id} interrupted: {interrupt.cause}")
+                            logger.debug(self, f"T={self.env.now:.2f} Remaining Phase 2 time for item {item_id}: {remaining_phase2_time:.2f}")
                         
                         # Wait for resume signal
-                        print(f"T={self.env.now:.2f} Item {item_id} waiting for resume signal (Phase 2)...")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f} Item {item_id} waiting for resume signal (Phase 2)...")
                         yield self.resume_event
-                        print(f"T={self.env.now:.2f} Item {item_id} resuming Phase 2 movement with {remaining_phase2_time:.2f} time remaining")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f} Item {item_id} resuming Phase 2 movement with {remaining_phase2_time:.2f} time remaining")
                 
-                print(f"T={self.env.now:.2f} Item {item_id} completed Phase 2 (reached exit)")
-                print(f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} going to ready_items")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Item {item_id} completed Phase 2 (reached exit)")
+                    logger.debug(self, f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} going to ready_items")
                 
                 item_index = self.items.index(item)
                 item_to_put = self.items.pop(item_index)  # Remove the item
@@ -694,7 +679,8 @@ class BeltStore(Store):
                     self.ready_items.append(item_to_put[0])
                     if not self.ready_item_event.triggered:
                         self.ready_item_event.succeed()  # Notify that a new item is ready
-                    print(f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} moved to ready_items")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} bufferstore finished moving item {item[0].id, item[1]} moved to ready_items")
                     self._trigger_reserve_get(None)
                     self._trigger_reserve_put(None)
                 else:
@@ -707,7 +693,8 @@ class BeltStore(Store):
             # Clean up the process tracking when done
             if item_id in self.active_move_processes:
                 del self.active_move_processes[item_id]
-                print(f"T={self.env.now:.2f} Removed tracking for completed move process of item {item_id}")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Removed tracking for completed move process of item {item_id}")
 
     def interrupt_all_move_processes(self, reason="External interrupt"):
         """
@@ -716,14 +703,16 @@ class BeltStore(Store):
         Args:
             reason (str): Reason for the interrupt
         """
-        print(f"T={self.env.now:.2f} BufferStore interrupting {len(self.active_move_processes)} move processes - {reason}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} BufferStore interrupting {len(self.active_move_processes)} move processes - {reason}")
         
         for item_id, process_info in self.active_move_processes.items():
             process = process_info['process']
             if process and not process.processed:
                 try:
                     process.interrupt(reason)
-                    print(f"T={self.env.now:.2f} Interrupted move process for item {item_id}")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} Interrupted move process for item {item_id}")
                 except RuntimeError:
                     # Process might already be finished
                     pass
@@ -732,7 +721,8 @@ class BeltStore(Store):
         """
         Resume all interrupted move_to_ready_items processes.
         """
-        print(f"T={self.env.now:.2f} BufferStore resuming move processes")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} BufferStore resuming move processes")
         
         # Create a new resume event and trigger it
         old_resume_event = self.resume_event
@@ -795,32 +785,38 @@ class BeltStore(Store):
             reason (str): Reason for the interrupt
         """
         if not self.items:
-            print(f"T={self.env.now:.2f} No items on belt to interrupt")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} No items on belt to interrupt")
             return
         
         # If noaccumulation_mode_on is True (STALLED_NONACCUMULATING_STATE), interrupt all items immediately
         if self.noaccumulation_mode_on:
-            print(f"T={self.env.now:.2f} No accumulation mode: interrupting all items immediately")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} No accumulation mode: interrupting all items immediately")
             for i, item in enumerate(self.items):
                 item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
                 self._interrupt_specific_item(item_id, f"{reason} - immediate (no accumulation)")
             return
         
         # For accumulating mode (STALLED_ACCUMULATING_STATE), use pattern-based interruption
-        print(f"T={self.env.now:.2f} Accumulating mode: using pattern-based interruption")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} Accumulating mode: using pattern-based interruption")
         
         # Get current belt pattern
         pattern = self._get_belt_pattern()
-        print(f"T={self.env.now:.2f} Current belt pattern: {pattern}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} Current belt pattern: {pattern}")
         
         # Analyze pattern and determine interruption strategy
         interruption_plan = self._analyze_pattern_for_interruption(pattern)
         
         if not interruption_plan:
-            print(f"T={self.env.now:.2f} No interruption needed for current pattern")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} No interruption needed for current pattern")
             return
         
-        print(f"T={self.env.now:.2f} Executing selective interruption plan: {interruption_plan}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f} Executing selective interruption plan: {interruption_plan}")
         
         # Execute the interruption plan
         self._execute_interruption_plan(interruption_plan, reason)
@@ -935,7 +931,8 @@ class BeltStore(Store):
             yield self.env.timeout(delay)
             self._interrupt_specific_item(item_id, f"{reason} (delayed by {delay})")
         except simpy.Interrupt:
-            print(f"T={self.env.now:.2f} Delayed interrupt process for item {item_id} was itself interrupted")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Delayed interrupt process for item {item_id} was itself interrupted")
 
     def _interrupt_specific_item(self, item_id, reason):
         """
@@ -952,13 +949,17 @@ class BeltStore(Store):
             if process and not process.processed:
                 try:
                     process.interrupt(reason)
-                    print(f"T={self.env.now:.2f} Selectively interrupted item {item_id}: {reason}")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} Selectively interrupted item {item_id}: {reason}")
                 except RuntimeError:
-                    print(f"T={self.env.now:.2f} Could not interrupt item {item_id} - process may be finished")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f} Could not interrupt item {item_id} - process may be finished")
             else:
-                print(f"T={self.env.now:.2f} Item {item_id} process already finished")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} Item {item_id} process already finished")
         else:
-            print(f"T={self.env.now:.2f} Item {item_id} not found in active processes")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f} Item {item_id} not found in active processes")
 
     def handle_new_item_during_interruption(self, item):
         """
@@ -976,8 +977,10 @@ class BeltStore(Store):
             item_id = item[0].id if hasattr(item[0], 'id') else str(id(item))
             
             if delay_before_interrupt > 0:
-                print(f"T={self.env.now:.2f} New item {item_id} will be interrupted after {delay_before_interrupt} time units")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} New item {item_id} will be interrupted after {delay_before_interrupt} time units")
                 self.env.process(self._delayed_interrupt(item_id, delay_before_interrupt, "New item during interruption"))
             else:
-                print(f"T={self.env.now:.2f} New item {item_id} interrupted immediately")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f} New item {item_id} interrupted immediately")
                 self._interrupt_specific_item(item_id, "New item during interruption")
\ No newline at end of file
@@ -0,0 +1,138 @@
+import math
+
+
+def _point_segment_distance(p, a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length2))
+    return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+
+def _segment_distance(a, b, c, d):
+    def orientation(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    if (orientation(a, b, c) * orientation(a, b, d) < 0) and (orientation(c, d, a) * orientation(c, d, b) < 0):
+        return 0.0
+    return min(_point_segment_distance(a, c, d), _point_segment_distance(b, c, d),
+               _point_segment_distance(c, a, b), _point_segment_distance(d, a, b))
+
+
+class TrafficGrid:
+    """
+    Traffic layer shared by the fleets that travel on the same route graph.
+
+    A vehicle moves along the shortest path hop by hop. Before it enters an aisle it reserves the time window
+    during which it will be in it. Two windows conflict when they overlap in time and the aisles are the same
+    (in either direction) or come closer than `clearance` to each other without sharing a node. A vehicle
+    whose window would conflict waits at the node before the aisle until the aisle is clear. Windows are
+    granted first come first served, so the granted windows never conflict. Vehicles waiting at a node are not
+    obstacles for the others.
+
+    The windows are kept in a uniform spatial hash grid: every window is registered in the cells covered by
+    the bounding box of its aisle, grown by `clearance / 2`. A new window is only checked against the windows
+    of its own cells, so the cost of a check depends on the local traffic and not on the size of the fleets.
+    Windows that have ended are dropped from a cell when it is next scanned. Cells no larger than the
+    typical aisle keep the number of windows checked small; the cell size does not change the results.
+
+    Args:
+        route_graph (RouteGraph): The layout travelled by the vehicles.
+        positions (dict): (x, y) coordinates of every node of `route_graph`.
+        cell_size (float): Side of the cells of the grid.
+        clearance (float, optional): Minimum distance between vehicles in aisles that do not share a node.
+                                     Defaults to 0.
+
+    Attributes:
+        num_delayed_hops (int): Number of hops started later than planned because of a conflict.
+        total_delay (float): Total waiting time caused by conflicts.
+
+    Raises:
+        ValueError: If a node has no position or if `cell_size` is not positive.
+    """
+
+    def __init__(self, route_graph, positions, cell_size, clearance=0):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size!r}.")
+        missing = [node for node in route_graph.nodes if node not in positions]
+        if missing:
+            raise ValueError(f"Nodes {missing!r} have no position.")
+        self.route_graph = route_graph
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self._points = [tuple(map(float, positions[node])) for node in route_graph.nodes]
+        self._cells = {}           # cell -> list of (start, end, i, j, vehicle)
+        self._aisle_cells = {}     # (i, j) -> cells covered by the aisle
+        self._conflicting = {}     # pair of aisles -> whether they conflict
+        self.num_delayed_hops = 0
+        self.total_delay = 0.0
+
+    def _cells_of(self, i, j):
+        cells = self._aisle_cells.get((i, j))
+        if cells is None:
+            (x0, y0), (x1, y1) = self._points[i], self._points[j]
+            margin = self.clearance / 2
+            cx0, cx1 = math.floor((min(x0, x1) - margin) / self.cell_size), math.floor((max(x0, x1) + margin) / self.cell_size)
+            cy0, cy1 = math.floor((min(y0, y1) - margin) / self.cell_size), math.floor((max(y0, y1) + margin) / self.cell_size)
+            cells = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+            self._aisle_cells[(i, j)] = self._aisle_cells[(j, i)] = cells
+        return cells
+
+    def _conflict(self, aisle, other):
+        key = aisle + other
+        conflict = self._conflicting.get(key)
+        if conflict is None:
+            if set(aisle) == set(other):
+                conflict = True
+            elif set(aisle) & set(other):
+                # aisles sharing a node only meet at the node
+                conflict = False
+            else:
+                points = self._points
+                conflict = _segment_distance(points[aisle[0]], points[aisle[1]],
+                                             points[other[0]], points[other[1]]) < self.clearance
+            self._conflicting[key] = conflict
+        return conflict
+
+    def reserve_path(self, vehicle, from_node, to_node, start):
+        """
+        Reserve the aisles along the shortest path between two nodes, hop by hop.
+
+        Args:
+            vehicle: Identifier of the vehicle, kept with its windows.
+            from_node (int): Index of the start node in the route graph.
+            to_node (int): Index of the end node in the route graph.
+            start (float): Time at which the vehicle leaves `from_node`, the current simulation time.
+
+        Returns:
+            float: The time at which the vehicle reaches `to_node`.
+        """
+        next_hop = self.route_graph.next_hop
+        travel_times = self.route_graph.travel_times
+        t = start
+        i = from_node
+        while i != to_node:
+            j = int(next_hop[i, to_node])
+            duration = travel_times[i, j]
+            aisle = (i, j)
+            cells = self._cells_of(i, j)
+            windows = set()
+            for cell in cells:
+                cell_windows = self._cells.get(cell)
+                if cell_windows:
+                    # windows that have ended cannot conflict with any later request
+                    cell_windows[:] = [window for window in cell_windows if window[1] > start]
+                    windows.update(cell_windows)
+            entry = t
+            for window in sorted(windows, key=lambda window: window[0]):
+                if window[0] >= t + duration:
+                    break
+                if window[1] > t and self._conflict(aisle, window[2:4]):
+                    t = window[1]
+            if t > entry:
+                self.num_delayed_hops += 1
+                self.total_delay += t - entry
+            window = (t, t + duration, i, j, vehicle)
+            for cell in cells:
+                self._cells.setdefault(cell, []).append(window)
+            t += duration
+            i = j
+        return t
@@ -1,3 +1,5 @@
+from factorysimpy.utils.logger import logger
+
 def connect_chain(env, count, node_cls, edge_cls,
                   node_kwargs=None, edge_kwargs=None,
                   node_kwargs_list=None, edge_kwargs_list=None,
@@ -6,7 +8,8 @@ def connect_chain(env, count, node_cls, edge_cls,
     edges = []
 
     for i in range(count):
-        print(i)
+        if logger.debug_enabled:
+            logger.debug('chain', i)
         kwargs = node_kwargs_list[i] if node_kwargs_list else node_kwargs or {"processing_delay": 0.8,"blocking": True}
         node_name = f"{prefix}_{i+1}"
         if "id" in kwargs:
@@ -1,5 +1,7 @@
 from factorysimpy.edges.edge import Edge
 from factorysimpy.base.buffer_store import BufferStore 
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, RESERVE_PUT, RESERVE_GET, PUT, GET
 
 
 class Buffer(Edge):
@@ -39,11 +41,12 @@ class Buffer(Edge):
             total_time_spent_in_states                  : Dictionary with total time spent in each state.
     """
 
+    multi_unit_reservations = True
+
     def __init__(self, env, id,  capacity=1, delay=0,  mode="FIFO"):
           super().__init__( env, id, capacity)
           self.state = "IDLE_STATE"
           self.mode=mode
-          self.delay = delay
           self.capacity =  capacity
           self.stats = {
             "last_state_change_time": None,
@@ -127,7 +130,7 @@ class Buffer(Edge):
             return False
         # return True if the number of items in the buffer is less than the store capacity minus the number of reservations
         # reservations_put is the number of items that are already reserved to be put in the buffer
-        return (self.capacity-len(self.inbuiltstore.items)-len(self.inbuiltstore.ready_items)) >len(self.inbuiltstore.reservations_put)
+        return (self.capacity-len(self.inbuiltstore.items)-len(self.inbuiltstore.ready_items)) >self.inbuiltstore.reservations_put.units
     
     def can_get(self):
         """
@@ -143,20 +146,73 @@ class Buffer(Edge):
         #only return items that are older than the delay. Count such items
         #count = sum(1 for item in self.inbuiltstore.items if item.time_stamp_creation + self.delay <= self.env.now)
         # count should be greater than the number of reservations that are already there
-        return len(self.inbuiltstore.ready_items) > len(self.inbuiltstore.reservations_get)
+        return len(self.inbuiltstore.ready_items) > self.inbuiltstore.reservations_get.units
     
 
 
-    def reserve_put(self):
-       return self.inbuiltstore.reserve_put()
+    def reserve_put(self, n=1, select=None):
+       """
+       Reserve space for one item, or for `n` items at once.
+
+       Parameters
+       ----------
+       n : int, optional
+           Number of slots to reserve. The event succeeds when all `n` slots are free and
+           the reservation is used by one `put` of a list of `n` items. Defaults to 1.
+       select : ReservationSelect, optional
+           Select on whose behalf the request is made.
+       """
+       if tracer.enabled:
+           tracer.record(self, RESERVE_PUT)
+       return self.inbuiltstore.reserve_put(n=n, select=select)
     
-    def reserve_get(self):
-        return self.inbuiltstore.reserve_get()
+    def reserve_get(self, n=1, select=None):
+        """
+        Reserve one item, or `n` items at once.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of items to reserve. The event succeeds when `n` unreserved items are ready
+            and the reservation is used by one `get` returning a list of `n` items. Defaults to 1.
+        select : ReservationSelect, optional
+            Select on whose behalf the request is made.
+        """
+        if tracer.enabled:
+            tracer.record(self, RESERVE_GET)
+        return self.inbuiltstore.reserve_get(n=n, select=select)
     
     def put(self, event, item):
-       delay=self.get_delay(self.delay)
-       print(f"T={self.env.now:.2f}: {self.id} is putting item {item.id} with delay {delay} at time {self.env.now}, total item in buffer is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
+       """
+       Put an item into the buffer.
+
+       Parameters
+       ----------
+       event : simpy.Event
+           The event that was reserved for putting an item.
+       item : object or list
+           The item to put, or a list of `n` items if `n` slots were reserved. Every item
+           gets its own delay.
+       """
+       if event.quantity > 1:
+           entries = []
+           for one_item in item:
+               delay = self._next_delay()
+               if tracer.enabled:
+                   tracer.record(self, PUT, one_item)
+               entries.append((one_item, delay))
+           if logger.debug_enabled:
+               logger.debug(self, f"T={self.env.now:.2f}: {self.id} is putting {len(entries)} items at time {self.env.now}, total item in buffer is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
+           proceed = self.inbuiltstore.put(event, entries)
+           self._buffer_stats_collector()
+           return proceed
+
+       delay=self._next_delay()
+       if logger.debug_enabled:
+           logger.debug(self, f"T={self.env.now:.2f}: {self.id} is putting item {item.id} with delay {delay} at time {self.env.now}, total item in buffer is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
        
+       if tracer.enabled:
+           tracer.record(self, PUT, item)
        proceed=self.inbuiltstore.put(event, (item,delay))
        self._buffer_stats_collector()
        return proceed
@@ -173,9 +229,12 @@ class Buffer(Edge):
         Returns
         -------
         item : object
-            The item retrieved from the buffer.
+            The item retrieved from the buffer, or a list of `n` items if `n` items were reserved.
         """
         item = self.inbuiltstore.get(event)
+        if tracer.enabled:
+            for one_item in (item if event.quantity > 1 else [item]):
+                tracer.record(self, GET, one_item)
         self._buffer_stats_collector()
         return item
     
@@ -220,12 +279,14 @@ class Buffer(Edge):
       while True: 
         if self.inbuiltstore.ready_items or self.inbuiltstore.items: 
           self.update_state("RELEASING_STATE", self.env.now)
-          print(f"T={self.env.now:.2f}: {self.id } is releasing an item from its in store")
+          if logger.debug_enabled:
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } is releasing an item from its in store")
 
         else:
           
           self.update_state("EMPTY_STATE", self.env.now)
-          print(f"T={self.env.now:.2f}: {self.id } is waiting to get an item ")
+          if logger.debug_enabled:
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } is waiting to get an item ")
 
         
         
@@ -11,6 +11,9 @@ import numpy as np
 from factorysimpy.helper.item import Item
 from factorysimpy.edges.edge import Edge
 from factorysimpy.base.belt_store import BeltStore
+from factorysimpy.base.analytical_belt_store import AnalyticalBeltStore
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, RESERVE_PUT, RESERVE_GET, PUT, GET, STATE_CHANGE
 
 
 
@@ -27,11 +30,14 @@ class ConveyorBelt(Edge):
         capacity (int): Maximum capacity of the belt.
         state (str): state of the conveyor belt.
         length (float): Length of the item.
-        speed (float): Speed of the conveyor belt.
+        speed (float): Nominal speed of the conveyor belt. With the analytical engine the belt can run at another speed, see `set_speed`.
         accumulating (bool): Whether the belt supports accumulation (1 for yes, 0 for no).
+        engine (str): How the items are moved along the belt. It can be
+            - "process": every item is moved by its own process, which is interrupted when the belt stalls (BeltStore).
+            - "analytical": positions and exit times are computed from a belt clock, using a single timer for the whole belt (AnalyticalBeltStore).
         belt (BeltStore): The belt store object.
     """
-    def __init__(self, env, id, conveyor_length, speed,item_length,accumulating):
+    def __init__(self, env, id, conveyor_length, speed,item_length,accumulating, engine="process"):
         capacity = int(np.ceil(conveyor_length)/item_length)
         super().__init__(env, id, capacity)
        
@@ -43,7 +49,13 @@ class ConveyorBelt(Edge):
         self.speed=speed
         self.delay = int(self.conveyor_length/self.speed)*capacity
         #self.delay = (self.length*self.speed)/capacity
-        self.belt = BeltStore(env, capacity, self.speed, self.accumulating)
+        if engine == "process":
+            self.belt = BeltStore(env, capacity, self.speed, self.accumulating)
+        elif engine == "analytical":
+            self.belt = AnalyticalBeltStore(env, capacity, self.speed, self.accumulating)
+        else:
+            raise ValueError("Invalid engine. Choose either 'process' or 'analytical'.")
+        self.engine = engine
       
         
         
@@ -142,13 +154,47 @@ class ConveyorBelt(Edge):
         else:
             return False
     
-    def reserve_put(self):
-    
+    def current_speed(self):
+        """Return the speed at which the belt runs at the current simulation time."""
+        if self.engine == "analytical":
+            return self.belt.current_speed()
+        return self.speed
+
+    def set_speed(self, speed, ramp_time=0):
+        """
+        Change the speed of the belt at runtime, at once or linearly over `ramp_time`, for example for an
+        energy saving slowdown or when the speed is set by a controller.
+
+        The positions and exit times of the items are recomputed from the belt clock, only the timer of the
+        next exit is rescheduled. Requires the analytical engine.
+
+        Args:
+            speed (float): The new speed of the belt.
+            ramp_time (float, optional): Time taken to reach `speed` from the current speed. Defaults to 0.
+
+        Raises:
+            ValueError: If the belt does not use the analytical engine, or if `speed` or `ramp_time` is negative.
+        """
+        if self.engine != "analytical":
+            raise ValueError(f"{self.id} - the speed of a belt can only be changed with engine='analytical'.")
+        self.belt.set_speed(speed, ramp_time)
+
+    def _check_single_unit(self, n):
+       # items enter and leave the belt one after the other, so a belt cannot grant n units at once
+       if n != 1:
+           raise ValueError(f"{self.id} - A conveyor belt moves one item at a time, multi-unit reservations (n={n}) are not supported.")
+
+    def reserve_put(self, n=1, select=None):
+       self._check_single_unit(n)
        if self.accumulating==0 and self.noaccumulation_mode_on==True:
-         print(f"T={self.env.now:.2f}: {self.id }: attempting to reserve_put an item while non accumulating mode on and {self.state} and {self.belt.noaccumulation_mode_on}")
+         if logger.debug_enabled:
+             logger.debug(self, f"T={self.env.now:.2f}: {self.id }: attempting to reserve_put an item while non accumulating mode on and {self.state} and {self.belt.noaccumulation_mode_on}")
        else:
-        print(f"T={self.env.now} will reserve_put yield?!?!?!!? ")
-       return self.belt.reserve_put()
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now} will reserve_put yield?!?!?!!? ")
+       if tracer.enabled:
+           tracer.record(self, RESERVE_PUT)
+       return self.belt.reserve_put(select=select)
     
     def put(self, event, item):
         """
@@ -167,25 +213,33 @@ class ConveyorBelt(Edge):
             An event that will be triggered when the item is successfully put on the belt.
         """
         #delay=self.get_delay(self.delay)
-        print(f"T={self.env.now:.2f}: Conveyor:put: putting item {item.id} ")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: Conveyor:put: putting item {item.id} ")
         delay = self.length * self.capacity/self.speed
         item.conveyor_entry_time = self.env.now
         item_to_put = (item, delay)
-        print(f"T={self.env.now:.2f}: {self.id }:put: putting item {item_to_put[0].id} on belt with delay {item_to_put[1]} {self.state}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id }:put: putting item {item_to_put[0].id} on belt with delay {item_to_put[1]} {self.state}")
+        if tracer.enabled:
+            tracer.record(self, PUT, item)
         return_val = self.belt.put(event, item_to_put)
         self._conveyor_stats_collector()
         if len(self.belt.items)==1 and self.state=="IDLE_STATE":
             self.item_arrival_event.succeed()
-            print(f"T={self.env.now:.2f}: {self.id }:put: item arrival event succeeded")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id }:put: item arrival event succeeded")
         else: 
             event= self.env.event()
             self.put_events_available.succeed()
             if self.accumulating==0:
-                print(f"T={self.env.now:.2f}: {self.id }: attempting to put an item while non accumulating mode on and {self.state} and {self.belt.noaccumulation_mode_on}")
-            print(f"T={self.env.now:.2f}: {self.id }:put: item arrival event else succeeded")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id }: attempting to put an item while non accumulating mode on and {self.state} and {self.belt.noaccumulation_mode_on}")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id }:put: item arrival event else succeeded")
         
         if self.state=="STALLED_ACCUMULATING_STATE" and self.accumulating==1 or self.state=="STALLED_NONACCUMULATING_STATE" and self.accumulating==0:
-            print(f"T={self.env.now:.2f}: {self.id }:put: handling new item during interruption {item_to_put[0].id} on belt")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id }:put: handling new item during interruption {item_to_put[0].id} on belt")
             self.belt.handle_new_item_during_interruption(item_to_put)
             
             
@@ -196,8 +250,11 @@ class ConveyorBelt(Edge):
     
         
 
-    def reserve_get(self):
-       return self.belt.reserve_get()
+    def reserve_get(self, n=1, select=None):
+       self._check_single_unit(n)
+       if tracer.enabled:
+           tracer.record(self, RESERVE_GET)
+       return self.belt.reserve_get(select=select)
     def get(self, event):
         """
         Get an item from the belt.
@@ -212,13 +269,17 @@ class ConveyorBelt(Edge):
         Item
             The item retrieved from the belt.
         """
-        print(f"T={self.env.now:.2f}: {self.id }:get: getting item from belt")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id }:get: getting item from belt")
         item = self.belt.get(event)
+        if tracer.enabled:
+            tracer.record(self, GET, item)
         item.conveyor_exit_time = self.env.now
         self._conveyor_stats_collector()
         event= self.env.event()
         self.get_events_available.succeed()
-        print(f"{self.env.now} {item.id} time in conveyor {item.conveyor_entry_time} and {item.conveyor_exit_time} - time spend in conveyor {item.conveyor_exit_time - item.conveyor_entry_time if item.conveyor_exit_time and item.conveyor_entry_time else 'N/A'}")
+        if logger.debug_enabled:
+            logger.debug(self, f"{self.env.now} {item.id} time in conveyor {item.conveyor_entry_time} and {item.conveyor_exit_time} - time spend in conveyor {item.conveyor_exit_time - item.conveyor_entry_time if item.conveyor_exit_time and item.conveyor_entry_time else 'N/A'}")
         return item
 
    
@@ -243,8 +304,9 @@ class ConveyorBelt(Edge):
        event_list=[self.belt.ready_item_event, self.get_events_available, self.put_events_available]
        
        while True:
-          print(f"T={self.env.now:.2f}: {self.id } is in {self.state}")
-          print(f"T={self.env.now:.2f}: {self.id } belt pattern: {self.belt._get_belt_pattern()[1]}, {[i[0].id for i in reversed(self.belt.items)]}, ready items: {[i.id for i in self.belt.ready_items]} ")
+          if logger.debug_enabled:
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } is in {self.state}")
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } belt pattern: {self.belt._get_belt_pattern()[1]}, {[i[0].id for i in reversed(self.belt.items)]}, ready items: {[i.id for i in self.belt.ready_items]} ")
           
 
 
@@ -255,7 +317,8 @@ class ConveyorBelt(Edge):
              yield self.item_arrival_event
              if self.item_arrival_event.triggered:
                  self.item_arrival_event = self.env.event()
-                 print(f"T={self.env.now:.2f}: {self.id }item_arrival  event triggered")
+                 if logger.debug_enabled:
+                     logger.debug(self, f"T={self.env.now:.2f}: {self.id }item_arrival  event triggered")
 
           elif not self.is_empty() and not self.is_stalled():
             #  print(len(self.belt.ready_items), len(self.belt.reservations_get))
@@ -279,7 +342,8 @@ class ConveyorBelt(Edge):
                
         
           else:
-            print(self.belt.items, self.belt.ready_items, self.is_stalled())
+            if logger.debug_enabled:
+                logger.debug(self, self.belt.items, self.belt.ready_items, self.is_stalled())
             raise ValueError(f"Conveyor {self.id} in unknown state {self.state}")
           
           
@@ -287,7 +351,8 @@ class ConveyorBelt(Edge):
           yield triggered_events_list
           #print(f"T={self.env.now:.2f}: {self.id } event triggered")
           if self.belt.ready_item_event.triggered:
-              print(f"T={self.env.now:.2f}: {self.id } ready item event triggered")
+              if logger.debug_enabled:
+                  logger.debug(self, f"T={self.env.now:.2f}: {self.id } ready item event triggered")
               if self.is_stalled():
                 if self.accumulating:
                     self.set_conveyor_state("STALLED_ACCUMULATING_STATE")
@@ -304,12 +369,14 @@ class ConveyorBelt(Edge):
           #if self.chosen_triggered_event is not None:
           if self.chosen_triggered_event:
              if self.chosen_triggered_event is self.get_events_available:
-                print(f"T={self.env.now:.2f}: {self.id } get event triggered")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id } get event triggered")
                 self.get_events_available = self.env.event()
                 event_list=[self.belt.ready_item_event, self.get_events_available, self.put_events_available]
              elif self.chosen_triggered_event is self.put_events_available:
                 self.put_events_available = self.env.event()
-                print(f"T={self.env.now:.2f}: {self.id } put event triggered")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id } put event triggered")
                 event_list=[self.belt.ready_item_event, self.get_events_available, self.put_events_available]
              else:
                   self.belt.ready_item_event = self.env.event()
@@ -325,9 +392,12 @@ class ConveyorBelt(Edge):
             new_state (str): The new conveyor state
         """
         old_state = self.state
+        if tracer.enabled and new_state != old_state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         
-        print(f"T={self.env.now:.2f}: {self.id} state changed from {old_state} to {new_state}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id} state changed from {old_state} to {new_state}")
         
         # Control belt store based on conveyor state changes
         if old_state in ["MOVING_STATE", "IDLE_STATE"] and new_state in ["STALLED_ACCUMULATING_STATE", "STALLED_NONACCUMULATING_STATE"]:
@@ -344,7 +414,8 @@ class ConveyorBelt(Edge):
             self.belt.resume_all_move_processes()
             self.belt.interrupt_and_resume_all_delayed_interrupt_processes()
         else:
-            print("state changes from",old_state,"to",  new_state)
+            if logger.debug_enabled:
+                logger.debug(self, "state changes from",old_state,"to",  new_state)
 
 
 
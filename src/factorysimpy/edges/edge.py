@@ -3,6 +3,9 @@
 
 import simpy
 from factorysimpy.nodes.node import Node
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.utils import compile_delay
+from factorysimpy.utils.trace import tracer, STATE_CHANGE
 
 
 class Edge:
@@ -26,9 +29,10 @@ class Edge:
 
     
     """
-    
 
- 
+    # True if reserve_put/reserve_get accept n > 1 and put/get move a list of n items
+    multi_unit_reservations = False
+
     def __init__(self, env, id, capacity):
         self.env = env
         self.id = id
@@ -51,26 +55,6 @@ class Edge:
         
 
 
-    def update_state(self, new_state: str, current_time: float):
-        """
-        Update node state and track the time spent in the previous state.
-        
-        Args:
-            new_state (str): The new state to transition to. Must be one of "SETUP_STATE", "GENERATING_STATE", "BLOCKED_STATE".
-            current_time (float): The current simulation time.
-
-        """
-        
-        if self.state is not None and self.stats["last_state_change_time"] is not None:
-            elapsed = current_time - self.stats["last_state_change_time"]
-
-            self.stats["total_time_spent_in_states"][self.state] = (
-                self.stats["total_time_spent_in_states"].get(self.state, 0.0) + elapsed
-            )
-        self.state = new_state
-        self.stats["last_state_change_time"] = current_time
-
-   
     def get_delay(self,delay):
         """
         Returns value based on the type of parameter `delay` provided.
@@ -98,6 +82,26 @@ class Edge:
         assert val >= 0, "Delay must be non-negative"
         return val
 
+    @property
+    def delay(self):
+        """
+        The delay of the items on the edge. Setting it compiles it again with `reset`, so a delay set after
+        the edge is created is used.
+        """
+        return self._delay
+
+    @delay.setter
+    def delay(self, delay):
+        self._delay = delay
+        self.reset()
+
+    def reset(self):
+        """
+        Compiles `delay` into `_next_delay`, a callable returning the delay of the next item, so that the type
+        of `delay` is not checked for every item. Called whenever `delay` is set.
+        """
+        self._next_delay = compile_delay(getattr(self, "delay", None), self.id)
+
 
     def update_state(self, new_state: str, current_time: float):
         """
@@ -115,6 +119,8 @@ class Edge:
             self.stats["total_time_spent_in_states"][self.state] = (
                 self.stats["total_time_spent_in_states"].get(self.state, 0.0) + elapsed
             )    
+        if tracer.enabled and new_state != self.state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         self.stats["last_state_change_time"] = current_time
 
@@ -157,7 +163,8 @@ class Edge:
             dest.in_edges = []
         if self not in dest.in_edges:
             dest.in_edges.append(self)
-        print(f"T={self.env.now:.2f}: Connected edge '{self.id}' from '{src.id}' to '{dest.id}'  ")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: Connected edge '{self.id}' from '{src.id}' to '{dest.id}'  ")
 
         
     
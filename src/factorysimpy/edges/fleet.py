@@ -1,5 +1,9 @@
+import numpy as np
+
 from factorysimpy.edges.edge import Edge
 from factorysimpy.base.fleet_store import FleetStore 
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, RESERVE_PUT, RESERVE_GET, PUT, GET
 
 
 
@@ -10,7 +14,16 @@ class Fleet(Edge):
 
     Attributes:
         state (str): The current state of the fleet.
-        capacity (int): The capacity of the fleet's internal storage.
+        capacity (int): The number of items a vehicle of the fleet moves at once.
+        num_vehicles (int): The number of vehicles in the fleet. If it is not given, the trips are not bound to
+                            vehicles and several batches can be in transit at once.
+        route_graph (RouteGraph): Layout travelled by the vehicles. When given, trip times are shortest path
+                                  travel times from the vehicle to `pickup_station` and from there to
+                                  `dropoff_station`, and `transit_delay` is not used.
+        pickup_station, dropoff_station, home_station: Nodes of `route_graph` where the items are picked up,
+                                  dropped off and where the vehicles start (defaults to `pickup_station`).
+        traffic (TrafficGrid): Traffic layer on `route_graph`, shared by the fleets whose vehicles can meet in
+                               the aisles.
         delay (int, float): Delay after which fleet activates to move items incase the target capacity is not reached. It Can be
         
             - int or float: Used as a constant delay.
@@ -20,7 +33,11 @@ class Fleet(Edge):
 
      Behavior:
             The Fleet is a type of edge represents components that moves multiple items simulataneaously between nodes.
-            User can specify a parameter `capacity` to specify how many items can be moved at once.
+            User can specify a parameter `capacity` to specify how many items can be moved at once by a vehicle,
+            and `num_vehicles` to specify how many vehicles serve the edge. The fleet then holds up to
+            `capacity * num_vehicles` items and a vehicle is busy until it delivers its batch. Without
+            `num_vehicles` the fleet holds up to `capacity` items and the waiting items leave together
+            whenever the fleet is dispatched.
             Incoming edges can use reserve_get and reserve_put calls on the store in the fleet to reserve an item or space and after yielding
             the requests, an item can be put and obtained by using put and get methods.
 
@@ -34,31 +51,49 @@ class Fleet(Edge):
             
             last_state_change_time                      : Time when the state was last changed.
             time_averaged_num_of_items_in_fleet        : Time-averaged number of items available in the fleet.
+            num_trips                                   : Total number of trips started by the fleet.
+            num_items_moved                             : Total number of items carried by the fleet.
+            vehicle_num_trips                           : Number of trips started by each vehicle, the per-vehicle
+                                                          metrics are empty lists without `num_vehicles`.
+            vehicle_num_items_moved                     : Number of items carried by each vehicle.
+            vehicle_busy_time                           : Time spent on trips by each vehicle.
+            vehicle_traffic_delay                       : Time each vehicle has waited for other vehicles in the aisles.
             total_time_spent_in_states                  : Dictionary with total time spent in each state.
     """
 
-    def __init__(self, env, id,  capacity=1, delay=1, transit_delay=0):
+    multi_unit_reservations = True
+
+    def __init__(self, env, id,  capacity=1, delay=1, transit_delay=0, num_vehicles=None, route_graph=None,
+                 pickup_station=None, dropoff_station=None, home_station=None, traffic=None):
           super().__init__( env, id, capacity)
           self.state = "IDLE_STATE"
           
-          self.delay = delay
           self.capacity =  capacity
           self.transit_delay = transit_delay
+          self.route_graph = route_graph
+          self.traffic = traffic
+          
+          
+          # Initialize the fleet store
+
+          self.inbuiltstore = FleetStore(env, capacity=self.capacity,  delay=delay, transit_delay=self.transit_delay, num_vehicles=num_vehicles,
+                                        route_graph=route_graph, pickup_station=pickup_station,
+                                        dropoff_station=dropoff_station, home_station=home_station,
+                                        traffic=traffic)
+          self.num_vehicles = self.inbuiltstore.num_vehicles
+          num_tracked = self.num_vehicles or 0
           self.stats = {
             "last_state_change_time": None,
             "time_averaged_num_of_items_in_fleet": 0,
+            "num_trips": 0,
+            "num_items_moved": 0,
+            "vehicle_num_trips": [0] * num_tracked,
+            "vehicle_num_items_moved": [0] * num_tracked,
+            "vehicle_busy_time": [0.0] * num_tracked,
+            "vehicle_traffic_delay": [0.0] * num_tracked,
             "total_time_spent_in_states":{"IDLE_STATE": 0.0, "RELEASING_STATE": 0.0, "BLOCKED_STATE": 0.0}
         }
           
-         
-          
-       
-          
-          
-          # Initialize the fleet store
-
-          self.inbuiltstore = FleetStore(env, capacity=self.capacity,  delay=self.delay, transit_delay=self.transit_delay)
-          
     
           
          
@@ -86,6 +121,15 @@ class Fleet(Edge):
 
 
         self.stats["time_averaged_num_of_items_in_fleet"] = self.inbuiltstore.time_averaged_num_of_items_in_store
+        store = self.inbuiltstore
+        # trips still running count up to now
+        busy_time = store.vehicle_busy_time + np.where(store.vehicle_in_transit, self.env.now - store.vehicle_departure_time, 0.0)
+        self.stats["vehicle_num_trips"] = store.vehicle_num_trips.tolist()
+        self.stats["vehicle_num_items_moved"] = store.vehicle_num_items_moved.tolist()
+        self.stats["vehicle_busy_time"] = busy_time.tolist()
+        self.stats["vehicle_traffic_delay"] = store.vehicle_traffic_delay.tolist()
+        self.stats["num_trips"] = store.num_trips
+        self.stats["num_items_moved"] = store.num_items_moved
 
     def update_final_fleet_avg_content(self, simulation_end_time):
         now = simulation_end_time
@@ -110,11 +154,11 @@ class Fleet(Edge):
             True if the fleet can accept an item, False otherwise.
         """
         # Check if the fleet has space for new items
-        if  len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)== self.capacity:
+        if  len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)== self.inbuiltstore.capacity:
             return False
         # return True if the number of items in the fleet is less than the store capacity minus the number of reservations
         # reservations_put is the number of items that are already reserved to be put in the fleet
-        return (self.capacity-len(self.inbuiltstore.items)-len(self.inbuiltstore.ready_items)) >len(self.inbuiltstore.reservations_put)
+        return (self.inbuiltstore.capacity-len(self.inbuiltstore.items)-len(self.inbuiltstore.ready_items)) >self.inbuiltstore.reservations_put.units
     
     def can_get(self):
         """
@@ -130,20 +174,65 @@ class Fleet(Edge):
         #only return items that are older than the delay. Count such items
         #count = sum(1 for item in self.inbuiltstore.items if item.time_stamp_creation + self.delay <= self.env.now)
         # count should be greater than the number of reservations that are already there
-        return len(self.inbuiltstore.ready_items) > len(self.inbuiltstore.reservations_get)
+        return len(self.inbuiltstore.ready_items) > self.inbuiltstore.reservations_get.units
     
 
 
-    def reserve_put(self):
-       return self.inbuiltstore.reserve_put()
+    def reserve_put(self, n=1, select=None):
+       """
+       Reserve space for one item, or for `n` items at once.
+
+       Parameters
+       ----------
+       n : int, optional
+           Number of slots to reserve. The event succeeds when all `n` slots are free and
+           the reservation is used by one `put` of a list of `n` items. Defaults to 1.
+       select : ReservationSelect, optional
+           Select on whose behalf the request is made.
+       """
+       if tracer.enabled:
+           tracer.record(self, RESERVE_PUT)
+       return self.inbuiltstore.reserve_put(select=select, n=n)
     
-    def reserve_get(self):
-        return self.inbuiltstore.reserve_get()
+    def reserve_get(self, n=1, select=None):
+        """
+        Reserve one item, or `n` items at once.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of items to reserve. The event succeeds when `n` unreserved items are ready
+            and the reservation is used by one `get` returning a list of `n` items. Defaults to 1.
+        select : ReservationSelect, optional
+            Select on whose behalf the request is made.
+        """
+        if tracer.enabled:
+            tracer.record(self, RESERVE_GET)
+        return self.inbuiltstore.reserve_get(select=select, n=n)
     
     def put(self, event, item):
-       delay=self.get_delay(self.delay)
-       print(f"T={self.env.now:.2f}: {self.id} is putting item {item.id} with delay {delay} at time {self.env.now}, total item in fleet is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
+       """
+       Put an item, or a list of `n` items if `n` slots were reserved, into the fleet.
+       """
+       if event.quantity > 1:
+           items = list(item)
+           if logger.debug_enabled:
+               logger.debug(self, f"T={self.env.now:.2f}: {self.id} is putting {len(items)} items at time {self.env.now}, total item in fleet is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
+           if tracer.enabled:
+               for one_item in items:
+                   tracer.record(self, PUT, one_item)
+           proceed = self.inbuiltstore.put(event, items)
+           self._fleet_stats_collector()
+           for one_item in items:
+               one_item.fleet_entry_time = self.env.now
+           return proceed
+
+       delay=self._next_delay()
+       if logger.debug_enabled:
+           logger.debug(self, f"T={self.env.now:.2f}: {self.id} is putting item {item.id} with delay {delay} at time {self.env.now}, total item in fleet is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
        
+       if tracer.enabled:
+           tracer.record(self, PUT, item)
        proceed=self.inbuiltstore.put(event,item)
        self._fleet_stats_collector()
        item.fleet_entry_time = self.env.now
@@ -165,9 +254,14 @@ class Fleet(Edge):
         """
         #print(f"T={self.env.now:.2f}: {self.id} is getting an item at time {self.env.now}, total item in fleet is {len(self.inbuiltstore.items)+len(self.inbuiltstore.ready_items)}")
         item = self.inbuiltstore.get(event)
+        items = item if event.quantity > 1 else [item]
+        if tracer.enabled:
+            for one_item in items:
+                tracer.record(self, GET, one_item)
         self._fleet_stats_collector()
         #print(f"T={self.env.now:.2f}, got an item!!!!")
-        item.fleet_exit_time = self.env.now
+        for one_item in items:
+            one_item.fleet_exit_time = self.env.now
         return item
     
     def reserve_get_cancel(self,event):
@@ -211,12 +305,14 @@ class Fleet(Edge):
       while True: 
         if self.inbuiltstore.ready_items or self.inbuiltstore.items: 
           self.update_state("RELEASING_STATE", self.env.now)
-          print(f"T={self.env.now:.2f}: {self.id } is releasing an item from its in store")
+          if logger.debug_enabled:
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } is releasing an item from its in store")
 
         else:
           
           self.update_state("EMPTY_STATE", self.env.now)
-          print(f"T={self.env.now:.2f}: {self.id } is waiting to get an item ")
+          if logger.debug_enabled:
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } is waiting to get an item ")
 
         
         
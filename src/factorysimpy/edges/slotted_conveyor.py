@@ -10,8 +10,11 @@ import random
 from factorysimpy.helper.item import Item
 from factorysimpy.edges.edge import Edge
 from factorysimpy.base.slotted_belt_store import BeltStore
+from factorysimpy.base.ring_belt_store import RingBeltStore
 from factorysimpy.base.reservable_priority_req_filter_store import ReservablePriorityReqFilterStore
 from factorysimpy.base.reservable_priority_req_store import ReservablePriorityReqStore
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, RESERVE_PUT, RESERVE_GET, PUT, GET, STATE_CHANGE
 
 
 
@@ -41,7 +44,8 @@ class BeltStore(BeltStore):
     def _do_put(self, event, item):
         """Override to handle the put operation with conveyor-specific logging."""
         returnval = super()._do_put(event, item)
-        print(f"T={self.env.now:.2f}: BeltStore:_do_put: putting item on belt {item[0].id} and belt items are {[(i[0].id) for i in self.items]}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: BeltStore:_do_put: putting item on belt {item[0].id} and belt items are {[(i[0].id) for i in self.items]}")
         return returnval
 class ConveyorBelt(Edge):
     """
@@ -53,9 +57,12 @@ class ConveyorBelt(Edge):
         state (str): state of the conveyor belt.
         delay (float): Time interval between two successive movements on the belt.
         accumulation (bool): Whether the belt supports accumulation (1 for yes, 0 for no).
+        engine (str): How the items are moved along the belt. It can be
+            - "process": every item is moved by its own process, which is interrupted when the belt stalls (BeltStore).
+            - "ring": the slots are kept in a circular array that is advanced by a single timer for the whole belt (RingBeltStore).
         
     """
-    def __init__(self, env, id, capacity, delay,accumulating):
+    def __init__(self, env, id, capacity, delay,accumulating, engine="process"):
         super().__init__(env, id, capacity )
        
         self.state = "IDLE_STATE"
@@ -65,7 +72,13 @@ class ConveyorBelt(Edge):
         self.delay=delay
         #self.delay = int(self.length/self.speed)*capacity
        
-        self.belt = BeltStore(env, capacity, self.delay)
+        if engine == "process":
+            self.belt = BeltStore(env, capacity, self.delay)
+        elif engine == "ring":
+            self.belt = RingBeltStore(env, capacity, self.delay, self.accumulating)
+        else:
+            raise ValueError("Invalid engine. Choose either 'process' or 'ring'.")
+        self.engine = engine
       
         
         
@@ -157,8 +170,16 @@ class ConveyorBelt(Edge):
         else:
             return False
     
-    def reserve_put(self):
-       return self.belt.reserve_put()
+    def _check_single_unit(self, n):
+       # items enter and leave the belt one slot at a time, so a belt cannot grant n units at once
+       if n != 1:
+           raise ValueError(f"{self.id} - A conveyor belt moves one item at a time, multi-unit reservations (n={n}) are not supported.")
+
+    def reserve_put(self, n=1, select=None):
+       self._check_single_unit(n)
+       if tracer.enabled:
+           tracer.record(self, RESERVE_PUT)
+       return self.belt.reserve_put(select=select)
     
     def put(self, event, item):
         """
@@ -177,11 +198,15 @@ class ConveyorBelt(Edge):
             An event that will be triggered when the item is successfully put on the belt.
         """
         #delay=self.get_delay(self.delay)
-        print(f"T={self.env.now:.2f}: Conveyor:put: putting item {item.id} ")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: Conveyor:put: putting item {item.id} ")
         delay = self.capacity * self.delay
         item.conveyor_entry_time = self.env.now
         item_to_put = (item, delay)
-        print(f"T={self.env.now:.2f}: {self.id }:put: putting item {item_to_put[0].id} on belt with delay {item_to_put[1]}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id }:put: putting item {item_to_put[0].id} on belt with delay {item_to_put[1]}")
+        if tracer.enabled:
+            tracer.record(self, PUT, item)
         return_val = self.belt.put(event, item_to_put)
         self._conveyor_stats_collector()
         # if len(self.belt.items)==1:
@@ -194,8 +219,11 @@ class ConveyorBelt(Edge):
             
         return return_val
 
-    def reserve_get(self):
-       return self.belt.reserve_get()
+    def reserve_get(self, n=1, select=None):
+       self._check_single_unit(n)
+       if tracer.enabled:
+           tracer.record(self, RESERVE_GET)
+       return self.belt.reserve_get(select=select)
     def get(self, event):
         """
         Get an item from the belt.
@@ -210,8 +238,11 @@ class ConveyorBelt(Edge):
         Item
             The item retrieved from the belt.
         """
-        print(f"T={self.env.now:.2f}: {self.id }:get: getting item from belt")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id }:get: getting item from belt")
         item = self.belt.get(event)
+        if tracer.enabled:
+            tracer.record(self, GET, item)
         item.conveyor_exit_time = self.env.now
         self._conveyor_stats_collector()
         # event= self.env.event()
@@ -238,7 +269,8 @@ class ConveyorBelt(Edge):
        #event_list=[self.belt.ready_item_event, self.get_events_available, self.put_events_available]
        
        while True:
-          print(f"T={self.env.now:.2f}: {self.id } is in {self.state}")
+          if logger.debug_enabled:
+              logger.debug(self, f"T={self.env.now:.2f}: {self.id } is in {self.state}")
           
           
           
@@ -247,7 +279,8 @@ class ConveyorBelt(Edge):
              self.set_conveyor_state("IDLE_STATE")
              yield self.item_arrival_event
              self.item_arrival_event = self.env.event()
-             print(f"T={self.env.now:.2f}: {self.id }item_arrival  event triggered")
+             if logger.debug_enabled:
+                 logger.debug(self, f"T={self.env.now:.2f}: {self.id }item_arrival  event triggered")
              
              
           elif not self.is_empty() and not self.is_stalled():
@@ -267,7 +300,8 @@ class ConveyorBelt(Edge):
                
         
           else:
-            print(self.belt.items, self.belt.ready_items, self.is_stalled())
+            if logger.debug_enabled:
+                logger.debug(self, self.belt.items, self.belt.ready_items, self.is_stalled())
             raise ValueError(f"Conveyor {self.id} in unknown state {self.state}")
           
           yield self.env.timeout(self.delay)
@@ -280,9 +314,12 @@ class ConveyorBelt(Edge):
             new_state (str): The new conveyor state
         """
         old_state = self.state
+        if tracer.enabled and new_state != old_state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         
-        print(f"T={self.env.now:.2f}: {self.id} state changed from {old_state} to {new_state}")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id} state changed from {old_state} to {new_state}")
         
         # Control belt store based on conveyor state changes
         if old_state in ["MOVING_STATE", "IDLE_STATE"] and new_state in ["STALLED_ACCUMULATING_STATE", "STALLED_NONACCUMULATING_STATE"]:
@@ -1,7 +1,10 @@
 # Combiner m input and 1 output without using cancel
 import simpy
 from factorysimpy.nodes.node import Node
-from factorysimpy.utils.utils import get_edge_selector
+from factorysimpy.utils.utils import get_edge_selector, compile_delay, compile_edge_selector
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, STATE_CHANGE
 
 
 
@@ -36,6 +39,9 @@ class Combiner(Node):
                     - "ROUND_ROBIN": Selects out edges in a round-robin manner.
                     - "FIRST_AVAILABLE": Selects the first out edge that can accept an item.
                 - callable: A function that returns an edge index.
+
+            bulk_reservations (bool): If True, the items needed from an in edge that supports multi-unit reservations (Buffer, Fleet) and
+                                      can hold the target quantity are reserved with a single `reserve_get(n)`. Default False.
             
 
         Behavior:
@@ -45,6 +51,10 @@ class Combiner(Node):
             `BLOCKED_STATE`. The combiner has a blocking behavior if `blocking`=`True` and gets blocked when all its worker threads have processed items and the out edge is full and 
             cannot accept the item that is being pushed by the combiner and waits until the out edge can accept the item. If `blocking`=`False`, the combiner will 
             discard the item if the out edge is full and cannot accept the item that is being pushed by the combiner.
+            By default the combiner reserves the items of each in edge one by one and takes every item as soon as it is available.
+            If `bulk_reservations`=`True`, all the items needed from an in edge that supports multi-unit reservations and has a capacity
+            of at least the target quantity are reserved with a single `reserve_get(n)`. They stay in the edge until all of them are
+            available and are then taken together, so the upstream edge holds them longer and the results differ from the default.
 
 
         Raises:
@@ -59,7 +69,7 @@ class Combiner(Node):
                 
     """
 
-    def __init__(self, env, id, in_edges=None, out_edges=None,node_setup_time=0,target_quantity_of_each_item=[1],processing_delay=0,blocking=True,out_edge_selection="FIRST_AVAILABLE"):
+    def __init__(self, env, id, in_edges=None, out_edges=None,node_setup_time=0,target_quantity_of_each_item=[1],processing_delay=0,blocking=True,out_edge_selection="FIRST_AVAILABLE",bulk_reservations=False):
         super().__init__(env, id,in_edges, out_edges, node_setup_time)
 
         self.state = "SETUP_STATE"  # Initial state of the combiner
@@ -67,6 +77,7 @@ class Combiner(Node):
         
         self.out_edge_selection = out_edge_selection
         self.blocking = blocking
+        self.bulk_reservations = bulk_reservations
         self.per_thread_total_time_in_blocked_state = 0.0
         self.per_thread_total_time_in_processing_state = 0.0
         self.target_quantity_of_each_item= target_quantity_of_each_item
@@ -138,6 +149,10 @@ class Combiner(Node):
            
             if self.out_edge_selection is None:
                 raise ValueError("out_edge_selection should not be None.")
+            # compiling the parameters once into callables, so that their types are not checked for every item
+            self._next_processing_delay = compile_delay(self.processing_delay, self.id)
+            if self.out_edge_selection != "FIRST_AVAILABLE":
+                self._select_out_edge = compile_edge_selector(self.out_edge_selection, self, "OUT")
         
 
     
@@ -160,6 +175,8 @@ class Combiner(Node):
             self.stats["total_time_spent_in_states"][self.state] = (
                 self.stats["total_time_spent_in_states"].get(self.state, 0.0) + elapsed
             )
+        if tracer.enabled and new_state != self.state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         self.stats["last_state_change_time"] = current_time
 
@@ -222,100 +239,42 @@ class Combiner(Node):
         else:
             raise ValueError(f"Edge already exists in Combiner '{self.id}' out_edges.")
         
-    def _get_out_edge_index(self):
-        
-         
-        # if it is a constant integer, use the value as is
-        if isinstance(self.out_edge_selection, int):
-            val = self.out_edge_selection
-        # if it is a generator, get the next value from the generator
-        elif hasattr(self.out_edge_selection, '__next__'):
-            # It's a generator
-            val = next(self.out_edge_selection)     
-        # if it is a function return the value returned by the function     
-        elif callable(self.out_edge_selection):
-            # It's a function (pass self and env if needed)
-            #return self.out_edge_selection(self, self.env)
-            val = self.out_edge_selection()       
-        else:
-            raise ValueError("out_edge_selection must be a generator or a callable.")   
-        # Check if the value is within the valid range of out_edges
-        #print(f"OUT: {val} {len(self.out_edges)}")
-        assert 0<= val < len(self.out_edges), f"{self.id} - Invalid edge index. {val} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for out_edges." 
-        self.stats["out_edge_selection"].append(val)
-        return val   
- 
-
-    
 
     def _push_item(self, item_to_push, out_edge):
         """
         It picks a processed item from the store and pushes it to the specified out_edge.
-        The out_edge can be a ConveyorBelt or Buffer.
         Args:
             item_to_push (BaseFlowItem Object): Item to be pushed.
-            out_edge (Edge Object): The edge to which the item will be pushed.
+            out_edge (EdgeOps): Edge protocol of the edge to which the item will be pushed.
 
 
         """
-       
-        if out_edge.__class__.__name__ == "ConveyorBelt":                 
-                put_token = out_edge.reserve_put()
-                pe = yield put_token
-                item_to_push.update_node_event(self.id, self.env, "exit")
-                
-                y=out_edge.put(pe, item_to_push)
-                if y:
-                    print(f"T={self.env.now:.2f}: {self.id} puts {item_to_push.id} item into {out_edge.id}  ")
-        elif out_edge.__class__.__name__ == "Buffer":
-                outstore = out_edge
-                put_token = outstore.reserve_put()
-                yield put_token
-                item_to_push.update_node_event(self.id, self.env, "exit")
-                y=outstore.put(put_token, item_to_push)
-                if y:
-                    print(f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id}")
-        else:
-                raise ValueError(f"Unsupported edge type: {out_edge.__class__.__name__}")
+        put_token = out_edge.reserve_put()
+        yield put_token
+        item_to_push.update_node_event(self.id, self.env, "exit")
+        y=out_edge.put(put_token, item_to_push)
+        if y:
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id}")
         
     def _pull_item(self, in_edge):
         """
         It pulls an item from the specified in_edge and assigns it to the worker for processing.
         Args:
            
-            in_edge (Edge Object): The edge from which the item will be pulled.
+            in_edge (EdgeOps): Edge protocol of the edge from which the item will be pulled.
 
         """
-
-        if in_edge.__class__.__name__ == "ConveyorBelt":
-               
-                get_token = in_edge.reserve_get()
-                
-                gtoken = yield get_token
-                
-                pulled_item = yield in_edge.get(gtoken)
-                pulled_item.update_node_event(self.id, self.env, "entry")
-                              
-                if pulled_item is not None:
-                    print(f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
-                    self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
-                    
-                else:
-                    raise ValueError(f"{self.id} - No item pulled from in_edge {in_edge.id}!")
-                
-        elif in_edge.__class__.__name__ == "Buffer":
-                outstore = in_edge
-                get_token = outstore.reserve_get()
-                yield get_token
-                pulled_item =outstore.get(get_token)
-                pulled_item.update_node_event(self.id, self.env, "entry")
-                if pulled_item is not None:
-                    print(f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
-                    self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
-                else:
-                    raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge.id}!")
+        get_token = in_edge.reserve_get()
+        yield get_token
+        pulled_item =in_edge.get(get_token)
+        if pulled_item is not None:
+            pulled_item.update_node_event(self.id, self.env, "entry")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
+            self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
         else:
-                raise ValueError(f"Unsupported edge type: {in_edge.__class__.__name__}")
+            raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge.id}!")
               
             
     
@@ -380,36 +339,12 @@ class Combiner(Node):
 
             
     
-    def _count_worker_state(self):
-        """
-        Counts and returns the number of threads in "PROCESSING_STATE" and "BLOCKED_STATE"
-        using self.worker_thread_list.
-    
-        Returns:
-            num_threads_PROCESSING (int): Number of threads in "PROCESSING_STATE"
-            num_threads_BLOCKED (int): Number of threads in "BLOCKED_STATE"
-        """
-        if not self.worker_thread_list:
-            num_threads_PROCESSING = 0
-            num_threads_BLOCKED = 0
-        else:
-            num_threads_PROCESSING = sum(
-                proc.thread_state == "PROCESSING_STATE" for proc in self.worker_thread_list
-            )
-            num_threads_BLOCKED = sum(
-                proc.thread_state == "BLOCKED_STATE" for proc in self.worker_thread_list
-            )
-    
-        assert 0 <= num_threads_BLOCKED <= self.work_capacity \
-            and 0 <= num_threads_PROCESSING <= self.work_capacity \
-            and 0 <= num_threads_BLOCKED + num_threads_PROCESSING <= self.work_capacity, \
-            f"T={self.env.now:.2f} {self.id} has more threads than work_capacity is created. num_threads_PROCESSING={num_threads_PROCESSING}, num_threads_BLOCKED={num_threads_BLOCKED}, work_capacity={self.work_capacity}"
-        return num_threads_PROCESSING, num_threads_BLOCKED
     
     # --- DEBUG TRACE ----------------------------------------------------------
     def _dbg(self, msg):
         # tiny helper so we can switch it off easily
-        print(f"{self.env.now:5.2f}  {self.id}: {msg}")
+        if logger.debug_enabled:
+            logger.debug(self, f"{self.env.now:5.2f}  {self.id}: {msg}")
     # -------------------------------------------------------------------------
 
     def check_thread_state_and_update_combiner_state_flexsim(self):
@@ -449,14 +384,16 @@ class Combiner(Node):
         elif numthreads_BLOCKED ==len(self.worker_thread_list):
         #elif numthreads_BLOCKED >=1:
             #print(self.env.now, numthreads_BLOCKED,len(self.worker_thread.users))
-            print(f"T={self.env.now:.2f}: {self.id} is in BLOCKED_STATE")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in BLOCKED_STATE")
             self.update_state("BLOCKED_STATE", self.env.now)
 
      
         
         else:
-            print("goingtofail")
-            print(numthreads_BLOCKED, numthreads_PROCESSING, self.work_capacity, len(self.worker_thread.users), len(self.worker_thread_list) )
+            if logger.enabled:
+                logger.error(self, "goingtofail")
+                logger.error(self, numthreads_BLOCKED, numthreads_PROCESSING, self.work_capacity, len(self.worker_thread.users), len(self.worker_thread_list))
             raise ValueError(f"{self.id} - Invalid worker thread state. numthreads_PROCESSING={numthreads_PROCESSING}, numthreads_BLOCKED={numthreads_BLOCKED}, work_capacity={self.work_capacity}")
     def check_thread_state_and_update_combiner_state1(self):
         
@@ -485,44 +422,27 @@ class Combiner(Node):
                 # if blocking yield reserve_put on all out_edges and take the one with min index and cancel others and push item
                 if self.blocking:
                     self.check_thread_state_and_update_combiner_state()
-                    self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                    self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                     self.check_thread_state_and_update_combiner_state()
                     blocking_start_time = self.env.now
                 
-                    #self.out_edge_events = [edge.reserve_put() if edge.__class__.__name__ == "ConveyorBelt" else edge.inbuiltstore.reserve_put() for edge in self.out_edges]
-                    #out_edge_events = [self.out_edges[i].inbuiltstore.reserve_put() for i in range(len(self.out_edges)-1,-1,-1)]
-                    out_edge_events= [edge.reserve_put() for edge in self.out_edges]  # Filter out None events
-                    #print(self.env.now,len(self.out_edge_events),self.out_edges)
-                    triggered_out_edge_events = self.env.any_of(out_edge_events)
-                    yield triggered_out_edge_events  # Wait for any in_edge to be available
-                    
-                    chosen_put_event = next((event for event in out_edge_events if event.triggered), None)
-                    
-                    
-                    #self.out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
+                    # a single select waits on all out_edges and is granted by exactly one of them
+                    out_edge_select = ReservationSelect(self.env, "put")
+                    yield out_edge_select.reserve(self.out_edge_ops)  # Wait for any out_edge to be available
+
+                    chosen_put_event = out_edge_select.chosen
                     if chosen_put_event is None:
                         raise ValueError(f"{self.env.now},{self.id} - No out_edge available for processing{[edge.id for edge in self.out_edges]}!")
-                    edge_index = out_edge_events.index(chosen_put_event)
+                    edge_index = out_edge_select.index
                     self.stats["out_edge_selection"].append(edge_index)  # Store the index of the chosen out_edge
-                    #out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
-                    #cancelling already triggered out_edge events
-                    for event in out_edge_events:
-                        #if event.triggered and event is not chosen_put_event:
-                        if event is not chosen_put_event:
-                            event.resourcename.reserve_put_cancel(event)
-                    #out_edge_events=[]
 
                     #putting the item in the chosen out_edge
                     
                     item.update_node_event(self.id, self.env, "exit")
-                    if self.out_edges[edge_index].__class__.__name__ == "Buffer":
-                        self.stats["num_item_processed"] += 1
-                        itemput=self.out_edges[edge_index].put(chosen_put_event, item)
-                        #itemput = chosen_put_event.resourcename.put(chosen_put_event, item)  # Get the item from the chosen in_edge
-
-                    else:
-                        raise ValueError(f"Unsupported edge type: {self.out_edges[edge_index].__class__.__name__}")
-                    print(f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {self.out_edges[edge_index].id} ")
+                    self.stats["num_item_processed"] += 1
+                    itemput=self.out_edge_ops[edge_index].put(chosen_put_event, item)
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {self.out_edges[edge_index].id} ")
                     
                     self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
@@ -535,19 +455,21 @@ class Combiner(Node):
                 #not blocking, check can_put on all, if all fails, then the item is discarded
                 else:
                     out_edge_index_to_put = None
-                    for edge in self.out_edges:
+                    for index, edge in enumerate(self.out_edges):
                         if edge.can_put():
-                            out_edge_index_to_put = edge
+                            out_edge_index_to_put = index
                             break
                     
                     if out_edge_index_to_put is not None:
+                         edge = self.out_edges[out_edge_index_to_put]
                          blocking_start_time = self.env.now
                          self.check_thread_state_and_update_combiner_state()
-                         self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                         self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                          self.check_thread_state_and_update_combiner_state()
-                         yield self.env.process(self._push_item(item, out_edge_index_to_put)) 
+                         yield self.env.process(self._push_item(item, self.out_edge_ops[out_edge_index_to_put])) 
                          self.stats["num_item_processed"] += 1 
-                         print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {out_edge_index_to_put.id} ")
+                         if logger.debug_enabled:
+                             logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {edge.id} ")
                          #self.check_thread_state_and_update_combiner_state()
                          #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
                          
@@ -556,7 +478,8 @@ class Combiner(Node):
 
                         
                     else:               
-                        print(f"T={ self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {edge.id} is full.")
+                        if logger.enabled:
+                            logger.warning(self, f"T={ self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {edge.id} is full.")
                         self.stats["num_item_discarded"] += 1  # Decrement processed count if item is discarded
 
 
@@ -566,26 +489,30 @@ class Combiner(Node):
 
             #out_edge_selection is not "FIRST_AVAILABLE" ---> get index value and push the item if not blocking
             else:
-                print(f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
-                out_edge_index_to_put = self._get_out_edge_index()
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
+                out_edge_index_to_put = self._select_out_edge()
                 #print("OUT",out_edge_index_to_put)
-                assert 0<=out_edge_index_to_put < len(self.out_edges), f"{self.id} - Invalid edge index. {out_edge_index_to_put} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for in_edges."
                 outedge_to_put = self.out_edges[out_edge_index_to_put]
+                out_edge_ops = self.out_edge_ops[out_edge_index_to_put]
                 #push the item if not blocking
-                self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                 self.check_thread_state_and_update_combiner_state()
                 if self.blocking:
                     blocking_start_time = self.env.now
-                    print(f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
                     #yield self.env.process(self._push_item(item, outedge_to_put))
-                    put_event=outedge_to_put.reserve_put()
+                    put_event=out_edge_ops.reserve_put()
                     yield put_event
-                    print(f"T={self.env.now:.2f}: {self.id} yielded and worker is putting item {item.id} into {outedge_to_put.id} " )
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded and worker is putting item {item.id} into {outedge_to_put.id} ")
                     item.update_node_event(self.id, self.env, "exit")
                     self.stats["num_item_processed"] += 1
-                    y=outedge_to_put.put(put_event, item)
+                    y=out_edge_ops.put(put_event, item)
                     if y:
-                     print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
+                     if logger.debug_enabled:
+                         logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
                     self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     #self.check_thread_state_and_update_combiner_state()  # Check and update the combiner state after blocking
                 #check can_put and only if it succeeds push the item if not blocking
@@ -593,12 +520,14 @@ class Combiner(Node):
                     # Check if the out_edge can accept the item
                     if outedge_to_put.can_put():
                         blocking_start_time = self.env.now
-                        yield self.env.process(self._push_item(item, outedge_to_put))
+                        yield self.env.process(self._push_item(item, out_edge_ops))
                         self.stats["num_item_processed"] += 1
-                        print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
                         self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     else:
-                        print(f"T={self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
+                        if logger.enabled:
+                            logger.warning(self, f"T={self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
                         self.stats["num_item_discarded"] += 1
             # Release the worker thread after processing
             #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
@@ -606,6 +535,7 @@ class Combiner(Node):
             yield self.worker_thread.release(req_token)  # Release the worker thread
       
             #delete the worker thread from the worker_thread_list
+            self._set_thread_state(self.env.active_process, None)
             if self.env.active_process in self.worker_thread_list:
                 self.worker_thread_list.remove(self.env.active_process)
             self._update_worker_occupancy(action="REMOVE")  # Update worker occupancy after processing
@@ -622,13 +552,15 @@ class Combiner(Node):
         #checking of the combiner has atleast 1 in_edge and 1 out_edge
         assert self.in_edges is not None and len(self.in_edges) >= 1, f"Combiner '{self.id}' must have atleast 1 in_edge."
         assert self.out_edges is not None and len(self.out_edges) >= 1, f"Combiner '{self.id}' must have atleast 1 out_edge."
+        self._resolve_edge_ops()
 
 
         while True:
             #print(f"T={self.env.now:.2f}: {self.id} worker{i} started processing")
             if self.state == "SETUP_STATE":
                 
-                print(f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE")
                 yield self.env.timeout(self.node_setup_time)# always an int or float
                 self.update_state("IDLE_STATE", self.env.now)
 
@@ -640,13 +572,14 @@ class Combiner(Node):
             
                 #self._update_worker_occupancy(action="UPDATE")
                 self.check_thread_state_and_update_combiner_state()               
-                print(f"T={self.env.now:.2f}: {self.id} is in {self.state}")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in {self.state}")
 
                 #Getting the Pallet
 
-                get_token = self.in_edges[0].reserve_get()
+                get_token = self.in_edge_ops[0].reserve_get()
                 yield get_token
-                self.pallet_in_process = self.in_edges[0].get(get_token)
+                self.pallet_in_process = self.in_edge_ops[0].get(get_token)
                 if self.pallet_in_process.flow_item_type != "Pallet":
                     raise RuntimeError(f"{self.id} - The first in_edge must supply Pallet type items only.")
                 self.pallet_in_process.update_node_event(self.id, self.env, "entry")
@@ -656,11 +589,17 @@ class Combiner(Node):
                 reservation_indx=[]
                 for edge_idx in range(1, len(self.in_edges)):
                     qty = self.target_quantity_of_each_item[edge_idx]
+                    edge=self.in_edges[edge_idx]
+                    edge_ops = self.in_edge_ops[edge_idx]
+                    # the whole quantity is reserved with one event if the edge can hold it
+                    if self.bulk_reservations and qty > 1 and edge.multi_unit_reservations and qty <= edge.capacity:
+                        reservation_tokens.append(edge_ops.reserve_get(n=qty))
+                        reservation_indx.append(edge_idx)
+                        continue
                     for _ in range(qty):
                         # Reserve get operation for the current edge
-                        edge=self.in_edges[edge_idx]
                         #print(edge.id)
-                        reservation_tokens.append(edge.reserve_get())
+                        reservation_tokens.append(edge_ops.reserve_get())
                         reservation_indx.append(edge_idx)
 
                 
@@ -680,20 +619,23 @@ class Combiner(Node):
                         raise ValueError(f"{self.env.now},{self.id} - No in_edge available for processing{[edge.id for edge in self.in_edges]}!")
                     token_index = reservation_tokens.index(chosen_get_event)
                     edge_index = reservation_indx[token_index]
-                    self.item_in_process = self.in_edges[edge_index].get(chosen_get_event)
+                    pulled_items = self.in_edge_ops[edge_index].get(chosen_get_event)
+                    if getattr(chosen_get_event, "quantity", 1) == 1:
+                        pulled_items = [pulled_items]
 
 
                 
-                                                   
-                    if self.item_in_process  is not None:
-                        #print(self.item_in_process)
-                        if self.item_in_process.flow_item_type != "item":
-                            raise RuntimeError(f"{self.id} - The in_edge {self.in_edges[edge_index].id} must supply item type items only.")
-                        self.item_in_process.update_node_event(self.id, self.env, "entry")
-                        self.pallet_in_process.add_item(self.item_in_process)
-                        print(f"T={self.env.now:.2f}: {self.id} gets item {self.item_in_process .id} from {self.in_edges[edge_index].id} ")
-                    else:
-                        raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {self.in_edges[edge_index].id}!")
+                    for self.item_in_process in pulled_items:
+                        if self.item_in_process  is not None:
+                            #print(self.item_in_process)
+                            if self.item_in_process.flow_item_type != "item":
+                                raise RuntimeError(f"{self.id} - The in_edge {self.in_edges[edge_index].id} must supply item type items only.")
+                            self.item_in_process.update_node_event(self.id, self.env, "entry")
+                            self.pallet_in_process.add_item(self.item_in_process)
+                            if logger.debug_enabled:
+                                logger.debug(self, f"T={self.env.now:.2f}: {self.id} gets item {self.item_in_process .id} from {self.in_edges[edge_index].id} ")
+                        else:
+                            raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {self.in_edges[edge_index].id}!")
               
                     reservation_indx.pop(token_index)
                     reservation_tokens.pop(token_index)
@@ -712,14 +654,15 @@ class Combiner(Node):
                 # #update occupancy
                 # self._update_worker_occupancy(action="ADD")
                 #get processing_time
-                next_processing_time = self.get_delay(self.processing_delay)
+                next_processing_time = self._next_processing_delay()
                 #print("!!!!!!!!!!!!!!!!!!EGKEKHRTUOYO!!!!!!!!!!!!!!!!!!!!!!!!!", next_processing_time)
                 worker_thread_req = self.worker_thread.request()  # Request a worker thread
                 yield worker_thread_req
                 #update occupancy
                 self._update_worker_occupancy(action="ADD")
                 self.stats["processing_delay"].append(next_processing_time)  # Update the processing delay in stats
-                print(f"T={self.env.now:.2f}: {self.id} worker started processing item {self.item_in_process.id} ")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker started processing item {self.item_in_process.id} ")
                 self.check_thread_state_and_update_combiner_state()  # Check and update the combiner state based on worker states
                 processing_start_time = self.env.now
                 #wait for processing_delay amount of time
@@ -730,8 +673,8 @@ class Combiner(Node):
 
                 #spawn a worker process
 
-                proc = self.env.process(self.worker(self.pallet_in_process, worker_thread_req))  # Start the worker process
-                proc.thread_state="PROCESSING_STATE" # Set the thread state to PROCESSING_STATE
+                proc = self.env.process(self._run_worker_thread(self.worker(self.pallet_in_process, worker_thread_req)))  # Start the worker process
+                self._set_thread_state(proc, "PROCESSING_STATE") # Set the thread state to PROCESSING_STATE
                 proc.item_to_put = self.pallet_in_process # Set the item to be put by the worker process
                 self.worker_thread_list.append(proc)  # Add the worker process to the worker_thread_list
                 self.check_thread_state_and_update_combiner_state()  # Check and update the combiner state based on worker states
@@ -0,0 +1,143 @@
+from factorysimpy.nodes.node import Node
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+
+
+class Diverge(Node):
+    """
+        Diverge class representing a junction that splits the flow of one incoming edge into several outgoing edges,
+        for example where a conveyor branches into two lines.
+
+        Parameters:
+            state (str): Current state of the diverge node. One of :
+
+                - IDLE_STATE: Waiting for an item on the incoming edge.
+                - BLOCKED_STATE: Holding an item that no allowed out edge can accept yet.
+
+            policy (str or callable): How the out edge of an item is chosen. One of :
+
+                - "FIRST_AVAILABLE": The first out edge, in the order of `out_edges`, that can accept the item.
+                - "ALTERNATING": The first out edge after the one used last that can accept the item.
+                - "BY_TYPE": The out edge given by `routes` for the `flow_item_type` of the item.
+                - A function that takes the item and returns the index of its out edge.
+
+            routes (dict, optional): Maps item types to indices of out edges. Required if `policy` is "BY_TYPE".
+
+        Behavior:
+            The Diverge moves items from its single in edge to its out edges without any delay. It has no worker
+            threads and no processing timer: a single process takes an item from the in edge and waits until an
+            out edge allowed by the policy accepts it. It holds at most one item, so an item waiting for a full
+            out edge blocks the items behind it.
+
+            The order of "FIRST_AVAILABLE" and "ALTERNATING" only applies to the out edges that can accept the item
+            when it arrives. If none of them can, the item goes to the first out edge that frees up.
+
+        Raises:
+            AssertionError: If the Diverge does not have exactly one in edge or has no out edge.
+            ValueError: If `policy` is not valid, if `routes` is missing or if an item is routed to an out edge that
+                        does not exist.
+
+        Output performance metrics:
+        The key performance metrics of the Diverge node is captured in `stats` attribute (dict) during a simulation run.
+
+            last_state_change_time    : Time when the state was last changed.
+            num_item_processed        : Total number of items moved.
+            num_item_per_out_edge     : Number of items put in each out edge.
+            total_time_spent_in_states: Dictionary with total time spent in each state.
+    """
+
+    def __init__(self, env, id, in_edges=None, out_edges=None, policy="FIRST_AVAILABLE", routes=None):
+        super().__init__(env, id, in_edges, out_edges)
+        if not callable(policy) and policy not in ("FIRST_AVAILABLE", "ALTERNATING", "BY_TYPE"):
+            raise ValueError(f"policy must be 'FIRST_AVAILABLE', 'ALTERNATING', 'BY_TYPE' or a function, got {policy!r}.")
+        if policy == "BY_TYPE" and routes is None:
+            raise ValueError("routes must be given when policy is 'BY_TYPE'.")
+        self.state = None  # set to IDLE_STATE when the process starts
+        self.policy = policy
+        self.routes = routes
+        self._last_index = -1  # out edge used last
+        self.stats = {"total_time_spent_in_states": {"IDLE_STATE": 0.0, "BLOCKED_STATE": 0.0},
+                      "last_state_change_time": None, "num_item_processed": 0, "num_item_per_out_edge": []}
+        self.env.process(self.behaviour())
+
+    def add_in_edges(self, edge):
+        """
+        Adds the in_edge of the node. Raises an error if the node already has one.
+
+        Args:
+            edge (Edge Object) : The edge to be added as the in_edge.
+        """
+        if self.in_edges is None:
+            self.in_edges = []
+        if len(self.in_edges) >= 1:
+            raise ValueError(f"Diverge '{self.id}' already has 1 in_edge. Cannot add more.")
+        self.in_edges.append(edge)
+
+    def add_out_edges(self, edge):
+        """
+        Adds an out_edge to the node. Raises an error if the edge already exists in the out_edges list.
+
+        Args:
+            edge (Edge Object) : The edge to be added as an out_edge.
+        """
+        if self.out_edges is None:
+            self.out_edges = []
+        if edge in self.out_edges:
+            raise ValueError(f"Edge already exists in Diverge '{self.id}' out_edges.")
+        self.out_edges.append(edge)
+
+    def update_final_state_time(self, simulation_end_time):
+        """
+        Add the time spent in the current state up to the end of the simulation.
+        """
+        self.update_state(self.state, simulation_end_time)
+
+    def _out_edge_order(self, item):
+        # indices of the out edges allowed for the item, in order of preference
+        if self.policy == "FIRST_AVAILABLE":
+            return list(range(len(self.out_edges)))
+        if self.policy == "ALTERNATING":
+            start = (self._last_index + 1) % len(self.out_edges)
+            return [(start + k) % len(self.out_edges) for k in range(len(self.out_edges))]
+        if self.policy == "BY_TYPE":
+            if item.flow_item_type not in self.routes:
+                raise ValueError(f"Diverge '{self.id}' has no route for items of type {item.flow_item_type!r}.")
+            index = self.routes[item.flow_item_type]
+        else:
+            index = self.policy(item)
+        if not 0 <= index < len(self.out_edges):
+            raise ValueError(f"Diverge '{self.id}' routed item {item.id} to out_edge {index!r}, which does not exist.")
+        return [index]
+
+    def behaviour(self):
+        assert self.in_edges is not None and len(self.in_edges) == 1, f"Diverge '{self.id}' must have exactly 1 in_edge."
+        assert self.out_edges is not None and len(self.out_edges) >= 1, f"Diverge '{self.id}' must have atleast 1 out_edge."
+        self.stats["num_item_per_out_edge"] = [0] * len(self.out_edges)
+        self._resolve_edge_ops()
+        in_edge = self.in_edge_ops[0]
+        self.update_state("IDLE_STATE", self.env.now)
+
+        while True:
+            get_event = in_edge.reserve_get()
+            yield get_event
+            item = in_edge.get(get_event)
+            item.update_node_event(self.id, self.env, "entry")
+
+            # a single select waits on all allowed out_edges, in order of preference, and is granted by exactly one of them
+            order = self._out_edge_order(item)
+            out_edge_select = ReservationSelect(self.env, "put")
+            select_event = out_edge_select.reserve([self.out_edge_ops[index] for index in order])
+            if not select_event.triggered:
+                self.update_state("BLOCKED_STATE", self.env.now)
+            yield select_event
+            index = order[out_edge_select.index]
+            out_edge = self.out_edge_ops[index]
+            item.update_node_event(self.id, self.env, "exit")
+            out_edge.put(out_edge_select.chosen, item)
+            self._last_index = index
+            self.stats["num_item_per_out_edge"][index] += 1
+            self.stats["num_item_processed"] += 1
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} moved item {item.id} from {in_edge.id} to {out_edge.id}")
+            if self.state == "BLOCKED_STATE":
+                self.update_state("IDLE_STATE", self.env.now)
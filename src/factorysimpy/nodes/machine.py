@@ -1,7 +1,12 @@
 # Machine m input and 1 output without using cancel
+from collections import deque
+
 import simpy
 from factorysimpy.nodes.node import Node
-from factorysimpy.utils.utils import get_edge_selector
+from factorysimpy.utils.utils import get_edge_selector, compile_delay, compile_edge_selector
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, STATE_CHANGE, DISCARD
 
 
 
@@ -83,6 +88,8 @@ class Machine(Node):
         self.per_thread_total_time_in_processing_state = 0.0
         
         self.worker_thread_list = []  # List to keep track of worker threads
+        self._idle_workers = deque()  # worker threads waiting for an item, in the order they became idle
+        self._pending_jobs = deque()  # items handed over while no worker thread was waiting
         
         self.item_in_process= None
         self.num_workers = 0  # Number of worker threads currently processing
@@ -159,6 +166,10 @@ class Machine(Node):
 
             num_processing, num_blocked = self._count_worker_state()
             self.state_rep = (num_processing, num_blocked)
+            if tracer.enabled and self.state_rep != previous_state_rep:
+                new_label = self._get_state_label(self.state_rep)
+                if new_label != self._get_state_label(previous_state_rep):
+                    tracer.record(self, STATE_CHANGE, new_label)
 
 
 
@@ -170,6 +181,27 @@ class Machine(Node):
         
         
       
+    def _get_state_label(self, state_rep):
+        """
+        Returns the name of the machine state represented by a `state_rep` tuple.
+
+        Args:
+            state_rep (tuple): (num_worker_threads_processing, num_worker_threads_blocked), (-1,-1) during setup.
+
+        Returns:
+            str: One of "SETUP_STATE", "IDLE_STATE", "ALL_ACTIVE_PROCESSING_STATE", "ALL_ACTIVE_BLOCKED_STATE" or "ATLEAST_ONE_BLOCKED_STATE" (when some threads are processing and some are blocked).
+        """
+        num_processing, num_blocked = state_rep
+        if num_processing < 0:
+            return "SETUP_STATE"
+        if num_processing == 0 and num_blocked == 0:
+            return "IDLE_STATE"
+        if num_blocked == 0:
+            return "ALL_ACTIVE_PROCESSING_STATE"
+        if num_processing == 0:
+            return "ALL_ACTIVE_BLOCKED_STATE"
+        return "ATLEAST_ONE_BLOCKED_STATE"
+
     def reset(self):
 
             
@@ -231,6 +263,12 @@ class Machine(Node):
                 raise ValueError("in_edge_selection should not be None")
             if self.out_edge_selection is None:
                 raise ValueError("out_edge_selection should not be None.")
+            # compiling the parameters once into callables, so that their types are not checked for every item
+            self._next_processing_delay = compile_delay(self.processing_delay, self.id)
+            if self.in_edge_selection != "FIRST_AVAILABLE":
+                self._select_in_edge = compile_edge_selector(self.in_edge_selection, self, "IN")
+            if self.out_edge_selection != "FIRST_AVAILABLE":
+                self._select_out_edge = compile_edge_selector(self.out_edge_selection, self, "OUT")
         
 
     
@@ -293,101 +331,44 @@ class Machine(Node):
         else:
             raise ValueError(f"Edge already exists in Machine '{self.id}' out_edges.")
         
-    def _get_out_edge_index(self):
-        
-         
-        # if it is a constant integer, use the value as is
-        if isinstance(self.out_edge_selection, int):
-            val = self.out_edge_selection
-        # if it is a generator, get the next value from the generator
-        elif hasattr(self.out_edge_selection, '__next__'):
-            # It's a generator
-            val = next(self.out_edge_selection)     
-        # if it is a function return the value returned by the function     
-        elif callable(self.out_edge_selection):
-            # It's a function (pass self and env if needed)
-            #return self.out_edge_selection(self, self.env)
-            val = self.out_edge_selection()       
-        else:
-            raise ValueError("out_edge_selection must be a generator or a callable.")   
-        # Check if the value is within the valid range of out_edges
-        #print(f"OUT: {val} {len(self.out_edges)}")
-        assert 0<= val < len(self.out_edges), f"{self.id} - Invalid edge index. {val} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for out_edges." 
-        self.stats["out_edge_selection"].append(val)
-        return val   
- 
 
-    def _get_in_edge_index(self):
-
-        # if it is a constant integer, use the value as is 
-        if isinstance(self.in_edge_selection, int):
-            val = self.in_edge_selection
-        # if it is a generator, get the next value from the generator
-        elif hasattr(self.in_edge_selection, '__next__'):
-            # It's a generator
-            val = next(self.in_edge_selection)    
-        # if it is a function return the value returned by the function
-        elif callable(self.in_edge_selection):
-          
-            val = self.in_edge_selection()   
-        else:
-            raise ValueError("in_edge_selection must be a generator or a callable.")    
-        # Check if the value is within the valid range of in_edges
-        #print( val )
-        assert 0<=val < len(self.in_edges), f"{self.id} - Invalid edge index. {val} is not in range. Range must be between {0} and  {len(self.in_edges)-1} for in_edges."
-        self.stats["in_edge_selection"].append(val)
-        return val
-                  
-   
 
-  
-    
     def _push_item(self, item_to_push, out_edge):
         """
         It picks a processed item from the store and pushes it to the specified out_edge.
         The out_edge can be a ConveyorBelt or Buffer.
         Args:
             item_to_push (BaseFlowItem Object): Item to be pushed.
-            out_edge (Edge Object): The edge to which the item will be pushed.
+            out_edge (EdgeOps): Edge protocol of the edge to which the item will be pushed.
 
 
         """
-       
-        
-        if out_edge.__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                outstore = out_edge
-                put_token = outstore.reserve_put()
-                yield put_token
-                item_to_push.update_node_event(self.id, self.env, "exit")
-                y=outstore.put(put_token, item_to_push)
-                if y:
-                    print(f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id}")
-        else:
-                raise ValueError(f"Unsupported edge type: {out_edge.__class__.__name__}")
+        put_token = out_edge.reserve_put()
+        yield put_token
+        item_to_push.update_node_event(self.id, self.env, "exit")
+        y=out_edge.put(put_token, item_to_push)
+        if y:
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id}")
         
     def _pull_item(self, in_edge):
         """
         It pulls an item from the specified in_edge and assigns it to the worker for processing.
         Args:
            
-            in_edge (Edge Object): The edge from which the item will be pulled.
+            in_edge (EdgeOps): Edge protocol of the edge from which the item will be pulled.
 
         """
-
-        
-        if in_edge.__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                outstore = in_edge
-                get_token = outstore.reserve_get()
-                yield get_token
-                pulled_item =outstore.get(get_token)
-                pulled_item.update_node_event(self.id, self.env, "entry")
-                if pulled_item is not None:
-                    print(f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
-                    self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
-                else:
-                    raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge.id}!")
+        get_token = in_edge.reserve_get()
+        yield get_token
+        pulled_item =in_edge.get(get_token)
+        if pulled_item is not None:
+            pulled_item.update_node_event(self.id, self.env, "entry")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
+            self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
         else:
-                raise ValueError(f"Unsupported edge type: {in_edge.__class__.__name__}")
+            raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge.id}!")
               
             
     
@@ -452,31 +433,6 @@ class Machine(Node):
 
             
     
-    def _count_worker_state(self):
-        """
-        Counts and returns the number of threads in "PROCESSING_STATE" and "BLOCKED_STATE"
-        using self.worker_thread_list.
-    
-        Returns:
-            num_threads_PROCESSING (int): Number of threads in "PROCESSING_STATE"
-            num_threads_BLOCKED (int): Number of threads in "BLOCKED_STATE"
-        """
-        if not self.worker_thread_list:
-            num_threads_PROCESSING = 0
-            num_threads_BLOCKED = 0
-        else:
-            num_threads_PROCESSING = sum(
-                proc.thread_state == "PROCESSING_STATE" for proc in self.worker_thread_list
-            )
-            num_threads_BLOCKED = sum(
-                proc.thread_state == "BLOCKED_STATE" for proc in self.worker_thread_list
-            )
-    
-        assert 0 <= num_threads_BLOCKED <= self.work_capacity \
-            and 0 <= num_threads_PROCESSING <= self.work_capacity \
-            and 0 <= num_threads_BLOCKED + num_threads_PROCESSING <= self.work_capacity, \
-            f"T={self.env.now:.2f} {self.id} has more threads than work_capacity is created. num_threads_PROCESSING={num_threads_PROCESSING}, num_threads_BLOCKED={num_threads_BLOCKED}, work_capacity={self.work_capacity}"
-        return num_threads_PROCESSING, num_threads_BLOCKED
     
     
 
@@ -489,6 +445,47 @@ class Machine(Node):
 
         
 
+    def _start_worker_pool(self):
+        """
+        Start the `work_capacity` worker threads of the machine. They live as long as the simulation and take the
+        items handed over by `behaviour`, so no process is created per item.
+        """
+        for _ in range(self.work_capacity):
+            proc = self.env.process(self._worker_loop())
+            proc.thread_state = None  # idle
+            proc.item_to_put = None
+            self.worker_thread_list.append(proc)
+
+    def _hand_off(self, job):
+        """
+        Hand an item over to an idle worker thread, or queue it until a worker thread is done.
+
+        Args:
+            job (tuple): (item, processing_delay, req_token) for `worker`.
+        """
+        if self._idle_workers:
+            proc = self._idle_workers.popleft()
+            self._set_thread_state(proc, "PROCESSING_STATE")
+            proc.item_to_put = job[0]
+            # the job is the value of the wake event, so the worker gets it as it was when handed over
+            proc.wake.succeed(job)
+        else:
+            self._pending_jobs.append(job)
+
+    def _worker_loop(self):
+        # a worker thread of the pool, runs `worker` for every item handed over to it
+        proc = self.env.active_process
+        while True:
+            if self._pending_jobs:
+                job = self._pending_jobs.popleft()
+                self._set_thread_state(proc, "PROCESSING_STATE")
+                proc.item_to_put = job[0]
+            else:
+                proc.wake = self.env.event()
+                self._idle_workers.append(proc)
+                job = yield proc.wake
+            yield from self._run_worker_thread(self.worker(*job))
+
     def worker(self,item,processing_delay,req_token,):
         #Worker process that processes items with resource and reserve handling."""
             #1self.check_thread_state_and_update_machine_state()  # Check and update the machine state based on worker states
@@ -505,45 +502,29 @@ class Machine(Node):
                 if self.blocking:
                     #self.check_thread_state_and_update_machine_state()
                     self.update_state_rep(self.env.now)
-                    self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                    self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                     #self.check_thread_state_and_update_machine_state()
                     self.update_state_rep(self.env.now)
                     blocking_start_time = self.env.now
                 
                    
-                    #out_edge_events = [self.out_edges[i].inbuiltstore.reserve_put() for i in range(len(self.out_edges)-1,-1,-1)]
-                    out_edge_events= [edge.reserve_put() for edge in self.out_edges]  # Filter out None events
-                    #print(self.env.now,len(self.out_edge_events),self.out_edges)
-                    triggered_out_edge_events = self.env.any_of(out_edge_events)
-                    yield triggered_out_edge_events  # Wait for any in_edge to be available
-                    
-                    chosen_put_event = next((event for event in out_edge_events if event.triggered), None)
-                    
-                    
-                    #self.out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
+                    # a single select waits on all out_edges and is granted by exactly one of them
+                    out_edge_select = ReservationSelect(self.env, "put")
+                    yield out_edge_select.reserve(self.out_edge_ops)  # Wait for any out_edge to be available
+
+                    chosen_put_event = out_edge_select.chosen
                     if chosen_put_event is None:
                         raise ValueError(f"{self.env.now},{self.id} - No out_edge available for processing{[edge.id for edge in self.out_edges]}!")
-                    edge_index = out_edge_events.index(chosen_put_event)
+                    edge_index = out_edge_select.index
                     self.stats["out_edge_selection"].append(edge_index)  # Store the index of the chosen out_edge
-                    #out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
-                    #cancelling already triggered out_edge events
-                    for event in out_edge_events:
-                        #if event.triggered and event is not chosen_put_event:
-                        if event is not chosen_put_event:
-                            event.resourcename.reserve_put_cancel(event)
-                    #out_edge_events=[]
 
                     #putting the item in the chosen out_edge
                     
                     item.update_node_event(self.id, self.env, "exit")
-                    if self.out_edges[edge_index].__class__.__name__  in [ "Buffer", "ConveyorBelt", "Fleet"]:
-                        self.stats["num_item_processed"] += 1
-                        itemput=self.out_edges[edge_index].put(chosen_put_event, item)
-                        #itemput = chosen_put_event.resourcename.put(chosen_put_event, item)  # Get the item from the chosen in_edge
-
-                    else:
-                        raise ValueError(f"Unsupported edge type: {self.out_edges[edge_index].__class__.__name__}")
-                    print(f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {self.out_edges[edge_index].id} ")
+                    self.stats["num_item_processed"] += 1
+                    itemput=self.out_edge_ops[edge_index].put(chosen_put_event, item)
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {self.out_edges[edge_index].id} ")
                     
                     self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
@@ -557,21 +538,23 @@ class Machine(Node):
                 #not blocking, check can_put on all, if all fails, then the item is discarded
                 else:
                     out_edge_index_to_put = None
-                    for edge in self.out_edges:
+                    for index, edge in enumerate(self.out_edges):
                         if edge.can_put():
-                            out_edge_index_to_put = edge
+                            out_edge_index_to_put = index
                             break
                     
                     if out_edge_index_to_put is not None:
+                         edge = self.out_edges[out_edge_index_to_put]
                          blocking_start_time = self.env.now
                          #self.check_thread_state_and_update_machine_state()
                          self.update_state_rep(self.env.now)
-                         self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                         self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                          #self.check_thread_state_and_update_machine_state()
                          self.update_state_rep(self.env.now)
-                         yield self.env.process(self._push_item(item, out_edge_index_to_put)) 
+                         yield self.env.process(self._push_item(item, self.out_edge_ops[out_edge_index_to_put])) 
                          self.stats["num_item_processed"] += 1 
-                         print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {out_edge_index_to_put.id} ")
+                         if logger.debug_enabled:
+                             logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {edge.id} ")
                          #self.check_thread_state_and_update_machine_state()
                          #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
                          
@@ -580,8 +563,11 @@ class Machine(Node):
                          self.update_state_rep(self.env.now)
 
                     else:
-                        print(f"T={ self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {edge.id} is full.")
+                        if logger.enabled:
+                            logger.warning(self, f"T={ self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {edge.id} is full.")
                         self.stats["num_item_discarded"] += 1  # Decrement processed count if item is discarded
+                        if tracer.enabled:
+                            tracer.record(self, DISCARD, item, edge)
 
 
                     
@@ -590,27 +576,31 @@ class Machine(Node):
 
             #out_edge_selection is not "FIRST_AVAILABLE" ---> get index value and push the item if not blocking
             else:
-                print(f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
-                out_edge_index_to_put = self._get_out_edge_index()
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
+                out_edge_index_to_put = self._select_out_edge()
                 #print("OUT",out_edge_index_to_put)
-                assert 0<=out_edge_index_to_put < len(self.out_edges), f"{self.id} - Invalid edge index. {out_edge_index_to_put} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for in_edges."
                 outedge_to_put = self.out_edges[out_edge_index_to_put]
+                out_edge_ops = self.out_edge_ops[out_edge_index_to_put]
                 #push the item if not blocking
-                self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                 #5self.check_thread_state_and_update_machine_state()
                 self.update_state_rep(self.env.now)
                 if self.blocking:
                     blocking_start_time = self.env.now
-                    print(f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
                     #yield self.env.process(self._push_item(item, outedge_to_put))
-                    put_event=outedge_to_put.reserve_put()
+                    put_event=out_edge_ops.reserve_put()
                     yield put_event
-                    print(f"T={self.env.now:.2f}: {self.id} yielded and worker is putting item {item.id} into {outedge_to_put.id} " )
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded and worker is putting item {item.id} into {outedge_to_put.id} ")
                     item.update_node_event(self.id, self.env, "exit")
                     self.stats["num_item_processed"] += 1
-                    y=outedge_to_put.put(put_event, item)
+                    y=out_edge_ops.put(put_event, item)
                     if y:
-                     print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
+                     if logger.debug_enabled:
+                         logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
                     self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     #self.check_thread_state_and_update_machine_state()  # Check and update the machine state after blocking
                 #check can_put and only if it succeeds push the item if not blocking
@@ -618,21 +608,25 @@ class Machine(Node):
                     # Check if the out_edge can accept the item
                     if outedge_to_put.can_put():
                         blocking_start_time = self.env.now
-                        yield self.env.process(self._push_item(item, outedge_to_put))
+                        yield self.env.process(self._push_item(item, out_edge_ops))
                         self.stats["num_item_processed"] += 1
-                        print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
                         self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     else:
-                        print(f"T={self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
+                        if logger.enabled:
+                            logger.warning(self, f"T={self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
                         self.stats["num_item_discarded"] += 1
+                        if tracer.enabled:
+                            tracer.record(self, DISCARD, item, outedge_to_put)
             # Release the worker thread after processing
             #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
             #self.check_thread_state_and_update_machine_state()
             yield self.worker_thread.release(req_token)  # Release the worker thread
       
-            #delete the worker thread from the worker_thread_list
-            if self.env.active_process in self.worker_thread_list:
-                self.worker_thread_list.remove(self.env.active_process)
+            #the worker thread is idle again
+            self._set_thread_state(self.env.active_process, None)
+            self.env.active_process.item_to_put = None
             self._update_worker_occupancy(action="REMOVE")  # Update worker occupancy after processing
             #2self.check_thread_state_and_update_machine_state()  
             self.update_state_rep(self.env.now)  
@@ -651,6 +645,8 @@ class Machine(Node):
         #checking of the machine has atleast 1 in_edge and 1 out_edge
         assert self.in_edges is not None and len(self.in_edges) >= 1, f"Machine '{self.id}' must have atleast 1 in_edge."
         assert self.out_edges is not None and len(self.out_edges) >= 1, f"Machine '{self.id}' must have atleast 1 out_edge."
+        self._resolve_edge_ops()
+        self._start_worker_pool()
         
         while True:
             #print(f"T={self.env.now:.2f}: {self.id} worker{i} started processing")
@@ -658,12 +654,18 @@ class Machine(Node):
             
             if self.state_rep == (-1, -1):
                 
-                print(f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE")
+                if tracer.enabled:
+                    tracer.record(self, STATE_CHANGE, "SETUP_STATE")
                 yield self.env.timeout(self.node_setup_time)# always an int or float
                 self.stats["total_time_spent_in_states"]["SETUP_STATE"] += self.node_setup_time
                 self.total_time_setup += self.node_setup_time
                 self.state_rep = (0, 0) # changing the state_rep to (0,0) to indicate that the machine is ready for processing
-                print(f"T={self.env.now:.2f}: {self.id} completed setup")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} completed setup")
+                if tracer.enabled:
+                    tracer.record(self, STATE_CHANGE, "IDLE_STATE")
                 self.update_state_rep(self.env.now)
                 #self.update_state("IDLE_STATE", self.env.now)
 
@@ -684,73 +686,21 @@ class Machine(Node):
                 #in_edge_selection is "FIRST_AVAILABLE"--->     yield in a list, select one with min. index value and cancel other and pull item
                 if self.in_edge_selection == "FIRST_AVAILABLE":
                     
-                    #if not self.in_edge_events:
-                    self.in_edge_events=  [edge.reserve_get() for edge in self.in_edges]
-
-                    # for i in self.in_edges:
-                    #     if len(i.inbuiltstore.items):
-
-                    #        print( f"T={self.env.now:.2f}: {self.id} in {i.id} item entry time - {[item.timestamp_node_exit for item in i.inbuiltstore.items] } and no. of reservations {len(i.inbuiltstore.reservations_get)} ") # Update the timestamp of items in the inbuilt store 
-                    #        #if len(i.inbuiltstore.reservations_get):
-                                                     
-                    #     else:
-                    #         print(f"T={self.env.now:.2f}: {self.id} in {i.id} is empty")
-                    #self.in_edge_events = [self.in_edges[i].inbuiltstore.reserve_get() for i in range(len(self.in_edges)-1,-1,-1)]
-                    print(f"T={self.env.now:.2f}: {self.id} waiting for in_edge events to be triggered")
-                    #print(f"T={self.env.now:.2f}: {self.id} in_edge_events: {[event.resourcename for event in self.in_edge_events]}")  # Debugging line to check in_edge_events
-                    triggered_in_edge_events = self.env.any_of(self.in_edge_events)
-                    
-                    yield triggered_in_edge_events  # Wait for any in_edge to be available
-                    trig_count = [1 if event.triggered else 0 for event in self.in_edge_events]
-                    #print(f"T={self.env.now:.2f}: {self.id} no of trigerred events {sum(trig_count)} , {trig_count}, in_edge_events triggered")
-                    # Find the first triggered event           
-                    self.chosen_event = next((event for event in self.in_edge_events if event.triggered), None)
+                    # a single select waits on all in_edges and is granted by exactly one of them
+                    in_edge_select = ReservationSelect(self.env, "get")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} waiting for in_edge events to be triggered")
+                    yield in_edge_select.reserve(self.in_edge_ops)  # Wait for any in_edge to be available
+                    self.in_edge_events = in_edge_select.requests
+                    self.chosen_event = in_edge_select.chosen
                     if self.chosen_event is None:
                         raise ValueError(f"{self.id} - No in_edge available for processing!")
-                    # Find the index of the chosen event in the in_edge_events list
-                    edge_index_to_print = None
-                    for i in range(len(self.in_edges)):
-                        #print(self.chosen_event.resourcename, self.in_edges[i])
-                        if self.in_edges[i].__class__.__name__ in ["Buffer", "Fleet"]:
-                            if self.chosen_event.resourcename == self.in_edges[i].inbuiltstore :
-                        
-                                edge_index_to_print=i
-                        elif self.in_edges[i].__class__.__name__ == "ConveyorBelt":
-
-                            print(self.chosen_event.resourcename, self.in_edges[i].belt)
-                            #if self.chosen_event.resourcename == self.in_edges[i].out_buf:
-                            if self.chosen_event.resourcename == self.in_edges[i].belt:
-                                
-                                edge_index_to_print=i
-                        else:
-                            raise ValueError(f"Unsupported edge type: {self.in_edges[i].__class__.__name__}")
-
-                            
-                    edge_index = self.in_edge_events.index(self.chosen_event)  # Get the index of the chosen event
-                    assert edge_index == edge_index_to_print, f"{self.id} - Edge index mismatch. {edge_index} != {edge_index_to_print}. Check the in_edge_events and in_edges."
-                    
-                    #print("!!!!!!",edge_index)
-                    self.stats["in_edge_selection"].append(edge_index)
-                    
-                    print(f"T={self.env.now:.2f}: {self.id} yielded from {self.in_edges[edge_index].id} ")
-                    
-                    
-                    #self.in_edge_events.remove(self.chosen_event)  #
-                    #  Remove the chosen event from the list
-                    #cancelling already triggered in_edge events other than chosen events
-                    
-                    for event in self.in_edge_events:
-                        event_cancelled = False
-                        #if event.triggered and event is not self.chosen_event:
-                        if  event is not self.chosen_event:
-                            #print(f"T={self.env.now:.2f}: {self.id} cancelling  in_edge events  ")
-                            event_cancelled = event.resourcename.reserve_get_cancel(event)
-                            if not event_cancelled:
-                                raise ValueError(f"{self.id} - Failed to cancel reserve_get for event {event}.")
-                            
-                        #self.in_edge_events=[]
+                    edge_index = in_edge_select.index
 
+                    self.stats["in_edge_selection"].append(edge_index)
                     
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded from {self.in_edges[edge_index].id} ")
 
                     ####---3/9 Create workers based on work_capacity
                     # worker_thread_req = self.worker_thread.request()  # Request a worker thread
@@ -762,13 +712,8 @@ class Machine(Node):
                     #update occupancy
                     #self._update_worker_occupancy(action="ADD")
 
-                    if self.in_edges[edge_index].__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                        self.item_in_process=self.in_edges[edge_index].get(self.chosen_event)  # Get the item from the chosen in_edge
-                        #print("getting getting getting getting  item from in_edge", self.chosen_event.resourcename)
-                        #self.item_in_process = self.chosen_event.resourcename.get(self.chosen_event)  # Get the item from the chosen in_edge
-                        self.item_in_process.update_node_event(self.id, self.env, "entry")
-                    else:
-                        raise ValueError(f"Unsupported edge type: {self.in_edges[edge_index].__class__.__name__}")
+                    self.item_in_process=self.in_edge_ops[edge_index].get(self.chosen_event)  # Get the item from the chosen in_edge
+                    self.item_in_process.update_node_event(self.id, self.env, "entry")
                     #print(f"T={self.env.now:.2f}: {self.id} received item {item.id} from {self.in_edges[edge_index].id} ")
                     
                     
@@ -776,10 +721,9 @@ class Machine(Node):
                 #in_edge_selection is not "FIRST_AVAILABLE"---> use get_in_edge_index and pull item
                 else:
                     #print("not_first_available")
-                    in_edge_index = self._get_in_edge_index()
+                    in_edge_index = self._select_in_edge()
                     #print(self.id, in_edge_index)
                     
-                    assert type(in_edge_index)==int and 0<=in_edge_index < len(self.in_edges), f"{self.id} - Invalid edge index. {in_edge_index} is not in range. Range must be between {0} and  {len(self.in_edges)-1} for in_edges."
                     #print("IN", in_edge_index)
                     in_edge_to_get = self.in_edges[in_edge_index]
                     
@@ -789,29 +733,21 @@ class Machine(Node):
                     
                     
 
-                    if in_edge_to_get.__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                        print(f"T={self.env.now:.2f}: {self.id} is pulling item from {in_edge_to_get.id} ")
-                        outstore = in_edge_to_get
-                        get_token = outstore.reserve_get()
-                        yield get_token
-                        print(f"T={self.env.now:.2f}: {self.id} yielded from {in_edge_to_get.id} ")
-                         # Create workers based on work_capacity
-                        #worker_thread_req = self.worker_thread.request()  # Request a worker thread
-                        #yield worker_thread_req
-                        #update occupancy
-                        #self._update_worker_occupancy(action="ADD")
-                        
-                        
-                        self.item_in_process =outstore.get(get_token)
-                        
-                        if self.item_in_process  is not None:
-                            #print(self.item_in_process)
-                            self.item_in_process .update_node_event(self.id, self.env, "entry")
-                            print(f"T={self.env.now:.2f}: {self.id} gets item {self.item_in_process .id} from {in_edge_to_get.id} ")
-                        else:
-                            raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge_to_get.id}!")
+                    in_edge_ops = self.in_edge_ops[in_edge_index]
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} is pulling item from {in_edge_to_get.id} ")
+                    get_token = in_edge_ops.reserve_get()
+                    yield get_token
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded from {in_edge_to_get.id} ")
+                    self.item_in_process =in_edge_ops.get(get_token)
+                    
+                    if self.item_in_process  is not None:
+                        self.item_in_process .update_node_event(self.id, self.env, "entry")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} gets item {self.item_in_process .id} from {in_edge_to_get.id} ")
                     else:
-                        raise ValueError(f"Unsupported edge type: {in_edge_to_get.__class__.__name__}")
+                        raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge_to_get.id}!")
 
 
 
@@ -829,16 +765,14 @@ class Machine(Node):
                 # #update occupancy
                 # self._update_worker_occupancy(action="ADD")
                 #get processing_time
-                next_processing_time = self.get_delay(self.processing_delay)
+                next_processing_time = self._next_processing_delay()
                 #print("!!!!!!!!!!!!!!!!!!EGKEKHRTUOYO!!!!!!!!!!!!!!!!!!!!!!!!!", next_processing_time)
 
                 self.stats["processing_delay"].append(next_processing_time)  # Update the processing delay in stats
-                print(f"T={self.env.now:.2f}: {self.id} worker started processing item {self.item_in_process.id} ")
-                #spawn a worker process
-                proc = self.env.process(self.worker(self.item_in_process, next_processing_time, worker_thread_req))  # Start the worker process
-                proc.thread_state="PROCESSING_STATE" # Set the thread state to PROCESSING_STATE
-                proc.item_to_put = self.item_in_process # Set the item to be put by the worker process
-                self.worker_thread_list.append(proc)  # Add the worker process to the worker_thread_list
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker started processing item {self.item_in_process.id} ")
+                #hand the item over to a worker of the pool
+                self._hand_off((self.item_in_process, next_processing_time, worker_thread_req))
                 #4self.check_thread_state_and_update_machine_state()  # Check and update the machine state based on worker states
                 self.update_state_rep(self.env.now)
                 #initialise item into none
@@ -0,0 +1,138 @@
+from factorysimpy.nodes.node import Node
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+
+
+class Merge(Node):
+    """
+        Merge class representing a junction that joins the flows of several incoming edges into one outgoing edge,
+        for example where two conveyors meet.
+
+        Parameters:
+            state (str): Current state of the merge node. One of :
+
+                - IDLE_STATE: Waiting for an item on the incoming edges.
+                - BLOCKED_STATE: Holding an item that the out edge cannot accept yet.
+
+            policy (str): How the in edge is chosen when several of them have an item ready. One of :
+
+                - "FIRST_AVAILABLE": The first in edge, in the order of `in_edges`.
+                - "PRIORITY": The in edge with the lowest value in `priorities`.
+                - "ALTERNATING": The first in edge after the one used last, so that the flows are interleaved
+                  while they all have items.
+
+            priorities (list, optional): One value per in edge, lower values are served first. Required if
+                                         `policy` is "PRIORITY".
+
+        Behavior:
+            The Merge moves items from its in edges to its single out edge without any delay. It has no worker threads
+            and no processing timer: a single process reserves an item on the in edges, takes the item granted first
+            (ties are broken by the policy) and waits until the out edge accepts it. It holds at most one item.
+            It replaces a Machine with a zero processing delay at conveyor junctions.
+
+            The policy only orders the in edges that have an item ready when the Merge looks for its next item.
+            If none of them has one, the Merge waits on all of them and takes the first item to arrive, whatever
+            its in edge, so under "PRIORITY" an item on a low priority edge can go before one that arrives later
+            on a high priority edge.
+
+        Raises:
+            AssertionError: If the Merge has no in edge or does not have exactly one out edge.
+            ValueError: If `policy` is not valid or if `priorities` does not match the in edges.
+
+        Output performance metrics:
+        The key performance metrics of the Merge node is captured in `stats` attribute (dict) during a simulation run.
+
+            last_state_change_time    : Time when the state was last changed.
+            num_item_processed        : Total number of items moved.
+            num_item_per_in_edge      : Number of items taken from each in edge.
+            total_time_spent_in_states: Dictionary with total time spent in each state.
+    """
+
+    def __init__(self, env, id, in_edges=None, out_edges=None, policy="FIRST_AVAILABLE", priorities=None):
+        super().__init__(env, id, in_edges, out_edges)
+        if policy not in ("FIRST_AVAILABLE", "PRIORITY", "ALTERNATING"):
+            raise ValueError(f"policy must be 'FIRST_AVAILABLE', 'PRIORITY' or 'ALTERNATING', got {policy!r}.")
+        if policy == "PRIORITY" and priorities is None:
+            raise ValueError("priorities must be given when policy is 'PRIORITY'.")
+        self.state = None  # set to IDLE_STATE when the process starts
+        self.policy = policy
+        self.priorities = priorities
+        self._last_index = -1  # in edge used last
+        self.stats = {"total_time_spent_in_states": {"IDLE_STATE": 0.0, "BLOCKED_STATE": 0.0},
+                      "last_state_change_time": None, "num_item_processed": 0, "num_item_per_in_edge": []}
+        self.env.process(self.behaviour())
+
+    def add_in_edges(self, edge):
+        """
+        Adds an in_edge to the node. Raises an error if the edge already exists in the in_edges list.
+
+        Args:
+            edge (Edge Object) : The edge to be added as an in_edge.
+        """
+        if self.in_edges is None:
+            self.in_edges = []
+        if edge in self.in_edges:
+            raise ValueError(f"Edge already exists in Merge '{self.id}' in_edges.")
+        self.in_edges.append(edge)
+
+    def add_out_edges(self, edge):
+        """
+        Adds the out_edge of the node. Raises an error if the node already has one.
+
+        Args:
+            edge (Edge Object) : The edge to be added as the out_edge.
+        """
+        if self.out_edges is None:
+            self.out_edges = []
+        if len(self.out_edges) >= 1:
+            raise ValueError(f"Merge '{self.id}' already has 1 out_edge. Cannot add more.")
+        self.out_edges.append(edge)
+
+    def update_final_state_time(self, simulation_end_time):
+        """
+        Add the time spent in the current state up to the end of the simulation.
+        """
+        self.update_state(self.state, simulation_end_time)
+
+    def _in_edge_order(self, first_order):
+        if self.policy == "ALTERNATING":
+            start = (self._last_index + 1) % len(self.in_edges)
+            return first_order[start:] + first_order[:start]
+        return first_order
+
+    def behaviour(self):
+        assert self.in_edges is not None and len(self.in_edges) >= 1, f"Merge '{self.id}' must have atleast 1 in_edge."
+        assert self.out_edges is not None and len(self.out_edges) == 1, f"Merge '{self.id}' must have exactly 1 out_edge."
+        if self.policy == "PRIORITY":
+            if len(self.priorities) != len(self.in_edges):
+                raise ValueError(f"Merge '{self.id}' needs one priority per in_edge.")
+            first_order = sorted(range(len(self.in_edges)), key=lambda index: self.priorities[index])
+        else:
+            first_order = list(range(len(self.in_edges)))
+        self.stats["num_item_per_in_edge"] = [0] * len(self.in_edges)
+        self._resolve_edge_ops()
+        out_edge = self.out_edge_ops[0]
+        self.update_state("IDLE_STATE", self.env.now)
+
+        while True:
+            # a single select waits on all in_edges, in order of preference, and is granted by exactly one of them
+            order = self._in_edge_order(first_order)
+            in_edge_select = ReservationSelect(self.env, "get")
+            yield in_edge_select.reserve([self.in_edge_ops[index] for index in order])
+            index = order[in_edge_select.index]
+            item = self.in_edge_ops[index].get(in_edge_select.chosen)
+            item.update_node_event(self.id, self.env, "entry")
+            self._last_index = index
+            self.stats["num_item_per_in_edge"][index] += 1
+
+            put_event = out_edge.reserve_put()
+            if not put_event.triggered:
+                self.update_state("BLOCKED_STATE", self.env.now)
+            yield put_event
+            item.update_node_event(self.id, self.env, "exit")
+            out_edge.put(put_event, item)
+            self.stats["num_item_processed"] += 1
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} moved item {item.id} from {self.in_edges[index].id} to {out_edge.id}")
+            if self.state == "BLOCKED_STATE":
+                self.update_state("IDLE_STATE", self.env.now)
@@ -1,4 +1,6 @@
 import simpy
+from factorysimpy.base.edge_protocol import EdgeOps
+from factorysimpy.utils.trace import tracer, STATE_CHANGE
 
 
 
@@ -32,6 +34,8 @@ class Node:
         self.node_setup_time = node_setup_time # Time taken to set up the node.
         self.in_edges = in_edges # List of input edges connected to the node.
         self.out_edges = out_edges #List of output edges connected to the node.
+        self._num_threads_processing = 0  # worker threads in PROCESSING_STATE, for nodes with worker threads
+        self._num_threads_blocked = 0  # worker threads in BLOCKED_STATE, for nodes with worker threads
 
        
         if isinstance(node_setup_time, (int, float)):
@@ -85,9 +89,74 @@ class Node:
             self.stats["total_time_spent_in_states"][self.state] = (
                 self.stats["total_time_spent_in_states"].get(self.state, 0.0) + elapsed
             )
+        if tracer.enabled and new_state != self.state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         self.stats["last_state_change_time"] = current_time
 
+    def _set_thread_state(self, proc, new_state):
+        """
+        Set the state of a worker thread and update the number of threads in each state.
+
+        Args:
+            proc (simpy.Process): The worker thread.
+            new_state (str or None): "PROCESSING_STATE", "BLOCKED_STATE" or None when the thread is done.
+        """
+        old_state = getattr(proc, "thread_state", None)
+        if old_state == "PROCESSING_STATE":
+            self._num_threads_processing -= 1
+        elif old_state == "BLOCKED_STATE":
+            self._num_threads_blocked -= 1
+        if new_state == "PROCESSING_STATE":
+            self._num_threads_processing += 1
+        elif new_state == "BLOCKED_STATE":
+            self._num_threads_blocked += 1
+        proc.thread_state = new_state
+
+    def _count_worker_state(self):
+        """
+        Returns the number of threads in "PROCESSING_STATE" and "BLOCKED_STATE", kept up to date by
+        `_set_thread_state`.
+    
+        Returns:
+            num_threads_PROCESSING (int): Number of threads in "PROCESSING_STATE"
+            num_threads_BLOCKED (int): Number of threads in "BLOCKED_STATE"
+        """
+        num_threads_PROCESSING = self._num_threads_processing
+        num_threads_BLOCKED = self._num_threads_blocked
+    
+        assert 0 <= num_threads_BLOCKED <= self.work_capacity \
+            and 0 <= num_threads_PROCESSING <= self.work_capacity \
+            and 0 <= num_threads_BLOCKED + num_threads_PROCESSING <= self.work_capacity, \
+            f"T={self.env.now:.2f} {self.id} has more threads than work_capacity is created. num_threads_PROCESSING={num_threads_PROCESSING}, num_threads_BLOCKED={num_threads_BLOCKED}, work_capacity={self.work_capacity}"
+        return num_threads_PROCESSING, num_threads_BLOCKED
+
+    def _run_worker_thread(self, worker):
+        """
+        Runs the generator of a worker thread and takes the thread out of the counts of `_count_worker_state`
+        when it ends, also when it is interrupted or fails.
+
+        Args:
+            worker (generator): The body of the worker thread.
+        """
+        proc = self.env.active_process
+        try:
+            yield from worker
+        finally:
+            self._set_thread_state(proc, None)
+
+    def _resolve_edge_ops(self):
+        """
+        Resolves the edge protocol of the in and out edges into `in_edge_ops` and `out_edge_ops`, lists of
+        `EdgeOps` in the order of `in_edges` and `out_edges`. Called once when the node starts, so that the
+        node calls the bound methods of the tables for every item.
+
+        Raises:
+            ValueError: If an edge does not implement the edge protocol.
+        """
+        self.in_edge_ops = [EdgeOps(edge) for edge in (self.in_edges or [])]
+        self.out_edge_ops = [EdgeOps(edge) for edge in (self.out_edges or [])]
+
     def add_in_edges(self, edge):
         #Override this method in subclasses.
         raise NotImplementedError("add_in_edges must be implemented in a subclass.")
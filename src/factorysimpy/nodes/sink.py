@@ -3,6 +3,9 @@ from factorysimpy.nodes.node import Node
 import simpy
 
 from factorysimpy.utils.utils import get_edge_selector
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, GET, STATE_CHANGE
 class Sink(Node):
     """
     
@@ -34,6 +37,8 @@ class Sink(Node):
 
     def reset(self):
         self.state = "COLLECTING_STATE"
+        if tracer.enabled:
+            tracer.record(self, STATE_CHANGE, self.state)
             
     def update_final_state_time(self, simulation_end_time):
         duration = simulation_end_time- self.stats["last_state_change_time"]
@@ -75,6 +80,7 @@ class Sink(Node):
       assert self.out_edges is None , f"Sink '{self.id}' must not have an out_edge."
 
       self.reset()
+      self._resolve_edge_ops()
       while True:
         #yield self.env.timeout(1)
         #print("sink")
@@ -84,26 +90,16 @@ class Sink(Node):
 
         
 
-        self.in_edge_events = [edge.inbuiltstore.reserve_get() for edge in self.in_edges]
-        
-        triggered_in_edge_events = self.env.any_of(self.in_edge_events)
-        yield triggered_in_edge_events  # Wait for any in_edge to be available
-
+        # a single select waits on all in_edges and is granted by exactly one of them
+        in_edge_select = ReservationSelect(self.env, "get")
+        yield in_edge_select.reserve(self.in_edge_ops)  # Wait for any in_edge to be available
+        self.in_edge_events = in_edge_select.requests
 
-
-        self.chosen_event = next((event for event in self.in_edge_events if event.triggered), None)
+        self.chosen_event = in_edge_select.chosen
         if self.chosen_event is None:
             raise ValueError(f"{self.id} - No in_edge available for processing!")
-        
-        self.in_edge_events.remove(self.chosen_event)  # Remove the chosen event from the list
-        #cancelling already triggered out_edge events
-        for event in self.in_edge_events:
-        #     if event.triggered:
-               event.resourcename.reserve_get_cancel(event)
-        
-        
-        
-        item = self.chosen_event.resourcename.get(self.chosen_event)  # Get the item from the chosen in_edge
+
+        item = self.in_edge_ops[in_edge_select.index].get(self.chosen_event)  # Get the item from the chosen in_edge
         if isinstance(item, simpy.events.Process):
             self.item_in_process = item
             yield self.item_in_process # Wait for the item to be available
@@ -120,16 +116,20 @@ class Sink(Node):
         
                 
         self.stats["num_item_received"] += 1
+        if tracer.enabled:
+            tracer.record(self, GET, self.item_in_process, self.in_edges[in_edge_select.index])
         self.stats["total_cycle_time"] += self.env.now - self.item_in_process.timestamp_creation
         
         #print("fromsink", self.env.now - item.timestamp_creation)
         #print(self.item_in_process.timestamp_node_entry)
         #self.buffertime+=(self.item_in_process.timestamp_node_entry- self.item_in_process.timestamp_creation)
         #print(f"buffertime={item.timestamp_node_entry- item.timestamp_creation}")
-        print(f"T={self.env.now:.2f}: {self.id } got an {self.item_in_process} ")
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id } got an {self.item_in_process} ")
         if hasattr(self.item_in_process, 'conveyor_entry_time'):
             self.item_list[self.item_in_process.id] = (self.item_in_process.conveyor_entry_time, self.item_in_process.conveyor_exit_time, self.item_in_process.conveyor_exit_time - self.item_in_process.conveyor_entry_time if self.item_in_process.conveyor_exit_time and self.item_in_process.conveyor_entry_time else 'N/A')
-            print(f"item{self.item_in_process.id} conveyortime {self.item_in_process.conveyor_entry_time} and {self.item_in_process.conveyor_exit_time} - time spend in conveyor {self.item_in_process.conveyor_exit_time - self.item_in_process.conveyor_entry_time if self.item_in_process.conveyor_exit_time and self.item_in_process.conveyor_entry_time else 'N/A'}")
+            if logger.debug_enabled:
+                logger.debug(self, f"item{self.item_in_process.id} conveyortime {self.item_in_process.conveyor_entry_time} and {self.item_in_process.conveyor_exit_time} - time spend in conveyor {self.item_in_process.conveyor_exit_time - self.item_in_process.conveyor_entry_time if self.item_in_process.conveyor_exit_time and self.item_in_process.conveyor_entry_time else 'N/A'}")
         #print(f"item{self.item_in_process.id} fleettime {self.item_in_process.fleet_entry_time} and {self.item_in_process.fleet_exit_time} - time spend in fleet {self.item_in_process.fleet_exit_time - self.item_in_process.fleet_entry_time if self.item_in_process.fleet_exit_time and self.item_in_process.fleet_entry_time else 'N/A'}")
         self.item_in_process=None
        
@@ -5,7 +5,10 @@ import simpy
 from factorysimpy.nodes.node import Node
 from factorysimpy.helper.item import Item
 from factorysimpy.helper.pallet import Pallet
-from factorysimpy.utils.utils import get_edge_selector
+from factorysimpy.utils.utils import get_edge_selector, compile_parameter, compile_delay
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, STATE_CHANGE, DISCARD
 
 
 
@@ -151,38 +154,14 @@ class Source(Node):
             raise ValueError("inter_arrival_time should not be None.")
         if self.out_edge_selection is None:
             raise ValueError("out_edge_selection should not be None.")
+        # compiling the parameters once into callables, so that their types are not checked for every item
+        self._next_inter_arrival_time = compile_delay(self.inter_arrival_time, self.id)
+        if self.out_edge_selection != "FIRST_AVAILABLE":
+            self._select_out_edge = compile_parameter(self.out_edge_selection)
         
     
 
-    def _get_out_edge_index(self):
-        
-            
-   
-        if isinstance(self.out_edge_selection, int):
-            return self.out_edge_selection
-        elif hasattr(self.out_edge_selection, '__next__'):
-            # It's a generator
-            val = next(self.out_edge_selection)
-            return val
-           
-        elif callable(self.out_edge_selection):
-            # It's a function (pass self and env if needed)
-            #return self.out_edge_selection(self, self.env)
-            val = self.out_edge_selection()
-            
-            return val
-        
-        else:
-            raise ValueError("out_edge_selection must be a generator or a callable.")    
-                
- 
-
-    
 
-    
-  
-        
- 
     def add_in_edges(self, edge):
         raise ValueError("Source does not have in_edges. Cannot add any.")
 
@@ -208,19 +187,16 @@ class Source(Node):
    
     
     def _push_item(self, item, out_edge):
-        
-        if out_edge.__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                outstore = out_edge
-                put_token = outstore.reserve_put()
-                yield put_token
-                item.set_creation(self.id, self.env)
-                            
-                item.timestamp_node_exit = self.env.now
-                y=outstore.put(put_token, item)
-                if y:
-                    print(f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id} ")
-        else:
-                raise ValueError(f"Unsupported edge type: {out_edge.__class__.__name__}")
+        # out_edge is the EdgeOps of the edge
+        put_token = out_edge.reserve_put()
+        yield put_token
+        item.set_creation(self.id, self.env)
+                    
+        item.timestamp_node_exit = self.env.now
+        y=out_edge.put(put_token, item)
+        if y:
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id} ")
 
     def update_state(self, new_state: str, current_time: float):
         """
@@ -239,6 +215,8 @@ class Source(Node):
             self.stats["total_time_spent_in_states"][self.state] = (
                 self.stats["total_time_spent_in_states"].get(self.state, 0.0) + elapsed
             )
+        if tracer.enabled and new_state != self.state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         self.stats["last_state_change_time"] = current_time
 
@@ -263,23 +241,26 @@ class Source(Node):
         assert self.in_edges is  None , f"Source '{self.id}' must not have an in_edge."
         assert self.out_edges is not None and len(self.out_edges) >= 1, f"Source '{self.id}' must have atleast 1 out_edge."
         self.reset()
+        self._resolve_edge_ops()
         i=0
         
         
         while True:
             self.update_state(self.state, self.env.now)
             if self.state == "SETUP_STATE":
-                print(f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE. Waiting for setup time {self.node_setup_time} seconds")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE. Waiting for setup time {self.node_setup_time} seconds")
                 
                 yield self.env.timeout(self.node_setup_time)
                 
                 self.update_state("GENERATING_STATE", self.env.now)
      
                 
-                print(f"T={self.env.now:.2f}: {self.id} is now {self.state}")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is now {self.state}")
             
             elif self.state== "GENERATING_STATE":
-                next_arrival_time = self.get_delay(self.inter_arrival_time)
+                next_arrival_time = self._next_inter_arrival_time()
                 if not isinstance(next_arrival_time, (int, float)):
                     raise AssertionError("inter_arrival_time returns an invalid value. It should be int or float")
                 yield self.env.timeout(next_arrival_time)
@@ -303,29 +284,21 @@ class Source(Node):
                         #print(self.env.now,"GEttingbloccccccked")
                         blocking_start_time = self.env.now
                     
-                        #self.out_edge_events = [edge.reserve_put() if edge.__class__.__name__ == "ConveyorBelt" else edge.inbuiltstore.reserve_put() for edge in self.out_edges]
-                        self.out_edge_events = [edge.reserve_put() for edge in self.out_edges]
-                        triggered_out_edge_events = self.env.any_of(self.out_edge_events)
-                        yield triggered_out_edge_events  # Wait for any in_edge to be available
-                        
+                        # a single select waits on all out_edges and is granted by exactly one of them
+                        out_edge_select = ReservationSelect(self.env, "put")
+                        yield out_edge_select.reserve(self.out_edge_ops)  # Wait for any out_edge to be available
+                        self.out_edge_events = out_edge_select.requests
 
-                        # Find the first triggered event
-                        chosen_put_event = next((event for event in self.out_edge_events if event.triggered), None)
-                        edge_index = self.out_edge_events.index(chosen_put_event)  # Get the index of the chosen event
-                        self.out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
+                        chosen_put_event = out_edge_select.chosen
                         if chosen_put_event is None:
                             raise ValueError(f"{self.id} - No in_edge available for processing!")
-                        
-                        #cancelling already triggered out_edge events
-                        for event in self.out_edge_events:
-                            
-                            event.resourcename.reserve_put_cancel(event)
+                        edge_index = out_edge_select.index
                         #print(f"T={self.env.now:.2f}: {self.id} yielded 11111111from {self.out_edges[edge_index].id} ")
                         #putting the item in the chosen out_edge
                         item.set_creation(self.id, self.env)
                         item.timestamp_node_exit = self.env.now
                         #print(chosen_put_event.requesting_process, self)
-                        itemput=self.out_edges[edge_index].put(chosen_put_event, item)
+                        itemput=self.out_edge_ops[edge_index].put(chosen_put_event, item)
                         #itemput = chosen_put_event.resourcename.put(chosen_put_event, item)  # put the item to the chosen out_edge
                         #print(f"T={self.env.now:.2f}: {self.id} placed 222222 from {self.out_edges[edge_index].id} ")
                         #print(f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {chosen_put_event.resourcename} {item.timestamp_creation} ")
@@ -336,7 +309,8 @@ class Source(Node):
                             #print("yaay")
                         else:
                             item1 = itemput
-                            print(f"T={self.env.now:.2f}: {self.id} {item.id} pushed to buffer {self.out_edges[edge_index].id} ")
+                            if logger.debug_enabled:
+                                logger.debug(self, f"T={self.env.now:.2f}: {self.id} {item.id} pushed to buffer {self.out_edges[edge_index].id} ")
                         
                         #print(f"T={self.env.now:.2f}: {self.id} BLOCKED to generated after {self.env.now - blocking_start_time:.2f} seconds")
                         self.update_state("GENERATING_STATE", self.env.now)  # Update state back to GENERATING_STATE
@@ -345,9 +319,9 @@ class Source(Node):
 
                     else:
                         out_edge_index_to_put = None
-                        for edge in self.out_edges:
+                        for edge, edge_ops in zip(self.out_edges, self.out_edge_ops):
                             if edge.can_put():
-                                out_edge_to_put = edge
+                                out_edge_to_put = edge_ops
                                 break
                         
                         if out_edge_to_put is not None:
@@ -360,8 +334,11 @@ class Source(Node):
 
                             
                         else:               
-                            print(f"T={ self.env.now:.2f}: {self.id} is discarding item {item.id} because out_edge {edge.id} is full.")
+                            if logger.enabled:
+                                logger.warning(self, f"T={ self.env.now:.2f}: {self.id} is discarding item {item.id} because out_edge {edge.id} is full.")
                             self.stats["num_item_discarded"] += 1  # Decrement processed count if item is discarded
+                            if tracer.enabled:
+                                tracer.record(self, DISCARD, item, edge)
 
 
                         
@@ -370,20 +347,19 @@ class Source(Node):
 
 
                 else:
-                    print(f"T={self.env.now:.2f}: {self.id} generated item: {item.id}")
-                    out_edge_index_to_put = self._get_out_edge_index()
-                    if out_edge_index_to_put is None:
-                        raise ValueError(f"{self.id} - No out_edge available for processing!")
-                    if out_edge_index_to_put < 0 or out_edge_index_to_put >= len(self.out_edges):
-                        raise IndexError(f"{self.id}  - Invalid edge index {out_edge_index_to_put} for out_edges.")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} generated item: {item.id}")
+                    out_edge_index_to_put = self._select_out_edge()
                     outedge_to_put = self.out_edges[out_edge_index_to_put]
+                    out_edge_ops = self.out_edge_ops[out_edge_index_to_put]
 
                     if self.blocking:
                         blocking_start_time = self.env.now
-                        print(f"T={self.env.now:.2f}: {self.id} is in BLOCKED_STATE")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in BLOCKED_STATE")
                         self.update_state("BLOCKED_STATE", self.env.now)
                         
-                        yield self.env.process(self._push_item(item, outedge_to_put))
+                        yield self.env.process(self._push_item(item, out_edge_ops))
                         #print(f"T={self.env.now:.2f}: {self.id} BLOCKED to generated after {self.env.now - blocking_start_time:.2f} seconds")
                         self.update_state("GENERATING_STATE", self.env.now)  # Update state back to GENERATING_STATE
                         
@@ -392,11 +368,14 @@ class Source(Node):
                         if outedge_to_put.can_put():
                             blocking_start_time = self.env.now
                             
-                            yield self.env.process(self._push_item(item, outedge_to_put))
+                            yield self.env.process(self._push_item(item, out_edge_ops))
                             
                         else:
-                            print(f"T={self.env.now:.2f}: {self.id} is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
+                            if logger.enabled:
+                                logger.warning(self, f"T={self.env.now:.2f}: {self.id} is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
                             self.stats["num_item_discarded"] += 1
+                            if tracer.enabled:
+                                tracer.record(self, DISCARD, item, outedge_to_put)
                
                     
                 
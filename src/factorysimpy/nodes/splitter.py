@@ -1,7 +1,10 @@
 # splitter m input and 1 output without using cancel
 import simpy
 from factorysimpy.nodes.node import Node
-from factorysimpy.utils.utils import get_edge_selector
+from factorysimpy.utils.utils import get_edge_selector, compile_delay, compile_edge_selector
+from factorysimpy.base.reservations import ReservationSelect
+from factorysimpy.utils.logger import logger
+from factorysimpy.utils.trace import tracer, STATE_CHANGE
 
 
 
@@ -49,6 +52,9 @@ class Splitter(Node):
                     - "ROUND_ROBIN": Selects out edges in a round-robin manner.
                     - "FIRST_AVAILABLE": Selects the first out edge that can accept an item.
                 - callable: A function that returns an edge index.
+
+            bulk_reservations (bool): If True, a blocking Splitter with a single out edge that supports multi-unit reservations (Buffer, Fleet)
+                                      pushes the items of a pallet with a single `reserve_put(n)`. Default False.
             
 
         Behavior:
@@ -58,6 +64,9 @@ class Splitter(Node):
             `BLOCKED_STATE`. The Splitter has a blocking behavior if `blocking`=`True` and gets blocked when all its worker threads have processed items and the out edge is full and
             cannot accept the item that is being pushed by the Splitter and waits until the out edge can accept the item. If `blocking`=`False`, the Splitter will
             discard the item if the out edge is full and cannot accept the item that is being pushed by the Splitter.
+            By default the items of a pallet are pushed one by one. If `bulk_reservations`=`True`, a blocking Splitter with a single out edge
+            that supports multi-unit reservations unpacks a pallet with a single `reserve_put(n)`, provided the edge capacity allows it. The
+            items are then pushed together once the edge has room for all of them, so the results differ from the default.
 
 
         Raises:
@@ -72,7 +81,7 @@ class Splitter(Node):
                 
     """
 
-    def __init__(self, env, id, in_edges=None, out_edges=None,node_setup_time=0,processing_delay=0,blocking=True,mode= "UNPACK", split_quantity=None, in_edge_selection="FIRST_AVAILABLE",out_edge_selection="FIRST_AVAILABLE"):
+    def __init__(self, env, id, in_edges=None, out_edges=None,node_setup_time=0,processing_delay=0,blocking=True,mode= "UNPACK", split_quantity=None, in_edge_selection="FIRST_AVAILABLE",out_edge_selection="FIRST_AVAILABLE",bulk_reservations=False):
         super().__init__(env, id,in_edges, out_edges, node_setup_time)
         
         self.state = "SETUP_STATE"  # Initial state of the Splitter
@@ -80,6 +89,7 @@ class Splitter(Node):
         self.in_edge_selection = in_edge_selection
         self.out_edge_selection = out_edge_selection
         self.blocking = blocking
+        self.bulk_reservations = bulk_reservations
         self.mode = mode
         self.split_quantity = split_quantity
         self.per_thread_total_time_in_blocked_state = 0.0
@@ -178,6 +188,12 @@ class Splitter(Node):
                 raise ValueError("in_edge_selection should not be None")
             if self.out_edge_selection is None:
                 raise ValueError("out_edge_selection should not be None.")
+            # compiling the parameters once into callables, so that their types are not checked for every item
+            self._next_processing_delay = compile_delay(self.processing_delay, self.id)
+            if self.in_edge_selection != "FIRST_AVAILABLE":
+                self._select_in_edge = compile_edge_selector(self.in_edge_selection, self, "IN")
+            if self.out_edge_selection != "FIRST_AVAILABLE":
+                self._select_out_edge = compile_edge_selector(self.out_edge_selection, self, "OUT")
         
 
     
@@ -200,6 +216,8 @@ class Splitter(Node):
             self.stats["total_time_spent_in_states"][self.state] = (
                 self.stats["total_time_spent_in_states"].get(self.state, 0.0) + elapsed
             )
+        if tracer.enabled and new_state != self.state:
+            tracer.record(self, STATE_CHANGE, new_state)
         self.state = new_state
         self.stats["last_state_change_time"] = current_time
 
@@ -262,121 +280,65 @@ class Splitter(Node):
         else:
             raise ValueError(f"Edge already exists in Splitter '{self.id}' out_edges.")
         
-    def _get_out_edge_index(self):
-        
-         
-        # if it is a constant integer, use the value as is
-        if isinstance(self.out_edge_selection, int):
-            val = self.out_edge_selection
-        # if it is a generator, get the next value from the generator
-        elif hasattr(self.out_edge_selection, '__next__'):
-            # It's a generator
-            val = next(self.out_edge_selection)     
-        # if it is a function return the value returned by the function     
-        elif callable(self.out_edge_selection):
-            # It's a function (pass self and env if needed)
-            #return self.out_edge_selection(self, self.env)
-            val = self.out_edge_selection()       
-        else:
-            raise ValueError("out_edge_selection must be a generator or a callable.")   
-        # Check if the value is within the valid range of out_edges
-        #print(f"OUT: {val} {len(self.out_edges)}")
-        assert 0<= val < len(self.out_edges), f"{self.id} - Invalid edge index. {val} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for out_edges." 
-        self.stats["out_edge_selection"].append(val)
-        return val   
- 
 
-    def _get_in_edge_index(self):
-
-        # if it is a constant integer, use the value as is 
-        if isinstance(self.in_edge_selection, int):
-            val = self.in_edge_selection
-        # if it is a generator, get the next value from the generator
-        elif hasattr(self.in_edge_selection, '__next__'):
-            # It's a generator
-            val = next(self.in_edge_selection)    
-        # if it is a function return the value returned by the function
-        elif callable(self.in_edge_selection):
-          
-            val = self.in_edge_selection()   
-        else:
-            raise ValueError("in_edge_selection must be a generator or a callable.")    
-        # Check if the value is within the valid range of in_edges
-        #print( val )
-        assert 0<=val < len(self.in_edges), f"{self.id} - Invalid edge index. {val} is not in range. Range must be between {0} and  {len(self.in_edges)-1} for in_edges."
-        self.stats["in_edge_selection"].append(val)
-        return val
-                  
-   
 
     def _push_item(self, item_to_push, out_edge):
         """
         It picks a processed item from the store and pushes it to the specified out_edge.
-        The out_edge can be a ConveyorBelt or Buffer.
         Args:
             item_to_push (BaseFlowItem Object): Item to be pushed.
-            out_edge (Edge Object): The edge to which the item will be pushed.
+            out_edge (EdgeOps): Edge protocol of the edge to which the item will be pushed.
 
 
         """
-       
-        if out_edge.__class__.__name__ == "ConveyorBelt":                 
-                put_token = out_edge.reserve_put()
-                pe = yield put_token
-                item_to_push.update_node_event(self.id, self.env, "exit")
-                
-                y=out_edge.put(pe, item_to_push)
-                if y:
-                    print(f"T={self.env.now:.2f}: {self.id} puts {item_to_push.id} item into {out_edge.id}  ")
-        elif out_edge.__class__.__name__ == "Buffer":
-                outstore = out_edge
-                put_token = outstore.reserve_put()
-                yield put_token
-                item_to_push.update_node_event(self.id, self.env, "exit")
-                y=outstore.put(put_token, item_to_push)
-                if y:
-                    print(f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id}")
-        else:
-                raise ValueError(f"Unsupported edge type: {out_edge.__class__.__name__}")
-        
+        put_token = out_edge.reserve_put()
+        yield put_token
+        item_to_push.update_node_event(self.id, self.env, "exit")
+        y=out_edge.put(put_token, item_to_push)
+        if y:
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item into {out_edge.id}")
+        
+    def _push_items_in_bulk(self, pallet, out_edge):
+        """
+        It unpacks all the items of the pallet and pushes them to the out_edge using a single multi-unit reservation.
+        Args:
+            pallet (Pallet Object): Pallet whose items are pushed. It is empty afterwards.
+            out_edge (EdgeOps): Edge protocol of the edge to which the items will be pushed. The edge must support multi-unit reservations.
+        """
+        items = pallet.items[:]
+        pallet.items.clear()
+        blocking_start_time = self.env.now
+        put_token = out_edge.reserve_put(n=len(items))
+        yield put_token
+        for item in items:
+            item.update_node_event(self.id, self.env, "exit")
+        if self.out_edge_selection == "FIRST_AVAILABLE":
+            self.stats["out_edge_selection"].extend([0] * len(items))
+        self.stats["num_item_processed"] += len(items)
+        out_edge.put(put_token, items)
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts {len(items)} items into {out_edge.id}")
+        self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
+
     def _pull_item(self, in_edge):
         """
         It pulls an item from the specified in_edge and assigns it to the worker for processing.
         Args:
            
-            in_edge (Edge Object): The edge from which the item will be pulled.
+            in_edge (EdgeOps): Edge protocol of the edge from which the item will be pulled.
 
         """
-
-        if in_edge.__class__.__name__ == "ConveyorBelt":
-               
-                get_token = in_edge.reserve_get()
-                
-                gtoken = yield get_token
-                
-                pulled_item = yield in_edge.get(gtoken)
-                pulled_item.update_node_event(self.id, self.env, "entry")
-                              
-                if pulled_item is not None:
-                    print(f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
-                    self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
-                    
-                else:
-                    raise ValueError(f"{self.id} - No item pulled from in_edge {in_edge.id}!")
-                
-        elif in_edge.__class__.__name__ == "Buffer":
-                outstore = in_edge
-                get_token = outstore.reserve_get()
-                yield get_token
-                pulled_item =outstore.get(get_token)
-                pulled_item.update_node_event(self.id, self.env, "entry")
-                if pulled_item is not None:
-                    print(f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
-                    self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
-                else:
-                    raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge.id}!")
+        get_token = in_edge.reserve_get()
+        yield get_token
+        pulled_item =in_edge.get(get_token)
+        if pulled_item is not None:
+            pulled_item.update_node_event(self.id, self.env, "entry")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} gets item {pulled_item.id} from {in_edge.id} ")
+            self.item_in_process= pulled_item  # Assign the pulled item to the item_in_process attribute
         else:
-                raise ValueError(f"Unsupported edge type: {in_edge.__class__.__name__}")
+            raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge.id}!")
               
             
     
@@ -441,36 +403,12 @@ class Splitter(Node):
 
             
     
-    def _count_worker_state(self):
-        """
-        Counts and returns the number of threads in "PROCESSING_STATE" and "BLOCKED_STATE"
-        using self.worker_thread_list.
-    
-        Returns:
-            num_threads_PROCESSING (int): Number of threads in "PROCESSING_STATE"
-            num_threads_BLOCKED (int): Number of threads in "BLOCKED_STATE"
-        """
-        if not self.worker_thread_list:
-            num_threads_PROCESSING = 0
-            num_threads_BLOCKED = 0
-        else:
-            num_threads_PROCESSING = sum(
-                proc.thread_state == "PROCESSING_STATE" for proc in self.worker_thread_list
-            )
-            num_threads_BLOCKED = sum(
-                proc.thread_state == "BLOCKED_STATE" for proc in self.worker_thread_list
-            )
-    
-        assert 0 <= num_threads_BLOCKED <= self.work_capacity \
-            and 0 <= num_threads_PROCESSING <= self.work_capacity \
-            and 0 <= num_threads_BLOCKED + num_threads_PROCESSING <= self.work_capacity, \
-            f"T={self.env.now:.2f} {self.id} has more threads than work_capacity is created. num_threads_PROCESSING={num_threads_PROCESSING}, num_threads_BLOCKED={num_threads_BLOCKED}, work_capacity={self.work_capacity}"
-        return num_threads_PROCESSING, num_threads_BLOCKED
     
     # --- DEBUG TRACE ----------------------------------------------------------
     def _dbg(self, msg):
         # tiny helper so we can switch it off easily
-        print(f"{self.env.now:5.2f}  {self.id}: {msg}")
+        if logger.debug_enabled:
+            logger.debug(self, f"{self.env.now:5.2f}  {self.id}: {msg}")
     # -------------------------------------------------------------------------
 
     def check_thread_state_and_update_splitter_state_flexsim(self):
@@ -510,14 +448,16 @@ class Splitter(Node):
         elif numthreads_BLOCKED ==len(self.worker_thread_list):
         #elif numthreads_BLOCKED >=1:
             #print(self.env.now, numthreads_BLOCKED,len(self.worker_thread.users))
-            print(f"T={self.env.now:.2f}: {self.id} is in BLOCKED_STATE")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in BLOCKED_STATE")
             self.update_state("BLOCKED_STATE", self.env.now)
 
      
         
         else:
-            print("goingtofail")
-            print(numthreads_BLOCKED, numthreads_PROCESSING, self.work_capacity, len(self.worker_thread.users), len(self.worker_thread_list) )
+            if logger.enabled:
+                logger.error(self, "goingtofail")
+                logger.error(self, numthreads_BLOCKED, numthreads_PROCESSING, self.work_capacity, len(self.worker_thread.users), len(self.worker_thread_list))
             raise ValueError(f"{self.id} - Invalid worker thread state. numthreads_PROCESSING={numthreads_PROCESSING}, numthreads_BLOCKED={numthreads_BLOCKED}, work_capacity={self.work_capacity}")
     def check_thread_state_and_update_splitter_state1(self):
         
@@ -546,11 +486,19 @@ class Splitter(Node):
             #self.stats["num_item_processed"] += 1
             self._update_avg_time_spent_in_processing(self.env.now - processing_start_time)  # Update the average time spent in processing
             
+            # items that all go to the only out_edge are pushed together with one reservation
+            if (self.bulk_reservations and self.blocking and len(self.out_edges) == 1 and len(pallet.items) > 1
+                    and self.out_edges[0].multi_unit_reservations and len(pallet.items) <= self.out_edges[0].capacity):
+                self._set_thread_state(self.env.active_process, "BLOCKED_STATE")
+                self.check_thread_state_and_update_splitter_state()
+                yield self.env.process(self._push_items_in_bulk(pallet, self.out_edge_ops[0]))
+
             # First, process all items from the pallet
             while len(pallet.items) > 0:
                 #print("!!!!!!!!!", len(pallet.items))
                 item = pallet.items.pop(0)
-                print(f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
                 # pushing the item to the out_edge based on the out_edge_selection method
                 
 
@@ -559,44 +507,27 @@ class Splitter(Node):
                     # if blocking yield reserve_put on all out_edges and take the one with min index and cancel others and push item
                     if self.blocking:
                         self.check_thread_state_and_update_splitter_state()
-                        self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                        self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                         self.check_thread_state_and_update_splitter_state()
                         blocking_start_time = self.env.now
                     
-                        #self.out_edge_events = [edge.reserve_put() if edge.__class__.__name__ == "ConveyorBelt" else edge.inbuiltstore.reserve_put() for edge in self.out_edges]
-                        #out_edge_events = [self.out_edges[i].inbuiltstore.reserve_put() for i in range(len(self.out_edges)-1,-1,-1)]
-                        out_edge_events= [edge.reserve_put() for edge in self.out_edges]  # Filter out None events
-                        #print(self.env.now,len(self.out_edge_events),self.out_edges)
-                        triggered_out_edge_events = self.env.any_of(out_edge_events)
-                        yield triggered_out_edge_events  # Wait for any in_edge to be available
-                        
-                        chosen_put_event = next((event for event in out_edge_events if event.triggered), None)
-                        
-                        
-                        #self.out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
+                        # a single select waits on all out_edges and is granted by exactly one of them
+                        out_edge_select = ReservationSelect(self.env, "put")
+                        yield out_edge_select.reserve(self.out_edge_ops)  # Wait for any out_edge to be available
+
+                        chosen_put_event = out_edge_select.chosen
                         if chosen_put_event is None:
                             raise ValueError(f"{self.env.now},{self.id} - No out_edge available for processing{[edge.id for edge in self.out_edges]}!")
-                        edge_index = out_edge_events.index(chosen_put_event)
+                        edge_index = out_edge_select.index
                         self.stats["out_edge_selection"].append(edge_index)  # Store the index of the chosen out_edge
-                        #out_edge_events.remove(chosen_put_event)  # Remove the chosen event from the list
-                        #cancelling already triggered out_edge events
-                        for event in out_edge_events:
-                            #if event.triggered and event is not chosen_put_event:
-                            if event is not chosen_put_event:
-                                event.resourcename.reserve_put_cancel(event)
-                        #out_edge_events=[]
 
                         #putting the item in the chosen out_edge
                         
                         item.update_node_event(self.id, self.env, "exit")
-                        if self.out_edges[edge_index].__class__.__name__ == "Buffer":
-                            self.stats["num_item_processed"] += 1
-                            itemput=self.out_edges[edge_index].put(chosen_put_event, item)
-                            #itemput = chosen_put_event.resourcename.put(chosen_put_event, item)  # Get the item from the chosen in_edge
-
-                        else:
-                            raise ValueError(f"Unsupported edge type: {self.out_edges[edge_index].__class__.__name__}")
-                        print(f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {self.out_edges[edge_index].id} ")
+                        self.stats["num_item_processed"] += 1
+                        itemput=self.out_edge_ops[edge_index].put(chosen_put_event, item)
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts item {item.id} into {self.out_edges[edge_index].id} ")
                         
                         self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                         #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
@@ -609,19 +540,21 @@ class Splitter(Node):
                     #not blocking, check can_put on all, if all fails, then the item is discarded
                     else:
                         out_edge_index_to_put = None
-                        for edge in self.out_edges:
+                        for index, edge in enumerate(self.out_edges):
                             if edge.can_put():
-                                out_edge_index_to_put = edge
+                                out_edge_index_to_put = index
                                 break
                         
                         if out_edge_index_to_put is not None:
+                            edge = self.out_edges[out_edge_index_to_put]
                             blocking_start_time = self.env.now
                             self.check_thread_state_and_update_splitter_state()
-                            self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                            self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                             self.check_thread_state_and_update_splitter_state()
-                            yield self.env.process(self._push_item(item, out_edge_index_to_put)) 
+                            yield self.env.process(self._push_item(item, self.out_edge_ops[out_edge_index_to_put])) 
                             self.stats["num_item_processed"] += 1 
-                            print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {out_edge_index_to_put.id} ")
+                            if logger.debug_enabled:
+                                logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {edge.id} ")
                             #self.check_thread_state_and_update_splitter_state()
                             #self.env.active_process.thread_state = "PROCESSING_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
                             
@@ -630,7 +563,8 @@ class Splitter(Node):
 
                             
                         else:               
-                            print(f"T={ self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {edge.id} is full.")
+                            if logger.enabled:
+                                logger.warning(self, f"T={ self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {edge.id} is full.")
                             self.stats["num_item_discarded"] += 1  # Decrement processed count if item is discarded
 
 
@@ -640,26 +574,30 @@ class Splitter(Node):
 
                 #out_edge_selection is not "FIRST_AVAILABLE" ---> get index value and push the item if not blocking
                 else:
-                    print(f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
-                    out_edge_index_to_put = self._get_out_edge_index()
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker processed item: {item.id}")
+                    out_edge_index_to_put = self._select_out_edge()
                     #print("OUT",out_edge_index_to_put)
-                    assert 0<=out_edge_index_to_put < len(self.out_edges), f"{self.id} - Invalid edge index. {out_edge_index_to_put} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for in_edges."
                     outedge_to_put = self.out_edges[out_edge_index_to_put]
+                    out_edge_ops = self.out_edge_ops[out_edge_index_to_put]
                     #push the item if not blocking
-                    self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                    self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                     self.check_thread_state_and_update_splitter_state()
                     if self.blocking:
                         blocking_start_time = self.env.now
-                        print(f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
                         #yield self.env.process(self._push_item(item, outedge_to_put))
-                        put_event=outedge_to_put.reserve_put()
+                        put_event=out_edge_ops.reserve_put()
                         yield put_event
-                        print(f"T={self.env.now:.2f}: {self.id} yielded and worker is putting item {item.id} into {outedge_to_put.id} " )
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded and worker is putting item {item.id} into {outedge_to_put.id} ")
                         item.update_node_event(self.id, self.env, "exit")
                         self.stats["num_item_processed"] += 1
-                        y=outedge_to_put.put(put_event, item)
+                        y=out_edge_ops.put(put_event, item)
                         if y:
-                            print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
+                            if logger.debug_enabled:
+                                logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
                         self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                         #self.check_thread_state_and_update_splitter_state()  # Check and update the splitter state after blocking
                     #check can_put and only if it succeeds push the item if not blocking
@@ -667,16 +605,19 @@ class Splitter(Node):
                         # Check if the out_edge can accept the item
                         if outedge_to_put.can_put():
                             blocking_start_time = self.env.now
-                            yield self.env.process(self._push_item(item, outedge_to_put))
+                            yield self.env.process(self._push_item(item, out_edge_ops))
                             self.stats["num_item_processed"] += 1
-                            print(f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
+                            if logger.debug_enabled:
+                                logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts item {item.id} into {outedge_to_put.id} ")
                             self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                         else:
-                            print(f"T={self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
+                            if logger.enabled:
+                                logger.warning(self, f"T={self.env.now:.2f}: {self.id} worker is discarding item {item.id} because out_edge {outedge_to_put.id} is full.")
                             self.stats["num_item_discarded"] += 1
             
             # After all items are processed, handle the empty pallet
-            print(f"T={self.env.now:.2f}: {self.id} worker processing empty pallet: {pallet.id}")
+            if logger.debug_enabled:
+                logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker processing empty pallet: {pallet.id}")
             item = pallet  # The empty pallet becomes the item to process
             
             #out_edge_selection is "FIRST_AVAILABLE"---> 
@@ -684,90 +625,91 @@ class Splitter(Node):
                 # if blocking yield reserve_put on all out_edges and take the one with min index and cancel others and push item
                 if self.blocking:
                     self.check_thread_state_and_update_splitter_state()
-                    self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                    self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                     self.check_thread_state_and_update_splitter_state()
                     blocking_start_time = self.env.now
                 
-                    out_edge_events= [edge.reserve_put() for edge in self.out_edges]  # Filter out None events
-                    triggered_out_edge_events = self.env.any_of(out_edge_events)
-                    yield triggered_out_edge_events  # Wait for any in_edge to be available
-                    
-                    chosen_put_event = next((event for event in out_edge_events if event.triggered), None)
-                    
+                    # a single select waits on all out_edges and is granted by exactly one of them
+                    out_edge_select = ReservationSelect(self.env, "put")
+                    yield out_edge_select.reserve(self.out_edge_ops)  # Wait for any out_edge to be available
+
+                    chosen_put_event = out_edge_select.chosen
                     if chosen_put_event is None:
                         raise ValueError(f"{self.env.now},{self.id} - No out_edge available for processing{[edge.id for edge in self.out_edges]}!")
-                    edge_index = out_edge_events.index(chosen_put_event)
+                    edge_index = out_edge_select.index
                     self.stats["out_edge_selection"].append(edge_index)  # Store the index of the chosen out_edge
-                    
-                    #cancelling already triggered out_edge events
-                    for event in out_edge_events:
-                        if event is not chosen_put_event:
-                            event.resourcename.reserve_put_cancel(event)
 
                     #putting the item in the chosen out_edge
                     item.update_node_event(self.id, self.env, "exit")
-                    if self.out_edges[edge_index].__class__.__name__ == "Buffer":
-                        self.stats["num_item_processed"] += 1
-                        itemput=self.out_edges[edge_index].put(chosen_put_event, item)
-                    else:
-                        raise ValueError(f"Unsupported edge type: {self.out_edges[edge_index].__class__.__name__}")
-                    print(f"T={self.env.now:.2f}: {self.id} puts empty pallet {item.id} into {self.out_edges[edge_index].id} ")
+                    self.stats["num_item_processed"] += 1
+                    itemput=self.out_edge_ops[edge_index].put(chosen_put_event, item)
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} puts empty pallet {item.id} into {self.out_edges[edge_index].id} ")
                     
                     self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     
                 #not blocking, check can_put on all, if all fails, then the item is discarded
                 else:
                     out_edge_index_to_put = None
-                    for edge in self.out_edges:
+                    for index, edge in enumerate(self.out_edges):
                         if edge.can_put():
-                            out_edge_index_to_put = edge
+                            out_edge_index_to_put = index
                             break
                     
                     if out_edge_index_to_put is not None:
+                        edge = self.out_edges[out_edge_index_to_put]
                         blocking_start_time = self.env.now
                         self.check_thread_state_and_update_splitter_state()
-                        self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                        self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                         self.check_thread_state_and_update_splitter_state()
-                        yield self.env.process(self._push_item(item, out_edge_index_to_put)) 
+                        yield self.env.process(self._push_item(item, self.out_edge_ops[out_edge_index_to_put])) 
                         self.stats["num_item_processed"] += 1 
-                        print(f"T={self.env.now:.2f}: {self.id} worker puts empty pallet {item.id} into {out_edge_index_to_put.id} ")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts empty pallet {item.id} into {edge.id} ")
                         self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     else:               
-                        print(f"T={ self.env.now:.2f}: {self.id} worker is discarding empty pallet {item.id} because out_edge {edge.id} is full.")
+                        if logger.enabled:
+                            logger.warning(self, f"T={ self.env.now:.2f}: {self.id} worker is discarding empty pallet {item.id} because out_edge {edge.id} is full.")
                         self.stats["num_item_discarded"] += 1
 
             #out_edge_selection is not "FIRST_AVAILABLE" ---> get index value and push the item if not blocking
             else:
-                print(f"T={self.env.now:.2f}: {self.id} worker processed empty pallet: {item.id}")
-                out_edge_index_to_put = self._get_out_edge_index()
-                assert 0<=out_edge_index_to_put < len(self.out_edges), f"{self.id} - Invalid edge index. {out_edge_index_to_put} is not in range. Range must be between {0} and  {len(self.out_edges)-1} for in_edges."
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker processed empty pallet: {item.id}")
+                out_edge_index_to_put = self._select_out_edge()
                 outedge_to_put = self.out_edges[out_edge_index_to_put]
+                out_edge_ops = self.out_edge_ops[out_edge_index_to_put]
                 #push the item if not blocking
-                self.env.active_process.thread_state = "BLOCKED_STATE"  # Update the thread state to PROCESSING_STATE BLOCKING
+                self._set_thread_state(self.env.active_process, "BLOCKED_STATE")  # Update the thread state to PROCESSING_STATE BLOCKING
                 self.check_thread_state_and_update_splitter_state()
                 if self.blocking:
                     blocking_start_time = self.env.now
-                    print(f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
-                    put_event=outedge_to_put.reserve_put()
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker is in BLOCKED_STATE")
+                    put_event=out_edge_ops.reserve_put()
                     yield put_event
-                    print(f"T={self.env.now:.2f}: {self.id} yielded and worker is putting empty pallet {item.id} into {outedge_to_put.id} " )
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded and worker is putting empty pallet {item.id} into {outedge_to_put.id} ")
                     item.update_node_event(self.id, self.env, "exit")
                     self.stats["num_item_processed"] += 1
-                    y=outedge_to_put.put(put_event, item)
+                    y=out_edge_ops.put(put_event, item)
                     if y:
-                        print(f"T={self.env.now:.2f}: {self.id} worker puts empty pallet {item.id} into {outedge_to_put.id} ")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts empty pallet {item.id} into {outedge_to_put.id} ")
                     self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                 #check can_put and only if it succeeds push the item if not blocking
                 else:
                     # Check if the out_edge can accept the item
                     if outedge_to_put.can_put():
                         blocking_start_time = self.env.now
-                        yield self.env.process(self._push_item(item, outedge_to_put))
+                        yield self.env.process(self._push_item(item, out_edge_ops))
                         self.stats["num_item_processed"] += 1
-                        print(f"T={self.env.now:.2f}: {self.id} worker puts empty pallet {item.id} into {outedge_to_put.id} ")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker puts empty pallet {item.id} into {outedge_to_put.id} ")
                         self._update_avg_time_spent_in_blocked(self.env.now - blocking_start_time)
                     else:
-                        print(f"T={self.env.now:.2f}: {self.id} worker is discarding empty pallet {item.id} because out_edge {outedge_to_put.id} is full.")
+                        if logger.enabled:
+                            logger.warning(self, f"T={self.env.now:.2f}: {self.id} worker is discarding empty pallet {item.id} because out_edge {outedge_to_put.id} is full.")
                         self.stats["num_item_discarded"] += 1
                         
                 # Release the worker thread after processing
@@ -776,6 +718,7 @@ class Splitter(Node):
             yield self.worker_thread.release(req_token)  # Release the worker thread
       
             #delete the worker thread from the worker_thread_list
+            self._set_thread_state(self.env.active_process, None)
             if self.env.active_process in self.worker_thread_list:
                 self.worker_thread_list.remove(self.env.active_process)
             self._update_worker_occupancy(action="REMOVE")  # Update worker occupancy after processing
@@ -792,13 +735,15 @@ class Splitter(Node):
         #checking of the splitter has atleast 1 in_edge and 1 out_edge
         assert self.in_edges is not None and len(self.in_edges) >= 1, f"Splitter '{self.id}' must have atleast 1 in_edge."
         assert self.out_edges is not None and len(self.out_edges) >= 1, f"Splitter '{self.id}' must have atleast 1 out_edge."
+        self._resolve_edge_ops()
 
 
         while True:
             #print(f"T={self.env.now:.2f}: {self.id} worker{i} started processing")
             if self.state == "SETUP_STATE":
                 
-                print(f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in SETUP_STATE")
                 yield self.env.timeout(self.node_setup_time)# always an int or float
                 self.update_state("IDLE_STATE", self.env.now)
 
@@ -810,95 +755,42 @@ class Splitter(Node):
             
                 #self._update_worker_occupancy(action="UPDATE")
                 self.check_thread_state_and_update_splitter_state()               
-                print(f"T={self.env.now:.2f}: {self.id} is in {self.state}")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} is in {self.state}")
                 
                 #in_edge_selection is "FIRST_AVAILABLE"--->     yield in a list, select one with min. index value and cancel other and pull item
                 if self.in_edge_selection == "FIRST_AVAILABLE":
                     
-                    #if not self.in_edge_events:
-                    self.in_edge_events=  [edge.reserve_get() for edge in self.in_edges]
-
-                    # for i in self.in_edges:
-                    #     if len(i.inbuiltstore.items):
-
-                    #        print( f"T={self.env.now:.2f}: {self.id} in {i.id} item entry time - {[item.timestamp_node_exit for item in i.inbuiltstore.items] } and no. of reservations {len(i.inbuiltstore.reservations_get)} ") # Update the timestamp of items in the inbuilt store 
-                    #        #if len(i.inbuiltstore.reservations_get):
-                                                     
-                    #     else:
-                    #         print(f"T={self.env.now:.2f}: {self.id} in {i.id} is empty")
-                    #self.in_edge_events = [self.in_edges[i].inbuiltstore.reserve_get() for i in range(len(self.in_edges)-1,-1,-1)]
-                    print(f"T={self.env.now:.2f}: {self.id} waiting for in_edge events to be triggered")
-                    #print(f"T={self.env.now:.2f}: {self.id} in_edge_events: {[event.resourcename for event in self.in_edge_events]}")  # Debugging line to check in_edge_events
-                    triggered_in_edge_events = self.env.any_of(self.in_edge_events)
-                    
-                    yield triggered_in_edge_events  # Wait for any in_edge to be available
-                    trig_count = [1 if event.triggered else 0 for event in self.in_edge_events]
-                    #print(f"T={self.env.now:.2f}: {self.id} no of trigerred events {sum(trig_count)} , {trig_count}, in_edge_events triggered")
-                    # Find the first triggered event           
-                    self.chosen_event = next((event for event in self.in_edge_events if event.triggered), None)
+                    # a single select waits on all in_edges and is granted by exactly one of them
+                    in_edge_select = ReservationSelect(self.env, "get")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} waiting for in_edge events to be triggered")
+                    yield in_edge_select.reserve(self.in_edge_ops)  # Wait for any in_edge to be available
+                    self.in_edge_events = in_edge_select.requests
+                    self.chosen_event = in_edge_select.chosen
                     if self.chosen_event is None:
                         raise ValueError(f"{self.id} - No in_edge available for processing!")
-                    # Find the index of the chosen event in the in_edge_events list
-                    edge_index_to_print = None
-                    for i in range(len(self.in_edges)):
-                        #print(self.chosen_event.resourcename, self.in_edges[i])
-                        if self.in_edges[i].__class__.__name__ == "Buffer" or self.in_edges[i].__class__.__name__ == "Fleet":
-                            if self.chosen_event.resourcename == self.in_edges[i].inbuiltstore :
-                        
-                                edge_index_to_print=i
-                        elif self.in_edges[i].__class__.__name__ == "ConveyorBelt":
-
-                            #print(self.chosen_event.resourcename, self.in_edges[i].belt)
-                            #if self.chosen_event.resourcename == self.in_edges[i].out_buf:
-                            if self.chosen_event.resourcename == self.in_edges[i].belt:
-                                
-                                edge_index_to_print=i
-                        else:
-                            raise ValueError(f"Unsupported edge type: {self.in_edges[i].__class__.__name__}")
+                    edge_index = in_edge_select.index
 
-                            
-                    edge_index = self.in_edge_events.index(self.chosen_event)  # Get the index of the chosen event
-                    assert edge_index == edge_index_to_print, f"{self.id} - Edge index mismatch. {edge_index} != {edge_index_to_print}. Check the in_edge_events and in_edges."
-                    
-                    #print("!!!!!!",edge_index)
                     self.stats["in_edge_selection"].append(edge_index)
                     
-                    print(f"T={self.env.now:.2f}: {self.id} yielded from {self.in_edges[edge_index].id} ")
-                    
-                    
-                    #self.in_edge_events.remove(self.chosen_event)  # Remove the chosen event from the list
-                    #cancelling already triggered in_edge events other than chosen events
-                    
-                    for event in self.in_edge_events:
-                        event_cancelled = False
-                        #if event.triggered and event is not self.chosen_event:
-                        if  event is not self.chosen_event:
-                            #print(f"T={self.env.now:.2f}: {self.id} cancelling  in_edge events  ")
-                            event_cancelled = event.resourcename.reserve_get_cancel(event)
-                            if not event_cancelled:
-                                raise ValueError(f"{self.id} - Failed to cancel reserve_get for event {event}.")
-                            
-                        #self.in_edge_events=[]
-
-                    
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} yielded from {self.in_edges[edge_index].id} ")
 
                     # Create workers based on work_capacity
                     worker_thread_req = self.worker_thread.request()  # Request a worker thread
-                    print(f"T={self.env.now:.2f}: {self.id} requested worker thread for processing item from {self.in_edges[edge_index].id} ")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} requested worker thread for processing item from {self.in_edges[edge_index].id} ")
                     yield worker_thread_req
-                    print(f"T={self.env.now:.2f}: {self.id} got worker thread for processing item from {self.in_edges[edge_index].id} ")
+                    if logger.debug_enabled:
+                        logger.debug(self, f"T={self.env.now:.2f}: {self.id} got worker thread for processing item from {self.in_edges[edge_index].id} ")
                     
                     
                     #update occupancy
                     self._update_worker_occupancy(action="ADD")
 
-                    if self.in_edges[edge_index].__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                        self.pallet_in_process=self.in_edges[edge_index].get(self.chosen_event)  # Get the item from the chosen in_edge
-                        #print("getting getting getting getting  item from in_edge", self.chosen_event.resourcename)
-                        #self.pallet_in_process = self.chosen_event.resourcename.get(self.chosen_event)  # Get the item from the chosen in_edge
-                        self.pallet_in_process.update_node_event(self.id, self.env, "entry")
-                    else:
-                        raise ValueError(f"Unsupported edge type: {self.in_edges[edge_index].__class__.__name__}")
+                    self.pallet_in_process=self.in_edge_ops[edge_index].get(self.chosen_event)  # Get the item from the chosen in_edge
+                    self.pallet_in_process.update_node_event(self.id, self.env, "entry")
                     #print(f"T={self.env.now:.2f}: {self.id} received item {item.id} from {self.in_edges[edge_index].id} ")
                     
                     
@@ -906,10 +798,9 @@ class Splitter(Node):
                 #in_edge_selection is not "FIRST_AVAILABLE"---> use get_in_edge_index and pull item
                 else:
                     #print("not_first_available")
-                    in_edge_index = self._get_in_edge_index()
+                    in_edge_index = self._select_in_edge()
                     #print(self.id, in_edge_index)
                     
-                    assert type(in_edge_index)==int and 0<=in_edge_index < len(self.in_edges), f"{self.id} - Invalid edge index. {in_edge_index} is not in range. Range must be between {0} and  {len(self.in_edges)-1} for in_edges."
                     #print("IN", in_edge_index)
                     in_edge_to_get = self.in_edges[in_edge_index]
                     
@@ -919,27 +810,24 @@ class Splitter(Node):
                     
                     
 
-                    if in_edge_to_get.__class__.__name__ in ["Buffer", "Fleet", "ConveyorBelt"]:
-                        outstore = in_edge_to_get
-                        get_token = outstore.reserve_get()
-                        yield get_token
-                         # Create workers based on work_capacity
-                        worker_thread_req = self.worker_thread.request()  # Request a worker thread
-                        yield worker_thread_req
-                        #update occupancy
-                        self._update_worker_occupancy(action="ADD")
-                        
-                        
-                        self.pallet_in_process =outstore.get(get_token)
-                        
-                        if self.pallet_in_process  is not None:
-                            #print(self.pallet_in_process)
-                            self.pallet_in_process .update_node_event(self.id, self.env, "entry")
-                            print(f"T={self.env.now:.2f}: {self.id} gets item {self.pallet_in_process .id} from {in_edge_to_get.id} ")
-                        else:
-                            raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge_to_get.id}!")
+                    in_edge_ops = self.in_edge_ops[in_edge_index]
+                    get_token = in_edge_ops.reserve_get()
+                    yield get_token
+                     # Create workers based on work_capacity
+                    worker_thread_req = self.worker_thread.request()  # Request a worker thread
+                    yield worker_thread_req
+                    #update occupancy
+                    self._update_worker_occupancy(action="ADD")
+                    
+                    
+                    self.pallet_in_process =in_edge_ops.get(get_token)
+                    
+                    if self.pallet_in_process  is not None:
+                        self.pallet_in_process .update_node_event(self.id, self.env, "entry")
+                        if logger.debug_enabled:
+                            logger.debug(self, f"T={self.env.now:.2f}: {self.id} gets item {self.pallet_in_process .id} from {in_edge_to_get.id} ")
                     else:
-                        raise ValueError(f"Unsupported edge type: {in_edge_to_get.__class__.__name__}")
+                        raise ValueError(f"T={self.env.now:.2f}: {self.id} - No item pulled from in_edge {in_edge_to_get.id}!")
 
 
 
@@ -957,14 +845,15 @@ class Splitter(Node):
                 # #update occupancy
                 # self._update_worker_occupancy(action="ADD")
                 #get processing_time
-                next_processing_time = self.get_delay(self.processing_delay)
+                next_processing_time = self._next_processing_delay()
                 #print("!!!!!!!!!!!!!!!!!!EGKEKHRTUOYO!!!!!!!!!!!!!!!!!!!!!!!!!", next_processing_time)
 
                 self.stats["processing_delay"].append(next_processing_time)  # Update the processing delay in stats
-                print(f"T={self.env.now:.2f}: {self.id} worker started processing item {self.pallet_in_process.id} ")
+                if logger.debug_enabled:
+                    logger.debug(self, f"T={self.env.now:.2f}: {self.id} worker started processing item {self.pallet_in_process.id} ")
                 #spawn a worker process
-                proc = self.env.process(self.worker(self.pallet_in_process, next_processing_time, worker_thread_req))  # Start the worker process
-                proc.thread_state="PROCESSING_STATE" # Set the thread state to PROCESSING_STATE
+                proc = self.env.process(self._run_worker_thread(self.worker(self.pallet_in_process, next_processing_time, worker_thread_req)))  # Start the worker process
+                self._set_thread_state(proc, "PROCESSING_STATE") # Set the thread state to PROCESSING_STATE
                 #proc.item_to_put = self.item_in_process # Set the item to be put by the worker process
                 self.worker_thread_list.append(proc)  # Add the worker process to the worker_thread_list
                 self.check_thread_state_and_update_splitter_state()  # Check and update the splitter state based on worker states
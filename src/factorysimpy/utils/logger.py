@@ -0,0 +1,231 @@
+import sys
+from collections import deque
+
+# Log levels, ordered by severity
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR", OFF: "OFF"}
+
+
+class LogRecord:
+    """
+    A single log entry emitted by a component.
+
+    Parameters:
+        time (float or None): Simulation time at which the record was emitted (None if the component has no environment).
+        level (int): Severity level of the record.
+        component (str): Id of the emitting component (or its class name if it has no id).
+        message (str): The formatted message.
+    """
+    __slots__ = ("time", "level", "component", "message")
+
+    def __init__(self, time, level, component, message):
+        self.time = time
+        self.level = level
+        self.component = component
+        self.message = message
+
+    def __repr__(self):
+        return f"LogRecord(time={self.time}, level={LEVEL_NAMES.get(self.level, self.level)}, component={self.component!r}, message={self.message!r})"
+
+
+class StreamSink:
+    """
+    Writes every record as a line to a text stream (stdout by default).
+    """
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, record):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(record.message + "\n")
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """
+    Appends every record as a line to a file.
+
+    Parameters:
+        path (str): Path of the log file.
+        mode (str): File open mode, "w" (default) or "a".
+    """
+    def __init__(self, path, mode="w"):
+        self.path = path
+        self._file = open(path, mode)
+
+    def emit(self, record):
+        self._file.write(f"{LEVEL_NAMES.get(record.level, record.level)}\t{record.component}\t{record.message}\n")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class RingBufferSink:
+    """
+    Keeps the last `capacity` records in memory.
+
+    Parameters:
+        capacity (int): Maximum number of records retained. Older records are dropped.
+    """
+    def __init__(self, capacity=10000):
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity must be a positive integer.")
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def clear(self):
+        self.records.clear()
+
+    def close(self):
+        pass
+
+
+class CallbackSink:
+    """
+    Passes every record to a user supplied function `callback(record)`.
+    """
+    def __init__(self, callback):
+        if not callable(callback):
+            raise ValueError("callback must be callable.")
+        self.callback = callback
+
+    def emit(self, record):
+        self.callback(record)
+
+    def close(self):
+        pass
+
+
+class SimLogger:
+    """
+    Level gated logger shared by all nodes, edges and stores.
+
+    Logging is off by default. Call sites guard every message with a single attribute
+    test, so that no message is formatted when its level is not emitted::
+
+        if logger.debug_enabled:
+            logger.debug(self, f"T={self.env.now:.2f}: {self.id} ...")
+
+    Parameters:
+        enabled (bool): True if at least one sink is attached and the level is not OFF. Read-only, updated by `configure`.
+        debug_enabled (bool): True if logging is enabled and the level is DEBUG. Read-only, updated by `configure`.
+        level (int): Minimum level of records that are emitted.
+        components (set or None): Ids (or class names) of the components whose records are emitted. None means all components.
+        sinks (list): Objects with an `emit(record)` method that receive the records.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.debug_enabled = False
+        self.level = OFF
+        self.components = None
+        self.sinks = []
+
+    def configure(self, level=DEBUG, sinks=None, components=None):
+        """
+        Enables logging with the given level, sinks and component filter.
+
+        Args:
+            level (int or str): Minimum level ("DEBUG", "INFO", "WARNING", "ERROR", "OFF" or the corresponding constant).
+            sinks (sink or list of sinks, optional): Where to route records. Defaults to a `StreamSink` on stdout.
+            components (iterable, optional): Component ids (or class names) to log. None logs every component.
+
+        Raises:
+            ValueError: If the level is invalid.
+        """
+        if isinstance(level, str):
+            names = {name: value for value, name in LEVEL_NAMES.items()}
+            if level.upper() not in names:
+                raise ValueError(f"Invalid log level '{level}'. Must be one of {list(names)}.")
+            level = names[level.upper()]
+        if not isinstance(level, int):
+            raise ValueError("level must be an int or a level name.")
+        if sinks is None:
+            sinks = [StreamSink()]
+        elif not isinstance(sinks, (list, tuple)):
+            sinks = [sinks]
+        self.level = level
+        self.sinks = list(sinks)
+        self.components = set(components) if components is not None else None
+        self._update_enabled()
+
+    def add_sink(self, sink):
+        """Attaches an additional sink."""
+        self.sinks.append(sink)
+        self._update_enabled()
+
+    def remove_sink(self, sink):
+        """Detaches a sink. Logging is disabled when no sink remains."""
+        self.sinks.remove(sink)
+        self._update_enabled()
+
+    def disable(self):
+        """Turns logging off and closes all sinks."""
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+        self.level = OFF
+        self.components = None
+        self._update_enabled()
+
+    def _update_enabled(self):
+        self.enabled = bool(self.sinks) and self.level < OFF
+        self.debug_enabled = self.enabled and self.level <= DEBUG
+
+    def is_enabled_for(self, level):
+        """
+        Returns True if records of `level` are emitted: logging is enabled and `level` is not below the configured level.
+
+        Args:
+            level (int): Severity level.
+        """
+        return self.enabled and level >= self.level
+
+    def log(self, level, component, *parts):
+        """
+        Emits a record if `level` and `component` pass the filters. `parts` are joined with spaces, like print().
+
+        Args:
+            level (int): Severity of the record.
+            component (object or str): Emitting component. Its `id` (or class name) is used for filtering.
+            *parts: Message parts.
+        """
+        if level < self.level:
+            return
+        if isinstance(component, str):
+            name = component
+            env = None
+        else:
+            name = getattr(component, "id", None) or component.__class__.__name__
+            env = getattr(component, "env", None)
+        if self.components is not None and name not in self.components:
+            return
+        message = " ".join(str(part) for part in parts)
+        record = LogRecord(env.now if env is not None else None, level, name, message)
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def debug(self, component, *parts):
+        self.log(DEBUG, component, *parts)
+
+    def info(self, component, *parts):
+        self.log(INFO, component, *parts)
+
+    def warning(self, component, *parts):
+        self.log(WARNING, component, *parts)
+
+    def error(self, component, *parts):
+        self.log(ERROR, component, *parts)
+
+
+# Shared logger instance used throughout the library
+logger = SimLogger()
@@ -0,0 +1,386 @@
+import os
+import json
+import numpy as np
+
+# Fixed event codes written by the components
+RESERVE_PUT = 1
+RESERVE_GET = 2
+PUT = 3
+GET = 4
+STATE_CHANGE = 5
+DISCARD = 6
+
+EVENT_NAMES = {RESERVE_PUT: "RESERVE_PUT", RESERVE_GET: "RESERVE_GET", PUT: "PUT", GET: "GET",
+               STATE_CHANGE: "STATE_CHANGE", DISCARD: "DISCARD"}
+
+# Layout of one trace record
+TRACE_DTYPE = np.dtype([
+    ("time", "f8"),
+    ("component", "i4"),
+    ("event", "u1"),
+    ("item", "i8"),
+    ("edge", "i4"),
+])
+
+
+class Tracer:
+    """
+    Dispatches trace events from the components to the attached recorders.
+
+    Tracing is off by default. Components guard every call with a single attribute test::
+
+        if tracer.enabled:
+            tracer.record(self, PUT, item)
+
+    Parameters:
+        enabled (bool): True if at least one recorder is attached. Read-only, updated by `attach` and `detach`.
+        recorders (list): Objects with a `record(time, component, event, item, edge)` method. `component` and `edge`
+                          are component ids, `item` is an item id or, for STATE_CHANGE events, the name of the new state.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.recorders = []
+
+    def attach(self, recorder):
+        """Attaches a recorder and enables tracing."""
+        if not hasattr(recorder, "record"):
+            raise ValueError("recorder must have a 'record' method.")
+        self.recorders.append(recorder)
+        self.enabled = True
+        return recorder
+
+    def detach(self, recorder=None):
+        """Detaches `recorder`, or every recorder if None. Tracing is disabled when no recorder remains."""
+        if recorder is None:
+            self.recorders = []
+        else:
+            self.recorders.remove(recorder)
+        self.enabled = bool(self.recorders)
+
+    def record(self, component, event, item=None, edge=None):
+        """
+        Forwards an event emitted by `component` to every attached recorder.
+
+        Args:
+            component (Node or Edge): Component emitting the event.
+            event (int): One of the event codes defined in this module.
+            item (BaseFlowItem or str, optional): Item involved in the event, or the new state for STATE_CHANGE.
+            edge (Edge, optional): Edge involved in the event, if the component is a node.
+        """
+        if item is not None and not isinstance(item, str):
+            item = item.id
+        if edge is not None:
+            edge = edge.id
+        now = component.env.now
+        for recorder in self.recorders:
+            recorder.record(now, component.id, event, item, edge)
+
+
+class TraceRecorder:
+    """
+    Records trace events as fixed size binary records in a preallocated NumPy structured array.
+
+    Component ids, item ids and state names are interned into the lookup tables `components`, `items` and
+    `states`, and the records store their indices. The `item` field holds an index into `states` for
+    STATE_CHANGE events and a numeric item key otherwise. Missing items or edges are stored as -1.
+
+    When the array is full it is either appended to `spill_path` (and reused), or, if no spill file is
+    given, overwritten from the start so that only the latest `capacity` records are kept.
+
+    Item ids are interned per fill of the array, so that the table does not grow with the length of the run.
+    When the array is full, the item ids of its records are appended to `spill_path + ".items"` and dropped
+    from `items`, or, without a spill file, only the ids that the retained records can refer to are kept.
+    An item seen again after that gets a new key.
+
+    Parameters:
+        capacity (int): Number of records held in memory.
+        spill_path (str, optional): File to which full buffers are appended. Read back through a memory map.
+    """
+    def __init__(self, capacity=65536, spill_path=None):
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity must be a positive integer.")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.num_spilled = 0
+        self.wrapped = False
+        self._pos = 0
+        self._spill_file = open(spill_path, "wb") if spill_path is not None else None
+        self._items_file = open(spill_path + ".items", "w") if spill_path is not None else None
+
+        self.components = []
+        self.items = []
+        self.states = []
+        self._component_index = {}
+        self._item_index = {}
+        self._state_index = {}
+        self._items_offset = 0  # key of items[0]
+        self._fill_start = 0  # key of the first item interned in the current fill of the buffer
+
+    def _intern(self, table, index, name):
+        idx = index.get(name)
+        if idx is None:
+            idx = len(table)
+            index[name] = idx
+            table.append(name)
+        return idx
+
+    def _intern_item(self, name):
+        key = self._item_index.get(name)
+        if key is None:
+            key = self._items_offset + len(self.items)
+            self._item_index[name] = key
+            self.items.append(name)
+        return key
+
+    def _start_fill(self):
+        # the records of the next fill only refer to keys interned from now on
+        self._item_index = {}
+        if self._items_file is not None:
+            for name in self.items:
+                self._items_file.write(json.dumps(name) + "\n")
+            keep_from = self._items_offset + len(self.items)
+        else:
+            # the retained records are those of the fill just completed and of the next one
+            keep_from = self._fill_start
+        del self.items[:keep_from - self._items_offset]
+        self._items_offset = keep_from
+        self._fill_start = self._items_offset + len(self.items)
+
+    def record(self, time, component, event, item, edge):
+        """
+        Appends one record to the buffer.
+
+        Args:
+            time (float): Simulation time of the event.
+            component (str): Id of the emitting component.
+            event (int): Event code.
+            item (str or None): Item id, or the new state for STATE_CHANGE events.
+            edge (str or None): Id of the edge involved in the event.
+        """
+        comp_idx = self._intern(self.components, self._component_index, component)
+        if item is None:
+            item_idx = -1
+        elif event == STATE_CHANGE:
+            item_idx = self._intern(self.states, self._state_index, item)
+        else:
+            item_idx = self._intern_item(item)
+        edge_idx = -1 if edge is None else self._intern(self.components, self._component_index, edge)
+
+        self.buffer[self._pos] = (time, comp_idx, event, item_idx, edge_idx)
+        self._pos += 1
+        if self._pos == self.capacity:
+            if self._spill_file is not None:
+                self.buffer.tofile(self._spill_file)
+                self.num_spilled += self.capacity
+            else:
+                self.wrapped = True
+            self._pos = 0
+            self._start_fill()
+
+    def __len__(self):
+        if self.spill_path is None and self.wrapped:
+            return self.capacity
+        return self.num_spilled + self._pos
+
+    def records(self):
+        """
+        Returns all retained records in the order they were written.
+
+        Returns:
+            numpy.ndarray: Structured array of dtype `TRACE_DTYPE`. Spilled records are read through a memory map.
+        """
+        current = self.buffer[:self._pos]
+        if self.spill_path is None:
+            if self.wrapped:
+                return np.concatenate((self.buffer[self._pos:], current))
+            return current.copy()
+        if self.num_spilled == 0:
+            return current.copy()
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        spilled = np.memmap(self.spill_path, dtype=TRACE_DTYPE, mode="r", shape=(self.num_spilled,))
+        return np.concatenate((spilled, current))
+
+    def decode(self, records=None):
+        """
+        Converts records back to tuples of names.
+
+        Args:
+            records (numpy.ndarray, optional): Records to decode. Defaults to `records()`.
+
+        Returns:
+            list: Tuples (time, component id, event name, item id or state, edge id).
+        """
+        if records is None:
+            records = self.records()
+        items, offset = self.items, self._items_offset
+        if self.spill_path is not None and offset > 0:
+            if self._items_file is not None:
+                self._items_file.flush()
+            items, offset = self.load_items(self.spill_path + ".items") + self.items, 0
+        decoded = []
+        for time, comp, event, item, edge in records.tolist():
+            if item < 0:
+                item_name = None
+            elif event == STATE_CHANGE:
+                item_name = self.states[item]
+            else:
+                item_name = items[item - offset]
+            decoded.append((time, self.components[comp], EVENT_NAMES.get(event, event), item_name,
+                            self.components[edge] if edge >= 0 else None))
+        return decoded
+
+    def close(self):
+        """Writes the buffered records to the spill file (if any) and closes it."""
+        if self._spill_file is not None and not self._spill_file.closed:
+            self.buffer[:self._pos].tofile(self._spill_file)
+            self.num_spilled += self._pos
+            self._pos = 0
+            self._spill_file.close()
+            self._spill_file = None
+            self._start_fill()
+            self._items_file.close()
+            self._items_file = None
+
+    @staticmethod
+    def load(path):
+        """
+        Memory maps a spill file written by a closed recorder.
+
+        Args:
+            path (str): Path of the spill file.
+
+        Returns:
+            numpy.memmap: The spilled records.
+
+        Raises:
+            RuntimeError: If the file does not exist.
+        """
+        if not os.path.exists(path):
+            raise RuntimeError(f"Trace file '{path}' does not exist.")
+        return np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+
+    @staticmethod
+    def load_items(path):
+        """
+        Reads the item ids written next to a spill file, in the order of their keys.
+
+        Args:
+            path (str): Path of the item file, the spill file path followed by ".items".
+
+        Returns:
+            list: The item ids.
+        """
+        with open(path) as file:
+            return [json.loads(line) for line in file]
+
+
+
+class ChromeTraceWriter:
+    """
+    Streams the state history of every component to a Chrome trace-event JSON file, viewable in
+    chrome://tracing or ui.perfetto.dev.
+
+    Each STATE_CHANGE closes the current slice of the component and opens a new one, so every
+    state interval becomes a complete ("X") event on the component's own track. Events are
+    buffered and written in chunks of `chunk_size`.
+
+    Parameters:
+        path (str): Output file path.
+        time_scale (float): Trace microseconds per unit of simulation time. Default 1e6 shows one time unit as one second.
+        chunk_size (int): Number of events buffered before they are written to the file.
+        include_events (bool): If True, the other trace events (put, get, discard, ...) are written as instant events.
+    """
+    def __init__(self, path, time_scale=1e6, chunk_size=10000, include_events=False):
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive.")
+        self.path = path
+        self.time_scale = time_scale
+        self.chunk_size = chunk_size
+        self.include_events = include_events
+        self.num_events = 0
+        self.last_time = 0.0
+
+        self._file = open(path, "w")
+        self._file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self._first = True
+        self._chunk = []
+        self._tids = {}
+        self._open_slices = {}
+
+    def _get_tid(self, component):
+        tid = self._tids.get(component)
+        if tid is None:
+            tid = len(self._tids) + 1
+            self._tids[component] = tid
+            self._emit('{"name": "thread_name", "ph": "M", "pid": 1, "tid": %d, "args": {"name": %s}}'
+                       % (tid, json.dumps(component)))
+        return tid
+
+    def _emit(self, event):
+        self._chunk.append(event)
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+
+    def _close_slice(self, component, end_time):
+        start = self._open_slices.pop(component, None)
+        if start is not None:
+            start_time, state, tid = start
+            self._emit('{"name": %s, "ph": "X", "pid": 1, "tid": %d, "ts": %r, "dur": %r}'
+                       % (json.dumps(state), tid, start_time * self.time_scale, (end_time - start_time) * self.time_scale))
+            self.num_events += 1
+
+    def record(self, time, component, event, item, edge):
+        """
+        Receives a trace event from the tracer. See `Tracer.record`.
+        """
+        self.last_time = time
+        if event == STATE_CHANGE:
+            tid = self._get_tid(component)
+            self._close_slice(component, time)
+            self._open_slices[component] = (time, item, tid)
+        elif self.include_events:
+            tid = self._get_tid(component)
+            args = {}
+            if item is not None:
+                args["item"] = item
+            if edge is not None:
+                args["edge"] = edge
+            self._emit('{"name": "%s", "ph": "i", "s": "t", "pid": 1, "tid": %d, "ts": %r, "args": %s}'
+                       % (EVENT_NAMES.get(event, event), tid, time * self.time_scale, json.dumps(args)))
+            self.num_events += 1
+
+    def flush(self):
+        """Writes the buffered events to the file."""
+        if not self._chunk:
+            return
+        text = ",\n".join(self._chunk)
+        if not self._first:
+            text = ",\n" + text
+        self._file.write(text)
+        self._first = False
+        self._chunk = []
+
+    def close(self, end_time=None):
+        """
+        Ends the open state slices at `end_time`, writes the remaining events and closes the file.
+
+        Args:
+            end_time (float, optional): Simulation end time. Defaults to the time of the last received event.
+        """
+        if self._file.closed:
+            return
+        if end_time is None:
+            end_time = self.last_time
+        for component in list(self._open_slices):
+            self._close_slice(component, end_time)
+        self.flush()
+        self._file.write("\n]}\n")
+        self._file.close()
+
+
+# Shared tracer instance used throughout the library
+tracer = Tracer()
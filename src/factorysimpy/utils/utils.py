@@ -51,3 +51,84 @@ def RoundRobin_edge_selector(node, env, edge_type):
         i = (i + 1) % len(edges)
 
 
+
+
+def compile_parameter(param):
+    """
+    Returns a callable, without arguments, that returns the next value of a parameter. The type of the
+    parameter is checked once here and not every time a value is needed.
+
+    Args:
+
+        param (int, float, generator, or callable): The parameter, which can be:
+
+            - int or float: Used as a constant.
+            - generator: A generator instance yielding the values.
+            - callable: A function that returns the values.
+
+    Returns:
+
+        callable: The bound `__next__` of a generator, the function itself, or a function returning the constant.
+    """
+    if hasattr(param, '__next__'):
+        return param.__next__
+    if callable(param):
+        return param
+    return lambda: param
+
+
+def compile_delay(delay, owner_id):
+    """
+    Returns a callable, without arguments, that returns the next value of `delay`. It returns the same values
+    as `get_delay` of nodes and edges, which checks the type of `delay` on every call.
+
+    Args:
+
+        delay (int, float, generator, or callable): The delay.
+        owner_id (str): Identifier of the node or edge, used in the error message.
+
+    Returns:
+
+        callable: A function returning the next delay. Values of generators and functions are checked to be
+        non-negative on every call, a constant is checked only once.
+    """
+    if not hasattr(delay, '__next__') and not callable(delay) and delay is not None and delay >= 0:
+        return lambda: delay
+    next_value = compile_parameter(delay)
+
+    def sample():
+        val = next_value()
+        assert val >= 0, f"{owner_id}- Delay must be non-negative"
+        return val
+    return sample
+
+
+def compile_edge_selector(selection, node, edge_type):
+    """
+    Returns a callable, without arguments, that returns the index of the next edge selected by `selection`,
+    checks that it is in range and records it in `node.stats["in_edge_selection"]` or
+    `node.stats["out_edge_selection"]`.
+
+    Args:
+
+        selection (int, generator, or callable): The edge selection of the node, after the names of the
+            inbuilt strategies are converted with `get_edge_selector`.
+        node (object): The node object containing in_edges or out_edges.
+        edge_type (str): Whether to select from 'out_edges' or 'in_edges'.
+
+    Returns:
+
+        callable: A function returning the selected edge index.
+    """
+    edge_type = edge_type.lower()
+    assert edge_type in ["in", "out"], "edge_type must be either 'in' or 'out'."
+    next_index = compile_parameter(selection)
+    num_edges = len(getattr(node, f"{edge_type}_edges"))
+    record = node.stats[f"{edge_type}_edge_selection"].append
+
+    def select():
+        val = next_index()
+        assert 0 <= val < num_edges, f"{node.id} - Invalid edge index. {val} is not in range. Range must be between {0} and  {num_edges-1} for {edge_type}_edges."
+        record(val)
+        return val
+    return select
@@ -1,5 +1,6 @@
 import pytest
 import simpy, sys, os
+import itertools
 import numpy as np
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
@@ -11,6 +12,10 @@ from factorysimpy.edges.continuous_conveyor import ConveyorBelt
 from factorysimpy.helper.item import Item
 from factorysimpy.nodes.source import Source
 from factorysimpy.nodes.sink import Sink
+from factorysimpy.nodes.node import Node
+from factorysimpy.base.belt_occupancy import BeltOccupancy
+from factorysimpy.base.belt_span_index import BeltSpanIndex
+from factorysimpy.base.belt_store import BeltStore
 
 
 @pytest.fixture
@@ -242,4 +247,166 @@ def test_conveyor_5():
 
 
 
-   
\ No newline at end of file
+   
+
+def test_conveyor_rejects_multi_unit_reservations(env_for_test):
+    conveyor = ConveyorBelt(env_for_test, "Conveyor1", conveyor_length=5, speed=1, item_length=0.5, accumulating=1)
+    with pytest.raises(ValueError):
+        conveyor.reserve_put(n=2)
+    with pytest.raises(ValueError):
+        conveyor.reserve_get(n=2)
+
+
+@pytest.mark.parametrize("conveyor_args, iat, work_capacity, expected", [
+    ((5, 1, 0.5, 1), 0.3, 1, (331, 9.974, 32.585)),
+    ((5, 5.76, 0.5, 0), 3, 2, (332, 0.289, 3.868)),
+])
+def test_analytical_engine_matches_process_engine(env_for_test, conveyor_args, iat, work_capacity, expected):
+    env = env_for_test
+    length, speed, item_length, accumulating = conveyor_args
+    conveyor1 = ConveyorBelt(env, "Conveyor1", conveyor_length=length, speed=speed, item_length=item_length,
+                             accumulating=accumulating, engine="analytical")
+    buffer1 = Buffer(env, "Buffer1", delay=0, capacity=4)
+    machine = Machine(env=env, id="M1", processing_delay=3, node_setup_time=0, work_capacity=work_capacity,
+                      blocking=True, in_edge_selection="ROUND_ROBIN", out_edge_selection="FIRST_AVAILABLE")
+    src1 = Source(env, id="Source-1", item_length=item_length, inter_arrival_time=iat, blocking=True,
+                  out_edge_selection="FIRST_AVAILABLE")
+    sink = Sink(env, id="Sink-1")
+    conveyor1.connect(src1, machine)
+    buffer1.connect(machine, sink)
+
+    env.run(until=1000)
+
+    assert sink.stats['num_item_received'] == expected[0]
+    assert np.round(conveyor1.stats['time_averaged_num_of_items_in_conveyor'],3) == expected[1]
+    assert np.round(sink.stats["total_cycle_time"]/sink.stats["num_item_received"],3) == expected[2]
+
+
+def test_conveyor_rejects_unknown_engine(env_for_test):
+    with pytest.raises(ValueError):
+        ConveyorBelt(env_for_test, "Conveyor1", conveyor_length=5, speed=1, item_length=0.5, accumulating=1, engine="fast")
+
+
+def test_belt_occupancy_gaps():
+    occupancy = BeltOccupancy(8, [(7, "c"), (1, "a"), (3, "b"), (4, "d")])
+    assert occupancy.pattern()[0] == "_*_**__*"
+    assert occupancy.ids == ["a", "b", "d", "c"]
+    assert occupancy.gaps == [1, 0, 2, 0]
+    assert not occupancy.is_contiguous()
+    # empty slots between each item and the exit, as counted on the pattern
+    assert [occupancy.empty_slots_ahead(i) for i in range(4)] == [3, 2, 2, 0]
+    assert BeltOccupancy(4, [(2, "a"), (3, "b")]).is_contiguous()
+    assert BeltOccupancy(2, [(0, "a"), (1, "b")]).is_full()
+
+
+def test_belt_span_index_mixed_lengths():
+    spans = BeltSpanIndex(speed=1)
+    for clock, length in [(0, 2), (3, 1), (5, 0.5)]:
+        spans.append(clock, length)
+    assert spans.length_ahead(2) == 3
+    assert spans.total_length() == 3.5
+    # exit item of length 1 on a belt with a delay of 10
+    assert spans.num_queued(10, 10, 1) == 1
+    assert spans.num_queued(12, 10, 1) == 3
+    spans.pack(12, 10, 1)
+    # the queued items move on touching each other
+    assert [spans.entry(i) for i in range(3)] == [3, 5, 6]
+    spans.popleft()
+    assert spans.entry(0) == 5
+    assert spans.length_ahead(1) == 1
+    assert spans.total_length() == 1.5
+
+
+def test_analytical_belt_speed_profile(env_for_test):
+    env = env_for_test
+    conveyor = ConveyorBelt(env, "Conveyor1", conveyor_length=4, speed=1, item_length=1, accumulating=1,
+                            engine="analytical")
+    conveyor.connect(Node(env, "src"), Node(env, "dest"))
+    exits = []
+
+    def feed():
+        event = conveyor.reserve_put()
+        yield event
+        item = Item("a")
+        item.length = 1
+        conveyor.put(event, item)
+
+    def control():
+        # half speed from t=1, then a ramp back to full speed between t=3 and t=5
+        yield env.timeout(1)
+        conveyor.set_speed(0.5)
+        yield env.timeout(2)
+        conveyor.set_speed(1, ramp_time=2)
+        assert conveyor.current_speed() == 0.5
+
+    def watch():
+        yield conveyor.belt.ready_item_event
+        exits.append(env.now)
+
+    env.process(feed())
+    env.process(control())
+    env.process(watch())
+    env.run(until=20)
+
+    # the item needs 4 units of belt clock: 1 + 0.5*2 + 1.5 (ramp) + 0.5 at full speed
+    assert exits == [pytest.approx(5.5)]
+    assert conveyor.current_speed() == 1
+
+
+def test_process_belt_rejects_speed_change(env_for_test):
+    conveyor = ConveyorBelt(env_for_test, "Conveyor1", conveyor_length=5, speed=1, item_length=0.5, accumulating=1)
+    with pytest.raises(ValueError):
+        conveyor.set_speed(2)
+
+
+def test_belt_store_stall_delays_items():
+    env = simpy.Environment()
+    store = BeltStore(env, capacity=2, speed=1)
+    item = Item("item1")
+    item.length = 1
+
+    def feed():
+        put_event = store.reserve_put()
+        yield put_event
+        store.put(put_event, (item, 4))
+
+    def stall():
+        yield env.timeout(1)
+        store.interrupt_all_move_processes()
+        yield env.timeout(1)
+        # stopping the stopped belt again does not change the time the item stands still
+        store.interrupt_all_move_processes()
+        yield env.timeout(1)
+        store.resume_all_move_processes()
+
+    env.process(feed())
+    env.process(stall())
+    env.run(until=5.9)
+    assert store.ready_items == []
+    env.run(until=6.1)
+    assert store.ready_items == [item]
+    assert item.conveyor_ready_item_entry_time == 6
+    assert item.total_interruption_time == 2
+
+
+def test_analytical_belt_spaces_mixed_length_items_end_to_end(env_for_test):
+    env = env_for_test
+    lengths = itertools.cycle([2, 0.5, 1])
+
+    class MixedLengthSource(Source):
+        # every item gets the next length of the cycle
+        item_length = property(lambda self: next(lengths), lambda self, value: None)
+
+    src = MixedLengthSource(env, id="SRC", inter_arrival_time=0, blocking=True)
+    conveyor = ConveyorBelt(env, "Conveyor1", conveyor_length=4, speed=1, item_length=0.5, accumulating=1,
+                            engine="analytical")
+    sink = Sink(env, id="SNK")
+    conveyor.connect(src, sink)
+
+    env.run(until=12)
+
+    # an item is put as soon as the one before it has fully entered the belt, and every item needs 4 time units
+    entries = [0, 2, 2.5, 3.5, 5.5, 6, 7]
+    assert sink.stats["num_item_received"] == len(entries)
+    assert [sink.item_list[f"item_SRC_{i}"][:2] for i in range(1, 8)] == [
+        pytest.approx((entry, entry + 4)) for entry in entries]
@@ -0,0 +1,49 @@
+import pytest
+import simpy, sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from factorysimpy.base.delay_queue import DelayQueue
+from factorysimpy.base.buffer_store import BufferStore
+
+
+def test_release_order_and_single_timer():
+    env = simpy.Environment()
+    released = []
+    queue = DelayQueue(env, lambda entry: released.append((env.now, entry)))
+
+    def pusher(env):
+        queue.push("a", 3)
+        queue.push("b", 3)
+        yield env.timeout(1)
+        queue.push("c", 1)      # overtakes a and b, queue switches to a heap
+        queue.push("d", 2)      # same ready time as a and b, released after them
+        assert len(queue) == 4
+        assert list(queue) == ["c", "a", "b", "d"]
+
+    env.process(pusher(env))
+    env.run()
+    assert released == [(2, "c"), (3, "a"), (3, "b"), (3, "d")]
+    assert len(queue) == 0
+
+
+def test_buffer_store_moves_items_after_delay():
+    env = simpy.Environment()
+    store = BufferStore(env, capacity=10)
+    ready = []
+
+    def producer(env):
+        for name, delay in [("x", 2), ("y", 0.5), ("z", 2)]:
+            event = store.reserve_put()
+            yield event
+            store.put(event, (name, delay))
+
+    def watcher(env):
+        for t in (0.4, 0.6, 2.1):
+            yield env.timeout(t - env.now)
+            ready.append(list(store.ready_items))
+
+    env.process(producer(env))
+    env.process(watcher(env))
+    env.run()
+    assert ready == [[], ["y"], ["y", "x", "z"]]
+    assert store.items == []
@@ -0,0 +1,162 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from factorysimpy.base.fleet_store import FleetStore
+from factorysimpy.base.route_graph import RouteGraph
+from factorysimpy.base.traffic_grid import TrafficGrid
+from factorysimpy.edges.fleet import Fleet
+from factorysimpy.nodes.source import Source
+from factorysimpy.nodes.sink import Sink
+import pytest
+import simpy
+
+
+@pytest.fixture
+def env():
+    return simpy.Environment()
+
+
+class Item:
+    def __init__(self, name):
+        self.name = name
+
+
+def put_items(env, store, names, at):
+    yield env.timeout(at)
+    for name in names:
+        event = store.reserve_put()
+        yield event
+        store.put(event, Item(name))
+
+
+def test_idle_fleet_schedules_no_events(env):
+    FleetStore(env, capacity=3, delay=2)
+    assert env.peek() == float('inf')
+
+
+def test_fleet_dispatch_on_timer_and_on_capacity(env):
+    store = FleetStore(env, capacity=3, delay=2, transit_delay=0.5)
+    ready = []
+
+    def check():
+        for t in [3.5, 4.5, 10.5, 11.5]:
+            yield env.timeout(t - env.now)
+            ready.append([item.name for item in store.ready_items])
+
+    env.process(put_items(env, store, ["a"], at=1))
+    env.process(put_items(env, store, ["b", "c"], at=10))
+    env.process(check())
+    env.run(until=20)
+
+    # "a" waits for the timer started at its arrival, "b" and "c" fill the fleet and leave at once
+    assert ready == [[], ["a"], ["a"], ["a", "b", "c"]]
+    assert store.items == []
+    # no timer is left once the fleet is idle again
+    assert env.peek() == 20
+
+
+def ready_at(env, store, times, ready):
+    for t in times:
+        yield env.timeout(t - env.now)
+        ready.append([item.name for item in store.ready_items])
+
+
+def test_fleet_without_vehicles_has_several_batches_in_transit(env):
+    store = FleetStore(env, capacity=3, delay=1, transit_delay=1)
+    ready = []
+    env.process(put_items(env, store, ["a"], at=0))
+    env.process(put_items(env, store, ["b"], at=1.5))
+    env.process(ready_at(env, store, [2.9, 3.1, 4.4, 4.6], ready))
+    env.run(until=10)
+
+    # "b" leaves on its timer at 2.5 while "a" is still in transit
+    assert store.num_vehicles is None
+    assert ready == [[], ["a"], ["a"], ["a", "b"]]
+    assert store.num_trips == 2
+    assert len(store.vehicle_num_trips) == 0
+
+
+def test_default_fleet_throughput():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=0.5, blocking=True)
+    sink = Sink(env, id="SNK")
+    fleet = Fleet(env, id="F", capacity=3, delay=1, transit_delay=0.7)
+    fleet.connect(source, sink)
+    env.run(until=100)
+
+    # trips are not bound to vehicles, so the fleet does not wait for a vehicle to come back
+    assert sink.stats["num_item_received"] == 163
+
+
+def test_fleet_vehicles_share_the_batches(env):
+    store = FleetStore(env, capacity=2, delay=5, transit_delay=1, num_vehicles=2)
+    ready = []
+    env.process(put_items(env, store, ["a", "b", "c", "d", "e"], at=0))
+    env.process(ready_at(env, store, [1.5, 2.5], ready))
+    env.run(until=10)
+
+    # each vehicle leaves with a full batch, "e" finds the fleet full
+    assert ready == [[], ["a", "b", "c", "d"]]
+    assert store.vehicle_num_trips.tolist() == [1, 1]
+    assert store.vehicle_num_items_moved.tolist() == [2, 2]
+    assert store.vehicle_busy_time.tolist() == [2, 2]
+    assert len(store.items) == 0
+
+
+def test_fleet_batch_waits_for_a_free_vehicle(env):
+    store = FleetStore(env, capacity=2, delay=1, transit_delay=1, num_vehicles=1)
+    ready = []
+    env.process(put_items(env, store, ["a"], at=0))
+    env.process(put_items(env, store, ["b"], at=1.5))
+    env.process(ready_at(env, store, [3.5, 4.9, 5.1], ready))
+    env.run(until=10)
+
+    # "b" is due at 2.5 but leaves when the vehicle is back from carrying "a" at 3
+    assert ready == [["a"], ["a"], ["a", "b"]]
+    assert store.vehicle_num_trips.tolist() == [2]
+
+
+def test_fleet_rejects_invalid_num_vehicles(env):
+    with pytest.raises(ValueError):
+        FleetStore(env, capacity=2, num_vehicles=0)
+
+
+def test_fleet_on_route_graph_sends_nearest_vehicle(env):
+    graph = RouteGraph([("A", "B", 1), ("B", "C", 2), ("C", "D", 3)])
+    store = FleetStore(env, capacity=1, delay=10, num_vehicles=2, route_graph=graph,
+                       pickup_station="B", dropoff_station="D", home_station="A")
+    ready = []
+    env.process(put_items(env, store, ["x"], at=0))
+    env.process(put_items(env, store, ["y"], at=7))
+    env.process(ready_at(env, store, [5.9, 6.1, 12.9, 13.1], ready))
+    env.run(until=20)
+
+    # A -> B -> D takes 6, then "y" is taken by the vehicle still waiting at A rather than the one at D
+    assert ready == [[], ["x"], ["x"], ["x", "y"]]
+    assert store.vehicle_num_trips.tolist() == [1, 1]
+    assert [graph.nodes[i] for i in store.vehicle_location] == ["D", "D"]
+
+
+def test_fleet_rejects_unknown_station(env):
+    graph = RouteGraph([("A", "B", 1)])
+    with pytest.raises(ValueError):
+        FleetStore(env, capacity=1, route_graph=graph, pickup_station="A", dropoff_station="Z")
+
+
+def test_fleets_share_traffic(env):
+    graph = RouteGraph([("A", "B", 4)])
+    traffic = TrafficGrid(graph, {"A": (0, 0), "B": (4, 0)}, cell_size=2)
+    forward = FleetStore(env, capacity=1, delay=10, route_graph=graph, pickup_station="A", dropoff_station="B",
+                         traffic=traffic)
+    backward = FleetStore(env, capacity=1, delay=10, route_graph=graph, pickup_station="B", dropoff_station="A",
+                          traffic=traffic)
+    ready = []
+    env.process(put_items(env, forward, ["x"], at=0))
+    env.process(put_items(env, backward, ["y"], at=0))
+    env.process(ready_at(env, forward, [4.5, 8.5], ready))
+    env.process(ready_at(env, backward, [4.5, 8.5], ready))
+    env.run(until=20)
+
+    # the backward vehicle waits for the aisle to be cleared
+    assert ready == [["x"], [], ["x"], ["y"]]
+    assert backward.vehicle_traffic_delay.tolist() == [4]
+    assert forward.vehicle_traffic_delay.tolist() == [0]
@@ -0,0 +1,157 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from factorysimpy.nodes.merge import Merge
+from factorysimpy.nodes.diverge import Diverge
+from factorysimpy.nodes.machine import Machine
+from factorysimpy.nodes.node import Node
+from factorysimpy.edges.buffer import Buffer
+from factorysimpy.helper.item import Item
+from factorysimpy.utils.trace import tracer, TraceRecorder
+import pytest
+import simpy
+
+
+@pytest.fixture
+def env():
+    return simpy.Environment()
+
+
+def wire(env, node, in_edges, out_edges):
+    # the tests put and get the items themselves, the far ends of the edges are plain nodes
+    for edge in in_edges:
+        edge.connect(Node(env, f"src-{edge.id}"), node)
+    for edge in out_edges:
+        edge.connect(node, Node(env, f"dest-{edge.id}"))
+    return node
+
+
+def contents(edge):
+    store = edge.inbuiltstore
+    return [item.id for item in store.ready_items + store.items]
+
+
+def put_items(env, edge, names, at=0, flow_item_type="item"):
+    yield env.timeout(at)
+    for name in names:
+        event = edge.reserve_put()
+        yield event
+        item = Item(name)
+        item.flow_item_type = flow_item_type
+        edge.put(event, item)
+
+
+def collect(env, edge, received, every=0):
+    while True:
+        event = edge.reserve_get()
+        yield event
+        received.append((env.now, edge.get(event).id))
+        yield env.timeout(every)
+
+
+def test_merge_priority_serves_lowest_value_first(env):
+    low, high, out = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=5), Buffer(env, "B3", capacity=1)
+    merge = wire(env, Merge(env, "M1", policy="PRIORITY", priorities=[2, 1]), [low, high], [out])
+    received = []
+    env.process(put_items(env, low, ["l1", "l2"]))
+    env.process(put_items(env, high, ["h1", "h2"]))
+    env.process(collect(env, out, received, every=1))
+    env.run(until=10)
+
+    # "l1" is taken before "h1" arrives, then the high priority edge is drained first
+    assert [name for _, name in received] == ["l1", "h1", "h2", "l2"]
+    assert merge.stats["num_item_processed"] == 4
+    assert merge.stats["num_item_per_in_edge"] == [2, 2]
+    assert merge.stats["total_time_spent_in_states"]["BLOCKED_STATE"] > 0
+
+
+def test_merge_alternating_interleaves_flows(env):
+    first, second, out = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=5), Buffer(env, "B3", capacity=1)
+    wire(env, Merge(env, "M1", policy="ALTERNATING"), [first, second], [out])
+    received = []
+    env.process(put_items(env, first, ["a1", "a2", "a3"]))
+    env.process(put_items(env, second, ["b1", "b2"]))
+    env.process(collect(env, out, received, every=1))
+    env.run(until=10)
+
+    assert [name for _, name in received] == ["a1", "b1", "a2", "b2", "a3"]
+
+
+def test_diverge_routes_by_type(env):
+    in_edge, boxes, crates = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=5), Buffer(env, "B3", capacity=5)
+    diverge = wire(env, Diverge(env, "D1", policy="BY_TYPE", routes={"box": 0, "crate": 1}), [in_edge], [boxes, crates])
+    env.process(put_items(env, in_edge, ["x1", "x2"], flow_item_type="box"))
+    env.process(put_items(env, in_edge, ["y1"], at=1, flow_item_type="crate"))
+    env.run(until=5)
+
+    assert contents(boxes) == ["x1", "x2"]
+    assert contents(crates) == ["y1"]
+    assert diverge.stats["num_item_per_out_edge"] == [2, 1]
+
+
+def test_diverge_rejects_unknown_type(env):
+    in_edge, out = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=5)
+    wire(env, Diverge(env, "D1", policy="BY_TYPE", routes={"box": 0}), [in_edge], [out])
+    env.process(put_items(env, in_edge, ["y1"], flow_item_type="crate"))
+    with pytest.raises(ValueError):
+        env.run(until=5)
+
+
+def test_diverge_first_available_skips_full_edge(env):
+    in_edge, first, second = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=1), Buffer(env, "B3", capacity=5)
+    wire(env, Diverge(env, "D1"), [in_edge], [first, second])
+    env.process(put_items(env, in_edge, ["a", "b", "c"]))
+    env.run(until=5)
+
+    assert contents(first) == ["a"]
+    assert contents(second) == ["b", "c"]
+
+
+def test_merge_matches_pass_through_machine():
+    def run(make_node):
+        env = simpy.Environment()
+        first, second = Buffer(env, "B1", capacity=3, delay=1), Buffer(env, "B2", capacity=3, delay=1)
+        out = Buffer(env, "B3", capacity=2, delay=1)
+        wire(env, make_node(env), [first, second], [out])
+        received = []
+        env.process(put_items(env, first, [f"a{k}" for k in range(20)]))
+        env.process(put_items(env, second, [f"b{k}" for k in range(20)]))
+        env.process(collect(env, out, received, every=0.5))
+        env.run(until=30)
+        return received
+
+    merged = run(lambda env: Merge(env, "J"))
+    machined = run(lambda env: Machine(env, "J", processing_delay=0, work_capacity=1))
+    # the junction delivers as fast as a machine without processing delay
+    assert [t for t, _ in merged] == [t for t, _ in machined]
+
+
+def test_waiting_merge_takes_first_arrival_whatever_the_priority(env):
+    low, high, out = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=5), Buffer(env, "B3", capacity=5)
+    wire(env, Merge(env, "M1", policy="PRIORITY", priorities=[2, 1]), [low, high], [out])
+    received = []
+    # both items arrive at t=1, the one on the low priority edge first
+    env.process(put_items(env, low, ["l1"], at=1))
+    env.process(put_items(env, high, ["h1"], at=1))
+    env.process(collect(env, out, received))
+    env.run(until=5)
+
+    # the merge was waiting on both edges, so the policy does not reorder them
+    assert [name for _, name in received] == ["l1", "h1"]
+
+
+@pytest.mark.parametrize("make_node", [
+    lambda env: Merge(env, "J", policy="ALTERNATING"),
+    lambda env: Diverge(env, "J", policy="ALTERNATING"),
+])
+def test_junction_records_each_state_change_once(env, make_node):
+    recorder = tracer.attach(TraceRecorder(capacity=1024))
+    try:
+        in_edge, out_edge = Buffer(env, "B1", capacity=5), Buffer(env, "B2", capacity=1)
+        wire(env, make_node(env), [in_edge], [out_edge])
+        env.process(put_items(env, in_edge, ["a", "b"]))
+        env.run(until=5)
+    finally:
+        tracer.detach()
+
+    states = [(t, state) for t, comp, event, state, _ in recorder.decode() if comp == "J" and event == "STATE_CHANGE"]
+    assert states == [(0, "IDLE_STATE"), (0, "BLOCKED_STATE")]
@@ -0,0 +1,100 @@
+import pytest
+import simpy, sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from factorysimpy.nodes.machine import Machine
+from factorysimpy.edges.buffer import Buffer
+from factorysimpy.nodes.source import Source
+from factorysimpy.nodes.sink import Sink
+from factorysimpy.utils.logger import logger, RingBufferSink, CallbackSink, FileSink, DEBUG, WARNING
+
+
+@pytest.fixture(autouse=True)
+def reset_logger():
+    logger.disable()
+    yield
+    logger.disable()
+
+
+def build_pipeline(env):
+    src = Source(env, id="SRC", inter_arrival_time=1, blocking=False, out_edge_selection="FIRST_AVAILABLE")
+    buf1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    m1 = Machine(env, id="M1", processing_delay=2, work_capacity=1)
+    buf2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SINK")
+    buf1.connect(src, m1)
+    buf2.connect(m1, sink)
+    return src, m1, sink
+
+
+def test_logger_disabled_by_default(capsys):
+    assert logger.enabled is False
+    env = simpy.Environment()
+    build_pipeline(env)
+    env.run(until=10)
+    assert capsys.readouterr().out == ""
+
+
+def test_ring_buffer_keeps_last_records():
+    sink = RingBufferSink(capacity=5)
+    logger.configure(level=DEBUG, sinks=sink)
+    assert logger.enabled
+    env = simpy.Environment()
+    build_pipeline(env)
+    env.run(until=10)
+    assert len(sink.records) == 5
+    assert all(rec.time is None or rec.time <= 10 for rec in sink.records)
+
+
+def test_component_and_level_filter():
+    records = []
+    logger.configure(level=DEBUG, sinks=CallbackSink(records.append), components=["M1"])
+    env = simpy.Environment()
+    build_pipeline(env)
+    env.run(until=10)
+    assert records
+    assert {rec.component for rec in records} == {"M1"}
+
+    records.clear()
+    logger.configure(level=WARNING, sinks=CallbackSink(records.append))
+    env = simpy.Environment()
+    build_pipeline(env)
+    env.run(until=10)
+    assert all(rec.level >= WARNING for rec in records)
+
+
+def test_file_sink(tmp_path):
+    path = tmp_path / "sim.log"
+    logger.configure(level="DEBUG", sinks=FileSink(str(path)))
+    env = simpy.Environment()
+    build_pipeline(env)
+    env.run(until=5)
+    logger.disable()
+    assert "M1" in path.read_text()
+
+
+def test_invalid_level_raises():
+    with pytest.raises(ValueError):
+        logger.configure(level="VERBOSE")
+
+
+class CountingId(str):
+    # an id that counts how often it is formatted into a message
+    formatted = 0
+
+    def __format__(self, spec):
+        CountingId.formatted += 1
+        return str.__format__(self, spec)
+
+
+@pytest.mark.parametrize("level, expect_formatted", [("INFO", False), ("DEBUG", True)])
+def test_debug_messages_formatted_only_at_debug_level(level, expect_formatted):
+    logger.configure(level=level, sinks=RingBufferSink())
+    assert logger.debug_enabled == expect_formatted
+    assert logger.is_enabled_for(WARNING)
+    env = simpy.Environment()
+    src, m1, sink = build_pipeline(env)
+    m1.id = CountingId("M1")
+    CountingId.formatted = 0
+    env.run(until=10)
+    assert (CountingId.formatted > 0) == expect_formatted
@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'
 
 
 from factorysimpy.nodes.machine import Machine
+from factorysimpy.nodes.node import Node
 from factorysimpy.edges.buffer import Buffer
 from factorysimpy.helper.item import Item
 from factorysimpy.nodes.source import Source
@@ -158,4 +159,222 @@ def test_pipeline_stats(inter_arrival_time, processing_delay, work_capacity,buff
     
     # Check that machine stats- states time should both add up to simulation time
     assert sum(machine.stats['total_time_spent_in_states'][s] for s in groupA) == SIM_TIME
-    assert sum(machine.stats['total_time_spent_in_states'][s] for s in groupB) == SIM_TIME
\ No newline at end of file
+    assert sum(machine.stats['total_time_spent_in_states'][s] for s in groupB) == SIM_TIME
+
+def test_machine_reuses_worker_threads():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=0.5)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=1, work_capacity=3)
+    buffer2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SNK")
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, sink)
+
+    env.run(until=100)
+
+    assert machine.stats["num_item_processed"] > 3
+    # the items are processed by the same work_capacity worker threads
+    assert len(machine.worker_thread_list) == 3
+    assert all(proc.is_alive for proc in machine.worker_thread_list)
+
+
+def test_machine_reset_in_the_instant_of_a_hand_off():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1, blocking=True)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=0.5, work_capacity=1)
+    buffer2 = Buffer(env, id="BUF2", capacity=5, delay=0)
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, Node(env, id="DEST"))
+    exit_times = []
+
+    def collect():
+        while True:
+            get_event = buffer2.reserve_get()
+            yield get_event
+            buffer2.get(get_event)
+            exit_times.append(env.now)
+
+    def change_delay():
+        # the second item is handed over to the idle worker at t=2, the machine is reset in the same instant
+        yield env.timeout(2)
+        while len(machine.stats["processing_delay"]) < 2:
+            yield env.timeout(0)
+        machine.processing_delay = 0.25
+        machine.reset()
+
+    env.process(collect())
+    env.process(change_delay())
+    env.run(until=5)
+
+    # the item handed over keeps the delay it was handed over with, the next ones use the new delay
+    assert machine.stats["processing_delay"][:4] == [0.5, 0.5, 0.25, 0.25]
+    assert exit_times[:3] == [1.5, 2.5, 3.25]
+
+
+def test_interrupted_worker_thread_is_not_counted():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1, blocking=True)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=5, work_capacity=1)
+    buffer2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SNK")
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, sink)
+
+    def interrupt_worker():
+        yield env.timeout(2)
+        machine.worker_thread_list[0].interrupt("breakdown")
+
+    env.process(interrupt_worker())
+    env.run(until=1.5)
+    assert machine._count_worker_state() == (1, 0)
+    with pytest.raises(simpy.Interrupt):
+        env.run(until=3)
+
+    assert machine._count_worker_state() == (0, 0)
+    assert machine.worker_thread_list[0].thread_state is None
+
+
+class CountingBuffer(Buffer):
+    # a user-defined edge, nodes move items through its edge protocol and not by its class name
+    def __init__(self, env, id, capacity=1, delay=0):
+        super().__init__(env, id, capacity=capacity, delay=delay)
+        self.num_put = 0
+
+    def put(self, event, item):
+        self.num_put += 1
+        return super().put(event, item)
+
+
+def test_machine_accepts_user_defined_edges():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1)
+    buffer1 = CountingBuffer(env, id="BUF1", capacity=2)
+    machine = Machine(env, id="M1", processing_delay=1)
+    buffer2 = CountingBuffer(env, id="BUF2", capacity=2)
+    sink = Sink(env, id="SNK")
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, sink)
+
+    env.run(until=20)
+
+    assert machine.stats["num_item_processed"] > 0
+    assert buffer2.num_put == machine.stats["num_item_processed"]
+
+
+class PlainReserveBuffer(Buffer):
+    # a user-defined edge whose reserve methods take no select argument
+    def reserve_put(self):
+        return super().reserve_put()
+
+    def reserve_get(self):
+        return super().reserve_get()
+
+
+def test_machine_selects_on_edges_without_select_support():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=0.5, blocking=True)
+    buffer1 = PlainReserveBuffer(env, id="BUF1", capacity=2)
+    machine = Machine(env, id="M1", processing_delay=1, work_capacity=2)
+    first, second = PlainReserveBuffer(env, id="BUF2", capacity=1, delay=1), Buffer(env, id="BUF3", capacity=1, delay=1)
+    sinks = [Sink(env, id="SNK1"), Sink(env, id="SNK2")]
+    buffer1.connect(source, machine)
+    first.connect(machine, sinks[0])
+    second.connect(machine, sinks[1])
+
+    env.run(until=20)
+
+    received = [sink.stats["num_item_received"] for sink in sinks]
+    assert machine.stats["num_item_processed"] > 0
+    assert all(received)
+    assert sum(received) + len(first.inbuiltstore.items) + len(second.inbuiltstore.items) \
+        + len(first.inbuiltstore.ready_items) + len(second.inbuiltstore.ready_items) == machine.stats["num_item_processed"]
+
+
+def test_machine_rejects_edges_without_the_edge_protocol():
+    env = simpy.Environment()
+    machine = Machine(env, id="M1", processing_delay=1)
+    machine.in_edges = [object()]
+    machine.out_edges = [Buffer(env, id="BUF", capacity=1, delay=0)]
+    with pytest.raises(ValueError, match="has no method 'reserve_put'"):
+        machine._resolve_edge_ops()
+
+
+def test_machine_uses_parameters_set_before_the_run():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1, blocking=True)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=None)
+    buffer2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SNK")
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, sink)
+    # the parameters are compiled when the nodes start, so values set after creating them are used
+    machine.processing_delay = iter([0.5, 0.25] * 20).__next__
+    buffer2.delay = (0.1 for _ in range(40))
+
+    env.run(until=10)
+
+    assert machine.stats["processing_delay"][:4] == [0.5, 0.25, 0.5, 0.25]
+    assert sink.stats["num_item_received"] > 0
+
+
+def test_edge_delay_set_after_creation_is_compiled_once():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1, blocking=True)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=1)
+    buffer2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, Node(env, id="DEST"))
+    buffer2.delay = 0.5
+    resets = []
+    compile_delay = buffer2.reset
+    buffer2.reset = lambda: (resets.append(env.now), compile_delay())
+    ready_times = []
+
+    def collect():
+        while True:
+            get_event = buffer2.reserve_get()
+            yield get_event
+            buffer2.get(get_event)
+            ready_times.append(env.now)
+
+    env.process(collect())
+    env.run(until=5)
+
+    # the delay is compiled when it is set, the nodes at both ends do not reset the edge
+    assert resets == []
+    assert ready_times[:2] == [2.5, 3.5]
+
+
+def test_machine_rejects_out_of_range_edge_selection():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1, blocking=True)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=1, out_edge_selection=(i for i in [0, 1]))
+    buffer2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SNK")
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, sink)
+
+    # the index is checked once, by the compiled selector
+    with pytest.raises(AssertionError, match="Invalid edge index. 1 is not in range"):
+        env.run(until=10)
+    assert machine.stats["out_edge_selection"] == [0]
+
+
+def test_machine_rejects_negative_processing_delay():
+    env = simpy.Environment()
+    source = Source(env, id="SRC", inter_arrival_time=1, blocking=True)
+    buffer1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    machine = Machine(env, id="M1", processing_delay=(d for d in [1, -1]))
+    buffer2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SNK")
+    buffer1.connect(source, machine)
+    buffer2.connect(machine, sink)
+
+    with pytest.raises(AssertionError, match="Delay must be non-negative"):
+        env.run(until=10)
@@ -601,3 +601,95 @@ def test_2reserve_get_delayed1get_filter(env):
   env.process(process())
   env.run()
 
+
+
+class TypedItem:
+  """Item with a type, used as key in the keyed store tests."""
+  def __init__(self, name, kind):
+    self.name = name
+    self.kind = kind
+
+
+def test_keyed_reserve_get_by_key(env):
+  store = ReservablePriorityReqFilterStore(env, capacity=10, key_function=lambda item: item.kind)
+  got = []
+
+  def consumer(kind, priority=0):
+    get_event = store.reserve_get(priority=priority, key=kind)
+    yield get_event
+    got.append((env.now, store.get(get_event).name))
+
+  def producer():
+    yield env.timeout(1)
+    for name, kind in [("b0", "B"), ("a0", "A"), ("b1", "B")]:
+      put_event = store.reserve_put()
+      yield put_event
+      store.put(put_event, TypedItem(name, kind))
+      yield env.timeout(1)
+
+  # the request for "C" never matches and must not block the others
+  env.process(consumer("C"))
+  env.process(consumer("A"))
+  env.process(consumer("B", priority=2))
+  env.process(consumer("B", priority=1))
+  env.process(producer())
+  env.run()
+  assert got == [(1, "b0"), (2, "a0"), (3, "b1")]
+  assert list(store.key_waiters) == ["C"]
+  assert store.items == []
+
+
+def test_keyed_store_cancel_and_filter_fallback(env):
+  store = ReservablePriorityReqFilterStore(env, capacity=10, key_function=lambda item: item.kind)
+
+  def process():
+    for name, kind in [("a0", "A"), ("b0", "B"), ("a1", "A")]:
+      put_event = store.reserve_put()
+      yield put_event
+      store.put(put_event, TypedItem(name, kind))
+
+    get_a = store.reserve_get(key="A")
+    yield get_a
+    assert store.reserved_items[get_a].name == "a0"
+    store.reserve_get_cancel(get_a)
+    assert [item.name for item in store.key_index["A"]] == ["a0", "a1"]
+
+    # a filter request takes the exact item it matched
+    get_any = store.reserve_get(filter=lambda item: item.name == "a1")
+    yield get_any
+    assert store.get(get_any).name == "a1"
+    assert [item.name for item in store.items] == ["a0", "b0"]
+
+    with pytest.raises(ValueError):
+      store.reserve_get(key="A", filter=lambda item: True)
+
+  env.process(process())
+  env.run()
+
+  with pytest.raises(ValueError):
+    ReservablePriorityReqFilterStore(env).reserve_get(key="A")
+
+
+def test_trigger_delay_wakes_waiting_get_once_ready(env):
+  store = ReservablePriorityReqFilterStore(env, capacity=5, trigger_delay=2)
+  got = []
+
+  def consumer():
+    for _ in range(3):
+      get_event = store.reserve_get()
+      yield get_event
+      got.append((env.now, store.get(get_event).name))
+
+  def producer():
+    for i in range(3):
+      put_event = store.reserve_put()
+      yield put_event
+      store.put(put_event, Item(f"item{i}"))
+      assert len(store.ready_index) >= 1
+      yield env.timeout(0.5)
+
+  env.process(consumer())
+  env.process(producer())
+  env.run()
+  assert got == [(2, "item0"), (2.5, "item1"), (3, "item2")]
+  assert len(store.ready_index) == 0
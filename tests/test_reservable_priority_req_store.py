@@ -514,3 +514,33 @@ def test_reserve_get_put(env, store):
 
 
 
+
+
+def test_reserve_get_priority_and_fifo_tie_break(env, store):
+  """Waiting reserve_get requests are served by priority, and in request order for equal priorities,
+  and cancelled requests are skipped."""
+  served = []
+
+  def getter(name, priority):
+    get_event = store.reserve_get(priority=priority)
+    if name == "cancelled":
+      store.reserve_get_cancel(get_event)
+      return
+    yield get_event
+    served.append(name)
+    store.get(get_event)
+
+  def putter():
+    yield env.timeout(1)
+    for i in range(4):
+      put_event = store.reserve_put()
+      yield put_event
+      store.put(put_event, Item(f"item{i}"))
+      yield env.timeout(1)
+
+  for name, priority in [("a", 2), ("b", 1), ("cancelled", 0), ("c", 2), ("d", 1)]:
+    env.process(getter(name, priority))
+  env.process(putter())
+  env.run()
+  assert served == ["b", "d", "a", "c"]
+  assert len(store.reserve_get_queue) == 0
@@ -0,0 +1,312 @@
+import pytest
+import simpy, sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from factorysimpy.base.reservations import ReservationQueue, ReservationSet, ReservationSelect
+from factorysimpy.base.buffer_store import BufferStore
+from factorysimpy.base.edge_protocol import EdgeOps
+from factorysimpy.edges.buffer import Buffer
+from factorysimpy.helper.item import Item
+from factorysimpy.nodes.node import Node
+
+
+def make_event(env, priority=0):
+    event = env.event()
+    event.priority_to_get = priority
+    return event
+
+
+def test_reservation_set_keeps_insertion_order():
+    env = simpy.Environment()
+    events = [env.event() for _ in range(5)]
+    res = ReservationSet()
+    for event in events:
+        res.append(event)
+    res.remove(events[2])
+    assert list(res) == [events[0], events[1], events[3], events[4]]
+    assert events[2] not in res and len(res) == 4
+    with pytest.raises(ValueError):
+        res.remove(events[2])
+
+
+def test_reservation_queue_fifo_and_priority():
+    env = simpy.Environment()
+    fifo = ReservationQueue()
+    prio = ReservationQueue("priority_to_get")
+    events = [make_event(env, p) for p in (2, 1, 2, 0)]
+    for event in events:
+        fifo.append(event)
+        prio.append(event)
+    assert [fifo.pop() for _ in range(4)] == events
+    prio.remove(events[3])
+    assert list(prio) == [events[1], events[0], events[2]]
+    assert prio.pop() is events[1]
+    assert prio.peek() is events[0]
+    with pytest.raises(ValueError):
+        prio.remove(events[3])
+
+
+def test_deep_buffer_store_cancel_and_get():
+    env = simpy.Environment()
+    store = BufferStore(env, capacity=10000, mode="FIFO")
+    served = []
+
+    def producer(env):
+        for i in range(2000):
+            event = store.reserve_put()
+            yield event
+            store.put(event, (i, 0))
+        yield env.timeout(0)
+
+    def consumer(env):
+        yield env.timeout(1)
+        events = [store.reserve_get() for _ in range(1000)]
+        for event in events[::2]:
+            store.reserve_get_cancel(event)
+        for event in events[1::2]:
+            yield event
+            served.append(store.get(event))
+
+    env.process(producer(env))
+    env.process(consumer(env))
+    env.run()
+    assert len(served) == 500
+    assert len(set(served)) == 500
+    assert len(store.reserved_items) == 0 and len(store.reservations_get) == 0
+
+
+def test_select_is_granted_by_exactly_one_store():
+    env = simpy.Environment()
+    stores = [BufferStore(env, capacity=5) for _ in range(3)]
+    result = {}
+
+    def consumer(env):
+        select = ReservationSelect(env, "get")
+        request = yield select.reserve(stores)
+        result["index"] = select.index
+        result["item"] = stores[select.index].get(request)
+
+    def producer(env, store, t):
+        yield env.timeout(t)
+        event = store.reserve_put()
+        yield event
+        store.put(event, ("x%g" % t, 0))
+
+    env.process(consumer(env))
+    env.process(producer(env, stores[2], 1))
+    env.process(producer(env, stores[0], 2))
+    env.run()
+    assert result == {"index": 2, "item": "x1"}
+    # the other stores never granted a reservation and hold no waiter
+    assert all(len(store.reserve_get_queue) == 0 for store in stores)
+    assert len(stores[0].reservations_get) == 0 and len(stores[0].ready_items) == 1
+
+
+def test_select_stops_at_first_available_and_cancel():
+    env = simpy.Environment()
+    stores = [BufferStore(env, capacity=1) for _ in range(3)]
+    select = ReservationSelect(env, "put")
+    select.reserve(stores)
+    assert select.triggered and select.index == 0
+    assert len(select.requests) == 1
+    select.cancel()
+    assert len(stores[0].reservations_put) == 0
+
+    with pytest.raises(ValueError):
+        ReservationSelect(env, "take")
+
+
+class PlainReserveBuffer(Buffer):
+    def reserve_put(self):
+        return super().reserve_put()
+
+    def reserve_get(self):
+        return super().reserve_get()
+
+
+@pytest.mark.parametrize("plain_first", [True, False])
+def test_select_falls_back_to_plain_reservations(plain_first):
+    env = simpy.Environment()
+    plain, other = PlainReserveBuffer(env, "P", capacity=5), Buffer(env, "B", capacity=5)
+    for edge in (plain, other):
+        # the test puts and gets the items itself, the far ends of the edges are plain nodes
+        edge.connect(Node(env, f"src-{edge.id}"), Node(env, f"dest-{edge.id}"))
+    edges = [EdgeOps(plain), EdgeOps(other)]
+    assert not edges[0].supports_select and edges[1].supports_select
+    result = {}
+
+    def consumer(env):
+        select = ReservationSelect(env, "get")
+        request = yield select.reserve(edges)
+        result["index"] = select.index
+        result["item"] = edges[select.index].get(request).id
+
+    def producer(env, edge, name, t):
+        yield env.timeout(t)
+        event = edge.reserve_put()
+        yield event
+        edge.put(event, Item(name))
+
+    env.process(consumer(env))
+    env.process(producer(env, plain, "p", 1 if plain_first else 2))
+    env.process(producer(env, other, "b", 2 if plain_first else 1))
+    env.run()
+
+    assert result == ({"index": 0, "item": "p"} if plain_first else {"index": 1, "item": "b"})
+    # the edge that was not chosen holds no reservation and keeps its item
+    for edge in (plain, other):
+        store = edge.inbuiltstore
+        assert len(store.reserve_get_queue) == 0 and len(store.reservations_get) == 0
+    assert len((other if plain_first else plain).inbuiltstore.ready_items) == 1
+
+
+def test_select_entries_behind_a_blocked_head_are_reclaimed():
+    env = simpy.Environment()
+    blocked, busy = BufferStore(env, capacity=1), BufferStore(env, capacity=1)
+    # a plain reservation that is never granted stays at the head of the get queue of `blocked`
+    blocked.reserve_get()
+    heap_sizes = []
+
+    def consumer(env):
+        for _ in range(1000):
+            select = ReservationSelect(env, "get")
+            request = yield select.reserve([blocked, busy])
+            busy.get(request)
+            heap_sizes.append(len(blocked.reserve_get_queue._heap))
+
+    def producer(env):
+        for i in range(1000):
+            event = busy.reserve_put()
+            yield event
+            busy.put(event, (i, 0))
+            yield env.timeout(1)
+
+    env.process(consumer(env))
+    env.process(producer(env))
+    env.run()
+    assert len(heap_sizes) == 1000
+    assert len(blocked.reserve_get_queue) == 1
+    assert max(heap_sizes) <= 3
+
+
+def test_multi_unit_reservations_are_atomic():
+    env = simpy.Environment()
+    store = BufferStore(env, capacity=4)
+    log = []
+
+    def producer(env):
+        for i in range(4):
+            event = store.reserve_put()
+            yield event
+            store.put(event, (i, 0))
+            yield env.timeout(1)
+
+    def consumer(env):
+        event = store.reserve_get(n=3)
+        yield event
+        log.append((env.now, store.get(event)))
+
+    env.process(producer(env))
+    env.process(consumer(env))
+    env.run()
+    # granted once the third item is ready, and the items are taken in FIFO order
+    assert log == [(2, [0, 1, 2])]
+    assert store.ready_items == [3]
+    assert store.reservations_get.units == 0
+
+    put_event = store.reserve_put(n=3)
+    assert put_event.triggered and store.reservations_put.units == 3
+    assert not store.reserve_put(n=1).triggered
+    with pytest.raises(ValueError):
+        store.put(put_event, [(4, 0), (5, 0)])
+    with pytest.raises(ValueError):
+        store.reserve_get(n=5)
+
+
+def test_multi_unit_cancel_releases_all_items():
+    env = simpy.Environment()
+    store = BufferStore(env, capacity=5)
+    event = store.reserve_put(n=3)
+    store.put(event, [("a", 0), ("b", 0), ("c", 0)])
+    env.run()
+    assert store.ready_items == ["a", "b", "c"]
+
+    event = store.reserve_get(n=2)
+    assert store.reserved_items[event] == ["a", "b"]
+    store.reserve_get_cancel(event)
+    assert store.reservations_get.units == 0 and sorted(store.ready_items) == ["a", "b", "c"]
+    assert store.reserve_get(n=3).triggered
+
+
+def build_combiner(env, bulk_reservations, parts_inter_arrival_time=0.2):
+    from factorysimpy.nodes.source import Source
+    from factorysimpy.nodes.sink import Sink
+    from factorysimpy.nodes.combiner import Combiner
+    from factorysimpy.edges.buffer import Buffer
+    pallets = Source(env, id="P", flow_item_type="pallet", inter_arrival_time=1, blocking=True)
+    parts = Source(env, id="A", inter_arrival_time=parts_inter_arrival_time, blocking=True)
+    combiner = Combiner(env, id="C", target_quantity_of_each_item=[1, 3], processing_delay=0.5, bulk_reservations=bulk_reservations)
+    sink = Sink(env, id="S")
+    Buffer(env, id="BP", capacity=1).connect(pallets, combiner)
+    parts_buffer = Buffer(env, id="BA", capacity=3)
+    parts_buffer.connect(parts, combiner)
+    Buffer(env, id="BO", capacity=1).connect(combiner, sink)
+    return combiner, parts_buffer, sink
+
+
+@pytest.mark.parametrize("bulk_reservations, expected", [(True, {3}), (False, {1})])
+def test_combiner_reserves_each_component_edge_once(bulk_reservations, expected):
+    env = simpy.Environment()
+    combiner, parts_buffer, sink = build_combiner(env, bulk_reservations)
+    requested = []
+    reserve_get = parts_buffer.reserve_get
+    parts_buffer.reserve_get = lambda n=1, select=None: requested.append(n) or reserve_get(n=n, select=select)
+    env.run(until=10)
+    assert sink.stats["num_item_received"] > 0
+    assert requested and set(requested) == expected
+
+
+@pytest.mark.parametrize("bulk_reservations", [True, False])
+def test_combiner_bulk_reservation_holds_items_upstream(bulk_reservations):
+    env = simpy.Environment()
+    combiner, parts_buffer, sink = build_combiner(env, bulk_reservations, parts_inter_arrival_time=1)
+    # the first pallet is waiting at t=1 and two of the three parts have arrived at t=2.5
+    env.run(until=2.5)
+    num_parts_in_buffer = len(parts_buffer.inbuiltstore.items) + len(parts_buffer.inbuiltstore.ready_items)
+    if bulk_reservations:
+        # the parts stay in the buffer until all three are available
+        assert num_parts_in_buffer == 2
+        assert len(combiner.pallet_in_process.items) == 0
+    else:
+        # every part is taken as soon as it is available
+        assert num_parts_in_buffer == 0
+        assert len(combiner.pallet_in_process.items) == 2
+
+
+@pytest.mark.parametrize("bulk_reservations, expected", [(True, {3}), (False, {1})])
+def test_splitter_bulk_reservation_is_opt_in(bulk_reservations, expected):
+    from factorysimpy.nodes.source import Source
+    from factorysimpy.nodes.sink import Sink
+    from factorysimpy.nodes.combiner import Combiner
+    from factorysimpy.nodes.splitter import Splitter
+    from factorysimpy.edges.buffer import Buffer
+    env = simpy.Environment()
+    pallets = Source(env, id="P", flow_item_type="pallet", inter_arrival_time=1, blocking=True)
+    parts = Source(env, id="A", inter_arrival_time=0.2, blocking=True)
+    combiner = Combiner(env, id="C", target_quantity_of_each_item=[1, 3], processing_delay=0.5)
+    # the pallets of the combiner are unpacked again by the splitter
+    splitter = Splitter(env, id="SP", processing_delay=0.1, bulk_reservations=bulk_reservations)
+    sink = Sink(env, id="S")
+    Buffer(env, id="BP", capacity=1).connect(pallets, combiner)
+    Buffer(env, id="BA", capacity=3).connect(parts, combiner)
+    Buffer(env, id="BO", capacity=1).connect(combiner, splitter)
+    items_buffer = Buffer(env, id="BI", capacity=4)
+    items_buffer.connect(splitter, sink)
+    requested = []
+    reserve_put = items_buffer.reserve_put
+    items_buffer.reserve_put = lambda n=1, select=None: requested.append(n) or reserve_put(n=n, select=select)
+    env.run(until=10)
+    assert sink.stats["num_item_received"] > 0
+    # the empty pallet is always pushed on its own
+    assert set(requested) == expected | {1}
+    assert (3 in requested) == bulk_reservations
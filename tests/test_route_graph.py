@@ -0,0 +1,62 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from factorysimpy.base.route_graph import RouteGraph
+import numpy as np
+import pytest
+
+
+AISLES = [("A", "B", 1), ("B", "C", 2), ("C", "D", 3), ("A", "D", 10), ("B", "D", 6)]
+
+
+def test_route_graph_shortest_paths():
+    graph = RouteGraph(AISLES, stations=["E"], speed=2)
+    assert graph.path("A", "D") == ["A", "B", "C", "D"]
+    assert graph.path("D", "A") == ["D", "C", "B", "A"]
+    assert graph.travel_time("A", "D") == 3
+    assert graph.path("A", "E") == []
+    assert graph.travel_time("E", "A") == float('inf')
+
+
+def test_route_graph_directed_aisles():
+    graph = RouteGraph(AISLES, directed=True)
+    assert graph.path("A", "D") == ["A", "B", "C", "D"]
+    assert graph.path("D", "A") == []
+
+
+def test_route_graph_matches_brute_force_on_a_grid():
+    rng = np.random.default_rng(3)
+    size = 6
+    aisles = []
+    for r in range(size):
+        for c in range(size):
+            if c + 1 < size:
+                aisles.append((r * size + c, r * size + c + 1, float(rng.integers(1, 9))))
+            if r + 1 < size:
+                aisles.append((r * size + c, (r + 1) * size + c, float(rng.integers(1, 9))))
+    graph = RouteGraph(aisles)
+    # Bellman-Ford from node 0
+    dist = {node: float('inf') for node in graph.nodes}
+    dist[0] = 0.0
+    for _ in graph.nodes:
+        for u, v, length in aisles:
+            dist[v] = min(dist[v], dist[u] + length)
+            dist[u] = min(dist[u], dist[v] + length)
+    for node in graph.nodes:
+        assert graph.travel_time(0, node) == dist[node]
+        path = graph.path(0, node)
+        lengths = {frozenset((u, v)): length for u, v, length in aisles}
+        assert sum(lengths[frozenset(hop)] for hop in zip(path, path[1:])) == dist[node]
+
+
+def test_route_graph_cache(tmp_path):
+    graph = RouteGraph(AISLES, cache_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == [f"route_graph_{graph.layout_hash}.npz"]
+    cached = RouteGraph(AISLES, cache_dir=str(tmp_path))
+    assert np.array_equal(cached.distance, graph.distance)
+    assert np.array_equal(cached.next_hop, graph.next_hop)
+    assert RouteGraph(AISLES[:-1]).layout_hash != graph.layout_hash
+
+
+def test_route_graph_rejects_negative_lengths():
+    with pytest.raises(ValueError):
+        RouteGraph([("A", "B", -1)])
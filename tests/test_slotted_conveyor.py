@@ -0,0 +1,62 @@
+import pytest
+import simpy, sys, os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from factorysimpy.nodes.machine import Machine
+from factorysimpy.edges.buffer import Buffer
+from factorysimpy.edges.slotted_conveyor import ConveyorBelt
+from factorysimpy.nodes.source import Source
+from factorysimpy.nodes.sink import Sink
+
+
+def build_model(engine, capacity, delay, accumulating, inter_arrival_time, processing_delay):
+    env = simpy.Environment()
+    src = Source(env, id="SRC", inter_arrival_time=inter_arrival_time, blocking=True, out_edge_selection="FIRST_AVAILABLE")
+    machine = Machine(env, id="M1", processing_delay=processing_delay, work_capacity=1, blocking=True,
+                      in_edge_selection="FIRST_AVAILABLE", out_edge_selection="ROUND_ROBIN")
+    sink = Sink(env, id="SINK")
+    buffer1 = Buffer(env, id="BUFFER1", capacity=1, delay=0)
+    conveyor = ConveyorBelt(env, id="CONVEYOR1", capacity=capacity, delay=delay, accumulating=accumulating, engine=engine)
+    conveyor.connect(src, machine)
+    buffer1.connect(machine, sink)
+    return env, conveyor, sink
+
+
+@pytest.mark.parametrize("accumulating", [True, False])
+def test_ring_engine_matches_process_engine(accumulating):
+    results = []
+    for engine in ("process", "ring"):
+        env, conveyor, sink = build_model(engine, 3, 1, accumulating, 1, 2)
+        env.run(until=500)
+        conveyor.update_final_conveyor_avg_content(500)
+        results.append((sink.stats["num_item_received"],
+                        np.round(conveyor.stats["time_averaged_num_of_items_in_conveyor"], 3),
+                        np.round(sink.stats["total_cycle_time"] / sink.stats["num_item_received"], 3)))
+    assert results[0] == results[1] == (247, 2.988, 7.976)
+
+
+def test_ring_engine_accumulates_behind_blocked_exit():
+    # the machine keeps the second item at the exit from t=10 to t=28
+    env, conveyor, sink = build_model("ring", 6, 1, True, 2, 20)
+    env.run(until=12.5)
+    assert conveyor.belt._get_belt_pattern() == "*_*_**"
+    env.run(until=20.5)
+    assert conveyor.belt._get_belt_pattern() == "_*****"
+    assert conveyor.belt.front_run == 5
+    assert len(conveyor.belt.ready_items) == 1
+
+
+def test_ring_engine_stops_non_accumulating_belt():
+    env, conveyor, sink = build_model("ring", 6, 1, False, 2, 20)
+    env.run(until=10.5)
+    assert conveyor.belt._get_belt_pattern() == "*_*_*_"
+    env.run(until=27.5)
+    assert conveyor.belt._get_belt_pattern() == "*_*_*_"
+    env.run(until=29.5)
+    assert conveyor.belt._get_belt_pattern() == "**_*_*"
+
+
+def test_slotted_conveyor_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        ConveyorBelt(simpy.Environment(), id="CONVEYOR1", capacity=3, delay=1, accumulating=True, engine="fast")
@@ -0,0 +1,111 @@
+import pytest
+import simpy, sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from factorysimpy.nodes.machine import Machine
+from factorysimpy.edges.buffer import Buffer
+from factorysimpy.nodes.source import Source
+from factorysimpy.nodes.sink import Sink
+from factorysimpy.utils.trace import tracer, TraceRecorder, TRACE_DTYPE
+
+
+@pytest.fixture(autouse=True)
+def reset_tracer():
+    tracer.detach()
+    yield
+    tracer.detach()
+
+
+def run_pipeline(until=20):
+    env = simpy.Environment()
+    src = Source(env, id="SRC", inter_arrival_time=1, blocking=False, out_edge_selection="ROUND_ROBIN")
+    buf1 = Buffer(env, id="BUF1", capacity=2, delay=0)
+    m1 = Machine(env, id="M1", processing_delay=2, work_capacity=1)
+    buf2 = Buffer(env, id="BUF2", capacity=2, delay=0)
+    sink = Sink(env, id="SINK")
+    buf1.connect(src, m1)
+    buf2.connect(m1, sink)
+    env.run(until=until)
+    return sink
+
+
+def test_tracing_disabled_by_default():
+    assert tracer.enabled is False
+    run_pipeline()
+
+
+def test_records_events_from_all_components():
+    rec = tracer.attach(TraceRecorder(capacity=1024))
+    sink = run_pipeline()
+    records = rec.records()
+    assert records.dtype == TRACE_DTYPE
+    assert len(records) == len(rec) > 0
+    assert (records["time"][1:] >= records["time"][:-1]).all()
+
+    decoded = rec.decode()
+    events = {(comp, ev) for _, comp, ev, _, _ in decoded}
+    assert ("BUF1", "PUT") in events
+    assert ("BUF1", "RESERVE_GET") in events
+    assert ("M1", "STATE_CHANGE") in events
+    assert ("SRC", "DISCARD") in events
+    sink_gets = [d for d in decoded if d[1] == "SINK" and d[2] == "GET"]
+    assert len(sink_gets) == sink.stats["num_item_received"]
+    assert all(d[4] == "BUF2" for d in sink_gets)
+
+
+def test_ring_buffer_keeps_latest_records():
+    full = tracer.attach(TraceRecorder(capacity=100000))
+    ring = tracer.attach(TraceRecorder(capacity=16))
+    run_pipeline()
+    assert len(ring) == 16
+    assert ring.decode() == full.decode()[-16:]
+
+
+def test_spill_to_file(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    full = tracer.attach(TraceRecorder(capacity=100000))
+    spill = tracer.attach(TraceRecorder(capacity=16, spill_path=path))
+    run_pipeline()
+    assert spill.num_spilled > 0
+    assert spill.decode() == full.decode()
+    spill.close()
+    loaded = TraceRecorder.load(path)
+    assert len(loaded) == len(full)
+    assert (loaded["time"] == full.records()["time"]).all()
+
+
+def test_item_table_does_not_grow_with_the_run(tmp_path):
+    full = tracer.attach(TraceRecorder(capacity=100000))
+    ring = tracer.attach(TraceRecorder(capacity=16))
+    path = str(tmp_path / "trace.bin")
+    spill = tracer.attach(TraceRecorder(capacity=16, spill_path=path))
+    sink = run_pipeline(until=200)
+    assert sink.stats["num_item_received"] > 32
+    # only the ids the retained records can refer to are kept in memory
+    assert len(ring.items) <= 2 * 16
+    assert len(spill.items) <= 16
+    assert ring.decode() == full.decode()[-16:]
+    spill.close()
+    assert spill.decode() == full.decode()
+    assert set(TraceRecorder.load_items(path + ".items")) == {d[3] for d in full.decode() if d[2] != "STATE_CHANGE" and d[3] is not None}
+
+
+def test_chrome_trace_export(tmp_path):
+    import json
+    from factorysimpy.utils.trace import ChromeTraceWriter
+    path = str(tmp_path / "trace.json")
+    writer = tracer.attach(ChromeTraceWriter(path, time_scale=1, chunk_size=3))
+    run_pipeline(until=20)
+    writer.close(end_time=20)
+    with open(path) as f:
+        data = json.load(f)
+    slices = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    names = {e["args"]["name"]: e["tid"] for e in data["traceEvents"] if e["ph"] == "M"}
+    assert {"SRC", "M1", "SINK"} <= set(names)
+    m1_slices = [e for e in slices if e["tid"] == names["M1"]]
+    assert m1_slices[0]["name"] == "SETUP_STATE"
+    # slices of one component tile the whole run
+    assert sum(e["dur"] for e in m1_slices) == pytest.approx(20)
+    for prev, nxt in zip(m1_slices, m1_slices[1:]):
+        assert prev["ts"] + prev["dur"] == pytest.approx(nxt["ts"])
+        assert prev["name"] != nxt["name"]
@@ -0,0 +1,74 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from factorysimpy.base.route_graph import RouteGraph
+from factorysimpy.base.traffic_grid import TrafficGrid, _segment_distance
+import numpy as np
+import pytest
+
+
+POSITIONS = {"A": (0, 0), "B": (4, 0), "C": (0, 1), "D": (4, 1), "E": (8, 0)}
+GRAPH = RouteGraph([("A", "B", 4), ("C", "D", 4), ("B", "E", 4)])
+
+
+def index(*nodes):
+    return [GRAPH.index[node] for node in nodes]
+
+
+def test_traffic_head_on_vehicles_wait():
+    traffic = TrafficGrid(GRAPH, POSITIONS, cell_size=2)
+    a, b = index("A", "B")
+    assert traffic.reserve_path("v1", a, b, 0) == 4
+    # the aisle is taken until 4
+    assert traffic.reserve_path("v2", b, a, 1) == 8
+    assert traffic.num_delayed_hops == 1
+    assert traffic.total_delay == 3
+    # windows that have ended are no obstacle
+    assert traffic.reserve_path("v3", a, b, 10) == 14
+
+
+def test_traffic_clearance_between_parallel_aisles():
+    a, b, c, d = index("A", "B", "C", "D")
+    close = TrafficGrid(GRAPH, POSITIONS, cell_size=2, clearance=1.5)
+    close.reserve_path("v1", a, b, 0)
+    assert close.reserve_path("v2", c, d, 0) == 8
+    apart = TrafficGrid(GRAPH, POSITIONS, cell_size=2, clearance=0.5)
+    apart.reserve_path("v1", a, b, 0)
+    assert apart.reserve_path("v2", c, d, 0) == 4
+
+
+def test_traffic_aisles_sharing_a_node():
+    traffic = TrafficGrid(GRAPH, POSITIONS, cell_size=2, clearance=1)
+    a, b, e = index("A", "B", "E")
+    traffic.reserve_path("v1", a, b, 0)
+    assert traffic.reserve_path("v2", e, b, 0) == 4
+
+
+def test_traffic_windows_never_conflict():
+    rng = np.random.default_rng(7)
+    size = 6
+    positions = {(r, c): (c * 3, r * 3) for r in range(size) for c in range(size)}
+    aisles = [((r, c), (r, c + 1), 3) for r in range(size) for c in range(size - 1)]
+    aisles += [((r, c), (r + 1, c), 3) for r in range(size - 1) for c in range(size)]
+    graph = RouteGraph(aisles)
+    traffic = TrafficGrid(graph, positions, cell_size=4, clearance=1)
+    for k in range(200):
+        start, end = rng.choice(len(graph.nodes), 2, replace=False)
+        traffic.reserve_path(k, int(start), int(end), float(k) / 4)
+    assert traffic.num_delayed_hops > 0
+
+    # check every pair of windows still registered, without the grid
+    windows = {window for cell in traffic._cells.values() for window in cell}
+    windows = sorted(windows, key=lambda window: window[0])
+    points = [positions[node] for node in graph.nodes]
+    for n, (s1, e1, i1, j1, _) in enumerate(windows):
+        for s2, e2, i2, j2, _ in windows[n + 1:]:
+            if s2 >= e1:
+                break
+            same = {i1, j1} == {i2, j2}
+            close = not {i1, j1} & {i2, j2} and _segment_distance(points[i1], points[j1], points[i2], points[j2]) < 1
+            assert not (same or close)
+
+
+def test_traffic_rejects_missing_positions():
+    with pytest.raises(ValueError):
+        TrafficGrid(GRAPH, {"A": (0, 0)}, cell_size=1)